@@ -0,0 +1,51 @@
+/**
+ * Print the benefit figures the web app computes for canvases, for cross-checking
+ * the Python portfolio engine (tools/portfolio-benefits.py --cross-check).
+ * Reads one canvas JSON per line on stdin and writes one result JSON per line to stdout,
+ * using the same computeCanvasSummary / timeBenefits helpers as the app.
+ * Run: npx tsx scripts/benefit-rollups.ts < canvases.jsonl
+ */
+
+import { createInterface } from 'readline'
+import type { CanvasData } from '../src/types/canvas'
+import { computeCanvasSummary } from '../src/utils/canvasSummary'
+import { getOversightMinutes, getTimeSavedPerUnit } from '../src/utils/timeBenefits'
+
+function rollup(data: CanvasData) {
+  const summary = computeCanvasSummary(data)
+  // The summary only exposes rounded hours; recompute the unrounded total the same way
+  const requirements = data.userExpectations?.requirements ?? []
+  const totalMinutesSavedPerMonth = requirements.reduce<number>((total, req) => {
+    const timeBenefit = (req.benefits || []).find((b) => b.benefitType === 'time')
+    if (!timeBenefit) return total
+    const volume = req.volumePerMonth ?? 0
+    const gross = getTimeSavedPerUnit(timeBenefit, req) * volume
+    return total + Math.max(0, gross - getOversightMinutes(timeBenefit, volume))
+  }, 0)
+  return {
+    taskCount: summary.userExpectations.taskCount,
+    totalMinutesSavedPerMonth,
+    totalTimeSavedHoursPerMonth: summary.userExpectations.totalTimeSavedHoursPerMonth,
+    benefitTypeCounts: summary.userExpectations.benefitTypeCounts,
+    amortizationMonths: summary.developerFeasibility.amortizationMonths,
+  }
+}
+
+async function main() {
+  const lines = createInterface({ input: process.stdin, crlfDelay: Infinity })
+  for await (const line of lines) {
+    if (!line.trim()) continue
+    let result: object
+    try {
+      result = rollup(JSON.parse(line) as CanvasData)
+    } catch (e) {
+      result = { error: e instanceof Error ? e.message : String(e) }
+    }
+    process.stdout.write(JSON.stringify(result) + '\n')
+  }
+}
+
+main().catch((err) => {
+  console.error(err)
+  process.exit(1)
+})
@@ -0,0 +1,9 @@
+"""
+Shared helpers for the AAC command-line tools in tools/.
+
+The scripts in tools/ are run directly (``python tools/<script>.py``), which
+puts this directory on ``sys.path`` so the ``aac`` package can be imported
+without installing anything.
+"""
+
+__version__ = "0.14.0"
@@ -0,0 +1,386 @@
+"""
+Batch validation of canvas files across a process pool.
+
+Inputs can be directories (searched recursively for ``*.json`` and
+``*.jsonl``), glob patterns or individual files. JSON Lines files contribute
+one document per non-empty line. Each worker process builds a single
+``Draft7Validator`` in its initializer and reuses it for every document it
+receives; the parent only keeps a bounded number of chunks in flight so that
+memory stays flat regardless of corpus size.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain, islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jsonschema import Draft7Validator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from . import __version__
+from .codegen import load_fast_validator
+from .jsonstream import NotAnObjectError, StreamParseError, iter_events
+from .profiling import SchemaProfiler
+from .rocrate import ProfileValidator
+from .rules import RuleEngine
+from .schemagraph import SchemaGraph
+from .validation import Issue, build_validator, check_instance, is_rocrate, load_json
+from .vocabularies import vocabularies_digest
+
+if TYPE_CHECKING:
+    from .cache import ResultCache
+
+GLOB_CHARS = set("*?[")
+
+
+@dataclass
+class Source:
+    """A single document to validate: a JSON file or one line of a JSONL file."""
+
+    name: str
+    path: Path
+    line: Optional[int] = None
+    text: Optional[str] = None
+    digest: Optional[str] = None
+
+
+@dataclass
+class ValidationResult:
+    """Outcome for one source: ``valid``, ``invalid``, ``skipped`` or ``error``."""
+
+    name: str
+    status: str
+    errors: List[Issue] = field(default_factory=list)
+    kind: str = "canvas"
+    # Seconds spent per semantic rule (not part of the reports or the cache)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def failed(self) -> bool:
+        return self.status in ("invalid", "error")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON form used by the JSON Lines report and the validation server."""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "status": self.status,
+            "errors": [issue.to_dict() for issue in self.errors],
+        }
+
+
+@dataclass
+class BatchConfig:
+    """Settings each worker needs to build its validators (must be picklable)."""
+
+    schema_file: str
+    fast_path: bool = True
+    profile_file: Optional[str] = None
+    stream: bool = False
+    max_errors: Optional[int] = None
+    # Semantic rules to evaluate on canvases (aac.rules); None disables them
+    rules: Optional[Tuple[str, ...]] = None
+    # Time every schema keyword (aac.profiling); disables the compiled fast path
+    profile_schema: bool = False
+
+    def cache_key(self) -> str:
+        """Hash of everything that can change a result: tool version, schemas, options."""
+        parts = {
+            "version": __version__,
+            "schema": SchemaGraph.from_file(Path(self.schema_file)).digest(),
+            "profile": hashlib.sha256(Path(self.profile_file).read_bytes()).hexdigest() if self.profile_file else None,
+            "max_errors": self.max_errors,
+            "rules": sorted(self.rules) if self.rules is not None else None,
+            "vocabularies": vocabularies_digest() if self.rules and "vocabularies" in self.rules else None,
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def default_jobs() -> int:
+    """Number of worker processes to use when none is requested."""
+    return os.cpu_count() or 1
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def expand_inputs(inputs: Iterable[str]) -> Iterator[Path]:
+    """Expand directories and glob patterns into a sorted stream of files."""
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.suffix in (".json", ".jsonl") and p.is_file())
+        elif GLOB_CHARS & set(item):
+            yield from (Path(p) for p in sorted(glob.glob(item, recursive=True)) if Path(p).is_file())
+        else:
+            yield path
+
+
+def iter_sources(inputs: Iterable[str]) -> Iterator[Source]:
+    """Yield one Source per JSON file and per non-empty JSONL line, lazily."""
+    for path in expand_inputs(inputs):
+        if path.suffix != ".jsonl":
+            yield Source(name=str(path), path=path)
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    yield Source(name=f"{path}:{line_no}", path=path, line=line_no, text=line)
+
+
+@dataclass
+class Validators:
+    """The canvas validator, its compiled fast path, the optional RO-Crate profile and semantic rules."""
+
+    validator: Draft7Validator
+    fast: Optional[Callable[[Any], bool]] = None
+    profile: Optional[ProfileValidator] = None
+    schema_digest: str = ""
+    rules: Optional[RuleEngine] = None
+    profiler: Optional[SchemaProfiler] = None
+
+    @classmethod
+    def from_config(cls, config: BatchConfig) -> "Validators":
+        """Load the schemas named in a config and build their validators."""
+        graph = SchemaGraph.from_file(Path(config.schema_file))
+        profile = None
+        if config.profile_file:
+            profile = ProfileValidator.from_file(Path(config.profile_file), config.fast_path)
+        rules = RuleEngine(config.rules) if config.rules is not None else None
+        if config.profile_schema:
+            # Every canvas goes through the timed validator, never the fast path
+            profiler = SchemaProfiler(graph)
+            validator = build_validator(graph.root, graph, profiler.validator_class())
+            profiler.register_root(validator.schema)
+            return cls(validator, None, profile, graph.digest(), rules, profiler)
+        return cls(
+            validator=build_validator(graph.root, graph),
+            fast=load_fast_validator(graph.root, graph=graph) if config.fast_path else None,
+            profile=profile,
+            schema_digest=graph.digest(),
+            rules=rules,
+        )
+
+    def check(self, name: str, data: Any, max_errors: Optional[int] = None) -> ValidationResult:
+        """Validate an already parsed canvas or RO-Crate document."""
+        if is_rocrate(data):
+            if self.profile is None:
+                return ValidationResult(name, "skipped", kind="rocrate")
+            is_valid, errors = self.profile.validate(data, max_errors)
+            return ValidationResult(name, "valid" if is_valid else "invalid", errors, kind="rocrate")
+
+        if self.profiler is not None:
+            self.profiler.instances += 1
+        is_valid, errors = check_instance(self.validator, data, self.fast, max_errors)
+        timings: Dict[str, float] = {}
+        if self.rules is not None and (max_errors is None or len(errors) < max_errors):
+            issues = self.rules.check(data, timings)
+            if issues:
+                errors = errors + issues[: None if max_errors is None else max_errors - len(errors)]
+                is_valid = False
+        return ValidationResult(name, "valid" if is_valid else "invalid", errors, timings=timings)
+
+
+# Per-process state, set once by init_worker()
+_validators: Optional[Validators] = None
+_stream = False
+_max_errors = None
+
+
+def init_worker(config: BatchConfig) -> None:
+    """Process pool initializer: load the schemas and build the validators once."""
+    global _validators, _stream, _max_errors
+    _validators = Validators.from_config(config)
+    _stream = config.stream
+    _max_errors = config.max_errors
+
+
+def worker_validators() -> Optional[Validators]:
+    """The validators of this process (set by init_worker(); in-process runs use the parent's)."""
+    return _validators
+
+
+def check_document(name: str, data: Any) -> ValidationResult:
+    """Validate an already parsed canvas or RO-Crate document."""
+    return _validators.check(name, data, _max_errors)
+
+
+def check_file_streaming(source: Source) -> ValidationResult:
+    """
+    Validate a file while parsing it incrementally.
+
+    Top-level members are read one by one; once an array ``@graph`` starts
+    the document is treated as an RO-Crate and its entities are validated as
+    they are parsed. Documents without one (canvases) are small and are
+    validated as a whole once fully read. A top-level array or scalar is
+    parsed whole, so it gets the same result as without streaming.
+    """
+    with open(source.path, "r", encoding="utf-8") as f:
+        events = iter_events(f, stream_keys=("@graph",))
+        members = {}
+        try:
+            for event in events:
+                kind, key, value = event
+                if kind == "start":
+                    profile = _validators.profile
+                    if profile is None:
+                        return ValidationResult(source.name, "skipped", kind="rocrate")
+                    is_valid, errors = profile.validate_events(chain([event], events), members, _max_errors)
+                    return ValidationResult(source.name, "valid" if is_valid else "invalid", errors, kind="rocrate")
+                members[key] = value
+        except NotAnObjectError:
+            return check_document(source.name, load_json(source.path))
+    return check_document(source.name, members)
+
+
+def check_source(source: Source) -> ValidationResult:
+    """Parse and validate one source with the per-process validators."""
+    try:
+        if _stream and source.text is None:
+            return check_file_streaming(source)
+        data = json.loads(source.text) if source.text is not None else load_json(source.path)
+    except (json.JSONDecodeError, StreamParseError, UnicodeDecodeError) as e:
+        return ValidationResult(source.name, "error", [Issue("", f"JSON parsing error: {e}", "parse")])
+    except OSError as e:
+        return ValidationResult(source.name, "error", [Issue("", f"Error: {e}", "io")])
+
+    return check_document(source.name, data)
+
+
+def check_chunk(chunk: List[Source]) -> List[ValidationResult]:
+    """Validate a chunk of sources (one pool task) in order."""
+    return [check_source(source) for source in chunk]
+
+
+def _chunked(sources: Iterable[Source], size: int) -> Iterator[List[Source]]:
+    iterator = iter(sources)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(
+    sources: Iterable[Source],
+    config: BatchConfig,
+    jobs: int = 1,
+    prefetch: int = 64,
+    chunk_size: int = 16,
+    cache: Optional["ResultCache"] = None,
+) -> Iterator[ValidationResult]:
+    """
+    Validate sources and yield results in input order.
+
+    With ``jobs <= 1`` everything runs in-process. Otherwise sources are sent
+    to a process pool in chunks of ``chunk_size``; at most ``prefetch`` chunks
+    are read ahead and in flight at any time.
+
+    If a ResultCache is given, sources are looked up in the parent first and
+    only cache misses are validated; their results are stored back.
+
+    Closing the generator early (e.g. to fail fast on the first failure)
+    cancels chunks that have not started yet instead of validating them.
+    """
+    # Compiles (or finds) the fast path in the parent so workers only import it
+    init_worker(config)
+
+    def split(chunk: List[Source]) -> Tuple[Dict[int, ValidationResult], List[Source]]:
+        if cache is None:
+            return {}, chunk
+        hits = {}
+        for i, source in enumerate(chunk):
+            result = cache.lookup(source)
+            if result is not None:
+                hits[i] = result
+        return hits, [source for i, source in enumerate(chunk) if i not in hits]
+
+    def merge(chunk: List[Source], hits, misses: List[Source], miss_results: List[ValidationResult]):
+        if cache is not None:
+            for source, result in zip(misses, miss_results):
+                cache.store(source, result)
+        miss_iter = iter(miss_results)
+        return [hits[i] if i in hits else next(miss_iter) for i in range(len(chunk))]
+
+    if jobs <= 1:
+        for chunk in _chunked(sources, chunk_size):
+            hits, misses = split(chunk)
+            yield from merge(chunk, hits, misses, check_chunk(misses))
+        return
+
+    pending = deque()
+
+    def collect():
+        chunk, hits, misses, future = pending.popleft()
+        return merge(chunk, hits, misses, future.result() if future is not None else [])
+
+    pool = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(config,))
+    try:
+        for chunk in _chunked(sources, chunk_size):
+            hits, misses = split(chunk)
+            pending.append((chunk, hits, misses, pool.submit(check_chunk, misses) if misses else None))
+            if len(pending) >= max(prefetch, 1):
+                yield from collect()
+        while pending:
+            yield from collect()
+    finally:
+        for *_, future in pending:
+            if future is not None:
+                future.cancel()
+        pool.shutdown(wait=True)
+
+
+def map_chunks(
+    func: Callable[[List[Any]], List[Any]],
+    items: Iterable[Any],
+    jobs: int = 1,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple = (),
+    prefetch: int = 64,
+    chunk_size: int = 16,
+) -> Iterator[Any]:
+    """
+    Apply ``func`` to chunks of ``items`` and yield its results in input order.
+
+    The same bounded pipeline as ``run_batch`` for other per-document tasks:
+    ``func`` takes a list of items and returns one result per item, and
+    ``initializer`` sets up per-process state (it is also called in-process
+    when ``jobs <= 1``). At most ``prefetch`` chunks are in flight.
+    """
+    if jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for chunk in _chunked(items, chunk_size):
+            yield from func(chunk)
+        return
+
+    pending = deque()
+    pool = ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs)
+    try:
+        for chunk in _chunked(items, chunk_size):
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= max(prefetch, 1):
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
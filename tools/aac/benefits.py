@@ -0,0 +1,158 @@
+"""
+Benefit math for one canvas, ported from the web app.
+
+Line-for-line ports of ``getExpectedLikely``, ``getTimeSavedPerUnit`` and
+``getOversightMinutes`` (src/utils/timeBenefits.ts), ``parseTimeUnit`` and
+``toMinutes`` (src/utils/timeUnitConversion.ts), and the time-saved,
+benefit-count and amortization part of ``computeCanvasSummary``
+(src/utils/canvasSummary.ts), including their edge cases, so numbers
+computed here match what the app shows. The vectorized portfolio engine in
+aac.portfolio is checked against these functions.
+
+Standard library only. Canvases are assumed to be schema-valid.
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+MINUTES_PER_HOUR = 60
+HOURS_PER_WEEK = 40
+
+
+def parse_time_unit(unit: str) -> Optional[str]:
+    """``parseTimeUnit``: "minutes", "hours" or None for a non-time unit string."""
+    normalized = unit.lower().strip()
+    if "minute" in normalized or normalized in ("min", "mins"):
+        return "minutes"
+    if "hour" in normalized or normalized in ("hr", "hrs", "h"):
+        return "hours"
+    return None
+
+
+def to_minutes(value: float, unit: str) -> float:
+    """``toMinutes``: unknown units are treated as minutes."""
+    return value * MINUTES_PER_HOUR if unit == "hours" else value
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def expected_likely(value: Any) -> float:
+    """``getExpectedLikely``: the value of a numeric BenefitValue, else 0."""
+    if isinstance(value, dict) and value.get("type") == "numeric" and is_number(value.get("value")):
+        return value["value"]
+    return 0
+
+
+def time_unit(benefit: dict, requirement: Optional[dict] = None) -> str:
+    """Unit of a time benefit's values: the requirement's ``timeUnit``, else parsed from ``benefitUnit``."""
+    if requirement and requirement.get("timeUnit"):
+        return requirement["timeUnit"]
+    if benefit.get("benefitUnit"):
+        return parse_time_unit(benefit["benefitUnit"]) or "minutes"
+    return "minutes"
+
+
+def time_saved_per_unit(benefit: dict, requirement: Optional[dict] = None) -> float:
+    """``getTimeSavedPerUnit``: baseline minus expected, in minutes, never negative."""
+    unit = time_unit(benefit, requirement)
+    baseline_minutes = to_minutes(expected_likely(benefit.get("baseline")), unit)
+    expected_minutes = to_minutes(expected_likely(benefit.get("expected")), unit)
+    return max(0, baseline_minutes - expected_minutes)
+
+
+def _set(value: Any) -> bool:
+    """``!== undefined && !== null && !isNaN()``."""
+    return is_number(value) and not math.isnan(value)
+
+
+def oversight_minutes(benefit: dict, volume_per_month: Optional[float] = None) -> float:
+    """
+    ``getOversightMinutes``: human oversight in minutes per month.
+
+    perUnit benefits multiply ``oversightMinutesPerUnit`` by the volume (a
+    zero or missing volume returns the per-unit figure, as in the app);
+    perMonth benefits use ``oversightMinutesPerMonth``; anything else is 0.
+    """
+    basis = benefit.get("aggregationBasis")
+    if basis == "perUnit":
+        per_unit = benefit.get("oversightMinutesPerUnit")
+        if _set(per_unit):
+            return per_unit * volume_per_month if volume_per_month else per_unit
+    elif basis == "perMonth":
+        per_month = benefit.get("oversightMinutesPerMonth")
+        if _set(per_month):
+            return per_month
+    return 0
+
+
+def time_benefit(requirement: dict) -> Optional[dict]:
+    """The requirement's first benefit of type "time" (the one the summary counts)."""
+    for benefit in requirement.get("benefits") or []:
+        if benefit.get("benefitType") == "time":
+            return benefit
+    return None
+
+
+def net_minutes_saved(requirement: dict) -> float:
+    """Net time saved per month by one requirement: gross saving minus oversight, never negative."""
+    benefit = time_benefit(requirement)
+    if benefit is None:
+        return 0
+    volume = requirement.get("volumePerMonth")
+    volume = 0 if volume is None else volume
+    gross = time_saved_per_unit(benefit, requirement) * volume
+    return max(0, gross - oversight_minutes(benefit, volume))
+
+
+def effort_hours(requirement: dict) -> Optional[float]:
+    """A requirement's effort estimate in person-hours, or None if it has none (or zero)."""
+    estimate = ((requirement.get("feasibility") or {}).get("effortEstimate")) or {}
+    value = estimate.get("value")
+    if not is_number(value) or value <= 0:
+        return None
+    return value * HOURS_PER_WEEK if estimate.get("unit") == "weeks" else value
+
+
+def js_round(value: float) -> float:
+    """``Math.round``: halves round up, unlike Python's ``round()``."""
+    return math.floor(value + 0.5)
+
+
+def canvas_benefit_summary(canvas: dict) -> Dict[str, Any]:
+    """
+    The benefit figures ``computeCanvasSummary`` derives for a canvas.
+
+    ``totalMinutesSavedPerMonth`` is the unrounded sum behind the summary's
+    ``totalTimeSavedHoursPerMonth`` (hours, one decimal).
+    """
+    requirements = (canvas.get("userExpectations") or {}).get("requirements") or []
+    total_minutes = 0
+    for requirement in requirements:
+        total_minutes += net_minutes_saved(requirement)
+
+    benefit_type_counts: Dict[str, int] = {}
+    for requirement in requirements:
+        for benefit in requirement.get("benefits") or []:
+            benefit_type_counts[benefit.get("benefitType")] = benefit_type_counts.get(benefit.get("benefitType"), 0) + 1
+
+    amortization_months = None
+    with_effort = [(r, effort_hours(r)) for r in requirements]
+    with_effort = [(r, hours) for r, hours in with_effort if hours is not None]
+    if with_effort:
+        total_effort = 0
+        total_benefit_hours = 0
+        for requirement, hours in with_effort:
+            total_effort += hours
+            total_benefit_hours += net_minutes_saved(requirement) / 60
+        if total_benefit_hours > 0:
+            amortization_months = total_effort / total_benefit_hours
+
+    return {
+        "taskCount": len(requirements),
+        "totalMinutesSavedPerMonth": total_minutes,
+        "totalTimeSavedHoursPerMonth": js_round((total_minutes / 60) * 10) / 10,
+        "benefitTypeCounts": benefit_type_counts,
+        "amortizationMonths": amortization_months,
+    }
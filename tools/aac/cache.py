@@ -0,0 +1,152 @@
+"""
+Persistent validation result cache backed by SQLite.
+
+Results are keyed by (content hash, config key), where the config key covers
+the schema and profile contents, the options that change results and the
+tool version. A second table remembers each file's size, mtime and content
+hash, so an unchanged file is recognized from a ``stat()`` alone and is
+neither read nor parsed on a cache hit.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from .batch import Source, ValidationResult
+from .validation import REPO_ROOT, Issue
+
+DEFAULT_CACHE_FILE = REPO_ROOT / ".cache" / "validation.sqlite"
+
+# Files modified this recently may still change within the same mtime tick,
+# so their stat data is not trusted on the next run (they are re-hashed)
+RACY_WINDOW_NS = 2_000_000_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    content_hash TEXT NOT NULL,
+    config_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    errors TEXT NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (content_hash, config_key)
+);
+"""
+
+
+def hash_bytes(data: bytes) -> str:
+    """Content hash used as the cache key."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Content hash of a file, read in chunks so large files stay out of memory."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Validation results for one configuration, stored in a SQLite file."""
+
+    def __init__(self, path: Path, config_key: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.config_key = config_key
+        self.started = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+
+    def content_hash(self, source: Source) -> str:
+        """Hash of a source, using stored stat data to avoid reading unchanged files."""
+        if source.text is not None:
+            return hash_bytes(source.text.encode("utf-8"))
+
+        key = str(source.path.resolve())
+        stat = source.path.stat()
+        row = self.db.execute("SELECT size, mtime_ns, content_hash FROM files WHERE path = ?", (key,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+
+        digest = hash_file(source.path)
+        racy = time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS
+        self.db.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)",
+            (key, stat.st_size, -1 if racy else stat.st_mtime_ns, digest),
+        )
+        return digest
+
+    def lookup(self, source: Source) -> Optional[ValidationResult]:
+        """
+        Return the cached result for a source, or None on a miss.
+
+        Sets ``source.digest`` so the result can be stored after validation.
+        Unreadable files are treated as misses and reported by the validator.
+        """
+        try:
+            source.digest = self.content_hash(source)
+        except OSError:
+            self.misses += 1
+            return None
+
+        row = self.db.execute(
+            "SELECT status, kind, errors FROM results WHERE content_hash = ? AND config_key = ?",
+            (source.digest, self.config_key),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.db.execute(
+            "UPDATE results SET last_seen = ? WHERE content_hash = ? AND config_key = ?",
+            (self.started, source.digest, self.config_key),
+        )
+        errors = [Issue.from_dict(item) for item in json.loads(row[2])]
+        return ValidationResult(source.name, row[0], errors, kind=row[1])
+
+    def store(self, source: Source, result: ValidationResult) -> None:
+        """Remember the result for a source looked up earlier in this run."""
+        if source.digest is None:
+            return
+        errors = json.dumps([issue.to_dict() for issue in result.errors])
+        self.db.execute(
+            "INSERT OR REPLACE INTO results (content_hash, config_key, status, kind, errors, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (source.digest, self.config_key, result.status, result.kind, errors, self.started),
+        )
+
+    def prune(self) -> int:
+        """
+        Drop entries for files that no longer exist, and results no remaining
+        file refers to that were not used in this run.
+
+        Returns:
+            Number of rows removed
+        """
+        missing = [(path,) for (path,) in self.db.execute("SELECT path FROM files") if not os.path.exists(path)]
+        self.db.executemany("DELETE FROM files WHERE path = ?", missing)
+        removed = self.db.execute(
+            "DELETE FROM results WHERE last_seen < ? AND content_hash NOT IN (SELECT content_hash FROM files)",
+            (self.started,),
+        ).rowcount
+        return len(missing) + removed
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.db.commit()
+        self.db.close()
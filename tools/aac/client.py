@@ -0,0 +1,88 @@
+"""
+Thin client for the validation server (aac.server).
+
+Standard library only and free of ``jsonschema`` imports, so a client
+process starts in a few milliseconds. Addresses are ``HOST:PORT``,
+``http://HOST:PORT`` or ``unix:/path/to/socket``.
+"""
+
+import http.client
+import json
+import socket
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+
+
+class ServerUnavailable(ConnectionError):
+    """Raised when the validation server cannot be reached."""
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ValidationClient:
+    """Keeps one persistent connection to the server and reuses it for every request."""
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 30.0):
+        self.address = address
+        self.timeout = timeout
+        self.connection: Optional[http.client.HTTPConnection] = None
+
+    def connect(self) -> http.client.HTTPConnection:
+        if self.address.startswith("unix:"):
+            return UnixHTTPConnection(self.address[len("unix:"):], self.timeout)
+        host_port = self.address.split("://", 1)[-1].rstrip("/")
+        host, _, port = host_port.rpartition(":")
+        return http.client.HTTPConnection(host or "127.0.0.1", int(port), timeout=self.timeout)
+
+    def request(self, method: str, path: str, body: bytes = b"") -> Dict[str, Any]:
+        """Send one request and return the decoded JSON response."""
+        # A kept-alive connection may have been closed by the server; retry once
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = self.connect()
+            try:
+                self.connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+                response = self.connection.getresponse()
+                payload = json.loads(response.read())
+            except (ConnectionError, http.client.HTTPException, OSError) as e:
+                self.close()
+                if attempt:
+                    raise ServerUnavailable(f"validation server at {self.address} is not reachable: {e}") from None
+                continue
+            if response.status != 200:
+                raise RuntimeError(payload.get("error", f"HTTP {response.status}"))
+            return payload
+
+    def validate(self, data: bytes, name: str = "<request>", max_errors: Optional[int] = None) -> Dict[str, Any]:
+        """Validate a JSON document (raw bytes) and return the result record."""
+        path = f"/validate?name={quote(name)}"
+        if max_errors is not None:
+            path += f"&max_errors={max_errors}"
+        return self.request("POST", path, data)
+
+    def status(self) -> Dict[str, Any]:
+        return self.request("GET", "/status")
+
+    def reload(self) -> Dict[str, Any]:
+        return self.request("POST", "/reload")
+
+    def shutdown(self) -> Dict[str, Any]:
+        return self.request("POST", "/shutdown")
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,369 @@
+"""
+Compile a JSON Schema into a plain Python validator module.
+
+The generated module exposes ``is_valid(instance) -> bool`` with every keyword
+check inlined as straight-line Python, so validating an instance no longer
+walks the schema dictionaries. It only answers valid/invalid: callers fall
+back to jsonschema to get error details for rejected instances.
+
+Compiled modules are cached on disk under a name derived from the schema hash
+(and COMPILER_VERSION), so they are regenerated only when the schema changes.
+Schemas using keywords the compiler does not support raise
+UnsupportedSchemaError; callers should then use jsonschema alone.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .schemagraph import RefResolutionError, SchemaGraph
+from .validation import REPO_ROOT
+
+# Bump when the generated code changes so stale cached modules are not reused
+COMPILER_VERSION = 1
+
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "validators"
+
+# Keywords that never affect validation
+ANNOTATIONS = {
+    "$schema", "$id", "$comment", "$defs", "definitions", "title", "description",
+    "default", "examples", "readOnly", "writeOnly", "format",
+}
+
+# Keywords that can be checked inline without nested subschemas
+LEAF_KEYWORDS = {
+    "type", "enum", "const", "minLength", "maxLength", "pattern",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "multipleOf",
+}
+
+SUPPORTED_KEYWORDS = LEAF_KEYWORDS | ANNOTATIONS | {
+    "$ref", "properties", "required", "additionalProperties", "minProperties", "maxProperties",
+    "items", "contains", "minItems", "maxItems", "allOf", "anyOf", "oneOf", "not",
+    "if", "then", "else",
+}
+
+TYPE_CHECKS = {
+    "string": "isinstance({v}, str)",
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool) or isinstance({v}, float) and {v}.is_integer())",
+}
+
+IS_NUMBER = TYPE_CHECKS["number"]
+
+RUNTIME = '''import re
+
+_MISSING = object()
+
+
+def _equal(a, b):
+    """JSON equality: booleans never equal numbers, 1 == 1.0."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_equal(a[k], b[k]) for k in a)
+    return type(a) is type(b) and a == b
+
+
+def _one_of(x, checks):
+    matched = 0
+    for check in checks:
+        if check(x):
+            matched += 1
+            if matched > 1:
+                return False
+    return matched == 1
+'''
+
+
+class UnsupportedSchemaError(Exception):
+    """Raised when a schema uses keywords the compiler cannot translate."""
+
+
+def schema_hash(schema: Any) -> str:
+    """Stable SHA-256 of a schema's canonical JSON form."""
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _indent(lines: List[str], level: int = 1) -> List[str]:
+    return ["    " * level + line for line in lines]
+
+
+class _Compiler:
+    """Translates subschemas into inline expressions and generated functions."""
+
+    def __init__(self, root: dict, graph: SchemaGraph):
+        self.root = root
+        self.graph = graph
+        self.functions: Dict[str, str] = {}
+        self.refs: Dict[str, str] = {}
+        self.constants: Dict[str, str] = {}
+        self.blocks: List[List[str]] = []
+
+    def constant(self, prefix: str, source: str) -> str:
+        """Hoist an expression (compiled regex, frozenset) to module level."""
+        if source not in self.constants:
+            self.constants[source] = f"_{prefix}{len(self.constants)}"
+        return self.constants[source]
+
+    def ref_function(self, schema: dict) -> str:
+        """Name of the function checking the target of ``schema["$ref"]`` (recursion-safe)."""
+        try:
+            key = self.graph.resolve(schema["$ref"], self.graph.base_of(schema))
+        except RefResolutionError as e:
+            raise UnsupportedSchemaError(str(e)) from None
+        if key not in self.refs:
+            # Reserve a name first so recursive references resolve to it
+            name = f"_ref{len(self.refs)}"
+            self.refs[key] = name
+            target = self.graph.get(key)
+            self.blocks.append(
+                [f"def {name}(x):", f"    return {self.function_for(target)}(x)"]
+            )
+        return self.refs[key]
+
+    def function_for(self, schema: Any) -> str:
+        """Name of a generated function checking ``schema`` (deduplicated)."""
+        key = self.graph.fingerprint(schema)
+        if key not in self.functions:
+            name = f"_check{len(self.functions)}"
+            self.functions[key] = name
+            body = self.statements(schema, "x")
+            self.blocks.append([f"def {name}(x):"] + _indent(body + ["return True"]))
+        return self.functions[key]
+
+    def check(self, schema: Any, var: str) -> str:
+        """Boolean expression checking ``var`` against ``schema``."""
+        if schema is True or schema == {}:
+            return "True"
+        if schema is False:
+            return "False"
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f"invalid subschema: {schema!r}")
+        if "$ref" in schema:
+            return f"{self.ref_function(schema)}({var})"
+        if set(schema) <= LEAF_KEYWORDS | ANNOTATIONS:
+            parts = self.leaf_parts(schema, var)
+            return " and ".join(parts) if parts else "True"
+        return f"{self.function_for(schema)}({var})"
+
+    def leaf_parts(self, schema: dict, var: str) -> List[str]:
+        """Inline expressions for the keywords that need no subschemas."""
+        parts = []
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            unknown = [t for t in types if t not in TYPE_CHECKS]
+            if unknown:
+                raise UnsupportedSchemaError(f"unknown type: {unknown}")
+            checks = [TYPE_CHECKS[t].format(v=var) for t in types]
+            parts.append(checks[0] if len(checks) == 1 else "(" + " or ".join(checks) + ")")
+
+        if "enum" in schema:
+            values = schema["enum"]
+            if all(isinstance(value, str) for value in values):
+                name = self.constant("E", f"frozenset({sorted(values)!r})")
+                parts.append(f"(isinstance({var}, str) and {var} in {name})")
+            else:
+                name = self.constant("E", repr(values))
+                parts.append(f"any(_equal({var}, e) for e in {name})")
+
+        if "const" in schema:
+            value = schema["const"]
+            if isinstance(value, str):
+                parts.append(f"{var} == {value!r}")
+            else:
+                parts.append(f"_equal({var}, {value!r})")
+
+        string_checks = []
+        if "minLength" in schema:
+            string_checks.append(f"len({var}) >= {schema['minLength']!r}")
+        if "maxLength" in schema:
+            string_checks.append(f"len({var}) <= {schema['maxLength']!r}")
+        if "pattern" in schema:
+            name = self.constant("P", f"re.compile({schema['pattern']!r})")
+            string_checks.append(f"{name}.search({var}) is not None")
+        if string_checks:
+            parts.append(f"(not isinstance({var}, str) or ({' and '.join(string_checks)}))")
+
+        number_checks = []
+        for keyword, op in (("minimum", ">="), ("maximum", "<="), ("exclusiveMinimum", ">"), ("exclusiveMaximum", "<")):
+            if keyword in schema:
+                number_checks.append(f"{var} {op} {schema[keyword]!r}")
+        if "multipleOf" in schema:
+            number_checks.append(f"({var} / {schema['multipleOf']!r}).is_integer()")
+        if number_checks:
+            parts.append(f"(not {IS_NUMBER.format(v=var)} or ({' and '.join(number_checks)}))")
+
+        return parts
+
+    def statements(self, schema: Any, var: str) -> List[str]:
+        """Statements that ``return False`` when ``var`` violates ``schema``."""
+        if schema is True or schema == {}:
+            return []
+        if schema is False:
+            return ["return False"]
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f"invalid subschema: {schema!r}")
+        if "$ref" in schema:
+            # Draft 7: siblings of $ref are ignored
+            return [f"if not {self.ref_function(schema)}({var}): return False"]
+
+        unsupported = set(schema) - SUPPORTED_KEYWORDS
+        if unsupported:
+            raise UnsupportedSchemaError(f"unsupported keyword(s): {', '.join(sorted(unsupported))}")
+
+        lines = [f"if not {part}: return False" for part in self.leaf_parts(schema, var)]
+
+        object_lines = []
+        for name in schema.get("required", []):
+            object_lines.append(f"if {name!r} not in {var}: return False")
+        if "minProperties" in schema:
+            object_lines.append(f"if len({var}) < {schema['minProperties']!r}: return False")
+        if "maxProperties" in schema:
+            object_lines.append(f"if len({var}) > {schema['maxProperties']!r}: return False")
+        properties = schema.get("properties", {})
+        for name, subschema in properties.items():
+            expr = self.check(subschema, "v")
+            if expr == "True":
+                continue
+            object_lines.append(f"v = {var}.get({name!r}, _MISSING)")
+            object_lines.append(f"if v is not _MISSING and not ({expr}): return False")
+        additional = schema.get("additionalProperties", True)
+        if additional is not True and additional != {}:
+            known = self.constant("K", f"frozenset({sorted(properties)!r})")
+            object_lines.append(f"for k, v in {var}.items():")
+            object_lines.append(f"    if k not in {known} and not ({self.check(additional, 'v')}): return False")
+        if object_lines:
+            lines.append(f"if isinstance({var}, dict):")
+            lines.extend(_indent(object_lines))
+
+        array_lines = []
+        if "minItems" in schema:
+            array_lines.append(f"if len({var}) < {schema['minItems']!r}: return False")
+        if "maxItems" in schema:
+            array_lines.append(f"if len({var}) > {schema['maxItems']!r}: return False")
+        if "items" in schema:
+            if isinstance(schema["items"], list):
+                raise UnsupportedSchemaError("tuple-form items")
+            expr = self.check(schema["items"], "v")
+            if expr != "True":
+                array_lines.append(f"for v in {var}:")
+                array_lines.append(f"    if not ({expr}): return False")
+        if "contains" in schema:
+            array_lines.append(f"if not any({self.check(schema['contains'], 'v')} for v in {var}): return False")
+        if array_lines:
+            lines.append(f"if isinstance({var}, list):")
+            lines.extend(_indent(array_lines))
+
+        for subschema in schema.get("allOf", []):
+            lines.append(f"if not ({self.check(subschema, var)}): return False")
+        if "anyOf" in schema:
+            names = ", ".join(self.function_for(s) for s in schema["anyOf"])
+            lines.append(f"if not any(f({var}) for f in ({names},)): return False")
+        if "oneOf" in schema:
+            names = ", ".join(self.function_for(s) for s in schema["oneOf"])
+            lines.append(f"if not _one_of({var}, ({names},)): return False")
+        if "not" in schema:
+            lines.append(f"if {self.check(schema['not'], var)}: return False")
+        if "if" in schema and ("then" in schema or "else" in schema):
+            lines.append(f"if {self.check(schema['if'], var)}:")
+            lines.append(f"    if not ({self.check(schema.get('then', True), var)}): return False")
+            lines.append("else:")
+            lines.append(f"    if not ({self.check(schema.get('else', True), var)}): return False")
+
+        return lines
+
+
+def compile_schema(schema: dict, graph: Optional[SchemaGraph] = None) -> str:
+    """
+    Return the source of a Python module validating instances of ``schema``.
+
+    ``graph`` (built from ``schema`` if not given) resolves ``$ref``s,
+    including those into other documents of a split schema.
+    """
+    graph = graph or SchemaGraph(schema)
+    compiler = _Compiler(schema, graph)
+    entry = compiler.function_for(schema)
+
+    out = [
+        f"# Generated by tools/aac/codegen.py (compiler v{COMPILER_VERSION}). Do not edit.",
+        f"# Schema: {schema.get('title', '')}",
+        RUNTIME,
+        f"SCHEMA_HASH = {_digest(schema, graph)!r}",
+        "",
+    ]
+    out.extend(f"{name} = {source}" for source, name in compiler.constants.items())
+    for block in compiler.blocks:
+        out.append("")
+        out.append("")
+        out.extend(block)
+    out.extend(["", "", "def is_valid(instance):", f"    return {entry}(instance)", ""])
+    return "\n".join(out)
+
+
+def _digest(schema: dict, graph: Optional[SchemaGraph]) -> str:
+    """Schema hash, covering every document of a split schema."""
+    if graph is not None and len(graph.documents) > 1:
+        return graph.digest()
+    return schema_hash(schema)
+
+
+def compiled_module_path(
+    schema: dict,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    graph: Optional[SchemaGraph] = None,
+) -> Path:
+    """Path of the cached compiled module for ``schema``."""
+    return cache_dir / f"schema_v{COMPILER_VERSION}_{_digest(schema, graph)[:16]}.py"
+
+
+def build_fast_validator(
+    schema: dict,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    graph: Optional[SchemaGraph] = None,
+) -> Path:
+    """Compile ``schema`` into the cache unless an up-to-date module exists."""
+    path = compiled_module_path(schema, cache_dir, graph)
+    if path.exists():
+        return path
+    source = compile_schema(schema, graph)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write atomically so concurrent workers never import a partial module
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(source)
+    os.replace(tmp, path)
+    return path
+
+
+def load_fast_validator(
+    schema: dict,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    graph: Optional[SchemaGraph] = None,
+) -> Optional[Callable[[Any], bool]]:
+    """
+    Return the compiled ``is_valid`` function for ``schema``.
+
+    Returns None when the schema cannot be compiled, in which case callers
+    should validate with jsonschema only.
+    """
+    try:
+        path = build_fast_validator(schema, cache_dir, graph)
+    except UnsupportedSchemaError:
+        return None
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.is_valid
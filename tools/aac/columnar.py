@@ -0,0 +1,226 @@
+"""
+A compact binary columnar file format for tabular exports.
+
+A ``.cols`` file holds one table as a sequence of row groups, each storing
+its columns one after the other, followed by a JSON footer (like Parquet,
+without the dependency):
+
+    b"AACCOLS1"
+    row group 0: column 0 | column 1 | ...
+    row group 1: ...
+    footer JSON | footer length (8 bytes, little-endian) | b"AACCOLS1"
+
+Every column chunk holds the values of one column as raw little-endian
+arrays, with nulls stored in-band:
+
+- ``f64``: 8-byte floats (``<f8``), NaN for null
+- ``i32``: 4-byte integers (``<i4``), -2147483648 for null
+- ``bool``: one signed byte per value: 1, 0, or -1 for null
+- ``str``: dictionary-encoded per row group: a 4-byte code per row (-1 for
+  null), then the number of distinct values, their ``count + 1`` 4-byte
+  offsets and their UTF-8 data. Enumerations, keys and units repeat across
+  rows, so each distinct string is stored once per row group.
+
+The footer lists the columns with their types and, per row group, the row
+count and the offset and length of every column chunk, so a reader can load
+single columns without touching the rest of the file. ``read_table()``
+returns Python lists; with NumPy, ``np.frombuffer(chunk, "<f8")`` maps an
+``f64`` chunk without copying.
+
+``ColumnWriter`` buffers rows in ``array`` columns and writes a row group
+whenever ``row_group_size`` rows are buffered, so memory stays flat however
+many rows are written.
+"""
+
+import json
+import sys
+from array import array
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+MAGIC = b"AACCOLS1"
+FORMAT_VERSION = 1
+
+# Column type -> array typecode of its values (str values are stored as dictionary codes)
+TYPECODES = {"f64": "d", "i32": "i", "bool": "b", "str": "i"}
+NULLS = {"f64": float("nan"), "i32": -(2 ** 31), "bool": -1, "str": -1}
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class ColumnBuffer:
+    """The values of one column for the current row group."""
+
+    def __init__(self, name: str, kind: str):
+        if kind not in TYPECODES:
+            raise ValueError(f"Unknown column type {kind!r} for column {name!r}")
+        self.name = name
+        self.kind = kind
+        self.clear()
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            self.values.append(NULLS[self.kind])
+        elif self.kind == "str":
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.codes)
+            self.values.append(code)
+        else:
+            self.values.append(value)
+
+    def encode(self) -> bytes:
+        if self.kind != "str":
+            return _little_endian(self.values)
+        data = bytearray()
+        offsets = array("i", [0])
+        for value in self.codes:
+            data += value.encode("utf-8")
+            offsets.append(len(data))
+        count = len(self.codes).to_bytes(4, "little")
+        return _little_endian(self.values) + count + _little_endian(offsets) + bytes(data)
+
+    def clear(self) -> None:
+        self.values = array(TYPECODES[self.kind])
+        self.codes: Dict[str, int] = {}
+
+
+class ColumnWriter:
+    """Writes rows to a ``.cols`` file in row groups."""
+
+    def __init__(self, f: BinaryIO, columns: Sequence[Tuple[str, str]], table: str = "", row_group_size: int = 65536):
+        """
+        Args:
+            f: Binary file opened for writing.
+            columns: (name, type) pairs; types are ``f64``, ``i32``, ``bool`` and ``str``.
+            table: Table name recorded in the footer.
+            row_group_size: Rows buffered before a row group is written.
+        """
+        self.f = f
+        self.table = table
+        self.row_group_size = row_group_size
+        self.buffers = [ColumnBuffer(name, kind) for name, kind in columns]
+        self.rows = 0
+        self.row_groups: List[Dict[str, Any]] = []
+        self.offset = f.write(MAGIC)
+
+    def write_row(self, row: Sequence[Any]) -> None:
+        """Append one row (values in column order, None for null)."""
+        for buffer, value in zip(self.buffers, row):
+            buffer.append(value)
+        self.rows += 1
+        if self.rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as a row group."""
+        if not self.rows:
+            return
+        chunks = []
+        for buffer in self.buffers:
+            data = buffer.encode()
+            chunks.append([self.offset, len(data)])
+            self.offset += self.f.write(data)
+            buffer.clear()
+        self.row_groups.append({"rows": self.rows, "columns": chunks})
+        self.rows = 0
+
+    def append_row_group(self, rows: int, chunks: Sequence[bytes]) -> None:
+        """Copy an encoded row group (e.g. from another file of the same table) as is."""
+        self.flush()
+        entries = []
+        for data in chunks:
+            entries.append([self.offset, len(data)])
+            self.offset += self.f.write(data)
+        self.row_groups.append({"rows": rows, "columns": entries})
+
+    def close(self) -> None:
+        """Write the remaining rows and the footer (does not close the file)."""
+        self.flush()
+        footer = json.dumps({
+            "version": FORMAT_VERSION,
+            "table": self.table,
+            "columns": [{"name": buffer.name, "type": buffer.kind} for buffer in self.buffers],
+            "rowGroups": self.row_groups,
+        }, separators=(",", ":")).encode("utf-8")
+        self.f.write(footer + len(footer).to_bytes(8, "little") + MAGIC)
+
+
+def read_footer(f: BinaryIO) -> Dict[str, Any]:
+    """
+    The footer of a ``.cols`` file.
+
+    Raises:
+        ValueError: If the file is not a ``.cols`` file.
+    """
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a columnar table file (bad magic)")
+    f.seek(-(8 + len(MAGIC)), 2)
+    length = int.from_bytes(f.read(8), "little")
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Truncated columnar table file")
+    f.seek(-(8 + len(MAGIC) + length), 2)
+    footer = json.loads(f.read(length))
+    if footer.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format version {footer.get('version')}")
+    return footer
+
+
+def iter_row_groups(f: BinaryIO, footer: Dict[str, Any]) -> Iterator[Tuple[int, List[bytes]]]:
+    """The row groups of a file as (rows, encoded column chunks)."""
+    for group in footer["rowGroups"]:
+        chunks = []
+        for offset, length in group["columns"]:
+            f.seek(offset)
+            chunks.append(f.read(length))
+        yield group["rows"], chunks
+
+
+def decode_chunk(kind: str, rows: int, chunk: bytes) -> List[Any]:
+    """The values of an encoded column chunk (None for nulls)."""
+    size = rows * array(TYPECODES[kind]).itemsize
+    values = _from_little_endian(TYPECODES[kind], chunk[:size])
+    if kind == "f64":
+        return [None if value != value else value for value in values]
+    if kind == "i32":
+        return [None if value == NULLS["i32"] else value for value in values]
+    if kind == "bool":
+        return [None if value < 0 else bool(value) for value in values]
+    count = int.from_bytes(chunk[size:size + 4], "little")
+    offsets = _from_little_endian("i", chunk[size + 4:size + 8 + 4 * count])
+    data = chunk[size + 8 + 4 * count:]
+    strings = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)]
+    return [None if code < 0 else strings[code] for code in values]
+
+
+def read_table(path: str, columns: Optional[Sequence[str]] = None) -> Dict[str, List[Any]]:
+    """
+    Load whole columns of a ``.cols`` file (default: all of them).
+
+    Returns:
+        Column name -> values in row order, None for nulls
+    """
+    with open(path, "rb") as f:
+        footer = read_footer(f)
+        wanted = [(i, c["name"], c["type"]) for i, c in enumerate(footer["columns"])
+                  if columns is None or c["name"] in columns]
+        result: Dict[str, List[Any]] = {name: [] for _, name, _ in wanted}
+        for group in footer["rowGroups"]:
+            for i, name, kind in wanted:
+                offset, length = group["columns"][i]
+                f.seek(offset)
+                result[name].extend(decode_chunk(kind, group["rows"], f.read(length)))
+    return result
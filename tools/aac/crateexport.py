@@ -0,0 +1,721 @@
+"""
+Canvas to RO-Crate generation, ported from the web app.
+
+A port of ``generateROCrate`` and ``validateForExport`` (src/utils/rocrate.ts)
+that builds the same ro-crate-metadata.json document for a canvas, entity by
+entity and key by key, so a crate generated here and one downloaded from the
+app only differ in the export date and in the keys the app leaves out
+(EXTRA_FIELDS), which aac.crateimport needs to convert the crate back to
+the same canvas. ``@id``s are allocated as in the app,
+from positions in the canvas (``#person-0``, ``#stage-1``,
+``#milestone-1-0``; requirements keep an ``id`` made of word characters), so
+the same canvas always yields the same crate.
+
+The browser version looks persons up with ``persons.find()`` for every
+stakeholder and agent and deduplicates role assignments with a linear scan;
+here persons are indexed by id once per canvas and role assignments are kept
+in a set. The fields copied from the canvas are compiled into tables, and
+the entities that are the same in every crate (the metadata descriptor, the
+AGENTS.md and benefit-display.json file entities, the ``@context``) are
+built once and shared by every crate, so they must not be modified.
+
+JavaScript's ``||`` and truthiness are reproduced as in aac.crateimport; a
+key missing from the canvas is ``undefined`` and left out of the entity,
+while a JSON ``null`` is kept, as ``JSON.stringify`` does.
+
+``generate_chunk`` is the process pool task behind tools/generate-rocrates.py:
+each source is read, checked like an export in the app, converted and
+validated against the RO-Crate profile on its own, so one broken canvas is
+reported without affecting the others.
+"""
+
+import datetime
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .batch import Source, peak_rss_mb
+from .crateimport import METADATA_ID, _first, _truthy
+from .ontology import PREFIXES
+from .rocrate import ProfileValidator
+from .validation import Issue, is_rocrate, load_json
+
+RO_CRATE_SPEC = "https://w3id.org/ro/crate/1.2"
+CONTEXT = [
+    f"{RO_CRATE_SPEC}/context",
+    {prefix: PREFIXES[prefix] for prefix in ("schema", "prov", "p-plan", "dct", "dcat", "aac")},
+]
+METADATA_DESCRIPTOR = {
+    "@id": METADATA_ID,
+    "@type": "schema:CreativeWork",
+    "conformsTo": {"@id": RO_CRATE_SPEC},
+    "about": {"@id": "./"},
+}
+AGENTS_FILE = {
+    "@id": "AGENTS.md",
+    "@type": "schema:File",
+    "name": "Agent instructions",
+    "description": "AI coding agent instructions derived from the AAC canvas specification",
+    "schema:encodingFormat": "text/markdown",
+}
+BENEFIT_DISPLAY_FILE = {
+    "@id": "benefit-display.json",
+    "@type": "schema:File",
+    "name": "Benefit display groups",
+    "description": "UI display groups for dashboard (which benefits to show together)",
+    "schema:encodingFormat": "application/json",
+}
+DEFAULT_DISPLAY_GROUP_COUNT = 5
+
+# Requirement ids kept as step @ids (JavaScript's \w is ASCII only)
+STEP_ID = re.compile(r"[\w-]+", re.ASCII)
+# parseInt(): leading whitespace, an optional sign, then decimal digits
+LEADING_INT = re.compile(r"\s*([+-]?[0-9]+)")
+
+BENEFIT_DIRECTIONS = "increaseIsBetter, decreaseIsBetter, targetIsBetter, boolIsBetter"
+VALUE_MEANINGS = "absolute, delta"
+
+# Marks a key missing from the canvas (JavaScript's undefined)
+_UNDEFINED = object()
+
+
+def _defined(value: Any) -> bool:
+    return True
+
+
+def _non_empty(value: Any) -> bool:
+    """``value && value.length > 0``"""
+    return isinstance(value, (list, str)) and len(value) > 0
+
+
+def _has_keys(value: Any) -> bool:
+    """``value && Object.keys(value).length > 0``"""
+    return isinstance(value, (dict, list, str)) and len(value) > 0
+
+
+# (canvas field, entity key, condition) in the order the app sets them
+PROJECT_FIELDS: List[Tuple[str, str, Callable[[Any], bool]]] = [
+    ("objective", "schema:abstract", _truthy),
+    ("projectStage", "aac:projectStage", _truthy),
+    ("startDate", "startDate", _truthy),
+    ("endDate", "endDate", _truthy),
+    ("domain", "aac:domain", _non_empty),
+    ("keywords", "keywords", _non_empty),
+    ("projectId", "identifier", _truthy),
+    ("headlineValue", "aac:headlineValue", _truthy),
+    ("primaryValueDriver", "aac:primaryValueDriver", _truthy),
+    ("roughEstimateValue", "aac:roughEstimateValue", _defined),
+    ("roughEstimateUnit", "aac:roughEstimateUnit", _truthy),
+]
+STEP_FIELDS: List[Tuple[str, str, Callable[[Any], bool]]] = [
+    ("userStory", "aac:userStory", _truthy),
+    ("priority", "priority", _truthy),
+    ("status", "status", _truthy),
+    ("unitOfWork", "aac:unitOfWork", _truthy),
+    ("unitCategory", "aac:unitCategory", _truthy),
+    ("volumePerMonth", "aac:volumePerMonth", _defined),
+    ("targetPopulation", "aac:targetPopulation", _truthy),
+]
+STEP_LIST_FIELDS: List[Tuple[str, str, Callable[[Any], bool]]] = [
+    ("benefits", "aac:benefits", _non_empty),
+    ("dependsOn", "aac:dependsOn", _non_empty),
+    ("feasibility", "aac:feasibility", _has_keys),
+]
+DATASET_FIELDS: List[Tuple[str, str, Callable[[Any], bool]]] = [
+    ("format", "schema:encodingFormat", _truthy),
+    ("license", "license", _truthy),
+    ("accessRights", "dct:accessRights", _truthy),
+    ("pid", "identifier", _truthy),
+    ("datasetSheetUri", "dcat:landingPage", _truthy),
+    ("duoTerms", "dct:conformsTo", _non_empty),
+    ("containsPersonalData", "aac:containsPersonalData", _defined),
+]
+# Dataset fields written as references rather than values
+DATASET_REFERENCES = {"license", "dcat:landingPage"}
+# Fields the app does not export, per section, written after the app's keys
+EXTRA_FIELDS: Dict[str, List[Tuple[str, str, Callable[[Any], bool]]]] = {
+    "requirements": [("timeUnit", "aac:timeUnit", _truthy)],
+    "datasets": [("publisher", "schema:publisher", _truthy), ("sensitivityLevel", "aac:sensitivityLevel", _truthy)],
+    "evaluations": [("metrics", "aac:metrics", _has_keys)],
+}
+
+
+def _copy_fields(entity: Dict[str, Any], obj: Dict[str, Any], fields: List[Tuple[str, str, Callable]]) -> None:
+    for name, key, condition in fields:
+        value = obj.get(name, _UNDEFINED)
+        if value is not _UNDEFINED and condition(value):
+            entity[key] = value
+
+
+def _entity(*items: Tuple[str, Any]) -> Dict[str, Any]:
+    """An entity from (key, value) pairs, leaving out undefined values."""
+    return {key: value for key, value in items if value is not _UNDEFINED}
+
+
+def _dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else []
+
+
+def _one_or_many(refs: List[Dict[str, str]]) -> Any:
+    """A single reference as an object, several as a list (as the app writes them)."""
+    return refs[0] if len(refs) == 1 else refs
+
+
+def generate_id(prefix: str, index: Optional[int] = None) -> str:
+    """Local ``@id`` of a crate entity: ``#prefix`` or ``#prefix-index``."""
+    return f"#{prefix}" if index is None else f"#{prefix}-{index}"
+
+
+def is_valid_date(value: Any) -> bool:
+    """Whether a date's year (``parseInt`` of the part before the first "-") is between 1000 and 3000."""
+    if not _truthy(value) or not isinstance(value, str):
+        return False
+    match = LEADING_INT.match(value.split("-", 1)[0])
+    return match is not None and 1000 <= int(match.group(1)) <= 3000
+
+
+def validate_for_export(canvas: Dict[str, Any]) -> List[Issue]:
+    """
+    Problems that make the app refuse to export a canvas as an RO-Crate.
+
+    The app reports every one of them as a blocking error: a benefit
+    without ``direction`` or ``valueMeaning``, or with direction
+    ``targetIsBetter`` but no ``target``.
+
+    Returns:
+        Issues with JSON Pointers into the canvas (empty if it can be exported)
+    """
+    issues: List[Issue] = []
+    requirements = _list(_dict(canvas.get("userExpectations")).get("requirements"))
+    for req_index, req in enumerate(requirements):
+        benefits = _dict(req).get("benefits")
+        if not _non_empty(benefits):
+            continue
+        for index, benefit in enumerate(benefits):
+            benefit = _dict(benefit)
+            base = f"/userExpectations/requirements/{req_index}/benefits/{index}"
+            if not _truthy(benefit.get("direction")):
+                issues.append(Issue(f"{base}/direction", "Benefit missing required 'direction' field. "
+                                    f"Expected one of: {BENEFIT_DIRECTIONS}", "export"))
+            if not _truthy(benefit.get("valueMeaning")):
+                issues.append(Issue(f"{base}/valueMeaning", "Benefit missing required 'valueMeaning' field. "
+                                    f"Expected one of: {VALUE_MEANINGS}", "export"))
+            if benefit.get("direction") == "targetIsBetter" and "target" not in benefit:
+                issues.append(Issue(f"{base}/target", "Benefit with direction 'targetIsBetter' must have a "
+                                    "'target' value", "export"))
+    return issues
+
+
+class _Generator:
+    """State for generating one crate; see ``canvas_to_crate``."""
+
+    def __init__(self, canvas: Dict[str, Any], today: str, schema_version: Optional[str],
+                 benefit_display: Optional[Dict[str, Any]]):
+        self.canvas = canvas
+        self.today = today
+        self.schema_version = schema_version
+        self.benefit_display = _dict(benefit_display)
+        self.graph: List[Dict[str, Any]] = []
+        self.has_part: List[Dict[str, str]] = []
+        self.warnings: List[str] = []
+
+        self.persons = _list(canvas.get("persons"))
+        # persons.find() returns the first person with an id, the id map keeps the last
+        self.person_by_id: Dict[str, Dict[str, Any]] = {}
+        self.crate_person_ids: Dict[str, str] = {}
+        # Person entities by @id and role assignments, in the order they are registered
+        self.person_entities: Dict[str, Dict[str, Any]] = {}
+        self.roles: Dict[Tuple[str, Any, str, Optional[str]], None] = {}
+        self.agent_role_entities: List[Dict[str, Any]] = []
+
+    def generate(self) -> Dict[str, Any]:
+        canvas = self.canvas
+        project = _dict(canvas.get("project"))
+        self.graph.append(METADATA_DESCRIPTOR)
+        root = _entity(
+            ("@id", "./"),
+            ("@type", ["schema:Dataset", "dcat:Dataset"]),
+            ("name", _first(project.get("title"), "Agentic Automation Project")),
+            ("description", project.get("description", _UNDEFINED)),
+            ("datePublished", self.today),
+        )
+        if _truthy(project.get("license")):
+            root["license"] = {"@id": project["license"]}
+            self.graph.append({"@id": project["license"], "@type": "schema:CreativeWork",
+                               "identifier": project["license"]})
+        project_id = generate_id("project")
+        root["about"] = {"@id": project_id}
+        self.graph.append(root)
+
+        entity = _entity(
+            ("@id", project_id),
+            ("@type", ["schema:Project", "schema:ResearchProject"]),
+            ("name", project.get("title", _UNDEFINED)),
+            ("description", project.get("description", _UNDEFINED)),
+        )
+        _copy_fields(entity, project, PROJECT_FIELDS)
+        version = _first(project.get("version"), canvas.get("version"), "0.1.0")
+        version_date = _first(project.get("versionDate"), canvas.get("versionDate"), self.today)
+        entity["aac:version"] = root["aac:version"] = version
+        entity["aac:versionDate"] = root["aac:versionDate"] = version_date
+        if self.schema_version:
+            root["aac:schemaVersion"] = self.schema_version
+        self.graph.append(entity)
+
+        self.register_persons()
+        self.requirements(entity)
+        self.stakeholders(entity)
+        self.stages(root)
+        self.datasets()
+        self.outcomes()
+
+        feasibility = canvas.get("developerFeasibility")
+        if _truthy(feasibility) and _has_keys(feasibility):
+            root["aac:developerFeasibility"] = feasibility
+        display_groups = self.benefit_display.get("displayGroups")
+        group_count = self.benefit_display.get("displayGroupCount")
+        if _non_empty(display_groups) or (group_count is not None and group_count != DEFAULT_DISPLAY_GROUP_COUNT):
+            self.has_part.append({"@id": BENEFIT_DISPLAY_FILE["@id"]})
+            self.graph.append(BENEFIT_DISPLAY_FILE)
+        self.has_part.append({"@id": AGENTS_FILE["@id"]})
+        self.graph.append(AGENTS_FILE)
+        root["hasPart"] = self.has_part
+
+        self.graph.extend(self.person_entities.values())
+        self.graph.extend(self.role_entities())
+        self.graph.extend(self.agent_role_entities)
+        return {"@context": CONTEXT, "@graph": self.graph}
+
+    # Persons and roles
+
+    def register_persons(self) -> None:
+        for index, person in enumerate(self.persons):
+            person = _dict(person)
+            person_id = person.get("id")
+            crate_id = generate_id("person", index)
+            if isinstance(person_id, str):
+                self.person_by_id.setdefault(person_id, person)
+                self.crate_person_ids[person_id] = crate_id
+            entity = self.person_entity(crate_id, person)
+            if _non_empty(person.get("functionRoles")):
+                entity["aac:functionRoles"] = person["functionRoles"]
+            if _truthy(person.get("localTitle")):
+                entity["aac:localTitle"] = person["localTitle"]
+
+    def person_entity(self, crate_id: str, person: Dict[str, Any]) -> Dict[str, Any]:
+        """``findOrCreatePersonWithId``: the registered entity, or a new identity-only one."""
+        entity = self.person_entities.get(crate_id)
+        if entity is None:
+            entity = _entity(("@id", crate_id), ("@type", "schema:Person"), ("name", person.get("name", _UNDEFINED)))
+            if _truthy(person.get("affiliation")):
+                entity["schema:affiliation"] = person["affiliation"]
+            if _truthy(person.get("orcid")):
+                entity["schema:identifier"] = person["orcid"]
+            self.person_entities[crate_id] = entity
+        return entity
+
+    def person_ref(self, person_id: Any, unknown: str) -> Optional[str]:
+        """The crate @id of a canvas person, or None (with a warning) if there is no such person."""
+        person = self.person_by_id.get(person_id) if isinstance(person_id, str) else None
+        if person is None:
+            self.warnings.append(f"{unknown}: {person_id}")
+            return None
+        crate_id = self.crate_person_ids[person_id]
+        self.person_entity(crate_id, person)
+        return crate_id
+
+    def add_role(self, crate_id: str, role: Any, context: str, stage_id: Optional[str] = None) -> None:
+        self.roles.setdefault((crate_id, role, context, stage_id), None)
+
+    def role_entities(self) -> List[Dict[str, Any]]:
+        entities = []
+        for index, (crate_id, role, context, stage_id) in enumerate(self.roles):
+            entity = {
+                "@id": generate_id("role", index),
+                "@type": "schema:Role",
+                "schema:roleName": role,
+                "schema:member": {"@id": crate_id},
+                "aac:roleContext": context,
+            }
+            if stage_id:
+                entity["aac:stageId"] = stage_id
+            entities.append(entity)
+        return entities
+
+    # User expectations
+
+    def requirements(self, project: Dict[str, Any]) -> None:
+        requirements = _dict(self.canvas.get("userExpectations")).get("requirements")
+        if not _non_empty(requirements):
+            return
+        plan_id = generate_id("user-plan")
+        steps = []
+        model_uris = set()
+        for index, req in enumerate(requirements):
+            req = _dict(req)
+            req_id = req.get("id")
+            step_id = f"#{req_id}" if isinstance(req_id, str) and STEP_ID.fullmatch(req_id) else \
+                generate_id("requirement", index)
+            steps.append({"@id": step_id})
+
+            description = req.get("description")
+            step = _entity(
+                ("@id", step_id),
+                ("@type", "p-plan:Step"),
+                ("name", req.get("title", _UNDEFINED)),
+                ("description", "" if description is None else description),
+                ("aac:title", req.get("title", _UNDEFINED)),
+            )
+            _copy_fields(step, req, STEP_FIELDS)
+            time_benefit = next((benefit for benefit in _list(req.get("benefits"))
+                                 if isinstance(benefit, dict) and benefit.get("benefitType") == "time"), None)
+            if time_benefit is not None and "oversightMinutesPerUnit" in time_benefit:
+                step["aac:humanOversightMinutesPerUnit"] = time_benefit["oversightMinutesPerUnit"]
+            _copy_fields(step, req, STEP_LIST_FIELDS)
+
+            feasibility = _dict(req.get("feasibility"))
+            model_uri = feasibility.get("modelCardUri")
+            if _truthy(model_uri):
+                step["aac:model"] = {"@id": model_uri}
+                step["prov:used"] = {"@id": model_uri}
+                if model_uri not in model_uris:
+                    model_uris.add(model_uri)
+                    model = {
+                        "@id": model_uri,
+                        "@type": "schema:SoftwareApplication",
+                        "schema:applicationCategory": "Machine Learning Model",
+                        "schema:url": model_uri,
+                    }
+                    if _truthy(feasibility.get("modelName")):
+                        model["name"] = feasibility["modelName"]
+                    self.graph.append(model)
+            if _non_empty(req.get("stakeholders")):
+                step["aac:stakeholders"] = req["stakeholders"]
+            _copy_fields(step, req, EXTRA_FIELDS["requirements"])
+            self.graph.append(step)
+
+        self.graph.append({
+            "@id": plan_id,
+            "@type": ["prov:Plan", "p-plan:Plan"],
+            "name": "User Expectations Plan",
+            "description": "User requirements and expectations for the automation",
+            "p-plan:hasStep": steps,
+        })
+        project["hasPlan"] = {"@id": plan_id}
+
+    def stakeholders(self, project: Dict[str, Any]) -> None:
+        person_ids: Dict[Any, None] = {}
+        for req in _list(_dict(self.canvas.get("userExpectations")).get("requirements")):
+            for person_id in _list(_dict(req).get("stakeholders")):
+                # A Set keeps the first occurrence of each id
+                person_ids.setdefault(person_id if not isinstance(person_id, (dict, list)) else id(person_id),
+                                      person_id)
+        refs = []
+        for person_id in person_ids.values():
+            crate_id = self.person_ref(person_id, "Stakeholder references unknown person")
+            if crate_id is None:
+                continue
+            self.add_role(crate_id, "Stakeholder", "stakeholder")
+            refs.append({"@id": crate_id})
+        if refs:
+            project["contributor"] = _one_or_many(refs)
+
+    # Governance
+
+    def stages(self, root: Dict[str, Any]) -> None:
+        stages = _dict(self.canvas.get("governance")).get("stages")
+        if not _non_empty(stages):
+            return
+        activities = []
+        counters = {"org": 0, "software": 0}
+        for index, stage in enumerate(stages):
+            stage = _dict(stage)
+            activity_id = generate_id("stage", index)
+            activities.append({"@id": activity_id})
+            activity = _entity(
+                ("@id", activity_id), ("@type", "prov:Activity"), ("name", stage.get("name", _UNDEFINED))
+            )
+            if _truthy(stage.get("startDate")):
+                activity["startedAtTime"] = f"{stage['startDate']}T00:00:00Z"
+            if _truthy(stage.get("endDate")):
+                activity["endedAtTime"] = f"{stage['endDate']}T23:59:59Z"
+
+            agents = stage.get("agents")
+            if _non_empty(agents):
+                refs = [ref for ref in (self.agent_ref(_dict(agent), activity_id, counters) for agent in agents)
+                        if ref is not None]
+                if refs:
+                    activity["wasAssociatedWith"] = _one_or_many(refs)
+
+            milestones = stage.get("milestones")
+            if _non_empty(milestones):
+                refs = []
+                for milestone_index, milestone in enumerate(milestones):
+                    milestone_id = generate_id(f"milestone-{index}", milestone_index)
+                    refs.append({"@id": milestone_id})
+                    details = _dict(milestone)
+                    entity = _entity(
+                        ("@id", milestone_id),
+                        ("@type", "schema:CreativeWork"),
+                        ("name", milestone if isinstance(milestone, str) else details.get("description", _UNDEFINED)),
+                    )
+                    if _truthy(details.get("kpi")):
+                        entity["description"] = details["kpi"]
+                    entity["aac:milestoneType"] = "milestone"
+                    self.graph.append(entity)
+                activity["hasMilestone"] = _one_or_many(refs)
+
+            if _non_empty(stage.get("complianceStandards")):
+                activity["aac:complianceStandard"] = stage["complianceStandards"]
+            if _truthy(stage.get("policyCardUri")):
+                activity["aac:policyCardUri"] = stage["policyCardUri"]
+            if index > 0:
+                activity["wasInformedBy"] = {"@id": generate_id("stage", index - 1)}
+            self.graph.append(activity)
+        # The app sets hasPart here, then replaces it with the crate's parts, which leave the stages out
+        root["hasPart"] = self.has_part + activities
+
+    def agent_ref(self, agent: Dict[str, Any], activity_id: str, counters: Dict[str, int]) -> Optional[Dict[str, str]]:
+        if agent.get("type") == "person":
+            if not _truthy(agent.get("personId")):
+                self.warnings.append("Person-type agent missing personId")
+                return None
+            crate_id = self.person_ref(agent["personId"], "Agent references unknown person")
+            if crate_id is None:
+                return None
+            if _truthy(agent.get("role")):
+                self.add_role(crate_id, agent["role"], "stage-agent", activity_id)
+            return {"@id": crate_id}
+
+        if not _truthy(agent.get("name")):
+            self.warnings.append("Non-person agent missing name")
+            return None
+        kind = "org" if agent.get("type") == "organization" else "software"
+        agent_id = generate_id(kind, counters[kind])
+        counters[kind] += 1
+        self.graph.append({
+            "@id": agent_id,
+            "@type": "schema:Organization" if kind == "org" else "schema:SoftwareApplication",
+            "name": agent["name"],
+        })
+        if _truthy(agent.get("role")):
+            self.agent_role_entities.append({
+                "@id": generate_id("agent-role", len(self.agent_role_entities)),
+                "@type": "schema:Role",
+                "schema:roleName": agent["role"],
+                "schema:member": {"@id": agent_id},
+                "aac:roleContext": "stage-agent",
+                "aac:stageId": activity_id,
+            })
+        return {"@id": agent_id}
+
+    # Data access and outcomes
+
+    def datasets(self) -> None:
+        datasets = _dict(self.canvas.get("dataAccess")).get("datasets")
+        if not _non_empty(datasets):
+            return
+        for index, dataset in enumerate(datasets):
+            dataset = _dict(dataset)
+            dataset_id = generate_id("dataset", index)
+            self.has_part.append({"@id": dataset_id})
+            entity = _entity(
+                ("@id", dataset_id),
+                ("@type", "dcat:Dataset"),
+                ("name", dataset.get("title", _UNDEFINED)),
+                ("description", dataset.get("description", _UNDEFINED)),
+            )
+            _copy_fields(entity, dataset, DATASET_FIELDS)
+            for key in DATASET_REFERENCES & entity.keys():
+                entity[key] = {"@id": entity[key]}
+            if "dct:conformsTo" in entity:
+                entity["dct:conformsTo"] = [{"@id": term} for term in entity["dct:conformsTo"]]
+            _copy_fields(entity, dataset, EXTRA_FIELDS["datasets"])
+            self.graph.append(entity)
+
+    def outcomes(self) -> None:
+        outcomes = _dict(self.canvas.get("outcomes"))
+        stages = _dict(self.canvas.get("governance")).get("stages")
+        last_stage = generate_id("stage", len(stages) - 1) if _non_empty(stages) else None
+
+        deliverables = outcomes.get("deliverables")
+        titled = [item for item in _list(deliverables) if isinstance(_dict(item).get("title"), str)
+                  and item["title"].strip()] if _non_empty(deliverables) else []
+        for index, deliverable in enumerate(titled):
+            outcome_id = generate_id("outcome", index)
+            self.has_part.append({"@id": outcome_id})
+            kind = deliverable.get("type")
+            entity = _entity(
+                ("@id", outcome_id),
+                ("@type", f"schema:{kind}" if _truthy(kind) else "schema:CreativeWork"),
+                ("aac:outcomeType", "deliverable"),
+                ("name", deliverable["title"]),
+                ("description", deliverable.get("description", _UNDEFINED)),
+            )
+            if is_valid_date(deliverable.get("date")):
+                entity["datePublished"] = deliverable["date"]
+            if _truthy(deliverable.get("pid")):
+                entity["identifier"] = deliverable["pid"]
+            if last_stage is not None:
+                entity["wasGeneratedBy"] = {"@id": last_stage}
+            self.graph.append(entity)
+
+        publications = outcomes.get("publications")
+        for index, publication in enumerate(publications if _non_empty(publications) else []):
+            publication = _dict(publication)
+            publication_id = generate_id("publication", index)
+            self.has_part.append({"@id": publication_id})
+            entity = _entity(
+                ("@id", publication_id),
+                ("@type", "schema:ScholarlyArticle"),
+                ("name", publication.get("title", _UNDEFINED)),
+            )
+            if _truthy(publication.get("doi")):
+                entity["identifier"] = publication["doi"]
+            if _non_empty(publication.get("authors")):
+                entity["author"] = [self.author(_dict(author)) for author in publication["authors"]]
+            if is_valid_date(publication.get("date")):
+                entity["datePublished"] = publication["date"]
+            self.graph.append(entity)
+
+        evaluations = outcomes.get("evaluations")
+        for index, evaluation in enumerate(evaluations if _non_empty(evaluations) else []):
+            evaluation = _dict(evaluation)
+            evaluation_id = generate_id("evaluation", index)
+            self.has_part.append({"@id": evaluation_id})
+            entity = _entity(
+                ("@id", evaluation_id),
+                ("@type", "schema:CreativeWork"),
+                ("name", evaluation.get("type", _UNDEFINED)),
+                ("description", evaluation.get("results", _UNDEFINED)),
+                ("aac:evaluationType", evaluation.get("type", _UNDEFINED)),
+            )
+            if is_valid_date(evaluation.get("date")):
+                entity["datePublished"] = evaluation["date"]
+            _copy_fields(entity, evaluation, EXTRA_FIELDS["evaluations"])
+            self.graph.append(entity)
+
+    def author(self, author: Dict[str, Any]) -> Dict[str, Any]:
+        person_id = author.get("personId")
+        if author.get("type") == "person" and _truthy(person_id):
+            person = self.person_by_id.get(person_id) if isinstance(person_id, str) else None
+            return {
+                "@type": "schema:Person",
+                "name": _first(_dict(person).get("name"), person_id),
+                "@id": f"#{person_id}",
+            }
+        return {"@type": "schema:Organization", "name": _first(author.get("name")) or ""}
+
+
+def canvas_to_crate(
+    canvas: Dict[str, Any],
+    today: Optional[str] = None,
+    schema_version: Optional[str] = None,
+    benefit_display: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Generate the RO-Crate metadata (ro-crate-metadata.json) of a canvas.
+
+    ``today`` (YYYY-MM-DD) is the crate's ``datePublished`` and the version
+    date of canvases without one, like the export date in the app; defaults
+    to the current UTC date. ``schema_version`` is recorded as
+    ``aac:schemaVersion`` and ``benefit_display`` is the app's benefit
+    display state, whose file entity is only added when it differs from
+    the default.
+
+    Returns:
+        Tuple of (crate, warnings): warnings name references to persons
+        that do not exist, which the crate leaves out (as the app does)
+    """
+    if today is None:
+        today = datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+    generator = _Generator(canvas, today, schema_version, benefit_display)
+    return generator.generate(), generator.warnings
+
+
+@dataclass
+class GenerateConfig:
+    """Settings each generator worker needs (must be picklable)."""
+
+    today: str
+    schema_version: Optional[str] = None
+    validate: bool = True
+    fast_path: bool = True
+    max_errors: Optional[int] = None
+    indent: Optional[int] = 2
+
+
+@dataclass
+class GenerationResult:
+    """
+    Outcome for one source: ``valid``, ``invalid`` (generated, fails the
+    RO-Crate profile), ``generated`` (not validated), ``blocked`` (the app
+    would refuse to export the canvas), ``skipped`` (already an RO-Crate) or
+    ``error``. ``peak_rss_mb`` is the peak memory of the worker that
+    generated it.
+    """
+
+    name: str
+    status: str
+    text: Optional[str] = None
+    errors: List[Issue] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    peak_rss_mb: Optional[float] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.status in ("invalid", "blocked", "error")
+
+
+# Per-process state, set once by init_generator()
+_config: Optional[GenerateConfig] = None
+_profile: Optional[ProfileValidator] = None
+
+
+def init_generator(config: GenerateConfig) -> None:
+    """Process pool initializer: keep the config and build the profile validator once."""
+    global _config, _profile
+    _config = config
+    _profile = ProfileValidator.from_file(fast_path=config.fast_path) if config.validate else None
+
+
+def generate_source(source: Source) -> GenerationResult:
+    """Read, check, convert and validate one source; any failure is confined to its result."""
+    try:
+        canvas = json.loads(source.text) if source.text is not None else load_json(source.path)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return GenerationResult(source.name, "error", errors=[Issue("", f"JSON parsing error: {e}", "parse")])
+    except OSError as e:
+        return GenerationResult(source.name, "error", errors=[Issue("", f"Error: {e}", "io")])
+    if is_rocrate(canvas):
+        return GenerationResult(source.name, "skipped")
+    if not isinstance(canvas, dict):
+        return GenerationResult(source.name, "error", errors=[Issue("", "Not a JSON object", "type")])
+
+    blocking = validate_for_export(canvas)
+    if blocking:
+        return GenerationResult(source.name, "blocked", errors=blocking)
+    try:
+        crate, warnings = canvas_to_crate(canvas, _config.today, _config.schema_version)
+    except Exception as e:  # a malformed canvas must not take down the batch
+        return GenerationResult(source.name, "error", errors=[Issue("", f"{type(e).__name__}: {e}", "generate")])
+
+    text = json.dumps(crate, indent=_config.indent, ensure_ascii=False)
+    if _profile is None:
+        return GenerationResult(source.name, "generated", text, warnings=warnings)
+    is_valid, issues = _profile.validate(crate, _config.max_errors)
+    return GenerationResult(source.name, "valid" if is_valid else "invalid", text, issues, warnings)
+
+
+def generate_chunk(chunk: List[Source]) -> List[GenerationResult]:
+    """Generate the crates of a chunk of sources (one pool task) in order."""
+    results = [generate_source(source) for source in chunk]
+    peak = peak_rss_mb()
+    for result in results:
+        result.peak_rss_mb = peak
+    return results
@@ -0,0 +1,648 @@
+"""
+RO-Crate to canvas conversion, ported from the web app.
+
+A port of ``parseROCrateToCanvas`` (src/utils/import.ts) that maps the
+entities of an RO-Crate's ``@graph`` back to canvas-schema.json structure.
+The browser version looks entities up with ``graph.find()`` /
+``graph.filter()`` for every reference, which is quadratic in the crate
+size; here each crate is indexed once by ``@id`` and by ``@type``
+(CrateIndex) and every lookup after that is a dictionary access. The
+mapping itself follows the TypeScript field by field, including its legacy
+fallbacks, so a crate converts to the same canvas in both.
+
+JavaScript's ``||`` and ``undefined`` semantics are reproduced with
+``_first()`` and by leaving out keys whose value would be undefined.
+
+Where the app's mapping loses data, the port deviates so that a canvas
+exported by aac.crateexport converts back to the same canvas: milestones
+become the strings canvas-schema.json requires (the app builds
+``{description, kpi}`` objects that fail validation), non-person stage
+agents get their role from their ``schema:Role`` entity, and the
+``aac:timeUnit`` of steps, the ``schema:publisher`` and
+``aac:sensitivityLevel`` of datasets and the ``aac:metrics`` of
+evaluations are read back.
+
+``convert_chunk`` is the process pool task behind tools/convert-rocrates.py:
+each source is read, converted, normalized (aac.migrate, as the app does
+for imported RO-Crate ZIPs) and validated on its own, so one broken crate
+is reported as an error without affecting the others.
+"""
+
+import copy
+import datetime
+import json
+import zipfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .batch import BatchConfig, Source, Validators
+from .migrate import migrate_effort_estimate, normalize_canvas
+from .validation import Issue, is_rocrate, load_json
+
+PROJECT_TYPES = ("Project", "ResearchProject", "schema:Project", "schema:ResearchProject")
+PLAN_TYPES = ("Plan", "p-plan:Plan", "prov:Plan")
+PERSON_TYPES = ("Person", "schema:Person")
+ROLE_TYPES = ("Role", "schema:Role")
+ACTIVITY_TYPES = ("Activity", "prov:Activity")
+DATASET_TYPES = ("Dataset", "dcat:Dataset", "schema:Dataset")
+LEGACY_OUTCOME_TYPES = (
+    "CreativeWork", "ScholarlyArticle", "Report", "schema:CreativeWork", "schema:ScholarlyArticle", "schema:Report",
+)
+PUBLICATION_TYPES = ("ScholarlyArticle", "schema:ScholarlyArticle")
+CREATIVE_WORK_TYPES = ("CreativeWork", "schema:CreativeWork")
+METADATA_ID = "ro-crate-metadata.json"
+
+
+class CrateImportError(ValueError):
+    """The document is not an RO-Crate that can be converted."""
+
+
+def _truthy(value: Any) -> bool:
+    """JavaScript truthiness: empty lists and objects are truthy, 0 and "" are not."""
+    if value is None or value is False or value == "":
+        return False
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value == value and value != 0
+    return True
+
+
+def _first(*values: Any) -> Any:
+    """``a || b || undefined``: the first truthy value, else None."""
+    for value in values:
+        if _truthy(value):
+            return value
+    return None
+
+
+def _compact(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop keys whose value is None, as ``JSON.stringify`` drops undefined."""
+    return {key: value for key, value in obj.items() if value is not None}
+
+
+def _as_list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else [value]
+
+
+def _local_id(entity_id: str) -> str:
+    """``id.replace('#', '')``: strips the first "#" only."""
+    return entity_id.replace("#", "", 1)
+
+
+def _ref_id(ref: Any) -> Optional[str]:
+    return ref.get("@id") if isinstance(ref, dict) else None
+
+
+def _primary_type(entity: dict) -> Optional[str]:
+    """First ``@type`` without a "schema:" prefix."""
+    entity_type = entity.get("@type")
+    if isinstance(entity_type, list):
+        entity_type = entity_type[0] if entity_type else None
+    if isinstance(entity_type, str):
+        return entity_type.replace("schema:", "", 1)
+    return entity_type
+
+
+def _has_name(entity: dict) -> bool:
+    name = entity.get("name")
+    return isinstance(name, str) and bool(name.strip())
+
+
+class CrateIndex:
+    """
+    Lookup tables for one crate's ``@graph``, built in a single pass.
+
+    ``by_id`` keeps the first entity with each ``@id`` (what
+    ``graph.find()`` returns); ``by_type`` lists entity positions per type
+    so multi-type queries can be answered in graph order.
+    """
+
+    def __init__(self, graph: List[dict]):
+        self.graph = graph
+        self.by_id: Dict[str, dict] = {}
+        self.by_type: Dict[str, List[int]] = {}
+        for position, entity in enumerate(graph):
+            entity_id = entity.get("@id")
+            if isinstance(entity_id, str) and entity_id not in self.by_id:
+                self.by_id[entity_id] = entity
+            for entity_type in _as_list(entity.get("@type")):
+                if isinstance(entity_type, str):
+                    positions = self.by_type.setdefault(entity_type, [])
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+
+    def get(self, entity_id: Any) -> Optional[dict]:
+        return self.by_id.get(entity_id) if isinstance(entity_id, str) else None
+
+    def resolve(self, ref: Any) -> Optional[dict]:
+        """The entity a ``{"@id": ...}`` reference points to, if it is in the crate."""
+        return self.get(_ref_id(ref))
+
+    def of_type(self, *types: str) -> List[dict]:
+        """Entities having any of ``types``, in graph order."""
+        positions = set()
+        for entity_type in types:
+            positions.update(self.by_type.get(entity_type, ()))
+        return [self.graph[position] for position in sorted(positions)]
+
+
+def _project(entity: dict) -> Dict[str, Any]:
+    def string_list(*keys: str) -> Optional[List[Any]]:
+        for key in keys:
+            value = entity.get(key)
+            if isinstance(value, list):
+                return value
+            if _truthy(value):
+                return [value]
+        return None
+
+    return {
+        "title": _first(entity.get("name")) or "",
+        "description": _first(entity.get("description")) or "",
+        "objective": _first(entity.get("schema:abstract"), entity.get("about")),
+        "projectStage": _first(entity.get("aac:projectStage")),
+        "startDate": _first(entity.get("startDate")),
+        "endDate": _first(entity.get("endDate")),
+        "domain": string_list("aac:domain", "domain"),
+        "keywords": string_list("keywords"),
+        "projectId": _first(entity.get("identifier")),
+        "headlineValue": _first(entity.get("aac:headlineValue")),
+        "primaryValueDriver": _first(entity.get("aac:primaryValueDriver")),
+        "roughEstimateValue": entity.get("aac:roughEstimateValue"),
+        "roughEstimateUnit": _first(entity.get("aac:roughEstimateUnit")),
+        "version": _first(entity.get("aac:version")),
+        "versionDate": _first(entity.get("aac:versionDate")),
+    }
+
+
+def _requirement(step: dict, index: CrateIndex) -> Dict[str, Any]:
+    description = _first(step.get("description")) or ""
+    name = _first(step.get("name")) or ""
+    title = step.get("aac:title")
+    user_story = step.get("aac:userStory")
+    if user_story is None:
+        user_story = name if name and name != (_first(title, description) or "") else None
+    req: Dict[str, Any] = {
+        "id": _local_id(step["@id"]),
+        "title": _first(title, description, name) or "",
+        "description": _first(description),
+        "userStory": user_story,
+        "priority": _first(step.get("priority")),
+        "status": _first(step.get("status")),
+        "benefits": [],
+    }
+    if _truthy(step.get("aac:unitOfWork")):
+        req["unitOfWork"] = step["aac:unitOfWork"]
+    if "aac:volumePerMonth" in step:
+        req["volumePerMonth"] = step["aac:volumePerMonth"]
+    if _truthy(step.get("aac:targetPopulation")):
+        req["targetPopulation"] = step["aac:targetPopulation"]
+    # Requirement-level aac:humanOversightMinutesPerUnit is ignored, as in the
+    # app: benefits are only read below, so there is no time benefit to move it to
+    if _truthy(step.get("aac:unitCategory")):
+        req["unitCategory"] = step["aac:unitCategory"]
+    if _truthy(step.get("aac:timeUnit")):
+        req["timeUnit"] = step["aac:timeUnit"]
+    for source, target in (("aac:benefits", "benefits"), ("aac:dependsOn", "dependsOn"),
+                           ("aac:stakeholders", "stakeholders")):
+        if isinstance(step.get(source), list):
+            req[target] = copy.deepcopy(step[source])
+    if isinstance(step.get("aac:feasibility"), dict):
+        req["feasibility"] = migrate_effort_estimate(step["aac:feasibility"])
+
+    # Fall back to the aac:model reference for the model card (and name)
+    model_id = _ref_id(step.get("aac:model"))
+    if _truthy(model_id) and not _truthy((req.get("feasibility") or {}).get("modelCardUri")):
+        feasibility = req.setdefault("feasibility", {})
+        feasibility["modelCardUri"] = model_id
+        if not _truthy(feasibility.get("modelName")):
+            model = index.get(model_id)
+            if model is not None and _truthy(model.get("name")):
+                feasibility["modelName"] = model["name"]
+    return _compact(req)
+
+
+def _affiliation(entity: dict) -> Optional[str]:
+    affiliation = entity.get("schema:affiliation")
+    return affiliation if _truthy(affiliation) and isinstance(affiliation, str) else None
+
+
+def _orcid(entity: dict) -> Any:
+    identifier = entity.get("schema:identifier")
+    if not _truthy(identifier):
+        return None
+    return identifier if isinstance(identifier, str) else _ref_id(identifier)
+
+
+def _person(entity: dict) -> Dict[str, Any]:
+    function_roles = entity.get("aac:functionRoles")
+    local_title = entity.get("aac:localTitle")
+    return _compact({
+        "id": _local_id(entity["@id"]),
+        "name": _first(entity.get("name")) or "",
+        "affiliation": _affiliation(entity),
+        "orcid": _orcid(entity),
+        "functionRoles": function_roles if isinstance(function_roles, list) else None,
+        "localTitle": local_title if isinstance(local_title, str) else None,
+    })
+
+
+def _legacy_roles(entity: dict, fallback_key: Optional[str] = None) -> List[Any]:
+    roles = entity.get("aac:roles")
+    if _truthy(roles):
+        return _as_list(roles)
+    if fallback_key and _truthy(entity.get(fallback_key)):
+        return [entity[fallback_key]]
+    return []
+
+
+class _Converter:
+    """State for converting one crate; see ``crate_to_canvas``."""
+
+    def __init__(self, crate: dict, today: str):
+        graph = crate.get("@graph")
+        if not isinstance(graph, list):
+            raise CrateImportError("Invalid RO-Crate format: missing @context or @graph")
+        self.index = CrateIndex([entity for entity in graph if isinstance(entity, dict)])
+        self.today = today
+        self.persons: List[Dict[str, Any]] = []
+        self.person_ids = set()
+        self.person_roles: Dict[str, List[Dict[str, Any]]] = {}
+
+    def convert(self) -> Dict[str, Any]:
+        canvas: Dict[str, Any] = {"project": {"title": "", "description": ""}}
+        self.project(canvas)
+        self.requirements(canvas)
+        self.people(canvas)
+        milestone_ids = self.governance(canvas)
+        self.datasets(canvas)
+        self.outcomes(canvas, milestone_ids)
+        self.evaluations(canvas)
+        return canvas
+
+    def project(self, canvas: Dict[str, Any]) -> None:
+        projects = self.index.of_type(*PROJECT_TYPES)
+        if projects:
+            canvas["project"] = _project(projects[0])
+        project = canvas["project"]
+
+        root = self.index.get("./")
+        if root is not None:
+            if not _truthy(project.get("version")) and _truthy(root.get("aac:version")):
+                project["version"] = root["aac:version"]
+            if not _truthy(project.get("versionDate")) and _truthy(root.get("aac:versionDate")):
+                project["versionDate"] = root["aac:versionDate"]
+            if _truthy(root.get("aac:developerFeasibility")):
+                feasibility = root["aac:developerFeasibility"]
+                canvas["developerFeasibility"] = (
+                    migrate_effort_estimate(feasibility) if isinstance(feasibility, dict) else feasibility
+                )
+
+        if _truthy(project.get("version")):
+            canvas["version"] = project["version"]
+        # The import date becomes the version date, as in the app
+        canvas["versionDate"] = self.today
+        project["versionDate"] = self.today
+        canvas["project"] = _compact(project)
+
+    def requirements(self, canvas: Dict[str, Any]) -> None:
+        plans = self.index.of_type(*PLAN_TYPES)
+        if not plans:
+            return
+        steps = plans[0].get("p-plan:hasStep") or []
+        requirements = []
+        for ref in steps:
+            step = self.index.resolve(ref)
+            if step is not None:
+                requirements.append(_requirement(step, self.index))
+        if requirements:
+            canvas["userExpectations"] = {"requirements": requirements}
+
+    def people(self, canvas: Dict[str, Any]) -> None:
+        for entity in self.index.of_type(*PERSON_TYPES):
+            person = _person(entity)
+            self.persons.append(person)
+            self.person_ids.add(person["id"])
+        # The app attaches the list only if the crate has Person entities;
+        # persons added later for stage agents then end up in it too
+        if self.persons:
+            canvas["persons"] = self.persons
+
+        for role in self.index.of_type(*ROLE_TYPES):
+            member_id = _ref_id(role.get("schema:member"))
+            if not _truthy(member_id):
+                continue
+            self.person_roles.setdefault(member_id, []).append({
+                "role": _first(role.get("schema:roleName")) or "",
+                "roleContext": _first(role.get("aac:roleContext")) or "stakeholder",
+                "stageId": role.get("aac:stageId"),
+            })
+
+    def stage_roles(self, agent: dict, activity: dict) -> List[Any]:
+        """Stage-agent roles of an agent for this activity, else for any activity."""
+        roles = [r for r in self.person_roles.get(agent["@id"], []) if r["roleContext"] == "stage-agent"]
+        this_stage = [r["role"] for r in roles if r["stageId"] == activity.get("@id")]
+        return this_stage or [r["role"] for r in roles]
+
+    def person_agent(self, agent: dict, activity: dict) -> Dict[str, Any]:
+        person_id = _local_id(agent["@id"])
+        if person_id not in self.person_ids:
+            self.persons.append(_compact({
+                "id": person_id,
+                "name": _first(agent.get("name")) or "",
+                "affiliation": _affiliation(agent),
+                "orcid": _orcid(agent),
+            }))
+            self.person_ids.add(person_id)
+
+        # Prefer stage-agent roles for this activity, then any stage-agent
+        # role, then roles embedded in the Person (legacy)
+        roles = self.stage_roles(agent, activity) or _legacy_roles(agent, "role")
+        meaningful = [r for r in roles if r not in ("stakeholder", "agent")]
+        primary = meaningful[0] if meaningful else (roles[0] if roles else None)
+        return _compact({"personId": person_id, "role": primary, "type": "person"})
+
+    def stage(self, activity: dict) -> Dict[str, Any]:
+        stage: Dict[str, Any] = {
+            "id": _local_id(activity["@id"]),
+            "name": _first(activity.get("name")) or "",
+        }
+        if _truthy(activity.get("startedAtTime")):
+            stage["startDate"] = activity["startedAtTime"].split("T")[0]
+        if _truthy(activity.get("endedAtTime")):
+            stage["endDate"] = activity["endedAtTime"].split("T")[0]
+
+        if _truthy(activity.get("wasAssociatedWith")):
+            agents = []
+            for ref in _as_list(activity["wasAssociatedWith"]):
+                agent = self.index.resolve(ref)
+                if agent is None:
+                    continue
+                agent_type = _primary_type(agent)
+                if agent_type == "Person":
+                    agents.append(self.person_agent(agent, activity))
+                else:
+                    # The export gives organizations and software a Role
+                    # entity; the app only reads a legacy "role" property
+                    roles = self.stage_roles(agent, activity)
+                    agents.append(_compact({
+                        "name": _first(agent.get("name")) or "",
+                        "role": _first(*roles, agent.get("role")),
+                        "type": "organization" if agent_type == "Organization" else "software",
+                    }))
+            stage["agents"] = agents
+
+        if _truthy(activity.get("hasMilestone")):
+            milestones = []
+            for ref in _as_list(activity["hasMilestone"]):
+                milestone = self.index.resolve(ref)
+                # canvas-schema.json milestones are names, not the app's {description, kpi}
+                if milestone is not None:
+                    milestones.append(_first(milestone.get("name")) or "")
+            stage["milestones"] = milestones
+
+        standards = _first(activity.get("aac:complianceStandard"), activity.get("complianceStandard"))
+        if standards is not None:
+            stage["complianceStandards"] = copy.deepcopy(_as_list(standards))
+        if _truthy(activity.get("aac:policyCardUri")):
+            stage["policyCardUri"] = activity["aac:policyCardUri"]
+        return stage
+
+    def governance(self, canvas: Dict[str, Any]) -> set:
+        """Add governance stages; returns the ids of milestone entities."""
+        activities = self.index.of_type(*ACTIVITY_TYPES)
+        milestone_ids = set()
+        for activity in activities:
+            if _truthy(activity.get("hasMilestone")):
+                milestone_ids.update(_ref_id(ref) for ref in _as_list(activity["hasMilestone"]))
+        if activities:
+            canvas["governance"] = {"stages": [self.stage(activity) for activity in activities]}
+        return milestone_ids
+
+    def datasets(self, canvas: Dict[str, Any]) -> None:
+        # Deliverables that are also Datasets would lack the required accessRights
+        entities = [
+            e for e in self.index.of_type(*DATASET_TYPES)
+            if e.get("@id") != "./" and e.get("aac:outcomeType") != "deliverable"
+        ]
+        if entities:
+            canvas["dataAccess"] = {"datasets": [_dataset(e) for e in entities]}
+
+    def outcome_entities(self, milestone_ids: set) -> List[dict]:
+        """Deliverables (aac:outcomeType or legacy CreativeWork types) and publications, deduplicated."""
+        selected = []
+        for entity in self.index.graph:
+            entity_id = entity.get("@id")
+            if entity_id in (METADATA_ID, "benefit-display.json"):
+                continue
+            if entity_id in milestone_ids or entity.get("aac:milestoneType") == "milestone":
+                continue
+            if _truthy(entity.get("aac:evaluationType")) or not _has_name(entity):
+                continue
+            if entity.get("aac:outcomeType") == "deliverable" or any(
+                t in LEGACY_OUTCOME_TYPES for t in _as_list(entity.get("@type"))
+            ):
+                selected.append(entity)
+        selected.extend(
+            e for e in self.index.of_type(*PUBLICATION_TYPES) if e.get("@id") != METADATA_ID and _has_name(e)
+        )
+        seen = set()
+        unique = []
+        for entity in selected:
+            if entity.get("@id") not in seen:
+                seen.add(entity.get("@id"))
+                unique.append(entity)
+        return unique
+
+    def outcomes(self, canvas: Dict[str, Any], milestone_ids: set) -> None:
+        deliverables = []
+        publications = []
+        for entity in self.outcome_entities(milestone_ids):
+            entity_type = _primary_type(entity)
+            outcome = {
+                "id": _local_id(entity["@id"]),
+                "title": entity["name"],
+                "description": _first(entity.get("description")),
+                "date": _first(entity.get("datePublished")),
+                "pid": _first(entity.get("identifier")),
+            }
+            if entity_type == "ScholarlyArticle":
+                raw_authors = entity.get("author") if isinstance(entity.get("author"), list) else []
+                authors = [_author(a) for a in raw_authors if isinstance(a, dict) and _truthy(a.get("name"))]
+                publications.append(_compact(dict(outcome, doi=outcome["pid"], authors=authors or None)))
+            else:
+                deliverables.append(_compact(dict(outcome, type=_first(entity_type) or "Deliverable")))
+
+        if deliverables or publications:
+            canvas["outcomes"] = {}
+            if deliverables:
+                canvas["outcomes"]["deliverables"] = deliverables
+            if publications:
+                canvas["outcomes"]["publications"] = publications
+
+    def evaluations(self, canvas: Dict[str, Any]) -> None:
+        entities = self.index.of_type("Evaluation") + [
+            e for e in self.index.of_type(*CREATIVE_WORK_TYPES)
+            if _truthy(e.get("aac:evaluationType")) and e.get("@id") != METADATA_ID
+        ]
+        if entities:
+            canvas.setdefault("outcomes", {})["evaluations"] = [
+                _compact({
+                    "id": _local_id(e["@id"]),
+                    "type": _first(e.get("aac:evaluationType"), e.get("name")) or "",
+                    "results": _first(e.get("description")),
+                    "date": _first(e.get("datePublished")),
+                    "metrics": copy.deepcopy(e["aac:metrics"]) if isinstance(e.get("aac:metrics"), dict) else None,
+                })
+                for e in entities
+            ]
+
+
+def _reference_or_value(value: Any) -> Any:
+    return value["@id"] if isinstance(value, dict) and "@id" in value else value
+
+
+def _dataset(entity: dict) -> Dict[str, Any]:
+    license_ = entity.get("license")
+    access_rights = entity.get("dct:accessRights")
+    landing = entity.get("dcat:landingPage")
+    if isinstance(landing, str):
+        sheet = landing
+    elif isinstance(landing, dict) and "@id" in landing:
+        sheet = landing["@id"]
+    else:
+        sheet = _first(entity.get("schema:url"))
+    terms = entity.get("dct:conformsTo")
+    personal = entity.get("aac:containsPersonalData", entity.get("containsPersonalData"))
+    return _compact({
+        "id": _local_id(entity["@id"]),
+        "title": _first(entity.get("name")) or "",
+        "description": _first(entity.get("description")),
+        "format": entity.get("schema:encodingFormat"),
+        "license": license_["@id"] if isinstance(license_, dict) and "@id" in license_ else _first(license_),
+        "accessRights": access_rights if isinstance(access_rights, str) else None,
+        "pid": _first(entity.get("identifier")),
+        "datasetSheetUri": sheet,
+        "duoTerms": [_reference_or_value(t) for t in _as_list(terms)] if _truthy(terms) else None,
+        "containsPersonalData": personal,
+        "publisher": _first(_reference_or_value(entity.get("schema:publisher"))),
+        "sensitivityLevel": _first(entity.get("aac:sensitivityLevel")),
+    })
+
+
+def _author(author: dict) -> Dict[str, Any]:
+    ref_id = author.get("@id")
+    types = _as_list(author.get("@type"))
+    is_org = bool(types) and types[0] in ("schema:Organization", "Organization")
+    if not is_org and _truthy(ref_id):
+        return {"type": "person", "personId": _local_id(ref_id)}
+    return {"type": "organization", "name": author["name"]}
+
+
+def crate_to_canvas(crate: dict, today: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convert a parsed RO-Crate (ro-crate-metadata.json) to canvas data.
+
+    ``today`` (YYYY-MM-DD) is written as the canvas and project
+    ``versionDate``, like the import date in the app; defaults to the
+    current UTC date.
+
+    Raises:
+        CrateImportError: If the document has no ``@context`` or ``@graph``.
+    """
+    if not isinstance(crate, dict) or not crate.get("@context") or not crate.get("@graph"):
+        raise CrateImportError("Invalid RO-Crate format: missing @context or @graph")
+    if today is None:
+        today = datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+    return _Converter(crate, today).convert()
+
+
+
+@dataclass
+class ConvertConfig:
+    """Settings each conversion worker needs (must be picklable)."""
+
+    today: str
+    schema_file: Optional[str] = None
+    fast_path: bool = True
+    max_errors: Optional[int] = None
+    indent: Optional[int] = 2
+    normalize: bool = True
+
+
+@dataclass
+class ConversionResult:
+    """
+    Outcome for one source: ``valid``, ``invalid`` (converted, fails the
+    canvas schema), ``converted`` (not validated), ``skipped`` (not an
+    RO-Crate) or ``error``. ``text`` is the serialized canvas, ``warnings``
+    what normalization changed.
+    """
+
+    name: str
+    status: str
+    text: Optional[str] = None
+    errors: List[Issue] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return self.status in ("invalid", "error")
+
+
+def read_crate(source: Source) -> Any:
+    """Parse a source: a JSON file, a JSONL line or an RO-Crate ZIP (its ro-crate-metadata.json)."""
+    if source.text is not None:
+        return json.loads(source.text)
+    if source.path.suffix == ".zip":
+        with zipfile.ZipFile(source.path) as archive:
+            try:
+                return json.loads(archive.read(METADATA_ID).decode("utf-8"))
+            except KeyError:
+                raise CrateImportError(f"{METADATA_ID} not found in ZIP file") from None
+    return load_json(source.path)
+
+
+# Per-process state, set once by init_converter()
+_config: Optional[ConvertConfig] = None
+_validators: Optional[Validators] = None
+
+
+def init_converter(config: ConvertConfig) -> None:
+    """Process pool initializer: keep the config and build the canvas validator once."""
+    global _config, _validators
+    _config = config
+    _validators = None
+    if config.schema_file:
+        _validators = Validators.from_config(BatchConfig(config.schema_file, fast_path=config.fast_path))
+
+
+def convert_source(source: Source) -> ConversionResult:
+    """Read, convert and validate one source; any failure is confined to its result."""
+    try:
+        crate = read_crate(source)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return ConversionResult(source.name, "error", errors=[Issue("", f"JSON parsing error: {e}", "parse")])
+    except (OSError, zipfile.BadZipFile, CrateImportError) as e:
+        return ConversionResult(source.name, "error", errors=[Issue("", f"Error: {e}", "io")])
+    if not is_rocrate(crate):
+        return ConversionResult(source.name, "skipped")
+
+    warnings: List[str] = []
+    try:
+        canvas = crate_to_canvas(crate, _config.today)
+        if _config.normalize:
+            canvas, warnings = normalize_canvas(canvas)
+    except Exception as e:  # a malformed entity must not take down the batch
+        message = str(e) if isinstance(e, CrateImportError) else f"{type(e).__name__}: {e}"
+        return ConversionResult(source.name, "error", errors=[Issue("", message, "convert")])
+
+    text = json.dumps(canvas, indent=_config.indent, ensure_ascii=False)
+    if _validators is None:
+        return ConversionResult(source.name, "converted", text, warnings=warnings)
+    result = _validators.check(source.name, canvas, _config.max_errors)
+    return ConversionResult(source.name, result.status, text, result.errors, warnings)
+
+
+def convert_chunk(chunk: List[Source]) -> List[ConversionResult]:
+    """Convert a chunk of sources (one pool task) in order."""
+    return [convert_source(source) for source in chunk]
@@ -0,0 +1,462 @@
+"""
+Requirement dependency analysis.
+
+``DependencyGraph`` indexes a canvas's requirements by ID and keeps their
+``dependsOn`` edges as adjacency lists in both directions, so every query is
+linear in the size of the graph:
+
+- ``cycles()``: strongly connected components (Tarjan, iterative so deep
+  chains do not hit the recursion limit) that contain a cycle
+- ``topological_order()``: dependencies before the requirements that need them
+- ``critical_path()``: the heaviest dependency chain, weighted by effort
+  estimate (or by requirement count)
+
+The graph can also be edited one requirement at a time
+(``set_requirement()`` / ``remove_requirement()``). The topological order is
+then maintained with the Pearce–Kelly algorithm, which only reorders the
+requirements between the two ends of a new edge, and the critical path is
+only recomputed downstream of the change. Dependencies on IDs that do not
+exist are kept as missing references and connected when that requirement
+appears.
+
+``dependency_issues()`` reports missing targets, duplicate IDs and cycles as
+validation issues for ``validate-examples.py --semantic``.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .benefits import effort_hours
+from .schemagraph import json_pointer
+from .validation import Issue
+
+REQUIREMENTS_PATH = ("userExpectations", "requirements")
+
+Weight = Callable[[dict], float]
+
+
+class DependencyCycleError(ValueError):
+    """The requirements' dependencies contain a cycle, so there is no order."""
+
+    def __init__(self, cycles: List[List[str]]):
+        self.cycles = cycles
+        super().__init__("; ".join(" -> ".join(cycle + cycle[:1]) for cycle in cycles))
+
+
+def effort_weight(requirement: dict) -> float:
+    """Critical path weight: the requirement's effort estimate in person-hours (0 if none)."""
+    return effort_hours(requirement) or 0
+
+
+def count_weight(requirement: dict) -> float:
+    """Critical path weight: every requirement counts as 1."""
+    return 1
+
+
+def canvas_requirements(canvas: Any) -> List[Any]:
+    """The canvas's requirements list (empty if it has none)."""
+    value = canvas
+    for key in REQUIREMENTS_PATH:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value if isinstance(value, list) else []
+
+
+def _dependency_ids(requirement: dict) -> List[str]:
+    """Distinct string IDs in ``dependsOn``, in order."""
+    depends_on = requirement.get("dependsOn")
+    if not isinstance(depends_on, list):
+        return []
+    return list(dict.fromkeys(d for d in depends_on if isinstance(d, str)))
+
+
+class DependencyGraph:
+    """
+    Requirements as nodes, ``dependsOn`` as edges from a dependency to the
+    requirement that needs it.
+
+    Nodes are integers; ``ids[node]`` is the requirement ID (None once
+    removed). ``deps[node]`` and ``dependents[node]`` are insertion-ordered
+    dicts used as sets, so edges can be added and removed in O(1).
+    """
+
+    def __init__(self, weight: Optional[Weight] = None):
+        self.weight = weight or count_weight
+        self.ids: List[Optional[str]] = []
+        self.index: Dict[str, int] = {}
+        self.weights: List[float] = []
+        self.deps: List[Dict[int, None]] = []
+        self.dependents: List[Dict[int, None]] = []
+        # Dependency ID -> requirements waiting for it (target not in the graph)
+        self.missing: Dict[str, Dict[int, None]] = {}
+        self.declared: List[List[str]] = []
+        # Maintained topological order: ord[node] is a slot in slots
+        self._ord: Optional[List[int]] = None
+        self._slots: List[Optional[int]] = []
+        # Critical path state: heaviest chain weight ending at each node and its predecessor
+        self._finish: Optional[List[float]] = None
+        self._previous: List[Optional[int]] = []
+        self._dirty: Dict[int, None] = {}
+
+    @classmethod
+    def from_requirements(cls, requirements: Iterable[Any], weight: Optional[Weight] = None) -> "DependencyGraph":
+        """Build the graph for a list of requirements (later duplicates of an ID are ignored)."""
+        graph = cls(weight)
+        for requirement in requirements:
+            if isinstance(requirement, dict) and isinstance(requirement.get("id"), str):
+                if requirement["id"] not in graph.index:
+                    graph._add_node(requirement)
+        for node in range(len(graph.ids)):
+            for dep_id in graph.declared[node]:
+                graph._link(dep_id, node)
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def nodes(self) -> Iterable[int]:
+        return (node for node, node_id in enumerate(self.ids) if node_id is not None)
+
+    def _add_node(self, requirement: dict) -> int:
+        node = len(self.ids)
+        self.ids.append(requirement["id"])
+        self.index[requirement["id"]] = node
+        self.weights.append(self.weight(requirement))
+        self.deps.append({})
+        self.dependents.append({})
+        self.declared.append(_dependency_ids(requirement))
+        self._previous.append(None)
+        if self._ord is not None:
+            self._ord.append(len(self._slots))
+            self._slots.append(node)
+        return node
+
+    def _link(self, dep_id: str, node: int) -> None:
+        """Record that ``node`` depends on ``dep_id`` (an edge, or a missing reference)."""
+        dep = self.index.get(dep_id)
+        if dep is None:
+            self.missing.setdefault(dep_id, {})[node] = None
+            return
+        self.deps[node][dep] = None
+        self.dependents[dep][node] = None
+
+    def _unlink(self, dep_id: str, node: int) -> None:
+        dep = self.index.get(dep_id)
+        if dep is None:
+            waiting = self.missing.get(dep_id)
+            if waiting is not None:
+                waiting.pop(node, None)
+                if not waiting:
+                    del self.missing[dep_id]
+            return
+        self.deps[node].pop(dep, None)
+        self.dependents[dep].pop(node, None)
+
+    # Incremental updates
+
+    def set_requirement(self, requirement: dict) -> None:
+        """Add a requirement or replace the one with the same ID (its weight and dependencies)."""
+        req_id = requirement["id"]
+        node = self.index.get(req_id)
+        new_edges: List[Tuple[int, int]] = []
+        if node is None:
+            node = self._add_node(requirement)
+            # Requirements that were waiting for this ID now depend on it
+            for dependent in self.missing.pop(req_id, {}):
+                self.deps[dependent][node] = None
+                self.dependents[node][dependent] = None
+                new_edges.append((node, dependent))
+            for dep_id in self.declared[node]:
+                self._link(dep_id, node)
+                if dep_id in self.index:
+                    new_edges.append((self.index[dep_id], node))
+        else:
+            old = self.declared[node]
+            new = _dependency_ids(requirement)
+            for dep_id in set(old) - set(new):
+                self._unlink(dep_id, node)
+            for dep_id in new:
+                if dep_id not in old:
+                    self._link(dep_id, node)
+                    if dep_id in self.index:
+                        new_edges.append((self.index[dep_id], node))
+            self.declared[node] = new
+            self.weights[node] = self.weight(requirement)
+        for source, target in new_edges:
+            self._insert_edge(source, target)
+        self._dirty[node] = None
+
+    def remove_requirement(self, req_id: str) -> None:
+        """Remove a requirement; requirements that depended on it now have a missing reference."""
+        node = self.index.pop(req_id, None)
+        if node is None:
+            return
+        for dep in self.deps[node]:
+            self.dependents[dep].pop(node, None)
+        for dep_id in self.declared[node]:
+            waiting = self.missing.get(dep_id)
+            if waiting is not None:
+                waiting.pop(node, None)
+                if not waiting:
+                    del self.missing[dep_id]
+        for dependent in self.dependents[node]:
+            self.deps[dependent].pop(node, None)
+            self.missing.setdefault(req_id, {})[dependent] = None
+            self._dirty[dependent] = None
+        self.deps[node] = {}
+        self.dependents[node] = {}
+        self.declared[node] = []
+        self.ids[node] = None
+        self._dirty.pop(node, None)
+        if self._ord is not None:
+            self._slots[self._ord[node]] = None
+
+    def _insert_edge(self, source: int, target: int) -> None:
+        """Pearce–Kelly: restore the order after adding ``source -> target``, or drop it on a cycle."""
+        if self._ord is None:
+            return
+        ord_ = self._ord
+        lower, upper = ord_[target], ord_[source]
+        if lower > upper:
+            return
+        if lower == upper:  # self-dependency
+            self._ord = None
+            return
+        forward = self._reach(target, self.dependents, lambda n: ord_[n] <= upper, stop=source)
+        if forward is None:
+            self._ord = None  # the new edge closes a cycle
+            return
+        backward = self._reach(source, self.deps, lambda n: ord_[n] >= lower)
+        forward.sort(key=ord_.__getitem__)
+        backward.sort(key=ord_.__getitem__)
+        nodes = backward + forward
+        slots = sorted(ord_[n] for n in nodes)
+        for node, slot in zip(nodes, slots):
+            ord_[node] = slot
+            self._slots[slot] = node
+
+    @staticmethod
+    def _reach(start: int, edges: List[Dict[int, None]], inside: Callable[[int], bool],
+               stop: Optional[int] = None) -> Optional[List[int]]:
+        """Nodes reachable from ``start`` within the affected region; None if ``stop`` is reached."""
+        seen = {start: None}
+        stack = [start]
+        while stack:
+            for nxt in edges[stack.pop()]:
+                if nxt == stop:
+                    return None
+                if nxt not in seen and inside(nxt):
+                    seen[nxt] = None
+                    stack.append(nxt)
+        return list(seen)
+
+    # Analysis
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Tarjan's algorithm over dependency edges; components come out dependencies first."""
+        size = len(self.ids)
+        order = [-1] * size
+        low = [0] * size
+        on_stack = [False] * size
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+        for root in self.nodes():
+            if order[root] >= 0:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter(self.deps[root]))]
+            while work:
+                node, edges = work[-1]
+                for nxt in edges:
+                    if order[nxt] < 0:
+                        order[nxt] = low[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack[nxt] = True
+                        work.append((nxt, iter(self.deps[nxt])))
+                        break
+                    if on_stack[nxt] and order[nxt] < low[node]:
+                        low[node] = order[nxt]
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        if low[node] < low[parent]:
+                            low[parent] = low[node]
+                    if low[node] == order[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
+
+    def cycles(self) -> List[List[str]]:
+        """One dependency cycle (as requirement IDs, in dependency order) per cyclic component."""
+        cycles = []
+        for component in self.strongly_connected_components():
+            if len(component) == 1:
+                node = component[0]
+                if node in self.deps[node]:
+                    cycles.append([self.ids[node]])
+                continue
+            # Walk from the smallest ID, always to the smallest other member ID, so the
+            # cycle does not depend on node numbers or on the order edges were added
+            # (a self-dependency inside the component would hide the larger cycle)
+            members = set(component)
+            by_id = self.ids.__getitem__
+            path: List[int] = []
+            position: Dict[int, int] = {}
+            node = min(component, key=by_id)
+            while node not in position:
+                position[node] = len(path)
+                path.append(node)
+                node = min((dep for dep in self.deps[node] if dep in members and dep != node), key=by_id)
+            cycle = path[position[node]:][::-1]
+            first = cycle.index(min(cycle, key=by_id))
+            cycles.append([self.ids[n] for n in cycle[first:] + cycle[:first]])
+        return cycles
+
+    def _full_order(self) -> None:
+        """Kahn's algorithm; leaves ``_ord`` unset if there is a cycle."""
+        remaining = [0] * len(self.ids)
+        ready = []
+        for node in self.nodes():
+            remaining[node] = len(self.deps[node])
+            if not remaining[node]:
+                ready.append(node)
+        order = []
+        while ready:
+            # FIFO over a list that only grows: ready[position:] is the queue
+            node = ready[len(order)]
+            order.append(node)
+            for dependent in self.dependents[node]:
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    ready.append(dependent)
+            if len(order) == len(ready):
+                break
+        if len(order) != len(self.index):
+            self._ord = None
+            return
+        self._slots = list(order)
+        self._ord = [0] * len(self.ids)
+        for slot, node in enumerate(order):
+            self._ord[node] = slot
+        self._finish = None
+
+    def _ensure_order(self) -> None:
+        if self._ord is None:
+            self._full_order()
+            if self._ord is None:
+                raise DependencyCycleError(self.cycles())
+
+    def topological_order(self) -> List[str]:
+        """
+        Requirement IDs with every requirement after the ones it depends on.
+
+        Raises:
+            DependencyCycleError: If the dependencies contain a cycle.
+        """
+        self._ensure_order()
+        return [self.ids[node] for node in self._slots if node is not None]
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """
+        The dependency chain with the largest total weight.
+
+        Returns:
+            Tuple of (requirement IDs from first to last, total weight)
+
+        Raises:
+            DependencyCycleError: If the dependencies contain a cycle.
+        """
+        self._ensure_order()
+        if self._finish is None or len(self._finish) != len(self.ids):
+            self._finish = [0.0] * len(self.ids)
+            self._previous = [None] * len(self.ids)
+            affected = [node for node in self._slots if node is not None]
+        else:
+            affected = self._downstream(self._dirty)
+        self._dirty = {}
+        finish, previous = self._finish, self._previous
+        for node in affected:
+            best, best_dep = 0.0, None
+            for dep in self.deps[node]:
+                if best_dep is None or finish[dep] > best:
+                    best, best_dep = finish[dep], dep
+            finish[node] = best + self.weights[node]
+            previous[node] = best_dep
+
+        end = max(self.nodes(), key=lambda n: (finish[n], -self._ord[n]), default=None)
+        if end is None:
+            return [], 0
+        path = []
+        node = end
+        while node is not None:
+            path.append(self.ids[node])
+            node = previous[node]
+        return path[::-1], finish[end]
+
+    def _downstream(self, changed: Iterable[int]) -> List[int]:
+        """``changed`` and everything that depends on them, in topological order."""
+        seen = {node: None for node in changed if self.ids[node] is not None}
+        stack = list(seen)
+        while stack:
+            for dependent in self.dependents[stack.pop()]:
+                if dependent not in seen:
+                    seen[dependent] = None
+                    stack.append(dependent)
+        return sorted(seen, key=self._ord.__getitem__)
+
+
+def dependency_issues(canvas: Any) -> List[Issue]:
+    """Missing dependency targets, duplicate requirement IDs and dependency cycles as validation issues."""
+    return requirement_issues(canvas_requirements(canvas))
+
+
+def requirement_issues(requirements: List[Any]) -> List[Issue]:
+    """``dependency_issues()`` for a canvas's requirements list."""
+    if not requirements:
+        return []
+    issues = []
+    base = list(REQUIREMENTS_PATH)
+    first_position: Dict[str, int] = {}
+    for position, requirement in enumerate(requirements):
+        if not isinstance(requirement, dict) or not isinstance(requirement.get("id"), str):
+            continue
+        req_id = requirement["id"]
+        if req_id in first_position:
+            issues.append(Issue(
+                json_pointer(base + [position, "id"]),
+                f"Duplicate requirement id {req_id!r} (first used at requirements/{first_position[req_id]})",
+                "duplicate-id",
+            ))
+        else:
+            first_position[req_id] = position
+
+    for position, requirement in enumerate(requirements):
+        if not isinstance(requirement, dict) or not isinstance(requirement.get("dependsOn"), list):
+            continue
+        for dep_position, dep_id in enumerate(requirement["dependsOn"]):
+            if isinstance(dep_id, str) and dep_id not in first_position:
+                issues.append(Issue(
+                    json_pointer(base + [position, "dependsOn", dep_position]),
+                    f"Depends on unknown requirement {dep_id!r}",
+                    "dependency",
+                ))
+
+    graph = DependencyGraph.from_requirements(requirements)
+    for cycle in graph.cycles():
+        position = first_position[cycle[0]]
+        if len(cycle) == 1:
+            message = f"Requirement {cycle[0]!r} depends on itself"
+        else:
+            message = f"Dependency cycle: {' -> '.join(cycle + cycle[:1])}"
+        issues.append(Issue(json_pointer(base + [position, "dependsOn"]), message, "dependency-cycle"))
+    return issues
@@ -0,0 +1,418 @@
+"""
+A content-addressed, delta-compressed version history of canvases.
+
+Each recorded version of a canvas is split into its top-level sections
+(``SECTIONS``, plus ``_meta`` for the remaining top-level fields such as
+``version`` and ``versionDate``). A section is identified by the SHA-256 of
+its canonical JSON and stored at most once as a zlib-compressed blob; a
+section that changed since the previous version is stored as a JSON Patch
+(aac.jsonpatch) against it instead, unless the patch is not smaller.
+
+Every ``snapshot_interval``-th version of a canvas is a snapshot: all its
+sections have blobs. Rebuilding a section therefore starts from the nearest
+blob at or before the version and applies fewer than ``snapshot_interval``
+patches, so any version is read in bounded time however long the history.
+Rebuilt sections are checked against their digest.
+
+Versions are numbered per canvas from 1 (``seq``); a canvas is identified by
+a key (tools/canvas-history.py uses ``project.projectId``, else the file
+path). Listing versions reads one
+table, and diffs only rebuild the sections whose digests differ.
+
+Documents come back equal as JSON to what was recorded, with the top-level
+fields in their original order (nested objects in canonical key order).
+"""
+
+import hashlib
+import json
+import sqlite3
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .jsonpatch import JsonPatchError, apply_patch, make_patch
+from .schemagraph import json_pointer
+
+SECTIONS = ("project", "userExpectations", "developerFeasibility", "governance", "dataAccess", "outcomes", "persons")
+META_SECTION = "_meta"
+
+DEFAULT_STORE_FILE = Path("canvas-history.sqlite")
+DEFAULT_SNAPSHOT_INTERVAL = 16
+
+# The store holds data, not a cache: other versions are refused, never rebuilt
+HISTORY_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS canvases (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY,
+    canvas_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    version TEXT,
+    version_date TEXT,
+    recorded_at TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    keys TEXT NOT NULL,
+    snapshot INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    UNIQUE (canvas_id, seq)
+);
+CREATE TABLE IF NOT EXISTS sections (
+    version_id INTEGER NOT NULL,
+    section TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    -- zlib-compressed JSON Patch from the same section of version seq - 1; NULL if the section
+    -- is unchanged or its digest has a blob
+    patch BLOB,
+    PRIMARY KEY (version_id, section)
+) WITHOUT ROWID;
+"""
+
+
+class HistoryError(Exception):
+    """The store cannot be used, or a requested canvas or version does not exist."""
+
+
+def canonical(value: Any) -> bytes:
+    """Canonical JSON (sorted keys, no whitespace) that section digests are computed over."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def digest_of(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def split_sections(canvas: Dict[str, Any]) -> Dict[str, Any]:
+    """A canvas as {section: value}; top-level fields outside ``SECTIONS`` are grouped under ``_meta``."""
+    sections = {name: canvas[name] for name in SECTIONS if name in canvas}
+    meta = {key: value for key, value in canvas.items() if key not in SECTIONS}
+    if meta:
+        sections[META_SECTION] = meta
+    return sections
+
+
+def canvas_key(canvas: Dict[str, Any]) -> Optional[str]:
+    """The default key of a canvas: its ``project.projectId``."""
+    project = canvas.get("project")
+    project_id = project.get("projectId") if isinstance(project, dict) else None
+    return project_id if isinstance(project_id, str) and project_id else None
+
+
+def version_date(canvas: Dict[str, Any]) -> Optional[str]:
+    """The canvas's own date: ``versionDate``, else ``project.versionDate``."""
+    project = canvas.get("project") if isinstance(canvas.get("project"), dict) else {}
+    value = canvas.get("versionDate") or project.get("versionDate")
+    return value if isinstance(value, str) else None
+
+
+def version_label(canvas: Dict[str, Any]) -> Optional[str]:
+    """The canvas's own version: ``version``, else ``project.version``."""
+    project = canvas.get("project") if isinstance(canvas.get("project"), dict) else {}
+    value = canvas.get("version") or project.get("version")
+    return value if isinstance(value, str) else None
+
+
+@dataclass
+class VersionInfo:
+    """One recorded version of a canvas."""
+
+    seq: int
+    version: Optional[str]
+    version_date: Optional[str]
+    recorded_at: str
+    digest: str
+    snapshot: bool
+    size: int
+    # Sections that differ from the previous version (all of them for the first)
+    changed: List[str] = field(default_factory=list)
+
+    @property
+    def date(self) -> str:
+        """The version's date for "as of" lookups: its own date, else the day it was recorded."""
+        return self.version_date or self.recorded_at[:10]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq, "version": self.version, "versionDate": self.version_date,
+            "recordedAt": self.recorded_at, "digest": self.digest, "snapshot": self.snapshot, "size": self.size,
+            "changed": self.changed,
+        }
+
+
+class HistoryStore:
+    """Version history of canvases in a SQLite file."""
+
+    def __init__(self, path: Path = DEFAULT_STORE_FILE, snapshot_interval: Optional[int] = None):
+        """
+        Args:
+            path: Store file, created if missing.
+            snapshot_interval: Versions between snapshots; fixed when the store is created
+                (default: DEFAULT_SNAPSHOT_INTERVAL).
+
+        Raises:
+            HistoryError: If the file is a store of another format version.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(str(path))
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, HISTORY_VERSION):
+            self.db.close()
+            raise HistoryError(f"{path} is a history store of format {version}, this tool reads {HISTORY_VERSION}")
+        self.db.executescript(SCHEMA)
+        self.db.execute(f"PRAGMA user_version = {HISTORY_VERSION}")
+        row = self.db.execute("SELECT value FROM settings WHERE name = 'snapshot_interval'").fetchone()
+        if row is None:
+            interval = DEFAULT_SNAPSHOT_INTERVAL if snapshot_interval is None else snapshot_interval
+            if interval < 1:
+                self.db.close()
+                raise HistoryError("snapshot interval must be at least 1")
+            self.db.execute("INSERT INTO settings (name, value) VALUES ('snapshot_interval', ?)", (str(interval),))
+            self.db.commit()
+        self.snapshot_interval = int(row[0]) if row else interval
+
+    # Writing
+
+    def _put_blob(self, digest: str, data: bytes) -> None:
+        self.db.execute("INSERT OR IGNORE INTO blobs (digest, data) VALUES (?, ?)", (digest, zlib.compress(data)))
+
+    def _has_blob(self, digest: str) -> bool:
+        return self.db.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def record(self, key: str, canvas: Dict[str, Any], recorded_at: Optional[str] = None) -> Optional[VersionInfo]:
+        """
+        Record a canvas as the next version of ``key`` (call ``commit()`` afterwards).
+
+        Returns:
+            The new version, or None if the canvas equals the latest version
+        """
+        sections = split_sections(canvas)
+        encoded = {name: canonical(value) for name, value in sections.items()}
+        digests = {name: digest_of(data) for name, data in encoded.items()}
+        whole = digest_of(canonical(canvas))
+
+        row = self.db.execute("SELECT id FROM canvases WHERE key = ?", (key,)).fetchone()
+        canvas_id = row[0] if row else self.db.execute("INSERT INTO canvases (key) VALUES (?)", (key,)).lastrowid
+        latest = self.db.execute(
+            "SELECT id, seq, digest FROM versions WHERE canvas_id = ? ORDER BY seq DESC LIMIT 1", (canvas_id,)
+        ).fetchone()
+        if latest and latest[2] == whole:
+            return None
+        seq = latest[1] + 1 if latest else 1
+        snapshot = (seq - 1) % self.snapshot_interval == 0
+        previous = dict(self.db.execute(
+            "SELECT section, digest FROM sections WHERE version_id = ?", (latest[0],)
+        ).fetchall()) if latest else {}
+
+        recorded_at = recorded_at or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        size = len(canonical(canvas))
+        version_id = self.db.execute(
+            "INSERT INTO versions (canvas_id, seq, version, version_date, recorded_at, digest, keys, snapshot, size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (canvas_id, seq, version_label(canvas), version_date(canvas),
+             recorded_at, whole, json.dumps(list(canvas)), int(snapshot), size),
+        ).lastrowid
+        for name, digest in digests.items():
+            patch = None
+            # Unchanged sections and sections with a blob need no patch
+            if previous.get(name) != digest and not self._has_blob(digest):
+                if snapshot or name not in previous:
+                    self._put_blob(digest, encoded[name])
+                else:
+                    patch = zlib.compress(canonical(make_patch(self.section(latest[0], name), sections[name])))
+                    if len(patch) >= len(zlib.compress(encoded[name])):
+                        self._put_blob(digest, encoded[name])
+                        patch = None
+            elif snapshot and not self._has_blob(digest):
+                self._put_blob(digest, encoded[name])
+            self.db.execute(
+                "INSERT INTO sections (version_id, section, digest, patch) VALUES (?, ?, ?, ?)",
+                (version_id, name, digest, patch),
+            )
+        return VersionInfo(seq, version_label(canvas), version_date(canvas), recorded_at, whole, snapshot,
+                           size, _changed(previous, digests))
+
+    def commit(self) -> None:
+        self.db.commit()
+
+    # Reading
+
+    def _canvas_id(self, key: str) -> int:
+        row = self.db.execute("SELECT id FROM canvases WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise HistoryError(f"No history for canvas {key!r}")
+        return row[0]
+
+    def section(self, version_id: int, name: str) -> Any:
+        """
+        A section of a version, rebuilt from the nearest blob.
+
+        Raises:
+            HistoryError: If the section is missing or does not match its digest.
+        """
+        row = self.db.execute(
+            "SELECT v.canvas_id, v.seq, s.digest FROM versions v JOIN sections s ON s.version_id = v.id "
+            "WHERE v.id = ? AND s.section = ?", (version_id, name),
+        ).fetchone()
+        if row is None:
+            raise HistoryError(f"Version {version_id} has no section {name!r}")
+        canvas_id, seq, expected = row
+        # Walk back to the nearest version whose section has a blob, collecting the patches on the way
+        patches: List[bytes] = []
+        digest = expected
+        while True:
+            blob = self.db.execute("SELECT data FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if blob is not None:
+                value = json.loads(zlib.decompress(blob[0]))
+                break
+            patch = self.db.execute(
+                "SELECT s.patch FROM sections s JOIN versions v ON v.id = s.version_id "
+                "WHERE v.canvas_id = ? AND v.seq = ? AND s.section = ?", (canvas_id, seq, name),
+            ).fetchone()
+            before = self.db.execute(
+                "SELECT s.digest FROM sections s JOIN versions v ON v.id = s.version_id "
+                "WHERE v.canvas_id = ? AND v.seq = ? AND s.section = ?", (canvas_id, seq - 1, name),
+            ).fetchone()
+            if before is None or (before[0] != digest and (patch is None or patch[0] is None)):
+                raise HistoryError(f"History of section {name!r} is broken at version {seq}")
+            if before[0] != digest:
+                patches.append(patch[0])
+            seq, digest = seq - 1, before[0]
+        try:
+            for patch in reversed(patches):
+                value = apply_patch(value, json.loads(zlib.decompress(patch)), in_place=True)
+        except JsonPatchError as e:
+            raise HistoryError(f"Section {name!r} of version {version_id} cannot be rebuilt: {e}") from e
+        if digest_of(canonical(value)) != expected:
+            raise HistoryError(f"Section {name!r} of version {version_id} does not match its digest")
+        return value
+
+    def _version_row(self, key: str, seq: Optional[int] = None, at: Optional[str] = None,
+                     version: Optional[str] = None) -> Tuple[int, int]:
+        """(version id, seq) of the version ``get()`` selects."""
+        canvas_id = self._canvas_id(key)
+        if seq is not None:
+            row = self.db.execute("SELECT id, seq FROM versions WHERE canvas_id = ? AND seq = ?",
+                                  (canvas_id, seq)).fetchone()
+        elif version is not None:
+            row = self.db.execute("SELECT id, seq FROM versions WHERE canvas_id = ? AND version = ? "
+                                  "ORDER BY seq DESC LIMIT 1", (canvas_id, version)).fetchone()
+        elif at is not None:
+            row = self.db.execute(
+                "SELECT id, seq FROM versions WHERE canvas_id = ? "
+                "AND COALESCE(version_date, substr(recorded_at, 1, 10)) <= ? ORDER BY seq DESC LIMIT 1",
+                (canvas_id, at),
+            ).fetchone()
+        else:
+            row = self.db.execute("SELECT id, seq FROM versions WHERE canvas_id = ? ORDER BY seq DESC LIMIT 1",
+                                  (canvas_id,)).fetchone()
+        if row is None:
+            wanted = f"version {seq}" if seq is not None else f"version {version!r}" if version is not None \
+                else f"a version on or before {at}" if at is not None else "a version"
+            raise HistoryError(f"Canvas {key!r} has no {wanted}")
+        return row
+
+    def get(self, key: str, seq: Optional[int] = None, at: Optional[str] = None,
+            version: Optional[str] = None) -> Tuple[int, Dict[str, Any]]:
+        """
+        A canvas as recorded: the latest version, version number ``seq``, the
+        latest with ``version`` label, or the latest dated on or before ``at`` (YYYY-MM-DD).
+
+        Returns:
+            (seq, canvas)
+        """
+        version_id, seq = self._version_row(key, seq, at, version)
+        keys = json.loads(self.db.execute("SELECT keys FROM versions WHERE id = ?", (version_id,)).fetchone()[0])
+        sections = {name: self.section(version_id, name) for (name,) in
+                    self.db.execute("SELECT section FROM sections WHERE version_id = ?", (version_id,)).fetchall()}
+        meta = sections.pop(META_SECTION, {})
+        return seq, {name: sections[name] if name in sections else meta[name] for name in keys}
+
+    def versions(self, key: str) -> List[VersionInfo]:
+        """Every version of a canvas, oldest first, with the sections each one changed."""
+        canvas_id = self._canvas_id(key)
+        rows = self.db.execute(
+            "SELECT v.seq, v.version, v.version_date, v.recorded_at, v.digest, v.snapshot, v.size, s.section, s.digest "
+            "FROM versions v JOIN sections s ON s.version_id = v.id WHERE v.canvas_id = ? ORDER BY v.seq",
+            (canvas_id,),
+        )
+        result: List[VersionInfo] = []
+        previous: Dict[str, str] = {}
+        current: Dict[str, str] = {}
+        for seq, label, date, recorded, digest, snapshot, size, name, section_digest in rows:
+            if not result or result[-1].seq != seq:
+                if result:
+                    result[-1].changed = _changed(previous, current)
+                    previous, current = current, {}
+                result.append(VersionInfo(seq, label, date, recorded, digest, bool(snapshot), size))
+            current[name] = section_digest
+        if result:
+            result[-1].changed = _changed(previous, current)
+        return result
+
+    def diff(self, key: str, old_seq: int, new_seq: int) -> List[Dict[str, Any]]:
+        """
+        JSON Patch from version ``old_seq`` to ``new_seq`` of a canvas; only
+        sections whose digests differ are rebuilt.
+        """
+        old_id, _ = self._version_row(key, seq=old_seq)
+        new_id, _ = self._version_row(key, seq=new_seq)
+        old = dict(self.db.execute("SELECT section, digest FROM sections WHERE version_id = ?", (old_id,)).fetchall())
+        new = dict(self.db.execute("SELECT section, digest FROM sections WHERE version_id = ?", (new_id,)).fetchall())
+        ops: List[Dict[str, Any]] = []
+        for name in _changed(old, new):
+            before = self.section(old_id, name) if name in old else None
+            after = self.section(new_id, name) if name in new else None
+            if name == META_SECTION:
+                # _meta holds top-level fields: diff them as members of the document
+                ops.extend(make_patch(before or {}, after or {}))
+            elif before is None:
+                ops.append({"op": "add", "path": json_pointer([name]), "value": after})
+            elif after is None:
+                ops.append({"op": "remove", "path": json_pointer([name])})
+            else:
+                ops.extend({**op, "path": json_pointer([name]) + op["path"]} for op in make_patch(before, after))
+        return ops
+
+    def keys(self) -> Iterator[Tuple[str, int, Optional[str]]]:
+        """Every canvas as (key, versions, latest version date)."""
+        yield from self.db.execute(
+            "SELECT c.key, COUNT(v.id), MAX(COALESCE(v.version_date, substr(v.recorded_at, 1, 10))) "
+            "FROM canvases c JOIN versions v ON v.canvas_id = c.id GROUP BY c.id ORDER BY c.key"
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Canvases, versions, the size of all versions as canonical JSON and the bytes actually stored."""
+        canvases, versions, logical = self.db.execute(
+            "SELECT COUNT(DISTINCT canvas_id), COUNT(*), COALESCE(SUM(size), 0) FROM versions"
+        ).fetchone()
+        blobs, blob_bytes = self.db.execute("SELECT COUNT(*), COALESCE(SUM(length(data)), 0) FROM blobs").fetchone()
+        patches, patch_bytes = self.db.execute(
+            "SELECT COUNT(patch), COALESCE(SUM(length(patch)), 0) FROM sections"
+        ).fetchone()
+        return {"canvases": canvases, "versions": versions, "logicalBytes": logical, "blobs": blobs,
+                "patches": patches, "storedBytes": blob_bytes + patch_bytes}
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.db.commit()
+        self.db.close()
+
+
+def _changed(old: Dict[str, str], new: Dict[str, str]) -> List[str]:
+    """Sections added, removed or with a different digest, in ``SECTIONS`` order."""
+    order = list(SECTIONS) + [META_SECTION]
+    return [name for name in order if old.get(name) != new.get(name)]
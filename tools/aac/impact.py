@@ -0,0 +1,508 @@
+"""
+Which canvases a schema change can affect.
+
+Three pieces, used together by tools/schema-impact.py:
+
+- ``diff_schemas()`` compares two versions of a schema subschema by
+  subschema (skipping identical subtrees by their SchemaGraph fingerprint)
+  and classifies each keyword-level change: ``breaking`` if it can reject
+  a canvas the old schema accepted (an enum value removed, a property made
+  required, a tighter bound), ``non-breaking`` if it only accepts more, and
+  ``annotation`` if it does not affect validation at all.
+- ``instance_patterns()`` maps every subschema to the instance locations it
+  validates, as path patterns like ``/userExpectations/requirements/*/benefits/*``
+  (``*`` for array items), following ``$ref``s and applicators.
+- ``PathIndex`` persists, per canvas, the set of path patterns it populates.
+  Canvases with the same structure share one "shape", so the index grows with
+  the number of distinct structures rather than documents x paths. It is
+  updated incrementally like the search index (stat, then content hash).
+
+A canvas is affected by a change if it populates one of the patterns the
+changed subschema validates; only those canvases need to be revalidated.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .cache import RACY_WINDOW_NS, hash_bytes
+from .schemagraph import DEFINITION_KEYWORDS, SchemaGraph, json_pointer
+from .validation import REPO_ROOT, is_rocrate
+
+DEFAULT_INDEX_FILE = REPO_ROOT / ".cache" / "impact.sqlite"
+
+# Bump when the tables or the recorded patterns change; older indexes are rebuilt
+PATH_INDEX_VERSION = 1
+
+# Patterns deeper than this are not followed through recursive $refs
+MAX_PATTERN_DEPTH = 64
+
+ANNOTATION_KEYWORDS = frozenset([
+    "title", "description", "examples", "default", "$comment", "$schema", "$id", "deprecated", "readOnly",
+    "writeOnly", "contentMediaType", "contentEncoding",
+])
+# Lower bounds: raising them can reject instances; upper bounds: lowering them can
+LOWER_BOUNDS = frozenset(["minimum", "exclusiveMinimum", "minLength", "minItems", "minProperties"])
+UPPER_BOUNDS = frozenset(["maximum", "exclusiveMaximum", "maxLength", "maxItems", "maxProperties"])
+SCHEMA_MAPS = ("properties", "patternProperties", "$defs", "definitions")
+SCHEMA_LISTS = ("allOf", "anyOf", "oneOf")
+# Schema-valued keywords that behave as if absent when they accept anything
+PERMISSIVE_DEFAULTS = frozenset(["items", "additionalItems", "additionalProperties", "propertyNames", "then", "else"])
+SCHEMA_VALUES = (
+    "items", "additionalItems", "additionalProperties", "contains", "propertyNames", "not", "if", "then", "else",
+)
+
+
+@dataclass
+class SchemaChange:
+    """One keyword-level difference between two schema versions."""
+
+    pointer: str
+    keyword: str
+    impact: str
+    message: str
+
+    @property
+    def location(self) -> str:
+        return f"#{self.pointer}/{self.keyword}" if self.keyword else f"#{self.pointer}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"location": self.location, "impact": self.impact, "message": self.message}
+
+
+def _types(value: Any) -> Set[str]:
+    types = set(value) if isinstance(value, list) else {value}
+    # "number" includes integers
+    if "number" in types:
+        types.add("integer")
+    return types
+
+
+class _Differ:
+    def __init__(self, old: SchemaGraph, new: SchemaGraph):
+        self.old = old
+        self.new = new
+        self.changes: List[SchemaChange] = []
+
+    def add(self, pointer: str, keyword: str, impact: str, message: str) -> None:
+        self.changes.append(SchemaChange(pointer, keyword, impact, message))
+
+    def schema(self, old: Any, new: Any, pointer: str) -> None:
+        """Compare two subschemas at the same location."""
+        if self.old.fingerprint(old) == self.new.fingerprint(new):
+            return
+        if not isinstance(old, dict) or not isinstance(new, dict):
+            # Boolean schemas: true (like {}) accepts everything, false nothing
+            impact = "non-breaking" if _accepts_all(new) or old is False else "breaking"
+            self.add(pointer, "", impact, f"schema {json.dumps(old)[:60]} -> {json.dumps(new)[:60]}")
+            return
+        for keyword in list(old) + [k for k in new if k not in old]:
+            if keyword not in new:
+                self.removed(pointer, keyword, old, new)
+            elif keyword not in old:
+                self.added(pointer, keyword, old, new)
+            elif self.old.fingerprint(old[keyword]) != self.new.fingerprint(new[keyword]):
+                self.changed(pointer, keyword, old[keyword], new[keyword], old, new)
+
+    def removed(self, pointer: str, keyword: str, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        if keyword in ANNOTATION_KEYWORDS:
+            self.add(pointer, keyword, "annotation", f"{keyword} removed")
+        elif keyword in SCHEMA_MAPS:
+            for name in old[keyword]:
+                self.member_removed(pointer, keyword, name, old, new)
+        elif keyword == "$ref":
+            self.add(pointer, keyword, "breaking", f"$ref {old[keyword]} replaced by an inline schema")
+        else:
+            self.add(pointer, keyword, "non-breaking", f"{keyword} constraint removed")
+
+    def added(self, pointer: str, keyword: str, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        if keyword in ANNOTATION_KEYWORDS:
+            self.add(pointer, keyword, "annotation", f"{keyword} added")
+        elif keyword in SCHEMA_MAPS:
+            for name in new[keyword]:
+                self.member_added(pointer, keyword, name, old, new)
+        elif keyword == "required":
+            self.add(pointer, keyword, "breaking", f"now requires {', '.join(map(str, new[keyword]))}")
+        elif keyword in PERMISSIVE_DEFAULTS and _accepts_all(new[keyword]):
+            self.add(pointer, keyword, "non-breaking", f"{keyword} added, accepting anything")
+        else:
+            self.add(pointer, keyword, "breaking", f"{keyword} constraint added: {json.dumps(new[keyword])[:80]}")
+
+    def member_removed(self, pointer: str, keyword: str, name: str, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        location = f"{pointer}/{keyword}{json_pointer([name])}"
+        if keyword == "properties" and new.get("additionalProperties") is False:
+            self.add(location, "", "breaking", f"property {name!r} removed and additional properties are not allowed")
+        elif keyword in DEFINITION_KEYWORDS:
+            self.add(location, "", "non-breaking", f"definition {name!r} removed")
+        else:
+            self.add(location, "", "non-breaking", f"{keyword} entry {name!r} removed")
+
+    def member_added(self, pointer: str, keyword: str, name: str, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        location = f"{pointer}/{keyword}{json_pointer([name])}"
+        schema = new[keyword][name]
+        if keyword in DEFINITION_KEYWORDS:
+            self.add(location, "", "non-breaking", f"definition {name!r} added")
+        elif _accepts_all(schema) or keyword == "properties" and old.get("additionalProperties") is False:
+            self.add(location, "", "non-breaking", f"{keyword} entry {name!r} added")
+        else:
+            # Canvases that already use the key must now match its schema
+            self.add(location, "", "breaking", f"{keyword} entry {name!r} added with constraints")
+
+    def changed(self, pointer: str, keyword: str, old_value: Any, new_value: Any, old: Dict[str, Any],
+                new: Dict[str, Any]) -> None:
+        child = f"{pointer}/{keyword}"
+        if keyword in ANNOTATION_KEYWORDS:
+            self.add(pointer, keyword, "annotation", f"{keyword} changed")
+        elif keyword in SCHEMA_MAPS and isinstance(old_value, dict) and isinstance(new_value, dict):
+            for name in list(old_value) + [n for n in new_value if n not in old_value]:
+                if name not in new_value:
+                    self.member_removed(pointer, keyword, name, old, new)
+                elif name not in old_value:
+                    self.member_added(pointer, keyword, name, old, new)
+                else:
+                    self.schema(old_value[name], new_value[name], f"{child}{json_pointer([name])}")
+        elif keyword in SCHEMA_LISTS and isinstance(old_value, list) and isinstance(new_value, list) \
+                and len(old_value) == len(new_value):
+            for index, (old_item, new_item) in enumerate(zip(old_value, new_value)):
+                self.schema(old_item, new_item, f"{child}/{index}")
+        elif keyword in SCHEMA_VALUES and isinstance(old_value, (dict, bool)) and isinstance(new_value, (dict, bool)):
+            self.schema(old_value, new_value, child)
+        elif keyword == "enum" and isinstance(old_value, list) and isinstance(new_value, list):
+            removed = [v for v in old_value if v not in new_value]
+            added = [v for v in new_value if v not in old_value]
+            parts = [f"removed {', '.join(map(json.dumps, removed))}"] if removed else []
+            parts += [f"added {', '.join(map(json.dumps, added))}"] if added else []
+            self.add(pointer, keyword, "breaking" if removed else "non-breaking", "enum " + "; ".join(parts or ["reordered"]))
+        elif keyword == "required" and isinstance(old_value, list) and isinstance(new_value, list):
+            added = [v for v in new_value if v not in old_value]
+            removed = [v for v in old_value if v not in new_value]
+            if added:
+                self.add(pointer, keyword, "breaking", f"now requires {', '.join(map(str, added))}")
+            if removed:
+                self.add(pointer, keyword, "non-breaking", f"no longer requires {', '.join(map(str, removed))}")
+        elif keyword == "type":
+            old_types, new_types = _types(old_value), _types(new_value)
+            impact = "non-breaking" if old_types <= new_types else "breaking"
+            self.add(pointer, keyword, impact, f"type {json.dumps(old_value)} -> {json.dumps(new_value)}")
+        elif keyword in LOWER_BOUNDS | UPPER_BOUNDS and _numbers(old_value, new_value):
+            looser = new_value < old_value if keyword in LOWER_BOUNDS else new_value > old_value
+            self.add(pointer, keyword, "non-breaking" if looser else "breaking", f"{keyword} {old_value} -> {new_value}")
+        elif keyword == "uniqueItems":
+            impact = "non-breaking" if new_value is False else "breaking"
+            self.add(pointer, keyword, impact, f"uniqueItems {json.dumps(old_value)} -> {json.dumps(new_value)}")
+        else:
+            self.add(pointer, keyword, "breaking",
+                     f"{keyword} {json.dumps(old_value)[:60]} -> {json.dumps(new_value)[:60]}")
+
+
+def _accepts_all(schema: Any) -> bool:
+    return schema is True or schema == {}
+
+
+def _numbers(*values: Any) -> bool:
+    return all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values)
+
+
+def diff_schemas(old: SchemaGraph, new: SchemaGraph) -> List[SchemaChange]:
+    """Keyword-level changes between the root documents of two schema versions."""
+    differ = _Differ(old, new)
+    differ.schema(old.root, new.root, "")
+    return differ.changes
+
+
+def instance_patterns(graph: SchemaGraph) -> Dict[str, Set[str]]:
+    """
+    JSON Pointer (within the root document) of every subschema reachable from
+    the root -> the instance path patterns it validates.
+
+    ``additionalProperties`` and ``patternProperties`` apply to keys that are
+    not known in advance, so they count as validating their whole object.
+    """
+    prefix = f"{graph.uri}#"
+    patterns: Dict[str, Set[str]] = {}
+    stack: List[Tuple[Any, str]] = [(graph.root, "")]
+    seen: Set[Tuple[int, str]] = set()
+    while stack:
+        schema, pattern = stack.pop()
+        if (id(schema), pattern) in seen or pattern.count("/") > MAX_PATTERN_DEPTH:
+            continue
+        seen.add((id(schema), pattern))
+        key = graph.key_of(schema)
+        if key and key.startswith(prefix):
+            patterns.setdefault(key[len(prefix):], set()).add(pattern)
+        if not isinstance(schema, dict):
+            continue
+        if isinstance(schema.get("$ref"), str):
+            try:
+                stack.append((graph.get(graph.resolve(schema["$ref"], graph.base_of(schema))), pattern))
+            except ValueError:
+                pass
+        for name, sub in (schema.get("properties") or {}).items():
+            stack.append((sub, pattern + json_pointer([name])))
+        for keyword in ("patternProperties",):
+            for sub in (schema.get(keyword) or {}).values():
+                stack.append((sub, pattern))
+        items = schema.get("items")
+        for sub in items if isinstance(items, list) else [items] if items is not None else []:
+            stack.append((sub, pattern + "/*"))
+        for keyword in ("additionalItems", "contains"):
+            if keyword in schema:
+                stack.append((schema[keyword], pattern + "/*"))
+        for keyword in ("additionalProperties", "not", "if", "then", "else"):
+            if keyword in schema:
+                stack.append((schema[keyword], pattern))
+        for keyword in SCHEMA_LISTS:
+            for sub in schema.get(keyword) or []:
+                stack.append((sub, pattern))
+    return patterns
+
+
+def affected_patterns(change: SchemaChange, old: Dict[str, Set[str]], new: Dict[str, Set[str]]) -> Set[str]:
+    """
+    Instance patterns a change can affect: those of the nearest enclosing
+    subschema, in either version. Definitions that no canvas location refers
+    to affect nothing.
+    """
+    pointer = change.pointer
+    while True:
+        found = old.get(pointer, set()) | new.get(pointer, set())
+        if found or not pointer:
+            return found
+        pointer, segment = pointer.rsplit("/", 1)
+        if segment in DEFINITION_KEYWORDS:
+            return set()
+
+
+def document_patterns(value: Any) -> Set[str]:
+    """Every path pattern a document populates (``*`` for array items), including the root ``""``."""
+    patterns = {""}
+    stack: List[Tuple[Any, str]] = [(value, "")]
+    while stack:
+        node, pattern = stack.pop()
+        if isinstance(node, dict):
+            for key, item in node.items():
+                child = pattern + json_pointer([key])
+                patterns.add(child)
+                stack.append((item, child))
+        elif isinstance(node, list):
+            child = pattern + "/*"
+            if node:
+                patterns.add(child)
+            for item in node:
+                stack.append((item, child))
+    return patterns
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    line INTEGER,
+    name TEXT NOT NULL,
+    shape_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_file ON documents (file_id);
+CREATE INDEX IF NOT EXISTS documents_shape ON documents (shape_id);
+CREATE TABLE IF NOT EXISTS shapes (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS patterns (
+    id INTEGER PRIMARY KEY,
+    pattern TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS shape_patterns (
+    pattern_id INTEGER NOT NULL,
+    shape_id INTEGER NOT NULL,
+    PRIMARY KEY (pattern_id, shape_id)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class ShapedDocument:
+    """A canvas in a file and the path patterns it populates."""
+
+    name: str
+    line: Optional[int]
+    patterns: List[str]
+
+
+@dataclass
+class PathUpdate:
+    """A changed file as read by a worker: its hash and canvases, or None if its content is unchanged."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    documents: Optional[List[ShapedDocument]] = None
+    errors: List[str] = field(default_factory=list)
+
+
+def read_file(path: str, previous_hash: Optional[str]) -> PathUpdate:
+    """Hash and, if its content changed, parse a file into the patterns of its canvases (RO-Crates are left out)."""
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    racy = time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS
+    update = PathUpdate(path, stat.st_size, -1 if racy else stat.st_mtime_ns, hash_bytes(data))
+    if update.content_hash == previous_hash:
+        return update
+
+    update.documents = []
+    text = data.decode("utf-8", "replace")
+    lines = enumerate(text.splitlines(), 1) if path.endswith(".jsonl") else [(None, text)]
+    for number, line in lines:
+        if not line.strip():
+            continue
+        name = f"{path}:{number}" if number is not None else path
+        try:
+            document = json.loads(line)
+        except ValueError as e:
+            update.errors.append(f"{name}: JSON parsing error: {e}")
+            continue
+        if isinstance(document, dict) and not is_rocrate(document):
+            update.documents.append(ShapedDocument(name, number, sorted(document_patterns(document))))
+    return update
+
+
+def read_chunk(chunk: List[Tuple[str, Optional[str]]]) -> List[PathUpdate]:
+    """Read a chunk of files (one pool task) in order; unreadable files are reported as errors."""
+    updates = []
+    for path, previous_hash in chunk:
+        try:
+            updates.append(read_file(path, previous_hash))
+        except OSError as e:
+            updates.append(PathUpdate(path, -1, -1, "", [], [f"{path}: {e}"]))
+    return updates
+
+
+@dataclass
+class IndexedCanvas:
+    """A canvas found in the index."""
+
+    name: str
+    path: str
+    line: Optional[int]
+
+
+class PathIndex:
+    """The persisted path patterns of every indexed canvas."""
+
+    def __init__(self, path: Path = DEFAULT_INDEX_FILE):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode = WAL")
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != PATH_INDEX_VERSION:
+            for table in ("shape_patterns", "patterns", "shapes", "documents", "files"):
+                self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            self.db.execute(f"PRAGMA user_version = {PATH_INDEX_VERSION}")
+        self.db.executescript(SCHEMA)
+        self.unchanged = 0
+
+    def stale(self, paths: Iterable[Path]) -> Iterable[Tuple[str, Optional[str]]]:
+        """
+        The files whose size or mtime differ from the index, as (path, indexed
+        hash) tasks for read_chunk(). Counts the others in ``self.unchanged``.
+        """
+        known = {path: (size, mtime_ns, digest) for path, size, mtime_ns, digest in
+                 self.db.execute("SELECT path, size, mtime_ns, content_hash FROM files")}
+        for path in paths:
+            key = str(path.resolve())
+            entry = known.get(key)
+            try:
+                stat = path.stat()
+            except OSError:
+                yield key, None  # reported by read_chunk()
+                continue
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                self.unchanged += 1
+                continue
+            yield key, entry[2] if entry else None
+
+    def _shape(self, patterns: List[str]) -> int:
+        digest = hashlib.blake2b("\n".join(patterns).encode("utf-8"), digest_size=16).hexdigest()
+        row = self.db.execute("SELECT id FROM shapes WHERE digest = ?", (digest,)).fetchone()
+        if row:
+            return row[0]
+        shape_id = self.db.execute("INSERT INTO shapes (digest) VALUES (?)", (digest,)).lastrowid
+        self.db.executemany("INSERT OR IGNORE INTO patterns (pattern) VALUES (?)", [(p,) for p in patterns])
+        self.db.executemany(
+            "INSERT INTO shape_patterns (pattern_id, shape_id) SELECT id, ? FROM patterns WHERE pattern = ?",
+            [(shape_id, p) for p in patterns],
+        )
+        return shape_id
+
+    def apply(self, update: PathUpdate) -> int:
+        """
+        Store a file read by read_chunk(), replacing its previous canvases.
+
+        Returns:
+            Number of canvases (re)indexed
+        """
+        if not update.content_hash:
+            return 0
+        row = self.db.execute("SELECT id FROM files WHERE path = ?", (update.path,)).fetchone()
+        if update.documents is None:
+            self.db.execute(
+                "UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?", (update.size, update.mtime_ns, row[0])
+            )
+            return 0
+        if row is None:
+            file_id = self.db.execute(
+                "INSERT INTO files (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)",
+                (update.path, update.size, update.mtime_ns, update.content_hash),
+            ).lastrowid
+        else:
+            file_id = row[0]
+            self.db.execute("DELETE FROM documents WHERE file_id = ?", (file_id,))
+            self.db.execute(
+                "UPDATE files SET size = ?, mtime_ns = ?, content_hash = ? WHERE id = ?",
+                (update.size, update.mtime_ns, update.content_hash, file_id),
+            )
+        self.db.executemany(
+            "INSERT INTO documents (file_id, line, name, shape_id) VALUES (?, ?, ?, ?)",
+            [(file_id, doc.line, doc.name, self._shape(doc.patterns)) for doc in update.documents],
+        )
+        return len(update.documents)
+
+    def canvases(self, patterns: Iterable[str], paths: Optional[Set[str]] = None) -> List[IndexedCanvas]:
+        """
+        The canvases that populate any of ``patterns``, in index order; with
+        ``paths``, only those in these files.
+        """
+        patterns = sorted(set(patterns))
+        if not patterns:
+            return []
+        marks = ", ".join("?" for _ in patterns)
+        rows = self.db.execute(
+            "SELECT d.name, f.path, d.line FROM documents d JOIN files f ON f.id = d.file_id "
+            "WHERE d.shape_id IN (SELECT sp.shape_id FROM shape_patterns sp JOIN patterns p ON p.id = sp.pattern_id "
+            f"WHERE p.pattern IN ({marks})) ORDER BY d.id",
+            patterns,
+        )
+        return [IndexedCanvas(*row) for row in rows if paths is None or row[1] in paths]
+
+    def counts(self) -> Tuple[int, int]:
+        """Number of indexed (canvases, distinct shapes in use)."""
+        return self.db.execute("SELECT COUNT(*), COUNT(DISTINCT shape_id) FROM documents").fetchone()
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.db.commit()
+        self.db.close()
@@ -0,0 +1,141 @@
+"""
+JSON Patch (RFC 6902) between JSON documents.
+
+``make_patch`` produces ``add``, ``remove`` and ``replace`` operations:
+objects are compared key by key and arrays element by element after
+trimming their common prefix and suffix, so editing one requirement of a
+long list yields a patch about that requirement only. ``apply_patch``
+applies those three operations (the subset ``make_patch`` emits).
+
+Standard library only.
+"""
+
+import copy
+import json
+from typing import Any, Dict, List
+
+from .schemagraph import json_pointer
+
+
+class JsonPatchError(ValueError):
+    """A patch operation does not apply to the document."""
+
+
+def make_patch(old: Any, new: Any) -> List[Dict[str, Any]]:
+    """
+    Operations turning ``old`` into ``new``.
+
+    Returns:
+        JSON Patch operations, empty if the documents are equal
+    """
+    ops: List[Dict[str, Any]] = []
+    _diff(old, new, [], ops)
+    return ops
+
+
+def _equal(a: Any, b: Any) -> bool:
+    """Equal as JSON: Python's ``1 == 1.0 == True`` does not hold in the serialized document."""
+    return a == b and json.dumps(a, sort_keys=True) == json.dumps(b, sort_keys=True)
+
+
+def _diff(old: Any, new: Any, path: List[Any], ops: List[Dict[str, Any]]) -> None:
+    if _equal(old, new):
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": json_pointer(path + [key])})
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, path + [key], ops)
+            else:
+                ops.append({"op": "add", "path": json_pointer(path + [key]), "value": value})
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        start = 0
+        while start < len(old) and start < len(new) and _equal(old[start], new[start]):
+            start += 1
+        end_old, end_new = len(old), len(new)
+        while end_old > start and end_new > start and _equal(old[end_old - 1], new[end_new - 1]):
+            end_old -= 1
+            end_new -= 1
+        common = min(end_old, end_new) - start
+        for i in range(start, start + common):
+            _diff(old[i], new[i], path + [i], ops)
+        # Removals from the back, so earlier indices stay valid
+        for i in reversed(range(start + common, end_old)):
+            ops.append({"op": "remove", "path": json_pointer(path + [i])})
+        for i in range(start + common, end_new):
+            ops.append({"op": "add", "path": json_pointer(path + [i]), "value": new[i]})
+        return
+    ops.append({"op": "replace", "path": json_pointer(path), "value": new})
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer {pointer!r}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in pointer[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index {index} out of range")
+    return index
+
+
+def apply_patch(document: Any, ops: List[Dict[str, Any]], in_place: bool = False) -> Any:
+    """
+    ``document`` with ``ops`` applied (``add``, ``remove`` and ``replace``).
+
+    The document and the operations' values are copied first unless
+    ``in_place`` (for freshly parsed documents and patches, which nothing
+    else refers to).
+
+    Raises:
+        JsonPatchError: If an operation's path does not exist or the operation is not supported.
+    """
+    if not in_place:
+        document, ops = copy.deepcopy(document), copy.deepcopy(ops)
+    for op in ops:
+        tokens = _parse_pointer(op["path"])
+        kind = op["op"]
+        if kind not in ("add", "remove", "replace"):
+            raise JsonPatchError(f"Unsupported patch operation {kind!r}")
+        if not tokens:
+            if kind == "remove":
+                raise JsonPatchError("Cannot remove the document root")
+            document = op["value"]
+            continue
+        parent = document
+        for token in tokens[:-1]:
+            try:
+                parent = parent[_index(parent, token, False)] if isinstance(parent, list) else parent[token]
+            except (KeyError, TypeError) as e:
+                raise JsonPatchError(f"Path {op['path']} does not exist") from e
+        last = tokens[-1]
+        value = op.get("value")
+        if isinstance(parent, list):
+            index = _index(parent, last, kind == "add")
+            if kind == "add":
+                parent.insert(index, value)
+            elif kind == "remove":
+                del parent[index]
+            else:
+                parent[index] = value
+        elif isinstance(parent, dict):
+            if kind != "add" and last not in parent:
+                raise JsonPatchError(f"Path {op['path']} does not exist")
+            if kind == "remove":
+                del parent[last]
+            else:
+                parent[last] = value
+        else:
+            raise JsonPatchError(f"Path {op['path']} does not exist")
+    return document
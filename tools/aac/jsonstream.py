@@ -0,0 +1,151 @@
+"""
+Incremental parsing of a top-level JSON object, stdlib only.
+
+``iter_events()`` reads a file in chunks and yields the members of the
+top-level object one at a time. Members named in ``stream_keys`` whose value
+is an array (such as an RO-Crate ``@graph``) are not materialized: their
+elements are yielded one by one instead, so peak memory is bounded by the
+largest single element plus one read chunk, not by the whole document.
+
+Events:
+    ("member", key, value)   a complete top-level member
+    ("start", key, None)     a streamed array begins
+    ("item", key, element)   one element of a streamed array
+    ("end", key, count)      a streamed array ends after ``count`` elements
+"""
+
+import json
+from typing import Any, Container, Iterator, TextIO, Tuple
+
+WHITESPACE = " \t\n\r"
+DELIMITERS = WHITESPACE + ",:]}"
+
+# A decode error this close to the end of the buffer may just be a value cut
+# in half by a chunk boundary (e.g. a partial ``true``), so read more first
+INCOMPLETE_MARGIN = 8
+
+
+class StreamParseError(ValueError):
+    """Raised for malformed JSON, with the character offset in the file."""
+
+    def __init__(self, msg: str, offset: int):
+        super().__init__(f"{msg}: char {offset}")
+        self.offset = offset
+
+
+class NotAnObjectError(StreamParseError):
+    """Raised when the top-level value is not an object, before anything is yielded."""
+
+
+class _Reader:
+    """Chunked text buffer that only keeps the unconsumed tail in memory."""
+
+    def __init__(self, fp: TextIO, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.consumed = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    @property
+    def offset(self) -> int:
+        return self.consumed + self.pos
+
+    def fill(self, size: int) -> None:
+        """Drop the consumed prefix and append up to ``size`` more characters."""
+        data = self.fp.read(size)
+        self.consumed += self.pos
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        if not data:
+            self.eof = True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos] if self.pos < len(self.buf) else ""
+            self.fill(self.chunk_size)
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise StreamParseError(f"Expecting '{char}'", self.offset)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        size = self.chunk_size
+        while True:
+            self.peek()
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number near the end of the buffer might continue in the next
+                # chunk ("-25" of "-25.0e3"), so only accept it once a delimiter follows
+                complete = (
+                    self.eof
+                    or end < len(self.buf) - INCOMPLETE_MARGIN
+                    or end < len(self.buf) and self.buf[end] in DELIMITERS
+                )
+                if complete:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                truncated = e.pos >= len(self.buf) - INCOMPLETE_MARGIN or e.msg.startswith("Unterminated string")
+                if self.eof or not truncated:
+                    raise StreamParseError(e.msg, self.consumed + e.pos) from None
+            self.fill(size)
+            size *= 2
+
+
+def iter_events(
+    fp: TextIO,
+    stream_keys: Container[str] = ("@graph",),
+    chunk_size: int = 1 << 16,
+) -> Iterator[Tuple[str, str, Any]]:
+    """Yield parse events for the top-level object read from ``fp``."""
+    reader = _Reader(fp, chunk_size)
+    if reader.peek() != "{":
+        raise NotAnObjectError("Expecting '{'", reader.offset)
+    reader.pos += 1
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            if reader.peek() != '"':
+                raise StreamParseError("Expecting property name enclosed in double quotes", reader.offset)
+            key = reader.value()
+            reader.expect(":")
+
+            if key in stream_keys and reader.peek() == "[":
+                reader.pos += 1
+                yield "start", key, None
+                count = 0
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield "item", key, reader.value()
+                        count += 1
+                        char = reader.peek()
+                        reader.pos += 1
+                        if char == "]":
+                            break
+                        if char != ",":
+                            raise StreamParseError("Expecting ',' delimiter", reader.offset - 1)
+                yield "end", key, count
+            else:
+                yield "member", key, reader.value()
+
+            char = reader.peek()
+            reader.pos += 1
+            if char == "}":
+                break
+            if char != ",":
+                raise StreamParseError("Expecting ',' delimiter", reader.offset - 1)
+
+    if reader.peek() != "":
+        raise StreamParseError("Extra data", reader.offset)
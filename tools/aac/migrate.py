@@ -0,0 +1,601 @@
+"""
+Canvas migrations from older schema versions to the current one.
+
+``normalize_canvas`` is a port of ``normalizeCanvasData``
+(src/utils/migrate.ts), which the app applies to imported RO-Crates: it
+fills a missing requirement title from the description, maps old unit
+categories to the current enum, moves requirement-level oversight to the
+first time benefit and drops values the current schema no longer accepts.
+
+The stored corpus needs more than that, so the schema changes listed in
+docs/changelog.md are also registered as individual migration steps
+(``MIGRATIONS``), each under the schema version that introduced it. A
+canvas carries no schema version of its own (its ``version`` field is the
+project's version), so ``plan()`` infers where a canvas stands from the
+oldest legacy shape it contains and returns the steps from there on;
+``migrate()`` applies them. Neither modifies its input.
+
+``migrate_chunk`` is the process pool task behind tools/migrate-canvases.py.
+"""
+
+import copy
+import difflib
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import __version__
+from .batch import Source
+from .validation import is_rocrate, load_json
+
+CURRENT_VERSION = __version__
+
+UNIT_CATEGORY_MAP = {
+    "case": "item",
+    "document": "item",
+    "record": "item",
+    "message": "interaction",
+    "meeting": "interaction",
+    "analysisRun": "computation",
+    "other": "other",
+}
+VALID_UNIT_CATEGORIES = {"item", "interaction", "computation", "other"}
+VALID_VALUE_DRIVERS = ("time", "quality", "risk", "enablement", "cost")
+REMOVED_AGGREGATE_FIELDS = ("aggregateBenefits", "aggregateBenefitValue", "aggregateBenefitUnit", "isImported")
+
+WEEKS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(?:week|wk)", re.IGNORECASE)
+HOURS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(?:person-?hour|person-?hr|ph|hour|hr)", re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r"(\d+(?:\.\d+)?)")
+VERSION_PATTERN = re.compile(r"^(\d+)\.(\d+)\.(\d+)")
+
+
+def _text(value: Any) -> str:
+    """``String(value).trim()`` for the JSON values a canvas can hold."""
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    return str(value).strip()
+
+
+def _has_text(requirement: dict, key: str) -> bool:
+    return requirement.get(key) is not None and _text(requirement[key]) != ""
+
+
+def _number(text: str) -> Any:
+    """``parseFloat``, keeping integral values as ints like JSON does."""
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def parse_effort_estimate(text: str) -> Optional[Dict[str, Any]]:
+    """A free-text effort estimate ("3 weeks", "20 ph", "5") as ``{"value", "unit"}``, or None."""
+    text = text.strip().lower()
+    match = WEEKS_PATTERN.search(text)
+    if match:
+        return {"value": _number(match.group(1)), "unit": "weeks"}
+    match = HOURS_PATTERN.search(text)
+    if match:
+        return {"value": _number(match.group(1)), "unit": "person-hours"}
+    match = NUMBER_PATTERN.search(text)
+    if match:
+        return {"value": _number(match.group(1)), "unit": "weeks"}
+    return None
+
+
+def migrate_effort_estimate(feasibility: dict) -> dict:
+    """
+    Convert a legacy free-text ``effortEstimate`` to ``{"value", "unit"}``
+    (an unparseable one is dropped), as the app's RO-Crate import does.
+    Returns a copy.
+    """
+    feasibility = copy.deepcopy(feasibility)
+    estimate = feasibility.get("effortEstimate")
+    if isinstance(estimate, str) and estimate:
+        migrated = parse_effort_estimate(estimate)
+        if migrated:
+            feasibility["effortEstimate"] = migrated
+        else:
+            del feasibility["effortEstimate"]
+    return feasibility
+
+
+def _oversight_to_time_benefit(oversight: Any, benefits: Any) -> bool:
+    """
+    Put requirement-level oversight on the first time benefit, wherever it is.
+
+    A value already on the benefit wins over the legacy requirement-level
+    one. The app's ``normalizeCanvasData`` only looks at the first benefit
+    and overwrites it; normalization and the ``oversight_to_benefits`` step
+    share this rule instead, so both give the same canvas. Returns whether
+    the value was moved.
+    """
+    benefit = next((b for b in _dicts(benefits) if b.get("benefitType") == "time"), None)
+    if benefit is None or oversight is None or "oversightMinutesPerUnit" in benefit:
+        return False
+    benefit["oversightMinutesPerUnit"] = oversight
+    return True
+
+
+def _normalize_requirement(req: dict, counts: Dict[str, int], unmapped: List[str]) -> Dict[str, Any]:
+    if _has_text(req, "title"):
+        title = _text(req["title"])
+        description = _text(req["description"]) if _has_text(req, "description") else None
+    else:
+        title = _text(req["description"]) if _has_text(req, "description") else ""
+        if title:
+            counts["title"] += 1
+        description = None
+
+    raw_category = req.get("unitCategory")
+    unit_category = "other"
+    if raw_category is not None and _text(raw_category) != "":
+        mapped = UNIT_CATEGORY_MAP.get(raw_category) if isinstance(raw_category, str) else None
+        if mapped:
+            unit_category = mapped
+            if raw_category != unit_category:
+                counts["unitCategory"] += 1
+        elif raw_category not in VALID_UNIT_CATEGORIES:
+            if raw_category not in unmapped:
+                unmapped.append(raw_category)
+        else:
+            unit_category = raw_category
+
+    benefits = copy.deepcopy(req.get("benefits") or [])
+    if "humanOversightMinutesPerUnit" in req:
+        _oversight_to_time_benefit(req["humanOversightMinutesPerUnit"], benefits)
+
+    normalized = copy.deepcopy(req)
+    normalized["title"] = title
+    if description:
+        normalized["description"] = description
+    else:
+        normalized.pop("description", None)
+    normalized["unitCategory"] = unit_category
+    normalized["benefits"] = benefits
+    return normalized
+
+
+def normalize_canvas(canvas: dict) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Normalize canvas data from an older schema to the current one.
+
+    Returns:
+        Tuple of (normalized canvas, list of warnings)
+    """
+    warnings = []
+    counts = {"title": 0, "unitCategory": 0}
+    unmapped: List[str] = []
+    requirements = (canvas.get("userExpectations") or {}).get("requirements") or []
+    normalized_requirements = [_normalize_requirement(req, counts, unmapped) for req in requirements]
+
+    if counts["title"]:
+        warnings.append(f"{counts['title']} requirement(s) had description used as title.")
+    if counts["unitCategory"]:
+        warnings.append(
+            f"{counts['unitCategory']} unit category/categories mapped to new values "
+            "(item, interaction, computation, other)."
+        )
+    if unmapped:
+        warnings.append(f"Unmapped unit categories dropped (set to 'other'): {', '.join(map(str, unmapped))}.")
+
+    project = copy.deepcopy(canvas.get("project") or {})
+    driver = project.get("primaryValueDriver")
+    if driver and driver not in VALID_VALUE_DRIVERS:
+        warnings.append(f"Project primaryValueDriver '{driver}' is not in current schema; field cleared.")
+    if not (driver and driver in VALID_VALUE_DRIVERS):
+        project.pop("primaryValueDriver", None)
+
+    result = copy.deepcopy(canvas)
+    result["project"] = project
+    if canvas.get("persons") is not None:
+        result["persons"] = [_normalize_person(person) for person in canvas["persons"]]
+    else:
+        result.pop("persons", None)
+    user_expectations = result.get("userExpectations") or {}
+    result["userExpectations"] = dict(user_expectations, requirements=normalized_requirements)
+    return result, warnings
+
+
+def _normalize_person(person: Any) -> Any:
+    """Migrate ``localTitles`` (a list) to ``localTitle`` (a string)."""
+    if not isinstance(person, dict) or person.get("localTitles") in (None, False, "", 0):
+        return person
+    local_titles = person["localTitles"]
+    rest = {key: value for key, value in person.items() if key != "localTitles"}
+    if not rest.get("localTitle"):
+        joined = ", ".join(map(str, local_titles)) if isinstance(local_titles, list) else str(local_titles)
+        rest["localTitle"] = joined
+    return rest
+
+
+# Migration table
+
+def parse_version(version: str) -> Tuple[int, int, int]:
+    """``"0.13.1"`` (pre-release and build suffixes ignored) as a comparable tuple."""
+    match = VERSION_PATTERN.match(version.strip())
+    if not match:
+        raise ValueError(f"Not a schema version: {version!r}")
+    return int(match.group(1)), int(match.group(2)), int(match.group(3))
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    One schema change: ``detect`` tells whether a canvas still has the old
+    shape, ``apply`` rewrites it in place and returns notes on what it
+    changed (empty if nothing).
+    """
+
+    version: str
+    name: str
+    description: str
+    detect: Callable[[dict], bool]
+    apply: Callable[[dict], List[str]]
+
+    @property
+    def key(self) -> Tuple[int, int, int]:
+        return parse_version(self.version)
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: str, detect: Callable[[dict], bool]):
+    """Register the decorated function as the migration step for a schema change made in ``version``."""
+
+    def register(apply: Callable[[dict], List[str]]) -> Callable[[dict], List[str]]:
+        description = (apply.__doc__ or "").strip().splitlines()[0]
+        MIGRATIONS.append(Migration(version, apply.__name__, description, detect, apply))
+        # Stable sort: steps of the same version run in registration order
+        MIGRATIONS.sort(key=lambda m: m.key)
+        return apply
+
+    return register
+
+
+def _dicts(value: Any) -> Iterator[dict]:
+    return (item for item in value if isinstance(item, dict)) if isinstance(value, list) else iter(())
+
+
+def _requirements(canvas: dict) -> Iterator[dict]:
+    user_expectations = canvas.get("userExpectations")
+    return _dicts(user_expectations.get("requirements")) if isinstance(user_expectations, dict) else iter(())
+
+
+def _benefits(canvas: dict) -> Iterator[dict]:
+    for req in _requirements(canvas):
+        yield from _dicts(req.get("benefits"))
+
+
+def _persons(canvas: dict) -> Iterator[dict]:
+    return _dicts(canvas.get("persons"))
+
+
+def _publications(canvas: dict) -> Iterator[dict]:
+    outcomes = canvas.get("outcomes")
+    return _dicts(outcomes.get("publications")) if isinstance(outcomes, dict) else iter(())
+
+
+def _feasibilities(canvas: dict) -> Iterator[dict]:
+    if isinstance(canvas.get("developerFeasibility"), dict):
+        yield canvas["developerFeasibility"]
+    for req in _requirements(canvas):
+        if isinstance(req.get("feasibility"), dict):
+            yield req["feasibility"]
+
+
+def _aggregate_holders(canvas: dict) -> Iterator[dict]:
+    yield canvas
+    if isinstance(canvas.get("project"), dict):
+        yield canvas["project"]
+    yield from _requirements(canvas)
+    yield from _benefits(canvas)
+
+
+def _person_ids_by_name(canvas: dict) -> Dict[str, str]:
+    names = {}
+    for person in _persons(canvas):
+        if isinstance(person.get("name"), str) and isinstance(person.get("id"), str):
+            names.setdefault(person["name"].strip().casefold(), person["id"])
+    return names
+
+
+@migration("0.10.0", lambda c: any(k in holder for holder in _aggregate_holders(c) for k in REMOVED_AGGREGATE_FIELDS))
+def drop_aggregate_benefits(canvas: dict) -> List[str]:
+    """Remove aggregateBenefits, aggregateBenefitValue, aggregateBenefitUnit and isImported."""
+    removed = 0
+    for holder in _aggregate_holders(canvas):
+        for key in REMOVED_AGGREGATE_FIELDS:
+            if key in holder:
+                del holder[key]
+                removed += 1
+    return [f"removed {removed} field(s) dropped from the schema"] if removed else []
+
+
+@migration("0.11.0", lambda c: any(not _has_text(r, "title") and _has_text(r, "description") for r in _requirements(c)))
+def requirement_titles(canvas: dict) -> List[str]:
+    """Use the description as title of requirements that have none."""
+    moved = 0
+    for req in _requirements(canvas):
+        if not _has_text(req, "title") and _has_text(req, "description"):
+            # Keep the field where the description was
+            title = _text(req["description"])
+            items = [("title", title) if key == "description" else (key, value)
+                     for key, value in req.items() if key != "title"]
+            req.clear()
+            req.update(items)
+            moved += 1
+    return [f"{moved} requirement(s) had description used as title"] if moved else []
+
+
+@migration("0.11.0", lambda c: any(
+    r.get("unitCategory") is not None and r["unitCategory"] not in VALID_UNIT_CATEGORIES for r in _requirements(c)
+))
+def unit_categories(canvas: dict) -> List[str]:
+    """Map old unit categories (case, document, message, ...) to item, interaction, computation or other."""
+    mapped = 0
+    unmapped: List[str] = []
+    for req in _requirements(canvas):
+        category = req.get("unitCategory")
+        if category is None or category in VALID_UNIT_CATEGORIES:
+            continue
+        new = UNIT_CATEGORY_MAP.get(category) if isinstance(category, str) else None
+        if new:
+            mapped += 1
+        elif category not in unmapped:
+            unmapped.append(category)
+        req["unitCategory"] = new or "other"
+    notes = [f"{mapped} unit category/categories mapped to new values"] if mapped else []
+    if unmapped:
+        notes.append(f"unmapped unit categories set to 'other': {', '.join(map(str, unmapped))}")
+    return notes
+
+
+@migration("0.11.0", lambda c: any("humanOversightMinutesPerUnit" in r for r in _requirements(c)))
+def oversight_to_benefits(canvas: dict) -> List[str]:
+    """Move requirement-level humanOversightMinutesPerUnit to the requirement's first time benefit."""
+    moved = dropped = 0
+    for req in _requirements(canvas):
+        if "humanOversightMinutesPerUnit" not in req:
+            continue
+        oversight = req.pop("humanOversightMinutesPerUnit")
+        has_time_benefit = any(b.get("benefitType") == "time" for b in _dicts(req.get("benefits")))
+        if not has_time_benefit or oversight is None:
+            dropped += 1
+        elif _oversight_to_time_benefit(oversight, req.get("benefits")):
+            moved += 1
+    notes = [f"oversight of {moved} requirement(s) moved to their time benefit"] if moved else []
+    if dropped:
+        notes.append(f"oversight of {dropped} requirement(s) without a time benefit dropped")
+    return notes or ["requirement-level oversight removed (already set on the time benefit)"]
+
+
+@migration("0.11.0", lambda c: any(isinstance(f.get("effortEstimate"), str) for f in _feasibilities(c)))
+def effort_estimates(canvas: dict) -> List[str]:
+    """Convert free-text effort estimates ("3 weeks", "20 ph") to {value, unit}."""
+    converted = dropped = 0
+    for feasibility in _feasibilities(canvas):
+        estimate = feasibility.get("effortEstimate")
+        if not isinstance(estimate, str):
+            continue
+        parsed = parse_effort_estimate(estimate) if estimate else None
+        if parsed:
+            feasibility["effortEstimate"] = parsed
+            converted += 1
+        else:
+            del feasibility["effortEstimate"]
+            dropped += 1
+    notes = [f"{converted} effort estimate(s) converted"] if converted else []
+    if dropped:
+        notes.append(f"{dropped} unparseable effort estimate(s) dropped")
+    return notes
+
+
+@migration("0.11.0", lambda c: isinstance(c.get("project"), dict) and "primaryValueDriver" in c["project"]
+           and c["project"]["primaryValueDriver"] not in VALID_VALUE_DRIVERS)
+def value_driver(canvas: dict) -> List[str]:
+    """Clear a project primaryValueDriver that is not in the current schema."""
+    driver = canvas["project"].pop("primaryValueDriver")
+    return [f"primaryValueDriver {driver!r} is not in the current schema; field cleared"]
+
+
+@migration("0.12.0", lambda c: any("stakeholder" in r for r in _requirements(c))
+           or isinstance(c.get("userExpectations"), dict) and "stakeholders" in c["userExpectations"])
+def legacy_stakeholders(canvas: dict) -> List[str]:
+    """Replace requirement.stakeholder (a name) with stakeholders (Person IDs); drop userExpectations.stakeholders."""
+    notes = []
+    person_ids = _person_ids_by_name(canvas)
+    linked = dropped = 0
+    for req in _requirements(canvas):
+        if "stakeholder" not in req:
+            continue
+        name = req.pop("stakeholder")
+        person_id = person_ids.get(name.strip().casefold()) if isinstance(name, str) else None
+        if person_id is None:
+            dropped += 1
+            continue
+        stakeholders = req.setdefault("stakeholders", [])
+        if isinstance(stakeholders, list) and person_id not in stakeholders:
+            stakeholders.append(person_id)
+        linked += 1
+    if linked:
+        notes.append(f"{linked} requirement stakeholder(s) linked to persons")
+    if dropped:
+        notes.append(f"{dropped} requirement stakeholder(s) matching no person dropped")
+    user_expectations = canvas.get("userExpectations")
+    if isinstance(user_expectations, dict) and "stakeholders" in user_expectations:
+        user_expectations.pop("stakeholders")
+        notes.append("project-level userExpectations.stakeholders dropped (stakeholders are per task)")
+    return notes
+
+
+@migration("0.13.1", lambda c: any("localTitles" in p for p in _persons(c)))
+def person_local_titles(canvas: dict) -> List[str]:
+    """Join a person's localTitles list into the localTitle string."""
+    persons = canvas["persons"]
+    migrated = 0
+    for position, person in enumerate(persons):
+        if isinstance(person, dict) and "localTitles" in person:
+            persons[position] = _normalize_person(person)
+            persons[position].pop("localTitles", None)
+            migrated += 1
+    return [f"localTitles of {migrated} person(s) migrated to localTitle"]
+
+
+@migration("0.14.0", lambda c: any(
+    isinstance(a, str) for p in _publications(c) if isinstance(p.get("authors"), list) for a in p["authors"]
+))
+def structured_authors(canvas: dict) -> List[str]:
+    """Turn plain-string publication authors into person references (by name) or organization authors."""
+    person_ids = _person_ids_by_name(canvas)
+    persons = organizations = 0
+    for publication in _publications(canvas):
+        authors = publication.get("authors")
+        if not isinstance(authors, list):
+            continue
+        for position, author in enumerate(authors):
+            if not isinstance(author, str):
+                continue
+            person_id = person_ids.get(author.strip().casefold())
+            if person_id is not None:
+                authors[position] = {"type": "person", "personId": person_id}
+                persons += 1
+            else:
+                authors[position] = {"type": "organization", "name": author}
+                organizations += 1
+    return [f"{persons + organizations} author(s) structured ({persons} matched to persons)"]
+
+
+def plan(canvas: dict, from_version: Optional[str] = None) -> List[Migration]:
+    """
+    Migration steps a canvas needs, in order.
+
+    With ``from_version`` every step newer than that schema version is
+    returned. Otherwise the canvas's version is inferred: it predates the
+    oldest step whose old shape it still has, and needs that step and all
+    later ones.
+    """
+    if from_version is not None:
+        start = parse_version(from_version)
+        return [m for m in MIGRATIONS if m.key > start]
+    for position, step in enumerate(MIGRATIONS):
+        if step.detect(canvas):
+            return MIGRATIONS[position:]
+    return []
+
+
+@dataclass
+class MigrationOutcome:
+    """A migrated canvas, the steps that changed it (with their notes) and the steps planned."""
+
+    canvas: Dict[str, Any]
+    planned: List[Migration]
+    applied: List[Tuple[Migration, List[str]]] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.applied)
+
+    @property
+    def from_version(self) -> Optional[str]:
+        """Version the canvas predates (the first planned step's), None if it is current."""
+        return self.planned[0].version if self.planned else None
+
+
+def migrate(canvas: dict, from_version: Optional[str] = None) -> MigrationOutcome:
+    """Apply the steps ``plan()`` selects to a copy of ``canvas``."""
+    steps = plan(canvas, from_version)
+    outcome = MigrationOutcome(copy.deepcopy(canvas) if steps else canvas, steps)
+    for step in steps:
+        if step.detect(outcome.canvas):
+            notes = step.apply(outcome.canvas)
+            if notes:
+                outcome.applied.append((step, notes))
+    return outcome
+
+
+# Batch migration
+
+@dataclass
+class MigrateConfig:
+    """Settings each migration worker needs (must be picklable)."""
+
+    from_version: Optional[str] = None
+    diff: bool = False
+    serialize_all: bool = False
+    compact: bool = False
+
+
+@dataclass
+class MigrationResult:
+    """
+    Outcome for one source: ``migrated``, ``current`` (nothing to do),
+    ``skipped`` (an RO-Crate) or ``error``. ``text`` is the serialized
+    canvas (compact for JSONL lines), set when migrated or when every
+    canvas is written out. ``steps`` names the steps that changed it.
+    """
+
+    name: str
+    status: str
+    from_version: Optional[str] = None
+    steps: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+    text: Optional[str] = None
+    diff: Optional[str] = None
+    error: Optional[str] = None
+
+
+_migrate_config: Optional[MigrateConfig] = None
+
+
+def init_migrator(config: MigrateConfig) -> None:
+    """Process pool initializer: keep the config."""
+    global _migrate_config
+    _migrate_config = config
+
+
+def _dump(canvas: Any, compact: bool) -> str:
+    if compact:
+        return json.dumps(canvas, ensure_ascii=False)
+    return json.dumps(canvas, indent=2, ensure_ascii=False)
+
+
+def migrate_source(source: Source) -> MigrationResult:
+    """Read and migrate one source; any failure is confined to its result."""
+    config = _migrate_config
+    try:
+        canvas = json.loads(source.text) if source.text is not None else load_json(source.path)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return MigrationResult(source.name, "error", error=f"JSON parsing error: {e}")
+    except OSError as e:
+        return MigrationResult(source.name, "error", error=f"Error: {e}")
+    if is_rocrate(canvas):
+        return MigrationResult(source.name, "skipped")
+    if not isinstance(canvas, dict):
+        return MigrationResult(source.name, "error", error="Not a canvas: expected a JSON object")
+
+    try:
+        outcome = migrate(canvas, config.from_version)
+    except Exception as e:  # a malformed canvas must not take down the batch
+        return MigrationResult(source.name, "error", error=f"{type(e).__name__}: {e}")
+
+    compact = config.compact or source.line is not None
+    result = MigrationResult(
+        source.name,
+        "migrated" if outcome.changed else "current",
+        outcome.from_version,
+        [step.name for step, _ in outcome.applied],
+        [f"{step.name}: {note}" for step, notes in outcome.applied for note in notes],
+    )
+    if outcome.changed or config.serialize_all:
+        result.text = _dump(outcome.canvas, compact)
+    if outcome.changed and config.diff:
+        before = _dump(canvas, False).splitlines(keepends=True)
+        after = (result.text if not compact else _dump(outcome.canvas, False)).splitlines(keepends=True)
+        result.diff = "".join(difflib.unified_diff(before, after, source.name, f"{source.name} (migrated)"))
+    return result
+
+
+def migrate_chunk(chunk: List[Source]) -> List[MigrationResult]:
+    """Migrate a chunk of sources (one pool task) in order."""
+    return [migrate_source(source) for source in chunk]
@@ -0,0 +1,115 @@
+"""
+Ontology terms behind the canvas fields.
+
+``ONTOLOGY_MAPPINGS`` maps canvas field names to the schema.org, DCT,
+PROV-O, P-Plan and FRAPO terms they correspond to (``None`` for fields that
+are specific to the canvas). tools/generate-reference.py shows it in the
+reference documentation and aac.rdf exports canvases with it.
+``PREFIXES`` expands the CURIEs, using the namespaces of the RO-Crate
+``@context`` the app writes, and ``ENTITY_TYPES`` gives the classes of the
+objects stored under a field, as in the app's RO-Crate export.
+"""
+
+PREFIXES = {
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+    "schema": "https://schema.org/",
+    "prov": "http://www.w3.org/ns/prov#",
+    "p-plan": "http://purl.org/net/p-plan#",
+    "dct": "http://purl.org/dc/terms/",
+    "dcat": "http://www.w3.org/ns/dcat#",
+    "frapo": "http://purl.org/cerif/frapo/",
+    "aac": "https://github.com/slolab/agentic-automation-canvas/schema/",
+}
+
+# Mapping of generic fields to their underlying ontologies
+ONTOLOGY_MAPPINGS = {
+    # Schema.org mappings
+    "title": "schema:name",
+    "name": "schema:name",
+    "description": "schema:description",
+    "objective": "schema:abstract",
+    "startDate": "schema:startDate",
+    "endDate": "schema:endDate",
+    "keywords": "schema:keywords",
+    "projectId": "schema:identifier",
+    "identifier": "schema:identifier",
+    "pid": "schema:identifier",
+    "doi": "schema:identifier",
+    "license": "schema:license",
+    "publisher": "schema:publisher",
+    "author": "schema:author",
+    "authors": "schema:author",
+    "date": "schema:datePublished",
+    "datePublished": "schema:datePublished",
+    "format": "schema:encodingFormat",
+    "affiliation": "schema:affiliation",
+    "orcid": "schema:identifier",
+    
+    # DCAT mappings
+    "accessRights": "dct:accessRights",
+    "duoTerms": "dct:conformsTo",
+    
+    # PROV-O mappings
+    "startedAtTime": "prov:startedAtTime",
+    "endedAtTime": "prov:endedAtTime",
+    "wasAssociatedWith": "prov:wasAssociatedWith",
+    "wasGeneratedBy": "prov:wasGeneratedBy",
+    "wasInformedBy": "prov:wasInformedBy",
+    "hadPlan": "prov:hadPlan",
+    
+    # P-Plan mappings
+    "requirements": "p-plan:hasStep",
+    "milestones": "p-plan:hasMilestone",
+    "userStory": "p-plan:Step",
+    
+    # FRAPO mappings
+    "fundingGrant": "frapo:fundingGrant",
+    "leadOrganization": "frapo:leadOrganization",
+    "projectStage": "frapo:hasStatus",
+    "deliverables": "frapo:deliverable",
+    
+    # Custom AAC fields (no ontology mapping)
+    "headlineValue": None,
+    "aggregateBenefitValue": None,
+    "aggregateBenefitUnit": None,
+    "primaryValueDriver": None,
+    "aggregateBenefits": None,
+    "version": None,
+    "versionDate": None,
+    "isImported": None,
+    "benefitType": None,
+    "metricId": None,
+    "metricLabel": None,
+    "direction": None,
+    "valueMeaning": None,
+    "benefitUnit": None,
+    "baseline": None,
+    "expected": None,
+    "confidenceUser": None,
+    "confidenceDev": None,
+    "assumptions": None,
+    "aggregationBasis": None,
+    "unitOfWork": None,
+    "unitCategory": None,
+    "volumePerMonth": None,
+    "humanOversightMinutesPerUnit": None,
+    "roleContext": None,
+    "containsPersonalData": None,
+    "sensitivityLevel": None,
+    "evaluationType": None,
+    "metrics": None,
+    "complianceStandard": None,
+}
+
+
+ENTITY_TYPES = {
+    "project": ("schema:Project", "schema:ResearchProject"),
+    "persons": ("schema:Person",),
+    "requirements": ("p-plan:Step",),
+    "stages": ("prov:Activity",),
+    "datasets": ("dcat:Dataset",),
+    "deliverables": ("schema:CreativeWork",),
+    "publications": ("schema:ScholarlyArticle",),
+    "evaluations": ("schema:CreativeWork",),
+}
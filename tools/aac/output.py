@@ -0,0 +1,130 @@
+"""
+Writing generated files without touching unchanged ones.
+
+Doc builds, watchers and incremental tools key off modification times, so a
+generator that rewrites identical output on every run makes everything
+downstream redo its work. ``ChangedFileWriter`` streams output to a temporary
+file next to the target while hashing it, and only replaces the target (an
+atomic ``os.replace()``) if the content differs; ``OutputDirectory`` does
+the same for every document a bulk tool writes into a directory.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> Optional[str]:
+    """blake2b digest of a file's bytes, or None if it cannot be read."""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _target_mode(path: Path) -> int:
+    """Mode for a replaced file: the existing file's, else 0666 minus the umask."""
+    try:
+        return path.stat().st_mode & 0o777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+class ChangedFileWriter:
+    """
+    File writer that leaves the target untouched if nothing changed.
+
+    Use as a context manager; ``changed`` tells afterwards whether the target
+    was replaced. If the block raises, the target is left as it was.
+    """
+
+    def __init__(self, path: Path, encoding: str = "utf-8"):
+        self.path = Path(path)
+        self.encoding = encoding
+        self.digest = hashlib.blake2b(digest_size=16)
+        self.size = 0
+        self.changed = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self.tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        self.fp = os.fdopen(fd, "wb")
+
+    def write(self, text: str) -> None:
+        self.write_bytes(text.encode(self.encoding))
+
+    def write_bytes(self, data: bytes) -> None:
+        self.digest.update(data)
+        self.size += len(data)
+        self.fp.write(data)
+
+    def close(self) -> bool:
+        """Finish the file; returns True if the target was (re)written."""
+        self.fp.close()
+        try:
+            same = self.path.stat().st_size == self.size and file_digest(self.path) == self.digest.hexdigest()
+        except OSError:
+            same = False
+        if same:
+            os.unlink(self.tmp)
+        else:
+            # mkstemp() creates 0600 files; give the result normal permissions
+            os.chmod(self.tmp, _target_mode(self.path))
+            os.replace(self.tmp, self.path)
+            self.changed = True
+        return self.changed
+
+    def discard(self) -> None:
+        self.fp.close()
+        if os.path.exists(self.tmp):
+            os.unlink(self.tmp)
+
+    def __enter__(self) -> "ChangedFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def write_if_changed(path: Path, text: str, encoding: str = "utf-8") -> bool:
+    """Write ``text`` to ``path`` unless it already has exactly that content."""
+    with ChangedFileWriter(path, encoding) as writer:
+        writer.write(text)
+    return writer.changed
+
+
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    """Write ``data`` to ``path`` unless it already has exactly that content."""
+    with ChangedFileWriter(path) as writer:
+        writer.write_bytes(data)
+    return writer.changed
+
+
+class OutputDirectory:
+    """Writes generated documents into a directory, keeping names unique and unchanged files untouched."""
+
+    def __init__(self, path: Path, suffix: str = ".json"):
+        self.path = path
+        self.suffix = suffix
+        self.used: Dict[str, int] = {}
+        self.written = 0
+
+    def write(self, name: str, text: str) -> Path:
+        """Write ``text`` as ``name`` (ending in the suffix), or ``name-2``... if already used in this run."""
+        count = self.used.get(name, 0)
+        self.used[name] = count + 1
+        if count:
+            name = f"{name[: -len(self.suffix)]}-{count + 1}{self.suffix}"
+        target = self.path / name
+        if write_if_changed(target, text + "\n"):
+            self.written += 1
+        return target
@@ -0,0 +1,382 @@
+"""
+Vectorized benefit rollups over a portfolio of canvases (requires NumPy).
+
+Canvases are loaded once into columnar arrays, one row per requirement and
+one row per benefit, and every rollup is then a handful of array operations
+instead of a Python loop per canvas:
+
+- per requirement: gross and net time saved per month and human oversight,
+  following ``getTimeSavedPerUnit``/``getOversightMinutes`` exactly
+- per canvas: the figures ``computeCanvasSummary`` shows (total time saved,
+  benefit type counts, amortization), identical to aac.benefits
+- per metric: ``volumePerMonth``-weighted baseline and expected values of
+  every numeric benefit, by (benefitType, metricId, benefitUnit); summed,
+  or averaged for percentages and rates (see ``is_rate_unit``)
+- per portfolio, or per group of canvases: totals of all of the above
+
+Sums per canvas use ``np.bincount``, which adds in row order, so per-canvas
+totals are bit-identical to the sequential sums in the TypeScript code.
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .benefits import effort_hours, is_number, time_unit
+
+# Aggregation basis codes; benefits without one count as perUnit in metric
+# rollups (the schema default) but get no oversight (as in the app)
+PER_UNIT, PER_MONTH, ONE_OFF, UNSET = 0, 1, 2, 3
+BASIS_CODES = {"perUnit": PER_UNIT, "perMonth": PER_MONTH, "oneOff": ONE_OFF}
+PERCENT_UNITS = {"%", "percent", "percentage"}
+
+
+def is_rate_unit(unit: str) -> bool:
+    """
+    Whether a benefitUnit is a percentage or a rate ("%", "incidents/month").
+
+    Volume-weighted sums of such values have no meaning (an error rate of
+    18 % over 100 units is not 1800 %), so their rollups are weighted means.
+    """
+    unit = unit.strip().lower()
+    return unit in PERCENT_UNITS or "/" in unit
+
+
+def _numeric(value: Any) -> Optional[float]:
+    """A BenefitValue's number, or None if it is not numeric."""
+    if isinstance(value, dict) and value.get("type") == "numeric" and is_number(value.get("value")):
+        return float(value["value"])
+    return None
+
+
+def _optional(value: Any) -> float:
+    """A number, or NaN when missing (NaN also stands for "not set" in the TS checks)."""
+    return float(value) if is_number(value) else np.nan
+
+
+class PortfolioBuilder:
+    """Collects canvases into typed arrays; ``build()`` wraps them as NumPy arrays without copying."""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.groups: List[str] = []
+        self.group_index: Dict[str, int] = {}
+        self.types: Dict[str, int] = {}
+        self.metrics: Dict[Tuple[str, str, str], int] = {}
+
+        self.req_canvas = array("i")
+        self.req_volume = array("d")
+        self.req_effort = array("d")
+
+        self.ben_canvas = array("i")
+        self.ben_requirement = array("i")
+        self.ben_type = array("i")
+        self.ben_metric = array("i")
+        self.ben_basis = array("b")
+        self.ben_numeric = array("b")
+        self.ben_first_time = array("b")
+        self.ben_baseline = array("d")
+        self.ben_expected = array("d")
+        self.ben_factor = array("d")
+        self.ben_oversight_unit = array("d")
+        self.ben_oversight_month = array("d")
+        self.canvas_group = array("i")
+
+    def add(self, name: str, canvas: dict, group: Optional[str] = None) -> None:
+        """Append one canvas (assumed schema-valid)."""
+        canvas_index = len(self.names)
+        self.names.append(name)
+        group = group if group is not None else ""
+        if group not in self.group_index:
+            self.group_index[group] = len(self.groups)
+            self.groups.append(group)
+        self.canvas_group.append(self.group_index[group])
+
+        requirements = (canvas.get("userExpectations") or {}).get("requirements") or []
+        for requirement in requirements:
+            requirement_index = len(self.req_canvas)
+            volume = requirement.get("volumePerMonth")
+            self.req_canvas.append(canvas_index)
+            self.req_volume.append(float(volume) if is_number(volume) else 0.0)
+            hours = effort_hours(requirement)
+            self.req_effort.append(np.nan if hours is None else float(hours))
+
+            seen_time = False
+            for benefit in requirement.get("benefits") or []:
+                benefit_type = benefit.get("benefitType")
+                is_time = benefit_type == "time"
+                baseline = _numeric(benefit.get("baseline"))
+                expected = _numeric(benefit.get("expected"))
+                unit = benefit.get("benefitUnit") or ""
+                # Time benefits are converted to minutes, so their metric unit is minutes
+                factor = 60.0 if is_time and time_unit(benefit, requirement) == "hours" else 1.0
+                metric = (benefit_type, benefit.get("metricId") or "", "minutes" if is_time else unit)
+
+                self.ben_canvas.append(canvas_index)
+                self.ben_requirement.append(requirement_index)
+                self.ben_type.append(self.types.setdefault(benefit_type, len(self.types)))
+                self.ben_metric.append(self.metrics.setdefault(metric, len(self.metrics)))
+                self.ben_basis.append(BASIS_CODES.get(benefit.get("aggregationBasis"), UNSET))
+                self.ben_numeric.append(baseline is not None and expected is not None)
+                self.ben_first_time.append(is_time and not seen_time)
+                # getExpectedLikely: non-numeric values count as 0
+                self.ben_baseline.append(0.0 if baseline is None else baseline)
+                self.ben_expected.append(0.0 if expected is None else expected)
+                self.ben_factor.append(factor)
+                self.ben_oversight_unit.append(_optional(benefit.get("oversightMinutesPerUnit")))
+                self.ben_oversight_month.append(_optional(benefit.get("oversightMinutesPerMonth")))
+                seen_time = seen_time or is_time
+
+    def build(self) -> "Portfolio":
+        def wrap(values: array, dtype: Any) -> np.ndarray:
+            return np.frombuffer(values, dtype=dtype) if len(values) else np.zeros(0, dtype=dtype)
+
+        return Portfolio(
+            names=self.names,
+            groups=self.groups,
+            types=list(self.types),
+            metrics=list(self.metrics),
+            canvas_group=wrap(self.canvas_group, np.intc),
+            req_canvas=wrap(self.req_canvas, np.intc),
+            req_volume=wrap(self.req_volume, np.float64),
+            req_effort=wrap(self.req_effort, np.float64),
+            ben_canvas=wrap(self.ben_canvas, np.intc),
+            ben_requirement=wrap(self.ben_requirement, np.intc),
+            ben_type=wrap(self.ben_type, np.intc),
+            ben_metric=wrap(self.ben_metric, np.intc),
+            ben_basis=wrap(self.ben_basis, np.int8),
+            ben_numeric=wrap(self.ben_numeric, np.int8).astype(bool),
+            ben_first_time=wrap(self.ben_first_time, np.int8).astype(bool),
+            ben_baseline=wrap(self.ben_baseline, np.float64),
+            ben_expected=wrap(self.ben_expected, np.float64),
+            ben_factor=wrap(self.ben_factor, np.float64),
+            ben_oversight_unit=wrap(self.ben_oversight_unit, np.float64),
+            ben_oversight_month=wrap(self.ben_oversight_month, np.float64),
+        )
+
+
+@dataclass
+class Portfolio:
+    """Columnar benefit data for many canvases (see PortfolioBuilder)."""
+
+    names: List[str]
+    groups: List[str]
+    types: List[str]
+    metrics: List[Tuple[str, str, str]]
+    canvas_group: np.ndarray
+    req_canvas: np.ndarray
+    req_volume: np.ndarray
+    req_effort: np.ndarray
+    ben_canvas: np.ndarray
+    ben_requirement: np.ndarray
+    ben_type: np.ndarray
+    ben_metric: np.ndarray
+    ben_basis: np.ndarray
+    ben_numeric: np.ndarray
+    ben_first_time: np.ndarray
+    ben_baseline: np.ndarray
+    ben_expected: np.ndarray
+    ben_factor: np.ndarray
+    ben_oversight_unit: np.ndarray
+    ben_oversight_month: np.ndarray
+    _requirement_time: Optional[Dict[str, np.ndarray]] = field(default=None, repr=False)
+
+    @classmethod
+    def from_canvases(cls, canvases: Iterable[Tuple[str, dict, Optional[str]]]) -> "Portfolio":
+        """Build from (name, canvas, group) triples."""
+        builder = PortfolioBuilder()
+        for name, canvas, group in canvases:
+            builder.add(name, canvas, group)
+        return builder.build()
+
+    @property
+    def canvas_count(self) -> int:
+        return len(self.names)
+
+    def requirement_time(self) -> Dict[str, np.ndarray]:
+        """
+        Gross saving, oversight and net saving per requirement, in minutes per month.
+
+        Only each requirement's first time benefit counts; requirements
+        without one have zeros.
+        """
+        if self._requirement_time is not None:
+            return self._requirement_time
+        rows = np.flatnonzero(self.ben_first_time)
+        requirement = self.ben_requirement[rows]
+        volume = self.req_volume[requirement]
+        factor = self.ben_factor[rows]
+        # toMinutes() is applied to baseline and expected separately, as in the TS
+        saved = np.maximum(0.0, self.ben_baseline[rows] * factor - self.ben_expected[rows] * factor)
+        gross = saved * volume
+
+        basis = self.ben_basis[rows]
+        per_unit = self.ben_oversight_unit[rows]
+        per_month = self.ben_oversight_month[rows]
+        oversight = np.where(
+            (basis == PER_UNIT) & ~np.isnan(per_unit),
+            # A zero volume is falsy in the TS, which then returns the per-unit figure
+            np.where(volume != 0, per_unit * volume, per_unit),
+            np.where((basis == PER_MONTH) & ~np.isnan(per_month), per_month, 0.0),
+        )
+        net = np.maximum(0.0, gross - oversight)
+
+        result = {}
+        for name, values in (("saved_per_unit", saved), ("gross", gross), ("oversight", oversight), ("net", net)):
+            column = np.zeros(len(self.req_canvas))
+            column[requirement] = values
+            result[name] = column
+        result["has_time_benefit"] = np.zeros(len(self.req_canvas), dtype=bool)
+        result["has_time_benefit"][requirement] = True
+        self._requirement_time = result
+        return result
+
+    def _per_canvas_sum(self, values: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        index = self.req_canvas if mask is None else self.req_canvas[mask]
+        weights = values if mask is None else values[mask]
+        return np.bincount(index, weights=weights, minlength=self.canvas_count)
+
+    def canvas_rollups(self) -> Dict[str, np.ndarray]:
+        """
+        Per-canvas figures, one array element per canvas.
+
+        ``hours_saved`` is rounded like the canvas summary; ``amortization_months``
+        is NaN where the summary shows nothing.
+        """
+        time = self.requirement_time()
+        minutes = self._per_canvas_sum(time["net"])
+        has_effort = ~np.isnan(self.req_effort)
+        effort = self._per_canvas_sum(self.req_effort, has_effort)
+        benefit_hours = self._per_canvas_sum(time["net"] / 60, has_effort)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            amortization = np.where(benefit_hours > 0, effort / benefit_hours, np.nan)
+        return {
+            "tasks": np.bincount(self.req_canvas, minlength=self.canvas_count),
+            "minutes_saved": minutes,
+            "gross_minutes": self._per_canvas_sum(time["gross"]),
+            "oversight_minutes": self._per_canvas_sum(time["oversight"]),
+            # Math.round((minutes / 60) * 10) / 10
+            "hours_saved": np.floor((minutes / 60) * 10 + 0.5) / 10,
+            "effort_hours": effort,
+            "amortization_months": amortization,
+        }
+
+    def type_counts(self) -> np.ndarray:
+        """Benefits per canvas and benefit type, shape (canvases, len(types))."""
+        width = max(len(self.types), 1)
+        flat = np.bincount(self.ben_canvas * width + self.ben_type, minlength=self.canvas_count * width)
+        return flat.reshape(self.canvas_count, width)[:, :len(self.types)]
+
+    def metric_rollups(self, canvases: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        ``volumePerMonth``-weighted values per metric, one element per entry of ``metrics``.
+
+        perUnit values are multiplied by the requirement's monthly volume and
+        perMonth values taken as they are, giving ``monthly_baseline`` and
+        ``monthly_expected``; ``monthly_weight`` is the sum of those weights
+        (``units_per_month`` only counts the volume behind the perUnit
+        ones), so dividing by it gives the weighted mean. oneOff values are
+        summed separately. Only
+        benefits with numeric baseline and expected values contribute to the
+        sums. ``canvases`` (a boolean mask) restricts the rollup.
+        """
+        rows = self.ben_numeric if canvases is None else self.ben_numeric & canvases[self.ben_canvas]
+        metric = self.ben_metric[rows]
+        basis = self.ben_basis[rows]
+        volume = self.req_volume[self.ben_requirement[rows]]
+        baseline = self.ben_baseline[rows] * self.ben_factor[rows]
+        expected = self.ben_expected[rows] * self.ben_factor[rows]
+        per_unit = (basis == PER_UNIT) | (basis == UNSET)
+        monthly = np.where(per_unit, volume, np.where(basis == PER_MONTH, 1.0, 0.0))
+        one_off = (basis == ONE_OFF).astype(np.float64)
+        size = len(self.metrics)
+
+        def total(weights: np.ndarray) -> np.ndarray:
+            return np.bincount(metric, weights=weights, minlength=size)
+
+        all_rows = self.ben_metric if canvases is None else self.ben_metric[canvases[self.ben_canvas]]
+        return {
+            "benefits": np.bincount(all_rows, minlength=size),
+            "numeric": np.bincount(metric, minlength=size),
+            "units_per_month": total(volume * per_unit),
+            "monthly_weight": total(monthly),
+            "monthly_baseline": total(baseline * monthly),
+            "monthly_expected": total(expected * monthly),
+            "one_off_baseline": total(baseline * one_off),
+            "one_off_expected": total(expected * one_off),
+        }
+
+    def group_rollups(self) -> List[Dict[str, Any]]:
+        """Totals per group of canvases (a single group when no grouping was used)."""
+        canvas = self.canvas_rollups()
+        types = self.type_counts()
+        time = self.requirement_time()
+        has_effort = ~np.isnan(self.req_effort)
+        results = []
+        for index, group in enumerate(self.groups):
+            members = self.canvas_group == index
+            requirements = members[self.req_canvas]
+            effort_rows = requirements & has_effort
+            effort = float(self.req_effort[effort_rows].sum())
+            benefit_hours = float((time["net"][effort_rows] / 60).sum())
+            hours = canvas["minutes_saved"][members] / 60
+            metrics = self.metric_rollups(members)
+            results.append({
+                "group": group,
+                "canvases": int(members.sum()),
+                "tasks": int(requirements.sum()),
+                "tasks_with_time_benefit": int((time["has_time_benefit"] & requirements).sum()),
+                "hours_saved_per_month": float(hours.sum()),
+                "gross_hours_per_month": float(canvas["gross_minutes"][members].sum() / 60),
+                "oversight_hours_per_month": float(canvas["oversight_minutes"][members].sum() / 60),
+                "hours_saved_p50": float(np.percentile(hours, 50)) if len(hours) else 0.0,
+                "hours_saved_p90": float(np.percentile(hours, 90)) if len(hours) else 0.0,
+                "effort_hours": effort,
+                "amortization_months": effort / benefit_hours if benefit_hours > 0 else None,
+                "benefit_types": {t: int(n) for t, n in zip(self.types, types[members].sum(axis=0)) if n},
+                "metrics": [
+                    self._metric_record(i, metrics)
+                    for i in range(len(self.metrics))
+                    if metrics["benefits"][i]
+                ],
+            })
+        return results
+
+    def _metric_record(self, index: int, metrics: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """One metric's rollup as a plain dict, with weighted means for percentages and rates."""
+        benefit_type, metric_id, unit = self.metrics[index]
+        record: Dict[str, Any] = {
+            "benefitType": benefit_type,
+            "metricId": metric_id,
+            "unit": unit,
+            "aggregate": "mean" if is_rate_unit(unit) else "sum",
+            **{key: (int(values[index]) if values.dtype.kind == "i" else float(values[index]))
+               for key, values in metrics.items()},
+        }
+        if record["aggregate"] == "mean":
+            weight = record["monthly_weight"]
+            record["mean_baseline"] = record["monthly_baseline"] / weight if weight else None
+            record["mean_expected"] = record["monthly_expected"] / weight if weight else None
+        return record
+
+    def canvas_records(self) -> List[Dict[str, Any]]:
+        """Per-canvas results as plain dicts, in input order."""
+        canvas = self.canvas_rollups()
+        types = self.type_counts()
+        records = []
+        for i, name in enumerate(self.names):
+            amortization = canvas["amortization_months"][i]
+            records.append({
+                "name": name,
+                "group": self.groups[self.canvas_group[i]],
+                "taskCount": int(canvas["tasks"][i]),
+                "totalMinutesSavedPerMonth": float(canvas["minutes_saved"][i]),
+                "totalTimeSavedHoursPerMonth": float(canvas["hours_saved"][i]),
+                "grossMinutesPerMonth": float(canvas["gross_minutes"][i]),
+                "oversightMinutesPerMonth": float(canvas["oversight_minutes"][i]),
+                "benefitTypeCounts": {t: int(n) for t, n in zip(self.types, types[i]) if n},
+                "amortizationMonths": None if np.isnan(amortization) else float(amortization),
+            })
+        return records
@@ -0,0 +1,755 @@
+"""
+Static HTML previews of canvases, ported from the web app.
+
+``canvas_summary`` ports ``computeCanvasSummary`` (src/utils/canvasSummary.ts,
+with the benefit math from aac.benefits) and ``render_preview`` ports
+``generateCanvasPreviewHtml`` (src/utils/generateCanvasPreviewHtml.ts), so a
+page built here has the same blocks, classes and styles as the
+``ro-crate-preview.html`` the app puts in RO-Crate downloads.
+
+The page shell (styles, layout and the block icons from
+src/assets/icons/canvas/) is compiled into a ``Template`` once per process;
+rendering a canvas fills its slots and joins the parts.
+
+``render_chunk`` is the process pool task behind tools/build-previews.py. A
+page is only rendered when the hash of its input (the canvas text and
+``render_context()``: this module, the icons and the tool version) differs
+from the manifest entry of the previous build, and only written if its HTML
+changed; the entry also keeps the summary row for the index pages, so
+unchanged canvases are not parsed at all.
+"""
+
+import hashlib
+import html
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import __version__
+from .batch import Source
+from .benefits import canvas_benefit_summary, is_number
+from .crateimport import CrateImportError, crate_to_canvas
+from .output import write_if_changed
+from .validation import REPO_ROOT, is_rocrate
+
+# Manifest of the previous build, kept in the output directory
+MANIFEST_FILE = ".preview-manifest.json"
+MANIFEST_VERSION = 1
+
+ICONS_DIR = REPO_ROOT / "src" / "assets" / "icons" / "canvas"
+BLOCK_ICONS = ("project", "expectations", "feasibility", "governance", "data", "outcomes")
+
+MAX_DESC_LEN = 300
+MAX_FEASIBILITY_NOTES_LEN = 300
+MAX_TASK_TITLES = 5
+MAX_OUTCOMES = 5
+
+NOT_SPECIFIED = '<p class="italic text-gray-400">Not specified</p>'
+
+_SLOT = re.compile(r"\{\{(\w+)\}\}")
+
+
+class Template:
+    """A text with ``{{name}}`` slots, split into literal parts and slot names once."""
+
+    def __init__(self, text: str):
+        self.parts: List[str] = []
+        self.slots: List[str] = []
+        position = 0
+        for match in _SLOT.finditer(text):
+            self.parts.append(text[position:match.start()])
+            self.slots.append(match.group(1))
+            position = match.end()
+        self.parts.append(text[position:])
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill every slot (values are inserted as is: escape them first)."""
+        out = [self.parts[0]]
+        for slot, part in zip(self.slots, self.parts[1:]):
+            out.append(values[slot])
+            out.append(part)
+        return "".join(out)
+
+
+def escape_html(value: Any) -> str:
+    """``escapeHtml``: escapes ``& < > " '``."""
+    return html.escape(js_str(value), quote=True).replace("&#x27;", "&#39;")
+
+
+def js_str(value: Any) -> str:
+    """A value as JavaScript interpolates it into a template literal."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e21:
+            return str(int(value))
+        return "NaN" if math.isnan(value) else repr(value)
+    return str(value)
+
+
+def _dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else []
+
+
+def _text(value: Any) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def truncate(text: Any, max_len: int) -> str:
+    t = _text(text)
+    return t if len(t) <= max_len else t[:max_len] + "..."
+
+
+def is_link(url: Optional[str]) -> bool:
+    """``isLink``: True if the value starts with http:// or https://."""
+    s = _text(url).lower()
+    return s.startswith("http://") or s.startswith("https://")
+
+
+_STORY_FULL = re.compile(r"^\s*(as\s+an?\s+)([\s\S]+?)(,?\s*i\s+want\s+)([\s\S]+?)(,?\s*so\s+that\s+)([\s\S]*)\s*$",
+                         re.IGNORECASE)
+_STORY_PARTIAL = re.compile(r"^\s*(as\s+an?\s+)([\s\S]+?)(,?\s*i\s+want\s+)([\s\S]*)\s*$", re.IGNORECASE)
+
+
+def parse_user_story(text: Optional[str]) -> Optional[List[Tuple[str, bool]]]:
+    """``parseUserStory``: "As a X, I want Y, so that Z" as (text, formulaic) segments, or None."""
+    t = _text(text)
+    if not t:
+        return None
+    match = _STORY_FULL.match(t) or _STORY_PARTIAL.match(t)
+    if not match:
+        return None
+    return [(segment if i % 2 == 0 else segment.strip(), i % 2 == 0) for i, segment in enumerate(match.groups())]
+
+
+def _has_dedicated_feasibility(requirement: Dict[str, Any]) -> bool:
+    f = _dict(requirement.get("feasibility"))
+    if not f:
+        return False
+    value = _dict(f.get("effortEstimate")).get("value")
+    architecture = _dict(f.get("technologyApproach")).get("architecture")
+    return bool(
+        f.get("technicalRisk")
+        or (is_number(value) and value > 0)
+        or _text(f.get("feasibilityNotes"))
+        or (f.get("modelSelection") and f.get("modelSelection") != "none")
+        or _text(f.get("modelName"))
+        or (architecture and architecture != "none")
+    )
+
+
+def canvas_summary(canvas: Dict[str, Any]) -> Dict[str, Any]:
+    """``computeCanvasSummary``: the six blocks of the one-page summary."""
+    project = _dict(canvas.get("project"))
+    requirements = [r for r in _list(_dict(canvas.get("userExpectations")).get("requirements")) if isinstance(r, dict)]
+    outcomes = _dict(canvas.get("outcomes"))
+    benefits = canvas_benefit_summary(canvas)
+
+    driver = project.get("primaryValueDriver") or ""
+    feasibility = _dict(canvas.get("developerFeasibility"))
+    trl = _dict(feasibility.get("trlLevel"))
+    effort = _dict(feasibility.get("effortEstimate"))
+    effort_estimate = None
+    if "value" in effort:
+        effort_estimate = f"{js_str(effort['value'])} {'weeks' if effort.get('unit') == 'weeks' else 'person-hours'}"
+
+    access_rights: Dict[str, int] = {}
+    sensitivity: List[str] = []
+    datasets = [d for d in _list(_dict(canvas.get("dataAccess")).get("datasets")) if isinstance(d, dict)]
+    for dataset in datasets:
+        rights = dataset.get("accessRights") or "unspecified"
+        access_rights[rights] = access_rights.get(rights, 0) + 1
+        level = dataset.get("sensitivityLevel")
+        if level and level not in sensitivity:
+            sensitivity.append(level)
+
+    deliverables = [d for d in _list(outcomes.get("deliverables")) if isinstance(d, dict)]
+    publications = [p for p in _list(outcomes.get("publications")) if isinstance(p, dict)]
+    evaluations = [e for e in _list(outcomes.get("evaluations")) if isinstance(e, dict)]
+    return {
+        "project": {
+            "title": project.get("title") or "Untitled Project",
+            "description": truncate(project.get("description"), MAX_DESC_LEN),
+            "stage": project.get("projectStage") or "",
+            "headlineValue": project.get("headlineValue") or "",
+            "primaryValueDriver": driver[:1].upper() + driver[1:] if isinstance(driver, str) else "",
+            "domain": _list(project.get("domain")),
+        },
+        "userExpectations": {
+            "taskCount": benefits["taskCount"],
+            "tasks": [
+                {"title": r.get("title") or "Untitled task", "userStory": _text(r.get("userStory")) or None}
+                for r in requirements[:MAX_TASK_TITLES]
+            ],
+            "totalTimeSavedHoursPerMonth": benefits["totalTimeSavedHoursPerMonth"],
+            "benefitTypeCounts": benefits["benefitTypeCounts"],
+        },
+        "developerFeasibility": {
+            "trlCurrent": trl.get("current"),
+            "trlTarget": trl.get("target"),
+            "technicalRisk": feasibility.get("technicalRisk"),
+            "effortEstimate": effort_estimate,
+            "amortizationMonths": benefits["amortizationMonths"],
+            "feasibilityNotes": truncate(feasibility.get("feasibilityNotes"), MAX_FEASIBILITY_NOTES_LEN),
+            "tasksWithDedicatedFeasibility": [
+                r.get("title") or "Untitled task" for r in requirements if _has_dedicated_feasibility(r)
+            ],
+        },
+        "governance": {
+            "stages": [
+                {
+                    "name": s.get("name") or "Unnamed stage",
+                    "startDate": s.get("startDate") or "",
+                    "endDate": s.get("endDate") or "",
+                    "agentCount": len(_list(s.get("agents"))),
+                    "milestoneCount": len(_list(s.get("milestones"))),
+                }
+                for s in _list(_dict(canvas.get("governance")).get("stages")) if isinstance(s, dict)
+            ],
+        },
+        "dataAccess": {
+            "datasetCount": len(datasets),
+            "accessRightsSummary": access_rights,
+            "sensitivitySummary": sensitivity,
+        },
+        "outcomes": {
+            "deliverableCount": len(deliverables),
+            "publicationCount": len(publications),
+            "evaluationCount": len(evaluations),
+            "deliverables": [{"title": d.get("title") or "Untitled", "pid": _text(d.get("pid")) or None}
+                             for d in deliverables[:MAX_OUTCOMES]],
+            "publications": [{"title": p.get("title") or "Untitled", "doi": _text(p.get("doi")) or None}
+                             for p in publications[:MAX_OUTCOMES]],
+            "evaluations": [{"type": e.get("type") or "Evaluation", "results": _text(e.get("results")) or None}
+                            for e in evaluations[:MAX_OUTCOMES]],
+        },
+    }
+
+
+def canvas_version(canvas: Dict[str, Any]) -> str:
+    """``getProjectVersion`` (src/utils/download.ts)."""
+    return _dict(canvas.get("project")).get("version") or canvas.get("version") or "0.1.0"
+
+
+def canvas_date(canvas: Dict[str, Any]) -> Optional[str]:
+    """The date the footer shows, or None if the page falls back to the build date."""
+    project = _dict(canvas.get("project"))
+    return project.get("versionDate") or canvas.get("versionDate") or project.get("startDate") or None
+
+
+# Block renderers, one per block of generateCanvasPreviewHtml
+
+
+def _user_story(story: Optional[str]) -> str:
+    if not _text(story):
+        return ""
+    segments = parse_user_story(story)
+    if segments is None:
+        return f'<span class="user-story-content">{escape_html(story)}</span>'
+    return "".join(
+        f'<span class="{"user-story-formulaic" if formulaic else "user-story-content"}">{escape_html(text)}</span>'
+        for text, formulaic in segments
+    )
+
+
+def _project_block(p: Dict[str, Any]) -> str:
+    no_title = not p["title"] or p["title"] == "Untitled Project"
+    if no_title and not p["description"] and not p["stage"] and not p["headlineValue"] \
+            and not p["primaryValueDriver"] and not p["domain"]:
+        return NOT_SPECIFIED
+    out = [f'<p class="font-semibold">{escape_html(p["title"])}</p>']
+    if p["description"]:
+        out.append(f'<p class="text-gray-600">{escape_html(p["description"])}</p>')
+    if p["stage"]:
+        out.append(f'<p class="text-xs uppercase">{escape_html(p["stage"])}</p>')
+    if p["headlineValue"]:
+        out.append(f'<p class="font-medium">{escape_html(p["headlineValue"])}</p>')
+    if p["primaryValueDriver"]:
+        out.append(f'<p class="text-xs">Primary value: {escape_html(p["primaryValueDriver"])}</p>')
+    if p["domain"]:
+        domains = "".join(f'<span class="text-gray-600">{escape_html(d)}</span>' for d in p["domain"])
+        out.append(f'<div class="flex flex-wrap gap-1 text-xs">{domains}</div>')
+    return "\n      ".join(out)
+
+
+def _governance_block(g: Dict[str, Any]) -> str:
+    if not g["stages"]:
+        return NOT_SPECIFIED
+    out = []
+    for s in g["stages"]:
+        lines = [f'<p class="font-medium">{escape_html(s["name"])}</p>']
+        if s["startDate"] or s["endDate"]:
+            arrow = "→" if s["startDate"] and s["endDate"] else ""
+            lines.append(f'<p class="text-gray-500">{escape_html(s["startDate"])} {arrow} {escape_html(s["endDate"])}</p>')
+        if s["agentCount"] > 0 or s["milestoneCount"] > 0:
+            lines.append(f'<p class="text-gray-500">{s["agentCount"]} agents, {s["milestoneCount"]} milestones</p>')
+        out.append('<div class="border-l-2 border-black pl-2 text-xs">\n            ' + "\n            ".join(lines)
+                   + "\n          </div>")
+    return "".join(out)
+
+
+def _expectations_block(u: Dict[str, Any]) -> str:
+    if u["taskCount"] == 0 and not u["benefitTypeCounts"] and not u["tasks"]:
+        return NOT_SPECIFIED
+    tasks = []
+    for t in u["tasks"]:
+        story = f'\n          <p class="text-xs italic mt-0.5 user-story-text">{_user_story(t["userStory"])}</p>' \
+            if t["userStory"] else ""
+        tasks.append(f'\n        <div class="border-l-2 border-gray-300 pl-2 py-0.5">\n          '
+                     f'<p class="font-medium text-gray-900">{escape_html(t["title"])}</p>{story}\n        </div>')
+    benefits = ""
+    hours = u["totalTimeSavedHoursPerMonth"]
+    if hours > 0 or u["benefitTypeCounts"]:
+        benefits = '\n        <p class="text-xs font-semibold uppercase tracking-wide text-gray-500 mt-2 mb-0.5">Benefits</p>'
+        if hours > 0:
+            benefits += f'\n        <p class="font-medium">~{js_str(hours)} hrs/month saved</p>'
+        if u["benefitTypeCounts"]:
+            counts = "".join(
+                f'<span class="px-1.5 py-0.5 border border-black text-gray-700 capitalize">{escape_html(kind)} {count}</span>'
+                for kind, count in u["benefitTypeCounts"].items()
+            )
+            benefits += f'\n        <div class="flex flex-wrap gap-1 text-xs">{counts}</div>'
+    return f'\n      <p><strong>{u["taskCount"]}</strong> tasks</p>\n      {"".join(tasks)}\n      {benefits}\n    '
+
+
+def _data_access_block(d: Dict[str, Any]) -> str:
+    if d["datasetCount"] == 0 and not d["accessRightsSummary"] and not d["sensitivitySummary"]:
+        return NOT_SPECIFIED
+    out = [f'<p><strong>{d["datasetCount"]}</strong> datasets</p>']
+    if d["accessRightsSummary"]:
+        rights = "".join(f"<p>{escape_html(r)}: {count}</p>" for r, count in d["accessRightsSummary"].items())
+        out.append(f'<div class="text-xs">{rights}</div>')
+    if d["sensitivitySummary"]:
+        levels = "".join(f'<span class="text-gray-600">{escape_html(s)}</span>' for s in d["sensitivitySummary"])
+        out.append(f'<div class="flex flex-wrap gap-1 text-xs">{levels}</div>')
+    return "\n      ".join(out)
+
+
+def _feasibility_block(d: Dict[str, Any], task_count: int) -> str:
+    empty = (d["trlCurrent"] is None and d["trlTarget"] is None and not d["technicalRisk"]
+             and not d["effortEstimate"] and d["amortizationMonths"] is None and not d["feasibilityNotes"].strip()
+             and not d["tasksWithDedicatedFeasibility"])
+    if empty and task_count == 0:
+        return NOT_SPECIFIED
+    out = []
+    current, target = d["trlCurrent"], d["trlTarget"]
+    if current is not None or target is not None:
+        if current is not None:
+            value = js_str(current) + (f" → {js_str(target)}" if target is not None else "")
+        else:
+            value = f"target {js_str(target)}"
+        out.append(f"<div><span>TRL</span> <span>{value}</span></div>")
+    if d["technicalRisk"]:
+        out.append(f'<p>Risk: <span class="capitalize">{escape_html(d["technicalRisk"])}</span></p>')
+    if d["effortEstimate"]:
+        out.append(f'<p>Effort: {escape_html(d["effortEstimate"])}</p>')
+    if d["amortizationMonths"] is not None:
+        out.append(f'<p class="text-xs">~{d["amortizationMonths"]:.1f} mo until amortization</p>')
+    if d["feasibilityNotes"]:
+        out.append(f"<p>{escape_html(d['feasibilityNotes'])}</p>")
+    if task_count > 0:
+        dedicated = len(d["tasksWithDedicatedFeasibility"])
+        progress = math.floor(dedicated / task_count * 100 + 0.5)
+        out.append(
+            '<div class="mt-2">\n             <p class="text-xs font-semibold uppercase tracking-wide text-gray-500 mb-1">'
+            f"Task-level feasibility: {dedicated} of {task_count} tasks</p>\n"
+            '             <div class="canvas-feasibility-bar"><div class="canvas-feasibility-fill" '
+            f'style="width:{progress}%"></div></div>\n           </div>'
+        )
+    return "\n      ".join(out)
+
+
+def _outcome_list(count: int, singular: str, items: List[str]) -> str:
+    label = f"{count} {singular if count == 1 else singular + 's'}"
+    return (f'\n        <p class="text-xs font-semibold uppercase tracking-wide text-gray-500">{label}</p>\n'
+            f'        <ul class="list-none space-y-0.5 text-xs">\n          {"".join(items)}\n        </ul>\n      ')
+
+
+def _linked(title: str, url: Optional[str]) -> str:
+    if is_link(url):
+        return (f'<li><a href="{escape_html(url)}" target="_blank" rel="noopener noreferrer" '
+                f'class="text-gray-700 hover:underline">{escape_html(title)}</a></li>')
+    return f"<li><span>{escape_html(title)}</span></li>"
+
+
+def _outcomes_block(o: Dict[str, Any]) -> str:
+    if not (o["deliverableCount"] or o["publicationCount"] or o["evaluationCount"]):
+        return NOT_SPECIFIED
+    parts = []
+    if o["deliverables"]:
+        parts.append(_outcome_list(o["deliverableCount"], "deliverable",
+                                   [_linked(d["title"], d["pid"]) for d in o["deliverables"]]))
+    if o["publications"]:
+        parts.append(_outcome_list(o["publicationCount"], "publication",
+                                   [_linked(p["title"], p["doi"]) for p in o["publications"]]))
+    if o["evaluations"]:
+        items = [
+            f'<li><span class="font-medium">{escape_html(e["type"])}</span>'
+            + (f' <span class="text-gray-600">— {escape_html(e["results"])}</span>' if e["results"] else "")
+            + "</li>"
+            for e in o["evaluations"]
+        ]
+        parts.append(_outcome_list(o["evaluationCount"], "evaluation", items))
+    return "".join(parts)
+
+
+STYLE = """    * { box-sizing: border-box; }
+    body { font-family: ui-sans-serif, system-ui, sans-serif; margin: 1rem; color: #1f2937; }
+    .canvas-bmc-wrapper { max-width: 1100px; margin: 0 auto; background: white; border: 4px solid black; box-shadow: 0 1px 3px 0 rgb(0 0 0 / 0.1); }
+    .canvas-bmc-header { display: flex; flex-wrap: wrap; align-items: center; justify-content: space-between; gap: 1rem; padding: 1rem 1.25rem; border-bottom: 2px solid black; }
+    .canvas-bmc-grid { display: grid; grid-template-columns: repeat(3, 1fr); min-height: 320px; }
+    @media (max-width: 767px) { .canvas-bmc-grid { grid-template-columns: 1fr; } .canvas-bmc-col { border-right: none !important; border-bottom: 2px solid black; } .canvas-bmc-col:last-child { border-bottom: none; } }
+    .canvas-bmc-col { display: flex; flex-direction: column; border-right: 2px solid black; }
+    .canvas-bmc-col:last-child { border-right: none; }
+    .canvas-bmc-block { flex: 1; padding: 0.5rem 1rem 1rem; display: flex; flex-direction: column; }
+    .canvas-bmc-block-title { font-size: 0.8rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.05em; margin-bottom: 0.75rem; padding-top: 0.125rem; padding-bottom: 0.35rem; border-bottom: 1px solid rgb(209 213 219); display: flex; align-items: center; gap: 0.5rem; justify-content: space-between; color: #111827; }
+    .canvas-bmc-block-title .icon { color: #374151; margin-left: auto; }
+    .canvas-bmc-content { font-size: 0.875rem; color: #1f2937; min-height: 4rem; }
+    .canvas-bmc-content p { margin: 0.25rem 0; }
+    .canvas-bmc-content .space-y-1\\.5 > * + * { margin-top: 0.375rem; }
+    .canvas-bmc-content .space-y-2 > * + * { margin-top: 0.5rem; }
+    .canvas-bmc-footer { display: flex; flex-wrap: wrap; align-items: center; justify-content: space-between; gap: 1rem; padding: 0.5rem 1.25rem; border-top: 2px solid black; font-size: 0.75rem; color: #6b7280; }
+    .text-xl { font-size: 1.25rem; }
+    .font-semibold { font-weight: 600; }
+    .text-gray-900 { color: #111827; }
+    .text-gray-500 { color: #6b7280; }
+    .text-gray-600 { color: #4b5563; }
+    .text-gray-700 { color: #374151; }
+    .text-gray-400 { color: #9ca3af; }
+    .text-xs { font-size: 0.75rem; }
+    .font-medium { font-weight: 500; }
+    .font-semibold { font-weight: 600; }
+    .uppercase { text-transform: uppercase; }
+    .capitalize { text-transform: capitalize; }
+    .italic { font-style: italic; }
+    .border-l-2 { border-left-width: 2px; }
+    .border-black { border-color: black; }
+    .pl-2 { padding-left: 0.5rem; }
+    .py-0\\.5 { padding-top: 0.125rem; padding-bottom: 0.125rem; }
+    .px-1\\.5 { padding-left: 0.375rem; padding-right: 0.375rem; }
+    .border { border-width: 1px; }
+    .gap-1 { gap: 0.25rem; }
+    .flex { display: flex; }
+    .flex-wrap { flex-wrap: wrap; }
+    .mt-0\\.5 { margin-top: 0.125rem; }
+    .mt-2 { margin-top: 0.5rem; }
+    .mb-0\\.5 { margin-bottom: 0.125rem; }
+    .mb-1 { margin-bottom: 0.25rem; }
+    .list-none { list-style: none; padding: 0; margin: 0; }
+    .space-y-0\\.5 > * + * { margin-top: 0.125rem; }
+    .user-story-formulaic { color: rgb(156 163 175); font-weight: 400; }
+    .user-story-content { color: rgb(75 85 99); font-weight: 500; }
+    .canvas-feasibility-bar { height: 0.625rem; background: #d1d5db; border: 1px solid #6b7280; border-radius: 0.125rem; overflow: hidden; box-shadow: inset 0 1px 2px rgba(0,0,0,0.15); }
+    .canvas-feasibility-fill { height: 100%; background: linear-gradient(180deg, #374151 0%, #1f2937 100%); box-shadow: inset 0 1px 0 rgba(255,255,255,0.1); }
+    a { color: #374151; text-decoration: none; }
+    a:hover { text-decoration: underline; }
+    @media print { .canvas-bmc-wrapper { break-inside: avoid; page-break-inside: avoid; } }
+"""
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Canvas Summary - {{page_title}}</title>
+  <style>
+{{style}}  </style>
+</head>
+<body>
+  <div class="canvas-bmc-wrapper">
+    <div class="canvas-bmc-header">
+      <h3 class="text-xl font-semibold text-gray-900">The Agentic Automation Canvas</h3>
+      <div class="text-xl">
+        <span class="font-semibold text-gray-900">Design for:</span>
+        <span class="text-gray-500" style="margin-left: 0.25rem;">{{project_title}}</span>
+      </div>
+    </div>
+    <div class="canvas-bmc-grid">
+      <div class="canvas-bmc-col">
+        <div class="canvas-bmc-block" style="border-bottom: 2px solid black;">
+          <h4 class="canvas-bmc-block-title">Project Definition <span class="icon">{{icon_project}}</span></h4>
+          <div class="canvas-bmc-content">{{project}}</div>
+        </div>
+        <div class="canvas-bmc-block">
+          <h4 class="canvas-bmc-block-title">Governance <span class="icon">{{icon_governance}}</span></h4>
+          <div class="canvas-bmc-content">{{governance}}</div>
+        </div>
+      </div>
+      <div class="canvas-bmc-col">
+        <div class="canvas-bmc-block" style="flex: 2; border-bottom: 2px solid black;">
+          <h4 class="canvas-bmc-block-title">User Expectations <span class="icon">{{icon_expectations}}</span></h4>
+          <div class="canvas-bmc-content">{{expectations}}</div>
+        </div>
+        <div class="canvas-bmc-block" style="flex: 1;">
+          <h4 class="canvas-bmc-block-title">Data Access <span class="icon">{{icon_data}}</span></h4>
+          <div class="canvas-bmc-content">{{data_access}}</div>
+        </div>
+      </div>
+      <div class="canvas-bmc-col">
+        <div class="canvas-bmc-block" style="border-bottom: 2px solid black;">
+          <h4 class="canvas-bmc-block-title">Developer Feasibility <span class="icon">{{icon_feasibility}}</span></h4>
+          <div class="canvas-bmc-content">{{feasibility}}</div>
+        </div>
+        <div class="canvas-bmc-block">
+          <h4 class="canvas-bmc-block-title">Outcomes <span class="icon">{{icon_outcomes}}</span></h4>
+          <div class="canvas-bmc-content">{{outcomes}}</div>
+        </div>
+      </div>
+    </div>
+    <div class="canvas-bmc-footer">
+      <span>Date: {{date}} · Version: {{version}}</span>
+      <span>Generated by the Agentic Automation Canvas · <a href="https://aac.slolab.ai" target="_blank" rel="noopener noreferrer">https://aac.slolab.ai</a></span>
+    </div>
+  </div>
+</body>
+</html>"""
+
+
+def load_icons() -> Dict[str, str]:
+    """The block icons (raw SVG, as the app inlines them), empty if the web app sources are missing."""
+    icons = {}
+    for name in BLOCK_ICONS:
+        try:
+            icons[name] = (ICONS_DIR / f"{name}.svg").read_text(encoding="utf-8")
+        except OSError:
+            icons[name] = ""
+    return icons
+
+
+def compile_page(icons: Dict[str, str]) -> Template:
+    """The page template with its constant slots (styles, icons) filled in."""
+    constants = {"style": STYLE, **{f"icon_{name}": svg for name, svg in icons.items()}}
+    return Template(_SLOT.sub(lambda m: constants.get(m.group(1), m.group(0)), PAGE))
+
+
+def render_context() -> str:
+    """Hash of everything besides the canvas a page depends on: this module, the icons and the tool version."""
+    digest = hashlib.sha256(__version__.encode("utf-8"))
+    digest.update(Path(__file__).read_bytes())
+    for svg in load_icons().values():
+        digest.update(svg.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def render_preview(summary: Dict[str, Any], version: str, date: str, page: Template) -> str:
+    """``generateCanvasPreviewHtml`` with a compiled page template; ``date`` is the footer date."""
+    project = summary["project"]
+    return page.render({
+        "page_title": escape_html(project["title"] or "Agentic Automation Project"),
+        "project_title": escape_html(project["title"] or "—"),
+        "project": _project_block(project),
+        "governance": _governance_block(summary["governance"]),
+        "expectations": _expectations_block(summary["userExpectations"]),
+        "data_access": _data_access_block(summary["dataAccess"]),
+        "feasibility": _feasibility_block(summary["developerFeasibility"], summary["userExpectations"]["taskCount"]),
+        "outcomes": _outcomes_block(summary["outcomes"]),
+        "date": escape_html(date),
+        "version": escape_html(version),
+    })
+
+
+# Catalogue builds
+
+
+@dataclass(frozen=True)
+class PreviewConfig:
+    """What each worker needs to render pages (must be picklable)."""
+
+    output_dir: str
+    context: str
+    # Footer date of canvases without a version or start date
+    today: str
+
+
+@dataclass
+class PageEntry:
+    """
+    One canvas of the catalogue, as kept in the manifest.
+
+    ``fallback_date`` is the build date the page shows if the canvas has no
+    date of its own (its page is re-rendered when that date changes).
+    ``row`` holds the fields of its line on the index pages.
+    """
+
+    name: str
+    page: str
+    hash: str
+    fallback_date: Optional[str] = None
+    row: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"page": self.page, "hash": self.hash, "fallbackDate": self.fallback_date, "row": self.row}
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "PageEntry":
+        return cls(name, data["page"], data["hash"], data.get("fallbackDate"), data.get("row", {}))
+
+
+@dataclass
+class RenderResult:
+    """Outcome for one canvas: ``unchanged``, ``rendered`` (``written`` if the file changed) or ``skipped``."""
+
+    name: str
+    status: str
+    entry: Optional[PageEntry] = None
+    written: bool = False
+    message: str = ""
+
+
+def page_file(name: str) -> str:
+    """Page path (relative to the output directory) for a canvas: readable, and unique per name."""
+    stem = re.sub(r"[^A-Za-z0-9]+", "-", Path(name.replace(":", "-l")).with_suffix("").as_posix()).strip("-")
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=4).hexdigest()
+    return f"canvases/{stem[-60:].lstrip('-')}-{digest}.html"
+
+
+# Per-process state, set once by init_renderer()
+_config: Optional[PreviewConfig] = None
+_page: Optional[Template] = None
+
+
+def init_renderer(config: PreviewConfig) -> None:
+    """Process pool initializer: compiles the page template."""
+    global _config, _page
+    _config = config
+    _page = compile_page(load_icons())
+
+
+def render_source(source: Source, previous: Optional[PageEntry]) -> RenderResult:
+    """Render one canvas unless its input hash matches ``previous`` and its page still exists."""
+    output_dir = Path(_config.output_dir)
+    data = source.text.encode("utf-8") if source.text is not None else source.path.read_bytes()
+    digest = hashlib.sha256(_config.context.encode("utf-8") + data).hexdigest()
+    if previous and previous.hash == digest and previous.fallback_date in (None, _config.today) \
+            and (output_dir / previous.page).exists():
+        return RenderResult(source.name, "unchanged", previous)
+
+    try:
+        canvas = json.loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return RenderResult(source.name, "skipped", message=str(e))
+    if not isinstance(canvas, dict):
+        return RenderResult(source.name, "skipped", message="not a JSON object")
+    if is_rocrate(canvas):
+        try:
+            # No import date: crates without dates of their own show the build date
+            canvas = crate_to_canvas(canvas, today="")
+        except Exception as e:  # a malformed entity must not take down the build
+            return RenderResult(source.name, "skipped",
+                                message=str(e) if isinstance(e, CrateImportError) else f"{type(e).__name__}: {e}")
+
+    summary = canvas_summary(canvas)
+    date = canvas_date(canvas)
+    version = canvas_version(canvas)
+    html_text = render_preview(summary, version, date or _config.today, _page)
+    entry = PageEntry(source.name, page_file(source.name), digest, None if date else _config.today, {
+        "title": summary["project"]["title"],
+        "stage": summary["project"]["stage"],
+        "valueDriver": summary["project"]["primaryValueDriver"],
+        "tasks": summary["userExpectations"]["taskCount"],
+        "hoursSaved": summary["userExpectations"]["totalTimeSavedHoursPerMonth"],
+        "risk": summary["developerFeasibility"]["technicalRisk"],
+        "version": version,
+    })
+    written = write_if_changed(output_dir / entry.page, html_text)
+    return RenderResult(source.name, "rendered", entry, written)
+
+
+def render_chunk(chunk: List[Tuple[Source, Optional[PageEntry]]]) -> List[RenderResult]:
+    """Render a chunk of canvases (one pool task) in order; unreadable files are skipped."""
+    results = []
+    for source, previous in chunk:
+        try:
+            results.append(render_source(source, previous))
+        except OSError as e:
+            results.append(RenderResult(source.name, "skipped", message=str(e)))
+    return results
+
+
+INDEX_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>{{title}}</title>
+  <style>
+    body { font-family: ui-sans-serif, system-ui, sans-serif; margin: 1rem; color: #1f2937; }
+    .catalogue { max-width: 1100px; margin: 0 auto; border: 4px solid black; }
+    .catalogue-header { padding: 1rem 1.25rem; border-bottom: 2px solid black; display: flex; flex-wrap: wrap; justify-content: space-between; align-items: baseline; gap: 1rem; }
+    h1 { font-size: 1.25rem; font-weight: 600; margin: 0; color: #111827; }
+    table { width: 100%; border-collapse: collapse; font-size: 0.875rem; }
+    th { text-align: left; font-size: 0.75rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.05em; color: #6b7280; border-bottom: 1px solid rgb(209 213 219); }
+    th, td { padding: 0.375rem 1.25rem 0.375rem 0; }
+    th:first-child, td:first-child { padding-left: 1.25rem; }
+    td { border-bottom: 1px solid #e5e7eb; vertical-align: top; }
+    td.number { text-align: right; }
+    .capitalize { text-transform: capitalize; }
+    .text-gray-500 { color: #6b7280; }
+    .catalogue-footer { display: flex; justify-content: space-between; padding: 0.5rem 1.25rem; border-top: 2px solid black; font-size: 0.75rem; color: #6b7280; }
+    a { color: #374151; text-decoration: none; }
+    a:hover { text-decoration: underline; }
+  </style>
+</head>
+<body>
+  <div class="catalogue">
+    <div class="catalogue-header">
+      <h1>{{heading}}</h1>
+      <span class="text-gray-500">{{counts}}</span>
+    </div>
+    <table>
+      <thead><tr><th>Project</th><th>Stage</th><th>Primary value</th><th>Risk</th><th>Tasks</th><th>Hrs/month saved</th><th>Version</th></tr></thead>
+      <tbody>
+{{rows}}      </tbody>
+    </table>
+    <div class="catalogue-footer">
+      <span>{{previous}}</span>
+      <span>Page {{page}} of {{pages}}</span>
+      <span>{{next}}</span>
+    </div>
+  </div>
+</body>
+</html>
+""")
+
+
+def index_file(page: int) -> str:
+    """File name of an index page (1-based)."""
+    return "index.html" if page == 1 else f"index-{page}.html"
+
+
+def render_index(entries: List[PageEntry], page: int, pages: int, total: int, page_size: int, title: str) -> str:
+    """One page of the paginated catalogue index."""
+    rows = []
+    for entry in entries:
+        row = entry.row
+        hours = row.get("hoursSaved") or 0
+        rows.append(
+            f'        <tr><td><a href="{escape_html(entry.page)}">{escape_html(row.get("title"))}</a>'
+            f'<br><span class="text-gray-500">{escape_html(entry.name)}</span></td>'
+            f'<td class="capitalize">{escape_html(row.get("stage") or "")}</td>'
+            f'<td>{escape_html(row.get("valueDriver") or "")}</td>'
+            f'<td class="capitalize">{escape_html(row.get("risk") or "")}</td>'
+            f'<td class="number">{row.get("tasks", 0)}</td>'
+            f'<td class="number">{js_str(hours) if hours > 0 else ""}</td>'
+            f'<td>{escape_html(row.get("version") or "")}</td></tr>\n'
+        )
+    first = (page - 1) * page_size + 1
+    return INDEX_PAGE.render({
+        "title": escape_html(title if page == 1 else f"{title} (page {page})"),
+        "heading": escape_html(title),
+        "counts": f"{first}–{first + len(entries) - 1} of {total} canvases" if entries else "No canvases",
+        "rows": "".join(rows),
+        "previous": f'<a href="{index_file(page - 1)}">← Previous</a>' if page > 1 else "",
+        "next": f'<a href="{index_file(page + 1)}">Next →</a>' if page < pages else "",
+        "page": str(page),
+        "pages": str(pages),
+    })
@@ -0,0 +1,170 @@
+"""
+Attributing validation time to the schema.
+
+``SchemaProfiler.validator_class()`` extends ``Draft7Validator`` so that every
+keyword function is timed. Each call is recorded under its keyword location:
+the JSON Pointer of the subschema it belongs to plus the keyword, e.g.
+``#/$defs/Benefit/oneOf``. Because keywords like ``properties``, ``items``,
+``oneOf`` and ``$ref`` validate their subschemas from inside the call, the
+calls nest. The profiler keeps the stack of active keyword locations and
+records per location:
+
+- self time: time in the keyword itself, excluding nested keywords
+- total time: including nested keywords (counted once when a location recurses)
+- calls
+
+It also records self time per stack, the input of the collapsed-stack
+format read by flamegraph.pl, speedscope and similar tools.
+
+Keyword functions are generators that jsonschema resumes as it consumes
+their errors. The profiler only counts the time spent inside them, not the
+time the caller holds them suspended.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from jsonschema import Draft7Validator, validators
+
+from .schemagraph import SchemaGraph
+
+Location = Tuple[str, str]  # (subschema pointer, keyword)
+
+
+class SchemaProfiler:
+    """Time and call counts per keyword location, aggregated over every validated instance."""
+
+    def __init__(self, graph: SchemaGraph):
+        # Subschema object -> pointer ("#/..." in the root document, "uri#/..." in others)
+        self.pointers: Dict[int, str] = {}
+        for node_id, key in graph.keys.items():
+            uri, _, pointer = key.partition("#")
+            self.pointers[node_id] = f"#{pointer}" if uri == graph.uri else key
+        self.self_time: Dict[Location, int] = {}
+        self.total_time: Dict[Location, int] = {}
+        self.calls: Dict[Location, int] = {}
+        self.stacks: Dict[Tuple[Location, ...], int] = {}
+        self.instances = 0
+        # Active frames: [location, stack path, start ns, nested ns]
+        self._frames: List[List[Any]] = []
+        self._active: Dict[Location, int] = {}
+
+    def register_root(self, schema: Any) -> None:
+        """Map a copy of the root schema (as made by build_validator()) to ``#``."""
+        self.pointers[id(schema)] = "#"
+
+    def pointer(self, schema: Any) -> str:
+        return self.pointers.get(id(schema), "?")
+
+    def validator_class(self, base: type = Draft7Validator) -> type:
+        """``base`` with every keyword function wrapped to record its time."""
+        wrapped = {keyword: self._wrap(keyword, function) for keyword, function in base.VALIDATORS.items()}
+        return validators.extend(base, wrapped)
+
+    def _enter(self, location: Location) -> None:
+        path = (self._frames[-1][1] if self._frames else ()) + (location,)
+        self._active[location] = self._active.get(location, 0) + 1
+        self._frames.append([location, path, time.perf_counter_ns(), 0])
+
+    def _leave(self) -> None:
+        location, path, started, nested = self._frames.pop()
+        elapsed = time.perf_counter_ns() - started
+        own = elapsed - nested
+        self.self_time[location] = self.self_time.get(location, 0) + own
+        self.stacks[path] = self.stacks.get(path, 0) + own
+        self._active[location] -= 1
+        if not self._active[location]:
+            self.total_time[location] = self.total_time.get(location, 0) + elapsed
+        if self._frames:
+            self._frames[-1][3] += elapsed
+
+    def _wrap(self, keyword: str, function: Callable) -> Callable:
+        def profiled(validator, value, instance, schema):
+            location = (self.pointer(schema), keyword)
+            self.calls[location] = self.calls.get(location, 0) + 1
+            self._enter(location)
+            try:
+                errors = function(validator, value, instance, schema)
+                if errors is None:
+                    return
+                errors = iter(errors)
+            finally:
+                self._leave()
+            while True:
+                self._enter(location)
+                try:
+                    error = next(errors)
+                except StopIteration:
+                    return
+                finally:
+                    self._leave()
+                yield error
+
+        return profiled
+
+    def by_location(self) -> List[Tuple[str, int, int, int]]:
+        """(keyword location, self ns, total ns, calls), most self time first."""
+        rows = [
+            (pointer.rstrip("/") + "/" + keyword, own, self.total_time.get((pointer, keyword), 0), self.calls[(pointer, keyword)])
+            for (pointer, keyword), own in self.self_time.items()
+        ]
+        return sorted(rows, key=lambda row: -row[1])
+
+    def by_keyword(self) -> List[Tuple[str, int, int]]:
+        """(keyword, self ns, calls), most self time first."""
+        totals: Dict[str, List[int]] = {}
+        for (_, keyword), own in self.self_time.items():
+            entry = totals.setdefault(keyword, [0, 0])
+            entry[0] += own
+            entry[1] += self.calls[(_, keyword)]
+        return sorted(((keyword, own, calls) for keyword, (own, calls) in totals.items()), key=lambda row: -row[1])
+
+    def by_subtree(self, depth: int = 2) -> List[Tuple[str, int, int]]:
+        """
+        Self time rolled up to schema subtrees such as ``#/$defs/Benefit`` or
+        ``#/properties/persons`` (the first ``depth`` pointer segments).
+
+        Returns:
+            List of (subtree pointer, self ns, calls), most time first
+        """
+        totals: Dict[str, List[int]] = {}
+        for (pointer, keyword), own in self.self_time.items():
+            base, _, path = pointer.partition("#")
+            segments = [s for s in path.split("/") if s]
+            subtree = f"{base}#/" + "/".join(segments[:depth]) if segments else f"{base}#"
+            entry = totals.setdefault(subtree, [0, 0])
+            entry[0] += own
+            entry[1] += self.calls[(pointer, keyword)]
+        return sorted(((subtree, own, calls) for subtree, (own, calls) in totals.items()), key=lambda row: -row[1])
+
+    def collapsed_lines(self) -> Iterable[str]:
+        """Collapsed stacks (``frame;frame;frame microseconds``), one per distinct stack."""
+        for path, ns in sorted(self.stacks.items()):
+            micros = ns // 1000
+            if micros > 0:
+                frames = ";".join(
+                    (pointer.rstrip("/") + "/" + keyword).replace(";", "%3B").replace(" ", "%20")
+                    for pointer, keyword in path
+                )
+                yield f"{frames} {micros}"
+
+    def print_report(self, top: int = 20, out: Optional[Any] = None) -> None:
+        """Print the ranked hot-spot tables."""
+        total = sum(self.self_time.values())
+        print(f"Schema profile: {self.instances} instance(s), {total / 1e6:.1f} ms in keywords", file=out)
+        print(file=out)
+
+        def share(ns: int) -> str:
+            return f"{ns / total * 100 if total else 0:5.1f}%"
+
+        print(f"{'self ms':>10} {'self':>6} {'total ms':>10} {'calls':>10}  keyword location", file=out)
+        for location, own, inclusive, calls in self.by_location()[:top]:
+            print(f"{own / 1e6:10.2f} {share(own)} {inclusive / 1e6:10.2f} {calls:10d}  {location}", file=out)
+        print(file=out)
+        print(f"{'self ms':>10} {'self':>6} {'calls':>10}  schema subtree", file=out)
+        for subtree, own, calls in self.by_subtree()[:top]:
+            print(f"{own / 1e6:10.2f} {share(own)} {calls:10d}  {subtree}", file=out)
+        print(file=out)
+        print(f"{'self ms':>10} {'self':>6} {'calls':>10}  keyword", file=out)
+        for keyword, own, calls in self.by_keyword()[:top]:
+            print(f"{own / 1e6:10.2f} {share(own)} {calls:10d}  {keyword}", file=out)
@@ -0,0 +1,225 @@
+"""
+Building the published schema artifacts.
+
+Every published source (the canvas schema, the RO-Crate profile, the
+vocabularies and the examples) becomes a set of files in the site:
+
+- the JSON as served (``aac.schema.json``: the source file itself, with the
+  schema ``$id`` pointing to w3id.org), a minified copy (``.min.json``) and,
+  for the canvas schema, YAML (``.yaml``)
+- a content-addressed copy of each (``aac.schema.1a2b3c4d5e6f.min.json``)
+  that can be served with a far-future cache lifetime
+- precompressed ``.gz`` and ``.br`` variants of all of them, so a static
+  server can send the compressed file directly (``.br`` needs the optional
+  ``brotli`` package: ``uv sync --group publish``)
+
+``manifest.json`` lists every file with its SHA-256 and size, and per source
+the hash of its inputs. A source whose input hash is unchanged and whose
+files are all present is skipped; changed sources are built across a
+process pool and their files are only replaced if their content differs.
+"""
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from . import __version__
+from .output import write_bytes_if_changed
+from .validation import REPO_ROOT
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bump when the generated files change so existing outputs are rebuilt
+PUBLISH_VERSION = 1
+
+SCHEMA_ID = "https://w3id.org/aac/schema/aac.schema.json"
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "site"
+MANIFEST_FILE = "schema/manifest.json"
+HASH_LENGTH = 12
+# Longest first: the content hash goes in front of these
+VARIANT_SUFFIXES = (".min.json", ".json", ".yaml")
+
+
+@dataclass(frozen=True)
+class Publication:
+    """A source file and where its artifacts go (``target`` is the served JSON, relative to the site)."""
+
+    source: str
+    target: str
+    schema_id: Optional[str] = None
+    yaml: bool = False
+
+
+def publications(root: Path = REPO_ROOT) -> List[Publication]:
+    """Everything that is published, in a stable order."""
+    schema_dir = root / "schema"
+    items = [
+        Publication("schema/canvas-schema.json", "schema/aac.schema.json", schema_id=SCHEMA_ID, yaml=True),
+        Publication("schema/rocrate-profile.json", "schema/rocrate-profile.json"),
+    ]
+    for path in sorted((schema_dir / "vocabularies").glob("*.json")):
+        items.append(Publication(f"schema/vocabularies/{path.name}", f"schema/vocabularies/{path.name}"))
+    for path in sorted((schema_dir / "examples").glob("*.json")):
+        items.append(Publication(f"schema/examples/{path.name}", f"examples/{path.name}"))
+    return items
+
+
+@dataclass(frozen=True)
+class PublishConfig:
+    """Options that change the generated files (part of every input hash; must be picklable)."""
+
+    root: str = str(REPO_ROOT)
+    output_dir: str = str(DEFAULT_OUTPUT_DIR)
+    content_addressed: bool = True
+    gzip_level: int = 9
+    brotli_quality: Optional[int] = 11
+
+    def options(self) -> Dict[str, Any]:
+        """The options as they enter the input hash."""
+        return {
+            "content_addressed": self.content_addressed,
+            "gzip": self.gzip_level,
+            # Installing brotli adds the .br files, so its presence is an input too
+            "brotli": self.brotli_quality if brotli is not None else None,
+        }
+
+
+def input_hash(publication: Publication, config: PublishConfig) -> str:
+    """Hash of everything a publication's files are generated from."""
+    digest = hashlib.sha256()
+    header = {
+        "publish": PUBLISH_VERSION,
+        "publication": [publication.source, publication.target, publication.schema_id, publication.yaml],
+        "options": config.options(),
+    }
+    digest.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+    digest.update((Path(config.root) / publication.source).read_bytes())
+    return digest.hexdigest()
+
+
+def sha256(data: bytes) -> str:
+    """SHA-256 hex digest, as listed in the manifest."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def content_addressed_name(path: str, digest: str) -> str:
+    """``schema/aac.schema.min.json`` -> ``schema/aac.schema.<hash>.min.json``."""
+    for suffix in VARIANT_SUFFIXES:
+        if path.endswith(suffix):
+            return f"{path[: -len(suffix)]}.{digest[:HASH_LENGTH]}{suffix}"
+    raise ValueError(f"Unexpected artifact name: {path}")
+
+
+def render(publication: Publication, source: bytes) -> List[Tuple[str, str, bytes]]:
+    """The uncompressed variants of a publication as (variant, path, content)."""
+    data = json.loads(source)
+    pretty = source
+    if publication.schema_id and data.get("$id") != publication.schema_id:
+        data["$id"] = publication.schema_id
+        pretty = (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    stem = publication.target[: -len(".json")]
+    variants = [
+        ("json", publication.target, pretty),
+        ("min", f"{stem}.min.json", json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")),
+    ]
+    if publication.yaml:
+        text = yaml.dump(data, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        variants.append(("yaml", f"{stem}.yaml", text.encode("utf-8")))
+    return variants
+
+
+@dataclass
+class PublishResult:
+    """Files generated for one publication and how many of them were (re)written."""
+
+    source: str
+    input: str
+    files: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    written: int = 0
+    error: Optional[str] = None
+
+
+def build(publication: Publication, config: PublishConfig) -> PublishResult:
+    """Generate and write all files of one publication."""
+    result = PublishResult(publication.source, input_hash(publication, config))
+    output_dir = Path(config.output_dir)
+    try:
+        source = (Path(config.root) / publication.source).read_bytes()
+        variants = render(publication, source)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        result.error = str(e)
+        return result
+
+    for variant, path, content in variants:
+        digest = sha256(content)
+        names = [path]
+        if config.content_addressed:
+            names.append(content_addressed_name(path, digest))
+        encoded = [(None, "", content), ("gzip", ".gz", gzip.compress(content, config.gzip_level, mtime=0))]
+        if brotli is not None and config.brotli_quality is not None:
+            encoded.append(("br", ".br", brotli.compress(content, quality=config.brotli_quality)))
+        for name in names:
+            for encoding, suffix, data in encoded:
+                entry: Dict[str, Any] = {"variant": variant, "sha256": sha256(data), "size": len(data)}
+                if encoding:
+                    entry["encoding"] = encoding
+                    entry["of"] = name
+                if name != path:
+                    entry["immutable"] = True
+                result.files[name + suffix] = entry
+                result.written += write_bytes_if_changed(output_dir / (name + suffix), data)
+    return result
+
+
+# Per-process state, set once by init_publisher()
+_config: Optional[PublishConfig] = None
+
+
+def init_publisher(config: PublishConfig) -> None:
+    """Process pool initializer."""
+    global _config
+    _config = config
+
+
+def build_chunk(chunk: List[Publication]) -> List[PublishResult]:
+    """Build a chunk of publications (one pool task) in order."""
+    return [build(publication, _config) for publication in chunk]
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Any]:
+    """The manifest of the previous build (empty if there is none)."""
+    try:
+        with open(output_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"sources": {}, "files": {}}
+    manifest.setdefault("sources", {})
+    manifest.setdefault("files", {})
+    return manifest
+
+
+def is_current(previous: Dict[str, Any], publication: Publication, digest: str, output_dir: Path) -> bool:
+    """Whether a publication's files from the previous build are up to date and present."""
+    entry = previous["sources"].get(publication.source)
+    if not entry or entry.get("input") != digest:
+        return False
+    return all((output_dir / path).is_file() for path in entry.get("files", []))
+
+
+def manifest_text(sources: Dict[str, Dict[str, Any]], files: Dict[str, Dict[str, Any]]) -> str:
+    """The manifest for a build (no timestamps, so an unchanged build writes an identical file)."""
+    manifest = {
+        "schemaVersion": __version__,
+        "schemaId": SCHEMA_ID,
+        "sources": dict(sorted(sources.items())),
+        "files": dict(sorted(files.items())),
+    }
+    return json.dumps(manifest, indent=2, ensure_ascii=False) + "\n"
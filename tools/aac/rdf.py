@@ -0,0 +1,333 @@
+"""
+Streaming RDF export of canvases (N-Triples and Turtle).
+
+A canvas becomes the subject ``project.projectId`` (an IRI as is, anything
+else appended to a base IRI; the document name when there is none). Every
+field is a triple whose predicate comes from aac.ontology
+``ONTOLOGY_MAPPINGS``, or ``aac:<field>`` for canvas-specific fields; nested
+objects are blank nodes (typed with ``ENTITY_TYPES``) and list items are one
+triple each. Values are typed by the schema's ``format``: ``uri`` fields
+holding an absolute IRI are IRIs (DUO terms as their OBO IRIs), ``date``
+fields are ``xsd:date``, numbers and booleans are typed literals. ``None``
+and empty strings are left out, and the order of list items is not kept.
+
+``Vocabulary`` compiles the field to term table once per process and keeps
+every serialized predicate and class term, so the export only formats
+objects. Blank node labels are prefixed with a hash of the document name, so
+they stay distinct when shards are loaded together.
+
+``export_shard`` is the process pool task behind tools/export-rdf.py: a shard
+(a contiguous run of input files) is streamed canvas by canvas, triple by
+triple, into a part file, which ``merge_parts`` concatenates in shard order.
+Compressed parts are separate gzip members, so they are concatenated as is.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from .batch import iter_sources
+from .crateimport import CrateImportError, crate_to_canvas, read_crate
+from .ontology import ENTITY_TYPES, ONTOLOGY_MAPPINGS, PREFIXES
+from .validation import SCHEMA_FILE, is_rocrate, load_json
+from .vocabularies import DUO_ID
+
+FORMATS = ("nt", "ttl")
+DEFAULT_BASE_IRI = "urn:aac:canvas:"
+DUO_IRI = "http://purl.obolibrary.org/obo/DUO_"
+
+# Absolute IRIs without the characters N-Triples forbids in an IRI reference
+IRI = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:[^\x00-\x20<>\"{}|^`\\]*")
+DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+# Local names that can be written as a prefixed name in Turtle
+LOCAL_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+# Python's json module accepts NaN and Infinity
+NON_FINITE = {"nan": "NaN", "inf": "INF", "-inf": "-INF"}
+ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+
+
+def is_iri(value: Any) -> bool:
+    """Whether ``value`` is an absolute IRI that can be written as an IRI term."""
+    return isinstance(value, str) and IRI.fullmatch(value) is not None
+
+
+def field_formats(schema: Any) -> Dict[str, str]:
+    """
+    The ``format`` of every property in ``schema`` (or of its array items), by property name.
+
+    Returns:
+        Property name to ``uri``, ``date`` or another JSON Schema format
+    """
+    formats: Dict[str, str] = {}
+
+    def walk(node: Any, name: Optional[str]) -> None:
+        if isinstance(node, list):
+            for item in node:
+                walk(item, name)
+            return
+        if not isinstance(node, dict):
+            return
+        if name is not None and isinstance(node.get("format"), str):
+            formats.setdefault(name, node["format"])
+        for key, value in node.items():
+            if key == "properties" and isinstance(value, dict):
+                for prop, prop_schema in value.items():
+                    walk(prop_schema, prop)
+            else:
+                walk(value, name if key in ("items", "oneOf", "anyOf", "allOf") else None)
+
+    walk(schema, None)
+    return formats
+
+
+class Vocabulary:
+    """Serialized terms for one output format, compiled once."""
+
+    def __init__(self, turtle: bool, formats: Dict[str, str]):
+        self.turtle = turtle
+        self.formats = formats
+        self.type = "a" if turtle else self.term("rdf:type")
+        self.datatypes = {name: self.term(f"xsd:{name}") for name in ("boolean", "integer", "decimal", "double",
+                                                                      "date")}
+        self.predicates: Dict[str, str] = {}
+        for name, curie in ONTOLOGY_MAPPINGS.items():
+            # Classes (p-plan:Step) are not predicates; such fields get their own term
+            if curie is not None and curie.split(":", 1)[1][:1].islower():
+                self.predicates[name] = self.term(curie)
+        self.types = {name: tuple(self.term(curie) for curie in curies) for name, curies in ENTITY_TYPES.items()}
+
+    def term(self, curie: str) -> str:
+        """A CURIE as a prefixed name (Turtle, where the local name allows it) or an IRI."""
+        prefix, local = curie.split(":", 1)
+        if self.turtle and LOCAL_NAME.fullmatch(local):
+            return curie
+        return f"<{PREFIXES[prefix]}{local}>"
+
+    def predicate(self, name: str) -> str:
+        """The predicate of a field: its ontology term, else ``aac:<field>``."""
+        predicate = self.predicates.get(name)
+        if predicate is None:
+            predicate = self.term(f"aac:{name}") if LOCAL_NAME.fullmatch(name) else \
+                f"<{PREFIXES['aac']}{quote(name, safe='')}>"
+            self.predicates[name] = predicate
+        return predicate
+
+    def literal(self, value: Any, name: str) -> Optional[str]:
+        """The object term of a field value, or None for values that are left out."""
+        if isinstance(value, bool):
+            text = "true" if value else "false"
+            return text if self.turtle else f'"{text}"^^{self.datatypes["boolean"]}'
+        if isinstance(value, int):
+            return str(value) if self.turtle else f'"{value}"^^{self.datatypes["integer"]}'
+        if isinstance(value, float):
+            text = repr(value)
+            if text in NON_FINITE:
+                return f'"{NON_FINITE[text]}"^^{self.datatypes["double"]}'
+            return f'"{text}"^^{self.datatypes["double" if "e" in text else "decimal"]}'
+        if not isinstance(value, str):
+            return None
+        if value == "":
+            return None
+        kind = self.formats.get(name)
+        if kind == "uri":
+            duo = DUO_ID.fullmatch(value)
+            if duo:
+                return f"<{DUO_IRI}{duo.group(1)}>"
+            if is_iri(value):
+                return f"<{value}>"
+        elif kind == "date" and DATE.fullmatch(value):
+            return f'"{value}"^^{self.datatypes["date"]}'
+        return f'"{value.translate(ESCAPES)}"'
+
+
+def canvas_subject(canvas: Dict[str, Any], name: str, base: str) -> str:
+    """The IRI term of a canvas: its projectId, else its document name, as an IRI."""
+    project = canvas.get("project")
+    project_id = project.get("projectId") if isinstance(project, dict) else None
+    if isinstance(project_id, str) and project_id:
+        return f"<{project_id}>" if is_iri(project_id) else f"<{base}{quote(project_id, safe='')}>"
+    return f"<{base}{quote(name, safe='')}>"
+
+
+def canvas_triples(canvas: Dict[str, Any], subject: str, label: str,
+                   vocabulary: Vocabulary) -> Iterator[Tuple[str, str, str]]:
+    """
+    Triples of a canvas as serialized (subject, predicate, object) terms.
+
+    The triples of each subject are contiguous (the canvas first, then its
+    nested objects breadth first), so Turtle can group them.
+    """
+    pending = [(subject, canvas, ())]
+    nodes = 0
+    for node, obj, types in pending:
+        for rdf_class in types:
+            yield node, vocabulary.type, rdf_class
+        for name, value in obj.items():
+            predicate = vocabulary.predicate(name)
+            for item in _items(value):
+                if isinstance(item, dict):
+                    nodes += 1
+                    child = f"_:{label}n{nodes}"
+                    pending.append((child, item, vocabulary.types.get(name, ())))
+                    yield node, predicate, child
+                else:
+                    term = vocabulary.literal(item, name)
+                    if term is not None:
+                        yield node, predicate, term
+
+
+def _items(value: Any) -> Iterator[Any]:
+    if isinstance(value, list):
+        for item in value:
+            yield from _items(item)
+    elif value is not None:
+        yield value
+
+
+def blank_label(name: str) -> str:
+    """Blank node label prefix for a document, distinct across documents."""
+    return "c" + hashlib.sha1(name.encode("utf-8")).hexdigest()[:12]
+
+
+def turtle_prefixes() -> str:
+    """The ``@prefix`` lines that start a Turtle file."""
+    return "".join(f"@prefix {prefix}: <{iri}> .\n" for prefix, iri in PREFIXES.items()) + "\n"
+
+
+def write_triples(out: IO[str], triples: Iterator[Tuple[str, str, str]], turtle: bool) -> int:
+    """
+    Write triples as N-Triples, or as Turtle grouped by subject and predicate.
+
+    Returns:
+        Number of triples written
+    """
+    count = 0
+    if not turtle:
+        for subject, predicate, obj in triples:
+            out.write(f"{subject} {predicate} {obj} .\n")
+            count += 1
+        return count
+    current_subject = current_predicate = None
+    for subject, predicate, obj in triples:
+        if subject != current_subject:
+            if current_subject is not None:
+                out.write(" .\n")
+            out.write(f"{subject} {predicate} {obj}")
+            current_subject, current_predicate = subject, predicate
+        elif predicate != current_predicate:
+            out.write(f" ;\n    {predicate} {obj}")
+            current_predicate = predicate
+        else:
+            out.write(f", {obj}")
+        count += 1
+    if current_subject is not None:
+        out.write(" .\n\n")
+    return count
+
+
+@dataclass(frozen=True)
+class ExportConfig:
+    """What each worker writes (must be picklable)."""
+
+    part_dir: str
+    rdf_format: str = "nt"
+    compress: bool = False
+    base: str = DEFAULT_BASE_IRI
+
+
+@dataclass
+class ShardResult:
+    """Counts for one exported shard; documents that could not be exported are listed in ``skipped``."""
+
+    shard: int
+    canvases: int = 0
+    triples: int = 0
+    skipped: List[str] = field(default_factory=list)
+
+
+def part_file(part_dir: Path, shard: int, rdf_format: str, compress: bool) -> Path:
+    return part_dir / f"part.{shard:05d}.{rdf_format}{'.gz' if compress else ''}"
+
+
+def open_output(path: Path, compress: bool) -> IO[str]:
+    """A text file for writing RDF (a gzip member if ``compress``)."""
+    # Lone surrogates (from JSON escapes) cannot be encoded; they must not end the export
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", errors="replace", compresslevel=6)
+    return open(path, "w", encoding="utf-8", errors="replace", newline="\n")
+
+
+# Per-process state, set once by init_exporter()
+_config: Optional[ExportConfig] = None
+_vocabulary: Optional[Vocabulary] = None
+
+
+def init_exporter(config: ExportConfig) -> None:
+    """Process pool initializer: compile the vocabulary once."""
+    global _config, _vocabulary
+    _config = config
+    _vocabulary = Vocabulary(config.rdf_format == "ttl", field_formats(load_json(SCHEMA_FILE)))
+
+
+def load_canvas(data: Any) -> Dict[str, Any]:
+    """
+    A parsed document as a canvas, converting RO-Crates.
+
+    Raises:
+        ValueError: If the document is not a JSON object, or an RO-Crate
+            that cannot be converted.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("not a JSON object")
+    if not is_rocrate(data):
+        return data
+    try:
+        # No import date: a crate's version date comes from the crate only
+        return crate_to_canvas(data, today="")
+    except Exception as e:  # a malformed entity must not take down the export
+        raise ValueError(str(e) if isinstance(e, CrateImportError) else f"{type(e).__name__}: {e}") from e
+
+
+def export_shard(shard: int, paths: List[str]) -> ShardResult:
+    """Stream the canvases of some input files into this shard's part file."""
+    result = ShardResult(shard)
+    turtle = _config.rdf_format == "ttl"
+    with open_output(part_file(Path(_config.part_dir), shard, _config.rdf_format, _config.compress),
+                     _config.compress) as out:
+        for source in iter_sources(paths):
+            try:
+                canvas = load_canvas(read_crate(source))
+            except (json.JSONDecodeError, UnicodeDecodeError, OSError, zipfile.BadZipFile, ValueError) as e:
+                result.skipped.append(f"{source.name}: {e}")
+                continue
+            subject = canvas_subject(canvas, source.name, _config.base)
+            triples = canvas_triples(canvas, subject, blank_label(source.name), _vocabulary)
+            result.triples += write_triples(out, triples, turtle)
+            result.canvases += 1
+    return result
+
+
+def export_chunk(chunk: List[Tuple[int, List[str]]]) -> List[ShardResult]:
+    """Export a chunk of shards (one pool task) in order."""
+    return [export_shard(shard, paths) for shard, paths in chunk]
+
+
+def merge_parts(output: Path, part_dir: Path, shards: int, rdf_format: str, compress: bool) -> None:
+    """Concatenate the part files, in shard order, into ``output`` and delete them."""
+    with open(output, "wb") as out:
+        if rdf_format == "ttl":
+            header = turtle_prefixes().encode("utf-8")
+            out.write(gzip.compress(header) if compress else header)
+        for shard in range(shards):
+            part = part_file(part_dir, shard, rdf_format, compress)
+            with open(part, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    out.write(block)
+            os.remove(part)
@@ -0,0 +1,113 @@
+"""
+Machine-readable validation reports, written as results arrive.
+
+``JsonLinesReport`` writes one JSON object per result and flushes it, so a
+consumer tailing the file sees results while a long run is still going.
+``JUnitReport`` streams ``<testcase>`` elements to a temporary spool file;
+the ``<testsuite>`` header needs the totals, so it is written at the end and
+the finished report replaces the target atomically.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, TextIO
+from xml.sax.saxutils import escape, quoteattr
+
+from .batch import ValidationResult
+
+
+class JsonLinesReport:
+    """
+    JSON Lines report: a ``result`` line per document and a final ``summary`` line.
+
+    ``-`` writes to stdout.
+    """
+
+    def __init__(self, target: str):
+        self.target = target
+        self.fp: TextIO = sys.stdout if target == "-" else open(target, "w", encoding="utf-8")
+        self.counts: Dict[str, int] = {}
+        self.started = time.perf_counter()
+
+    def write(self, result: ValidationResult) -> None:
+        self.counts[result.status] = self.counts.get(result.status, 0) + 1
+        record = dict(type="result", **result.to_dict())
+        self.fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.fp.flush()
+
+    def close(self, stopped_early: bool = False) -> None:
+        summary = {
+            "type": "summary",
+            "counts": self.counts,
+            "stopped_early": stopped_early,
+            "seconds": round(time.perf_counter() - self.started, 3),
+        }
+        self.fp.write(json.dumps(summary) + "\n")
+        self.fp.flush()
+        if self.fp is not sys.stdout:
+            self.fp.close()
+
+
+class JUnitReport:
+    """JUnit XML report with one ``<testcase>`` per document."""
+
+    def __init__(self, target: str, suite_name: str = "validate-examples"):
+        self.target = Path(target)
+        self.suite_name = suite_name
+        self.tests = 0
+        self.failures = 0
+        self.errors = 0
+        self.skipped = 0
+        self.started = time.perf_counter()
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self.spool = tempfile.TemporaryFile("w+", encoding="utf-8")
+
+    def write(self, result: ValidationResult) -> None:
+        self.tests += 1
+        self.spool.write(f"  <testcase classname={quoteattr(result.kind)} name={quoteattr(result.name)}>")
+        details = "\n".join(issue.message if result.status == "error" else str(issue) for issue in result.errors)
+        if result.status == "invalid":
+            self.failures += 1
+            message = f"{len(result.errors)} validation error(s)"
+            self.spool.write(f"<failure message={quoteattr(message)}>{escape(details)}</failure>")
+        elif result.status == "error":
+            self.errors += 1
+            message = result.errors[0].message if result.errors else "error"
+            self.spool.write(f"<error message={quoteattr(message)}>{escape(details)}</error>")
+        elif result.status == "skipped":
+            self.skipped += 1
+            self.spool.write("<skipped/>")
+        self.spool.write("</testcase>\n")
+
+    def close(self, stopped_early: bool = False) -> None:
+        elapsed = time.perf_counter() - self.started
+        fd, tmp = tempfile.mkstemp(dir=self.target.parent, prefix=f".{self.target.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            out.write(
+                f"<testsuite name={quoteattr(self.suite_name)} tests=\"{self.tests}\" "
+                f"failures=\"{self.failures}\" errors=\"{self.errors}\" skipped=\"{self.skipped}\" "
+                f"time=\"{elapsed:.3f}\">\n"
+            )
+            if stopped_early:
+                out.write('  <properties><property name="stopped_early" value="true"/></properties>\n')
+            self.spool.seek(0)
+            for chunk in iter(lambda: self.spool.read(1 << 16), ""):
+                out.write(chunk)
+            out.write("</testsuite>\n")
+        self.spool.close()
+        os.replace(tmp, self.target)
+
+
+def open_reports(jsonl: Optional[str], junit: Optional[str]) -> list:
+    """Open the requested report writers."""
+    reports = []
+    if jsonl:
+        reports.append(JsonLinesReport(jsonl))
+    if junit:
+        reports.append(JUnitReport(junit))
+    return reports
@@ -0,0 +1,297 @@
+"""
+Validate RO-Crates against schema/rocrate-profile.json.
+
+The profile's ``@graph`` items are a ``oneOf`` over entity kinds, so a plain
+JSON Schema validator tries every entity against every branch. Instead, each
+entity is routed to the single branch its ``@id`` (metadata descriptor, root
+dataset) or ``@type`` selects and checked against that branch only. An
+``@id`` set built in the same pass over ``@graph`` is then used to check that
+every local ``{"@id": ...}`` reference resolves. ``validate_stream()`` does
+the same while parsing ``@graph`` incrementally, for crates too large to load.
+
+Entities are normalized the way JSON-LD treats them before checking: a single
+``@type`` string and a one-element list are equivalent, and ``schema:X`` is
+the same term as ``X`` (the RO-Crate context maps bare terms to schema.org).
+"""
+
+import copy
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from jsonschema import Draft7Validator
+
+from .codegen import load_fast_validator
+from .jsonstream import iter_events
+from .validation import REPO_ROOT, Issue, build_validator, check_instance, issue_from_error, json_pointer, load_json
+
+PROFILE_FILE = REPO_ROOT / "schema" / "rocrate-profile.json"
+
+METADATA_DESCRIPTOR_ID = "ro-crate-metadata.json"
+
+# Absolute IRIs (any scheme) point outside the crate and need no entity
+ABSOLUTE_IRI = re.compile(r"^[A-Za-z][A-Za-z0-9+.\-]*:")
+
+
+def normalize_types(value: Any) -> List[str]:
+    """Return ``@type`` as a list of terms with the ``schema:`` prefix compacted."""
+    types = value if isinstance(value, list) else [value]
+    return [t[len("schema:"):] if isinstance(t, str) and t.startswith("schema:") else t for t in types]
+
+
+def _selector_values(schema: Any) -> List[Any]:
+    """Values a ``const``/``enum`` (optionally under ``contains``) accepts."""
+    if not isinstance(schema, dict):
+        return []
+    if "contains" in schema:
+        return _selector_values(schema["contains"])
+    if "const" in schema:
+        return [schema["const"]]
+    return list(schema.get("enum", []))
+
+
+@dataclass
+class ProfileBranch:
+    """One ``@graph`` entity kind from the profile, with its compiled checks."""
+
+    description: str
+    validator: Draft7Validator
+    fast: Optional[Callable[[Any], bool]]
+    types_as_list: bool
+
+
+class ProfileValidator:
+    """RO-Crate profile checker with per-branch validators built once."""
+
+    def __init__(self, profile: dict, fast_path: bool = True):
+        graph_schema = profile.get("properties", {}).get("@graph", {})
+        items = graph_schema.get("items", {})
+
+        # Everything except the entities themselves is checked as one envelope
+        envelope = copy.deepcopy(profile)
+        envelope_graph = envelope["properties"]["@graph"]
+        envelope_graph.pop("items", None)
+        self.graph_min_items = envelope_graph.pop("minItems", None)
+        self.envelope = build_validator(envelope)
+
+        self.branches: List[ProfileBranch] = []
+        self.by_id: Dict[str, int] = {}
+        self.by_type: Dict[str, int] = {}
+        for index, branch in enumerate(items.get("oneOf", [])):
+            properties = branch.get("properties", {})
+            type_schema = properties.get("@type", {})
+            self.branches.append(ProfileBranch(
+                description=branch.get("description", f"branch {index}"),
+                validator=build_validator(branch),
+                fast=load_fast_validator(branch) if fast_path else None,
+                types_as_list=type_schema.get("type") == "array" or "contains" in type_schema,
+            ))
+            id_values = _selector_values(properties.get("@id"))
+            for entity_id in id_values:
+                self.by_id.setdefault(entity_id, index)
+            if not id_values:
+                # Branches pinned to an @id are only selected by that @id
+                for term in _selector_values(properties.get("@type")):
+                    self.by_type.setdefault(term, index)
+
+    @classmethod
+    def from_file(cls, profile_file: Path = PROFILE_FILE, fast_path: bool = True) -> "ProfileValidator":
+        """Load the profile from disk and build the validator."""
+        return cls(load_json(profile_file), fast_path)
+
+    def select_branch(self, entity: dict) -> Optional[int]:
+        """Index of the profile branch an entity belongs to, or None."""
+        entity_id = entity.get("@id")
+        if isinstance(entity_id, str) and entity_id in self.by_id:
+            return self.by_id[entity_id]
+        candidates = [self.by_type[t] for t in normalize_types(entity.get("@type")) if t in self.by_type]
+        return min(candidates) if candidates else None
+
+    def check_entity(self, entity: Any, position: int, max_errors: Optional[int] = None) -> List[Issue]:
+        """
+        Check one ``@graph`` entity against the branch it selects.
+
+        Issue pointers are relative to the crate (``/@graph/{position}/...``)
+        and messages name the entity's ``@id`` and the profile entity type.
+        """
+        base = f"/@graph/{position}"
+        if not isinstance(entity, dict):
+            return [Issue(base, "entity is not an object", "type")]
+        label = f"({entity.get('@id', 'no @id')})"
+
+        branch_index = self.select_branch(entity)
+        if branch_index is None:
+            message = f"{label} @type {entity.get('@type')!r} matches no entity type in the RO-Crate profile"
+            return [Issue(base, message, "oneOf")]
+
+        branch = self.branches[branch_index]
+        normalized = dict(entity)
+        if "@type" in entity:
+            types = normalize_types(entity["@type"])
+            # Branches matching a single @type term expect the compact string form
+            normalized["@type"] = types if branch.types_as_list or len(types) != 1 else types[0]
+        is_valid, issues = check_instance(branch.validator, normalized, branch.fast, max_errors)
+        for issue in issues:
+            issue.pointer = base + issue.pointer
+            issue.message = f"{label} [{branch.description}] {issue.message}"
+        return issues
+
+    def validate(self, crate: Any, max_errors: Optional[int] = None) -> Tuple[bool, List[Issue]]:
+        """
+        Validate an RO-Crate document that is already loaded.
+
+        Returns:
+            Tuple of (is_valid, list_of_issues)
+        """
+        check = CrateCheck(self, max_errors)
+        graph = crate.get("@graph") if isinstance(crate, dict) else None
+        if isinstance(graph, list):
+            for position, entity in enumerate(graph):
+                if check.full:
+                    break
+                check.add_entity(position, entity)
+        return check.finish(crate)
+
+    def validate_stream(
+        self,
+        fp: TextIO,
+        chunk_size: int = 1 << 16,
+        max_errors: Optional[int] = None,
+    ) -> Tuple[bool, List[Issue]]:
+        """
+        Validate an RO-Crate read incrementally from ``fp``.
+
+        ``@graph`` entities are parsed and checked one at a time, so memory is
+        bounded by the largest entity plus the compact ``@id`` set used for
+        the reference checks at the end.
+
+        Returns:
+            Tuple of (is_valid, list_of_issues)
+        """
+        events = iter_events(fp, stream_keys=("@graph",), chunk_size=chunk_size)
+        return self.validate_events(events, max_errors=max_errors)
+
+    def validate_events(
+        self,
+        events: Iterable[Tuple[str, str, Any]],
+        members: Optional[Dict[str, Any]] = None,
+        max_errors: Optional[int] = None,
+    ) -> Tuple[bool, List[Issue]]:
+        """
+        Validate an RO-Crate from aac.jsonstream events.
+
+        ``members`` holds top-level members the caller already consumed from
+        the same event stream. Once ``max_errors`` issues have been found the
+        rest of the stream is not parsed.
+
+        Returns:
+            Tuple of (is_valid, list_of_issues)
+        """
+        check = CrateCheck(self, max_errors)
+        members = dict(members or {})
+        for event, key, value in events:
+            if event == "item":
+                check.add_entity(check.count, value)
+                if check.full:
+                    break
+            elif event == "start":
+                members[key] = []
+            elif event == "member":
+                members[key] = value
+        return check.finish(members)
+
+
+class CrateCheck:
+    """
+    Incremental RO-Crate check fed one ``@graph`` entity at a time.
+
+    Keeps only the set of ``@id`` values seen so far and the references that
+    pointed forward to entities not seen yet; everything else is dropped as
+    soon as an entity has been checked. With ``max_errors`` set, entity issues
+    stop being collected once the cap is reached (``full``), and the final
+    report is truncated to the cap.
+    """
+
+    def __init__(self, profile: ProfileValidator, max_errors: Optional[int] = None):
+        self.profile = profile
+        self.max_errors = max_errors
+        self.errors: List[Issue] = []
+        self.ids: Set[str] = set()
+        self.pending: List[Tuple[int, str, str, str]] = []
+        self.count = 0
+
+    @property
+    def full(self) -> bool:
+        """True once ``max_errors`` issues have been collected."""
+        return self.max_errors is not None and len(self.errors) >= self.max_errors
+
+    def add_entity(self, position: int, entity: Any) -> None:
+        """Check one entity and record its @id and outgoing references."""
+        self.count += 1
+        remaining = None if self.max_errors is None else self.max_errors - len(self.errors)
+        self.errors.extend(self.profile.check_entity(entity, position, remaining))
+        if not isinstance(entity, dict):
+            return
+
+        entity_id = entity.get("@id")
+        if isinstance(entity_id, str):
+            if entity_id in self.ids:
+                self.errors.append(Issue(f"/@graph/{position}/@id", f"duplicate @id '{entity_id}'", "uniqueId"))
+            self.ids.add(entity_id)
+
+        for path, target in iter_references(entity):
+            if target not in self.ids and is_local_reference(target):
+                self.pending.append((position, str(entity_id), json_pointer(path), target))
+
+    def finish(self, members: Any) -> Tuple[bool, List[Issue]]:
+        """
+        Check the envelope (top-level members without the entities) and the
+        references collected on the way.
+
+        When the check stopped early (``full``), the crate was not read to the
+        end, so the whole-crate checks (descriptor, references) are skipped.
+
+        Returns:
+            Tuple of (is_valid, list_of_issues)
+        """
+        issues = []
+        if isinstance(members, dict) and isinstance(members.get("@graph"), list):
+            members = dict(members, **{"@graph": []})
+            min_items = self.profile.graph_min_items
+            if min_items is not None and self.count < min_items and not self.full:
+                message = f"expected at least {min_items} entities, found {self.count}"
+                issues.append(Issue("/@graph", message, "minItems"))
+        issues.extend(issue_from_error(error) for error in self.profile.envelope.iter_errors(members))
+        issues.extend(self.errors)
+
+        if not self.full:
+            if self.count and METADATA_DESCRIPTOR_ID not in self.ids:
+                message = f"missing RO-Crate Metadata File Descriptor '{METADATA_DESCRIPTOR_ID}'"
+                issues.append(Issue("/@graph", message, "required"))
+            for position, entity_id, path, target in self.pending:
+                if target not in self.ids:
+                    message = f"({entity_id}) reference to unknown entity '{target}'"
+                    issues.append(Issue(f"/@graph/{position}{path}", message, "reference"))
+        if self.max_errors is not None:
+            issues = issues[:self.max_errors]
+        return not issues, issues
+
+
+def iter_references(value: Any, path: Tuple = ()) -> Iterator[Tuple[Tuple, str]]:
+    """Yield (path of keys and indices, target) for every ``{"@id": ...}`` reference in a value."""
+    if isinstance(value, dict):
+        target = value.get("@id")
+        if path and isinstance(target, str):
+            yield path, target
+        for key, item in value.items():
+            if key != "@id":
+                yield from iter_references(item, path + (key,))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from iter_references(item, path + (index,))
+
+
+def is_local_reference(target: str) -> bool:
+    """True if a reference must resolve to an entity inside the crate."""
+    return not ABSOLUTE_IRI.match(target)
@@ -0,0 +1,246 @@
+"""
+Semantic checks that JSON Schema cannot express, in a single pass.
+
+Each rule names the canvas locations it reads as path patterns ("*" matches
+every array item) and gets the values found there, in document order, with
+their paths. ``RuleEngine`` merges the patterns of all enabled rules into one
+tree and walks each canvas once along it, visiting only the parts some rule
+reads; the rules then check the values they were given and build whatever
+ID indexes they need from them.
+
+Rules register themselves with the ``@rule`` decorator:
+
+    @rule("dates", "End dates are not before start dates", "project", "governance/stages/*")
+    def check_dates(matches):
+        for path, item in matches["project"] + matches["governance/stages/*"]:
+            ...
+
+``RuleEngine.timings`` accumulates the time spent in each rule (and in the
+walk, under "walk") so slow rules can be found.
+"""
+
+import datetime
+import functools
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .dependencies import requirement_issues
+from .schemagraph import json_pointer
+from .validation import Issue
+from .vocabularies import REFERENCES, VocabularyIndex
+
+Path = List[Any]
+Matches = Dict[str, List[Tuple[Path, Any]]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A semantic check over the values at ``paths`` (patterns like ``persons/*/id``)."""
+
+    name: str
+    description: str
+    paths: Tuple[str, ...]
+    check: Callable[[Matches], Iterable[Issue]]
+
+
+RULES: List[Rule] = []
+
+
+def rule(name: str, description: str, *paths: str) -> Callable:
+    """Register the decorated function as a rule reading ``paths``."""
+
+    def register(check: Callable[[Matches], Iterable[Issue]]) -> Callable:
+        RULES.append(Rule(name, description, paths, check))
+        return check
+
+    return register
+
+
+def rule_names() -> List[str]:
+    """Names of the registered rules, in evaluation order."""
+    return [r.name for r in RULES]
+
+
+class RuleEngine:
+    """Evaluates a set of rules on canvases with one walk per canvas."""
+
+    def __init__(self, names: Optional[Sequence[str]] = None):
+        """
+        Args:
+            names: Rules to enable (default: all registered rules).
+
+        Raises:
+            ValueError: If a name is not a registered rule.
+        """
+        by_name = {r.name: r for r in RULES}
+        unknown = [name for name in names or () if name not in by_name]
+        if unknown:
+            raise ValueError(f"Unknown rule(s): {', '.join(unknown)} (available: {', '.join(by_name)})")
+        self.rules = [r for r in RULES if names is None or r.name in names]
+        self.timings: Dict[str, float] = {name: 0.0 for name in ["walk"] + [r.name for r in self.rules]}
+        # Path tree: segment -> (sinks, children); a sink is (rule position, pattern)
+        self.tree: Dict[str, Any] = {}
+        for position, r in enumerate(self.rules):
+            for pattern in r.paths:
+                children = self.tree
+                *parents, last = pattern.split("/")
+                for segment in parents:
+                    children = children.setdefault(segment, ([], {}))[1]
+                children.setdefault(last, ([], {}))[0].append((position, pattern))
+
+    def collect(self, canvas: Any) -> List[Matches]:
+        """Walk the canvas once; the matches for each enabled rule."""
+        matches: List[Matches] = [{pattern: [] for pattern in r.paths} for r in self.rules]
+
+        # Recursion depth is bounded by the longest pattern, not by the canvas
+        def visit(value: Any, children: Dict[str, Any], path: Path) -> None:
+            if type(value) is dict:
+                for key, (sinks, subtree) in children.items():
+                    if key in value:
+                        item, item_path = value[key], path + [key]
+                        for position, pattern in sinks:
+                            matches[position][pattern].append((item_path, item))
+                        if subtree:
+                            visit(item, subtree, item_path)
+            elif type(value) is list and "*" in children:
+                sinks, subtree = children["*"]
+                for position, item in enumerate(value):
+                    item_path = path + [position]
+                    for rule_position, pattern in sinks:
+                        matches[rule_position][pattern].append((item_path, item))
+                    if subtree:
+                        visit(item, subtree, item_path)
+
+        visit(canvas, self.tree, [])
+        return matches
+
+    def check(self, canvas: Any, timings: Optional[Dict[str, float]] = None) -> List[Issue]:
+        """
+        Issues from all enabled rules, rule by rule.
+
+        The time spent is added to ``timings`` (default: ``self.timings``).
+        """
+        if timings is None:
+            timings = self.timings
+        started = time.perf_counter()
+        matches = self.collect(canvas)
+        now = time.perf_counter()
+        timings["walk"] = timings.get("walk", 0.0) + now - started
+        issues: List[Issue] = []
+        for r, rule_matches in zip(self.rules, matches):
+            issues.extend(r.check(rule_matches))
+            started, now = now, time.perf_counter()
+            timings[r.name] = timings.get(r.name, 0.0) + now - started
+        return issues
+
+
+def _date(value: Any) -> Optional[datetime.date]:
+    try:
+        return datetime.date.fromisoformat(value) if isinstance(value, str) else None
+    except ValueError:
+        return None
+
+
+def _declared_ids(matches: List[Tuple[Path, Any]]) -> Dict[str, Path]:
+    """ID -> path of its first declaration."""
+    ids: Dict[str, Path] = {}
+    for path, value in matches:
+        if isinstance(value, str):
+            ids.setdefault(value, path)
+    return ids
+
+
+@rule("dates", "End dates are not before start dates", "project", "governance/stages/*")
+def check_dates(matches: Matches) -> Iterator[Issue]:
+    for path, item in matches["project"] + matches["governance/stages/*"]:
+        if not isinstance(item, dict):
+            continue
+        start, end = _date(item.get("startDate")), _date(item.get("endDate"))
+        if start and end and end < start:
+            yield Issue(
+                json_pointer(path + ["endDate"]),
+                f"endDate {item['endDate']} is before startDate {item['startDate']}",
+                "date-order",
+            )
+
+
+@rule("unique-ids", "IDs are unique within each list of entities",
+      "persons/*/id", "governance/stages/*/id", "dataAccess/datasets/*/id", "outcomes/deliverables/*/id",
+      "outcomes/publications/*/id", "outcomes/evaluations/*/id")
+def check_unique_ids(matches: Matches) -> Iterator[Issue]:
+    # Requirement IDs are checked by the dependencies rule
+    for pattern, found in matches.items():
+        first: Dict[str, Path] = {}
+        for path, value in found:
+            if not isinstance(value, str):
+                continue
+            if value in first:
+                yield Issue(
+                    json_pointer(path),
+                    f"Duplicate id {value!r} (first used at {json_pointer(first[value])})",
+                    "duplicate-id",
+                )
+            else:
+                first[value] = path
+
+
+@rule("person-references", "Stakeholders, agents and authors refer to declared persons",
+      "persons/*/id", "userExpectations/requirements/*/stakeholders/*", "governance/stages/*/agents/*",
+      "outcomes/publications/*/authors/*")
+def check_person_references(matches: Matches) -> Iterator[Issue]:
+    persons = _declared_ids(matches["persons/*/id"])
+    references = [(path, value) for path, value in matches["userExpectations/requirements/*/stakeholders/*"]]
+    for path, agent in matches["governance/stages/*/agents/*"] + matches["outcomes/publications/*/authors/*"]:
+        if isinstance(agent, dict) and agent.get("type") == "person" and "personId" in agent:
+            references.append((path + ["personId"], agent["personId"]))
+    for path, person_id in references:
+        if isinstance(person_id, str) and person_id not in persons:
+            yield Issue(json_pointer(path), f"Refers to unknown person {person_id!r}", "person-reference")
+
+
+@rule("dependencies", "Requirement dependencies name existing requirements and have no cycles",
+      "userExpectations/requirements")
+def check_dependencies(matches: Matches) -> List[Issue]:
+    issues = []
+    for _, requirements in matches["userExpectations/requirements"]:
+        if isinstance(requirements, list):
+            issues.extend(requirement_issues(requirements))
+    return issues
+
+
+@rule("benefits", "Benefit fields that depend on each other are consistent",
+      "userExpectations/requirements/*/benefits/*")
+def check_benefits(matches: Matches) -> Iterator[Issue]:
+    for path, benefit in matches["userExpectations/requirements/*/benefits/*"]:
+        if not isinstance(benefit, dict):
+            continue
+        # The same checks as validateForExport and getOversightMinutes in the app
+        if benefit.get("direction") == "targetIsBetter" and "target" not in benefit:
+            yield Issue(json_pointer(path), "Benefit with direction 'targetIsBetter' must have a 'target' value", "benefit")
+        # Without an aggregationBasis the app counts no oversight at all
+        basis = benefit.get("aggregationBasis")
+        for field, used_with in (("oversightMinutesPerUnit", "perUnit"), ("oversightMinutesPerMonth", "perMonth")):
+            if field in benefit and basis != used_with:
+                ignored = f"aggregationBasis {basis!r}" if basis is not None else "a benefit without aggregationBasis"
+                yield Issue(
+                    json_pointer(path + [field]),
+                    f"{field} is ignored for {ignored} (only used with {used_with!r})",
+                    "benefit",
+                )
+
+
+@functools.lru_cache(maxsize=None)
+def _vocabulary_index() -> VocabularyIndex:
+    return VocabularyIndex.load()
+
+
+@rule("vocabularies", "Vocabulary references name entries of schema/vocabularies/",
+      *(pattern for pattern, _ in REFERENCES))
+def check_vocabularies(matches: Matches) -> Iterator[Issue]:
+    index = _vocabulary_index()
+    for pattern, name in REFERENCES:
+        for path, value in matches[pattern]:
+            issue = index.check_reference(path, name, value)
+            if issue is not None:
+                yield issue
@@ -0,0 +1,253 @@
+"""
+Indexed view of a JSON Schema (and the documents it references).
+
+``SchemaGraph`` walks each schema document once and records every subschema
+under a key ``"{document URI}#{JSON Pointer}"``, together with the base URI in
+effect there (``$id`` changes it), the ``$id``/anchor URIs it declares and the
+``$defs``/``definitions`` names. Everything the tools need afterwards is a
+dictionary lookup:
+
+- ``resolve()`` turns a ``$ref`` (local pointer, anchor, relative or absolute
+  URI, pointer into a sub-resource with its own ``$id``) into a node key, and
+  memoizes the result per (base, ref)
+- ``deref()`` follows chains of ``$ref`` and raises RefCycleError on loops
+- ``find()`` looks definitions up by name, optionally case-insensitively
+- ``fingerprint()`` is a content hash per node, computed bottom-up once, for
+  deduplicating identical subschemas without re-serializing them
+
+Split schemas are supported by ``from_file()``, which loads documents that
+``$ref`` points to from next to the root schema file. Standard library only,
+so the documentation tools can use it without ``jsonschema``.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote, urldefrag, urljoin
+
+# Keywords whose values are instance data rather than subschemas
+DATA_KEYWORDS = frozenset(["enum", "const", "examples", "default"])
+DEFINITION_KEYWORDS = ("$defs", "definitions")
+
+
+class RefResolutionError(ValueError):
+    """Raised when a ``$ref`` does not point to any indexed subschema."""
+
+
+class RefCycleError(RefResolutionError):
+    """Raised when ``$ref``s only point at each other and never reach a schema."""
+
+
+def json_pointer(path: Iterable[Any]) -> str:
+    """RFC 6901 JSON Pointer for a sequence of keys and indices (``""`` is the root)."""
+    return "".join("/" + str(p).replace("~", "~0").replace("/", "~1") for p in path)
+
+
+class SchemaGraph:
+    """Every subschema of one or more schema documents, indexed by JSON Pointer."""
+
+    def __init__(self, root: Any, uri: str = ""):
+        self.root = root
+        self.documents: Dict[str, Any] = {}
+        self.aliases: Dict[str, str] = {}
+        self.nodes: Dict[str, Any] = {}
+        self.bases: Dict[str, str] = {}
+        self.keys: Dict[int, str] = {}
+        self.ids: Dict[str, str] = {}
+        self.names: Dict[str, str] = {}
+        self.names_lower: Dict[str, List[str]] = {}
+        self.definition_keys: Dict[str, str] = {}
+        self.refs: List[Tuple[str, str]] = []
+        self._resolved: Dict[Tuple[str, str], str] = {}
+        self._fingerprints: Dict[int, str] = {}
+        self.uri = self.add_document(root, uri)
+
+    @classmethod
+    def from_file(cls, path: Path, load_external: bool = True) -> "SchemaGraph":
+        """
+        Load a schema file; with ``load_external``, also load every document its
+        ``$ref``s point to that exists next to it on disk (for split schemas).
+        """
+        path = Path(path).resolve()
+        with open(path, "r", encoding="utf-8") as f:
+            graph = cls(json.load(f), uri=path.as_uri())
+        if load_external:
+            graph.load_external(path.parent)
+        return graph
+
+    def add_document(self, document: Any, uri: str = "") -> str:
+        """
+        Index a schema document retrieved from ``uri``.
+
+        Returns:
+            The document's canonical URI (its ``$id`` resolved against ``uri``)
+        """
+        base = uri
+        if isinstance(document, dict) and isinstance(document.get("$id"), str):
+            base = urljoin(uri, document["$id"])
+        doc_uri = urldefrag(base)[0]
+        self.documents[doc_uri] = document
+        self.aliases[doc_uri] = doc_uri
+        if uri:
+            self.aliases.setdefault(urldefrag(uri)[0], doc_uri)
+
+        stack = [(document, "", doc_uri)]
+        while stack:
+            node, pointer, base = stack.pop()
+            key = f"{doc_uri}#{pointer}"
+            self.nodes[key] = node
+            if isinstance(node, list):
+                self.keys[id(node)] = key
+                for index, item in enumerate(node):
+                    if isinstance(item, (dict, list, bool)):
+                        stack.append((item, f"{pointer}/{index}", base))
+                continue
+            if not isinstance(node, dict):
+                continue
+
+            self.keys[id(node)] = key
+            if isinstance(node.get("$id"), str) and pointer:
+                base = urljoin(base, node["$id"])
+                self.ids.setdefault(base[:-1] if base.endswith("#") else base, key)
+            self.bases[key] = base
+            if isinstance(node.get("$ref"), str):
+                self.refs.append((key, urljoin(base, node["$ref"])))
+
+            for name, value in node.items():
+                if name in DATA_KEYWORDS or not isinstance(value, (dict, list, bool)):
+                    continue
+                child = f"{pointer}/{name.replace('~', '~0').replace('/', '~1')}"
+                if name in DEFINITION_KEYWORDS and isinstance(value, dict):
+                    for def_name in value:
+                        def_key = f"{doc_uri}#{child}/{def_name.replace('~', '~0').replace('/', '~1')}"
+                        self.names.setdefault(def_name, def_key)
+                        self.names_lower.setdefault(def_name.lower(), []).append(def_key)
+                        self.definition_keys[def_key] = def_name
+                stack.append((value, child, base))
+        return doc_uri
+
+    def load_external(self, directory: Path) -> None:
+        """Load referenced documents found on disk relative to the root schema file."""
+        root_dir = urljoin(self.uri, ".")
+        attempted: Set[str] = set()
+        while True:
+            missing = [
+                doc for doc in (urldefrag(target)[0] for _, target in self.refs)
+                if doc and doc not in self.aliases and doc not in self.ids and doc not in attempted
+            ]
+            if not missing:
+                return
+            for doc_uri in missing:
+                attempted.add(doc_uri)
+                if doc_uri.startswith("file:"):
+                    path = Path(unquote(doc_uri[len("file://"):]))
+                elif doc_uri.startswith(root_dir):
+                    # Relative to the root $id, so relative to the root file on disk
+                    path = directory / unquote(doc_uri[len(root_dir):])
+                else:
+                    continue
+                if not path.is_file():
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    canonical = self.add_document(json.load(f), uri=path.resolve().as_uri())
+                self.aliases.setdefault(doc_uri, canonical)
+
+    def resolve(self, ref: str, base: Optional[str] = None) -> str:
+        """Key of the subschema ``ref`` points to, relative to ``base`` (default: the root)."""
+        if base is None:
+            base = self.uri
+        memo = (base, ref)
+        if memo in self._resolved:
+            return self._resolved[memo]
+
+        absolute = urljoin(base, ref)
+        doc_uri, fragment = urldefrag(absolute)
+        fragment = unquote(fragment)
+        if fragment and not fragment.startswith("/"):
+            # Plain-name fragment: a Draft 7 location-independent identifier
+            key = self.ids.get(absolute)
+        elif doc_uri in self.ids:
+            # A subschema with its own $id, optionally followed by a pointer into it
+            key = self.ids[doc_uri] + fragment
+        elif doc_uri in self.aliases:
+            key = f"{self.aliases[doc_uri]}#{fragment}"
+        else:
+            key = None
+        if key is None or key not in self.nodes:
+            raise RefResolutionError(f"unresolvable $ref: {ref}")
+        self._resolved[memo] = key
+        return key
+
+    def base_of(self, node: Any) -> str:
+        """Base URI in effect at an indexed node (the root's for unknown nodes)."""
+        key = self.keys.get(id(node))
+        return self.bases.get(key, self.uri) if key else self.uri
+
+    def key_of(self, node: Any) -> Optional[str]:
+        """Key of an indexed dict or list node."""
+        return self.keys.get(id(node))
+
+    def get(self, key: str) -> Any:
+        return self.nodes[key]
+
+    def deref(self, schema: Any) -> Tuple[Optional[str], Any]:
+        """
+        Follow ``$ref`` from ``schema`` until a schema without one is reached.
+
+        Returns:
+            Tuple of (key, subschema); key is None if ``schema`` has no ``$ref``
+        """
+        key = None
+        seen: List[str] = []
+        while isinstance(schema, dict) and isinstance(schema.get("$ref"), str):
+            key = self.resolve(schema["$ref"], self.base_of(schema))
+            if key in seen:
+                chain = " -> ".join(seen + [key])
+                raise RefCycleError(f"$ref cycle: {chain}")
+            seen.append(key)
+            schema = self.nodes[key]
+        return key, schema
+
+    def definition_name(self, key: str) -> Optional[str]:
+        """Name of the ``$defs``/``definitions`` entry at ``key``, if it is one."""
+        return self.definition_keys.get(key)
+
+    def definitions(self) -> Dict[str, Any]:
+        """All named definitions (first occurrence of each name), in document order."""
+        return {name: self.nodes[key] for name, key in self.names.items()}
+
+    def find(self, name: str, case_insensitive: bool = False) -> List[str]:
+        """Keys of the definitions called ``name``."""
+        if case_insensitive:
+            return list(self.names_lower.get(name.lower(), []))
+        return [self.names[name]] if name in self.names else []
+
+    def fingerprint(self, node: Any) -> str:
+        """
+        Content hash of a subschema; equal content gives equal fingerprints.
+
+        Computed from the children's fingerprints and memoized for indexed
+        nodes, so fingerprinting every node of a schema is linear in its size.
+        """
+        memo = id(node) in self.keys
+        if memo and id(node) in self._fingerprints:
+            return self._fingerprints[id(node)]
+        if isinstance(node, dict):
+            parts = [f"{json.dumps(k)}:{self.fingerprint(v)}" for k, v in sorted(node.items())]
+            text = "{" + ",".join(parts) + "}"
+        elif isinstance(node, list):
+            text = "[" + ",".join(self.fingerprint(v) for v in node) + "]"
+        else:
+            return json.dumps(node)
+        # The "#" prefix keeps digests distinct from JSON-encoded scalars
+        digest = "#" + hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        if memo:
+            self._fingerprints[id(node)] = digest
+        return digest
+
+    def digest(self) -> str:
+        """Hash of all loaded documents (root first), for cache keys."""
+        text = json.dumps([self.root] + [d for uri, d in sorted(self.documents.items()) if d is not self.root],
+                          sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,404 @@
+"""
+A SQLite search index over canvas and RO-Crate corpora.
+
+Each indexed document (a JSON file or one line of a JSONL file) becomes a
+row of ``documents`` with the fields searches filter on as typed columns,
+its multi-valued fields (keywords and domains, every technical risk level,
+DUO terms) as rows of ``terms``, and its text in the FTS5 table
+``documents_fts``. RO-Crates are mapped to canvas structure first
+(aac.crateimport), so both formats are searched the same way.
+
+Updates are incremental: ``files`` remembers each file's size, mtime and
+content hash, so an unchanged file is recognized from a ``stat()`` and a
+touched but identical one from its hash; only changed files are read and
+parsed (across a process pool) and their documents replaced.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .cache import RACY_WINDOW_NS, hash_bytes
+from .crateimport import CrateImportError, crate_to_canvas
+from .validation import REPO_ROOT, is_rocrate
+from .vocabularies import duo_id
+
+DEFAULT_INDEX_FILE = REPO_ROOT / ".cache" / "search.sqlite"
+
+# Bump when the tables or the extracted fields change; older indexes are rebuilt
+SEARCH_INDEX_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    errors INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    line INTEGER,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    title TEXT,
+    value_driver TEXT COLLATE NOCASE,
+    stage TEXT COLLATE NOCASE,
+    technical_risk TEXT COLLATE NOCASE,
+    trl_current INTEGER,
+    trl_target INTEGER
+);
+CREATE INDEX IF NOT EXISTS documents_file ON documents (file_id);
+CREATE INDEX IF NOT EXISTS documents_value_driver ON documents (value_driver);
+CREATE INDEX IF NOT EXISTS documents_technical_risk ON documents (technical_risk);
+CREATE TABLE IF NOT EXISTS terms (
+    field TEXT NOT NULL,
+    value TEXT NOT NULL COLLATE NOCASE,
+    document_id INTEGER NOT NULL,
+    PRIMARY KEY (field, value, document_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS terms_document ON terms (document_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5 (
+    title, description, keywords, text, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+TERM_FIELDS = ("keyword", "risk", "duo")
+
+
+@dataclass
+class IndexedDocument:
+    """The searchable fields of one document."""
+
+    name: str
+    kind: str
+    line: Optional[int] = None
+    title: Optional[str] = None
+    description: str = ""
+    text: str = ""
+    value_driver: Optional[str] = None
+    stage: Optional[str] = None
+    technical_risk: Optional[str] = None
+    trl_current: Optional[int] = None
+    trl_target: Optional[int] = None
+    terms: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class FileUpdate:
+    """A changed file as read by a worker: its hash and documents, or None if its content is unchanged."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    documents: Optional[List[IndexedDocument]] = None
+    errors: List[str] = field(default_factory=list)
+
+
+def _text(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) and value else None
+
+
+def _strings(value: Any) -> List[str]:
+    return [item for item in value if isinstance(item, str) and item] if isinstance(value, list) else []
+
+
+def _dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _objects(value: Any) -> List[Dict[str, Any]]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def _integer(value: Any) -> Optional[int]:
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def extract(name: str, data: Any, line: Optional[int] = None) -> IndexedDocument:
+    """
+    The searchable fields of a parsed canvas or RO-Crate.
+
+    Raises:
+        ValueError: If the document is not a JSON object, or an RO-Crate
+            that cannot be converted.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("not a JSON object")
+    kind = "canvas"
+    if is_rocrate(data):
+        kind = "rocrate"
+        try:
+            # The version date is not indexed, so the conversion date does not matter
+            data = crate_to_canvas(data, today="")
+        except Exception as e:  # a malformed entity must not take down the batch
+            raise ValueError(str(e) if isinstance(e, CrateImportError) else f"{type(e).__name__}: {e}") from e
+
+    project = _dict(data.get("project"))
+    feasibility = _dict(data.get("developerFeasibility"))
+    trl = _dict(feasibility.get("trlLevel"))
+    requirements = _objects(_dict(data.get("userExpectations")).get("requirements"))
+    datasets = _objects(_dict(data.get("dataAccess")).get("datasets"))
+
+    keywords = _strings(project.get("keywords")) + _strings(project.get("domain"))
+    risks = [_text(feasibility.get("technicalRisk"))]
+    risks += [_text(_dict(req.get("feasibility")).get("technicalRisk")) for req in requirements]
+    duo_terms = [duo_id(term) for dataset in datasets for term in _strings(dataset.get("duoTerms"))]
+
+    terms = {("keyword", keyword.lower()) for keyword in keywords}
+    terms.update(("risk", risk.lower()) for risk in risks if risk)
+    terms.update(("duo", term) for term in duo_terms)
+    text = [_text(project.get(key)) for key in ("objective", "headlineValue")]
+    text += [_text(req.get("title")) for req in requirements] + [_text(ds.get("title")) for ds in datasets]
+    return IndexedDocument(
+        name=name,
+        kind=kind,
+        line=line,
+        title=_text(project.get("title")),
+        description=_text(project.get("description")) or "",
+        text="\n".join(item for item in text if item),
+        value_driver=_text(project.get("primaryValueDriver")),
+        stage=_text(project.get("projectStage")),
+        technical_risk=_text(feasibility.get("technicalRisk")),
+        trl_current=_integer(trl.get("current")),
+        trl_target=_integer(trl.get("target")),
+        terms=sorted(terms),
+    )
+
+
+def read_file(task: Tuple[str, Optional[str]]) -> FileUpdate:
+    """
+    Hash and, if its content changed, parse a file (``task`` is the path and
+    its previously indexed hash). A document that cannot be parsed is
+    reported in ``errors`` and left out; the other documents are indexed.
+    """
+    path, previous_hash = task
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    racy = time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS
+    update = FileUpdate(path, stat.st_size, -1 if racy else stat.st_mtime_ns, hash_bytes(data))
+    if update.content_hash == previous_hash:
+        return update
+
+    update.documents = []
+    if path.endswith(".jsonl"):
+        lines = [(number, line) for number, line in enumerate(data.decode("utf-8", "replace").splitlines(), 1)]
+    else:
+        lines = [(None, data.decode("utf-8", "replace"))]
+    for number, text in lines:
+        if not text.strip():
+            continue
+        name = f"{path}:{number}" if number is not None else path
+        try:
+            update.documents.append(extract(name, json.loads(text), number))
+        except ValueError as e:  # includes json.JSONDecodeError
+            update.errors.append(f"{name}: {e}")
+    return update
+
+
+def read_chunk(chunk: List[Tuple[str, Optional[str]]]) -> List[FileUpdate]:
+    """Read a chunk of files (one pool task) in order; unreadable files are reported as errors."""
+    updates = []
+    for path, previous_hash in chunk:
+        try:
+            updates.append(read_file((path, previous_hash)))
+        except OSError as e:
+            updates.append(FileUpdate(path, -1, -1, "", [], [f"{path}: {e}"]))
+    return updates
+
+
+@dataclass
+class SearchHit:
+    """One document matching a query."""
+
+    name: str
+    kind: str
+    title: Optional[str]
+    value_driver: Optional[str]
+    technical_risk: Optional[str]
+    stage: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "title": self.title,
+            "primaryValueDriver": self.value_driver,
+            "technicalRisk": self.technical_risk,
+            "projectStage": self.stage,
+        }
+
+
+class SearchIndex:
+    """The search database: incremental updates and queries."""
+
+    def __init__(self, path: Path = DEFAULT_INDEX_FILE):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SEARCH_INDEX_VERSION:
+            # Layout or extracted fields changed: start over
+            for table in ("documents_fts", "terms", "documents", "files"):
+                self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            self.db.execute(f"PRAGMA user_version = {SEARCH_INDEX_VERSION}")
+        self.db.executescript(SCHEMA)
+
+    def stale(self, paths: Iterable[Path]) -> Iterable[Tuple[str, Optional[str]]]:
+        """
+        The files whose size or mtime differ from the index, as (path, indexed
+        hash) tasks for read_file(). Sets ``self.unchanged`` to the number of
+        files skipped.
+        """
+        known = {path: (size, mtime_ns, digest) for path, size, mtime_ns, digest in
+                 self.db.execute("SELECT path, size, mtime_ns, content_hash FROM files")}
+        self.unchanged = 0
+        for path in paths:
+            key = str(path.resolve())
+            entry = known.get(key)
+            try:
+                stat = path.stat()
+            except OSError:
+                yield key, None  # reported by read_chunk()
+                continue
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                self.unchanged += 1
+                continue
+            yield key, entry[2] if entry else None
+
+    def apply(self, update: FileUpdate) -> int:
+        """
+        Store a file read by read_file(), replacing its previous documents.
+
+        Returns:
+            Number of documents (re)indexed
+        """
+        if not update.content_hash:
+            return 0
+        row = self.db.execute("SELECT id FROM files WHERE path = ?", (update.path,)).fetchone()
+        if update.documents is None:
+            self.db.execute(
+                "UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?", (update.size, update.mtime_ns, row[0])
+            )
+            return 0
+        if row is None:
+            file_id = self.db.execute(
+                "INSERT INTO files (path, size, mtime_ns, content_hash, errors) VALUES (?, ?, ?, ?, ?)",
+                (update.path, update.size, update.mtime_ns, update.content_hash, len(update.errors)),
+            ).lastrowid
+        else:
+            file_id = row[0]
+            self._delete_documents(file_id)
+            self.db.execute(
+                "UPDATE files SET size = ?, mtime_ns = ?, content_hash = ?, errors = ? WHERE id = ?",
+                (update.size, update.mtime_ns, update.content_hash, len(update.errors), file_id),
+            )
+        for doc in update.documents:
+            document_id = self.db.execute(
+                "INSERT INTO documents (file_id, line, name, kind, title, value_driver, stage, technical_risk, "
+                "trl_current, trl_target) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (file_id, doc.line, doc.name, doc.kind, doc.title, doc.value_driver, doc.stage, doc.technical_risk,
+                 doc.trl_current, doc.trl_target),
+            ).lastrowid
+            self.db.executemany(
+                "INSERT OR IGNORE INTO terms (field, value, document_id) VALUES (?, ?, ?)",
+                [(term_field, value, document_id) for term_field, value in doc.terms],
+            )
+            keywords = " ".join(value for term_field, value in doc.terms if term_field == "keyword")
+            self.db.execute(
+                "INSERT INTO documents_fts (rowid, title, description, keywords, text) VALUES (?, ?, ?, ?, ?)",
+                (document_id, doc.title or "", doc.description, keywords, doc.text),
+            )
+        return len(update.documents)
+
+    def _delete_documents(self, file_id: int) -> None:
+        ids = [(document_id,) for (document_id,) in
+               self.db.execute("SELECT id FROM documents WHERE file_id = ?", (file_id,))]
+        self.db.executemany("DELETE FROM documents_fts WHERE rowid = ?", ids)
+        self.db.executemany("DELETE FROM terms WHERE document_id = ?", ids)
+        self.db.execute("DELETE FROM documents WHERE file_id = ?", (file_id,))
+
+    def prune(self) -> int:
+        """
+        Drop files that no longer exist and their documents.
+
+        Returns:
+            Number of files removed
+        """
+        missing = [(file_id,) for file_id, path in self.db.execute("SELECT id, path FROM files")
+                   if not os.path.exists(path)]
+        for (file_id,) in missing:
+            self._delete_documents(file_id)
+        self.db.executemany("DELETE FROM files WHERE id = ?", missing)
+        return len(missing)
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        filters: Optional[Dict[str, str]] = None,
+        terms: Iterable[Tuple[str, str]] = (),
+        kind: Optional[str] = None,
+        limit: Optional[int] = 20,
+    ) -> List[SearchHit]:
+        """
+        Documents matching all criteria, best text match first (else in index order).
+
+        Args:
+            text: FTS5 query over title, description, keywords and other text
+                (e.g. ``triage AND radiology``, ``"data quality"``, ``auto*``)
+            filters: Column -> value (``value_driver``, ``stage``, ``technical_risk``), case-insensitive
+            terms: (field, value) pairs the document must have, see TERM_FIELDS
+            kind: ``canvas`` or ``rocrate``
+            limit: Maximum number of hits (None: all)
+
+        Raises:
+            sqlite3.OperationalError: If ``text`` is not a valid FTS5 query.
+        """
+        sql = ["SELECT d.name, d.kind, d.title, d.value_driver, d.technical_risk, d.stage FROM documents d"]
+        where: List[str] = []
+        params: List[Any] = []
+        if text:
+            sql.append("JOIN documents_fts ON documents_fts.rowid = d.id")
+            where.append("documents_fts MATCH ?")
+            params.append(text)
+        for column, value in (filters or {}).items():
+            if column not in ("value_driver", "stage", "technical_risk"):
+                raise ValueError(f"Unknown filter: {column}")
+            where.append(f"d.{column} = ?")
+            params.append(value)
+        for term_field, value in terms:
+            if term_field not in TERM_FIELDS:
+                raise ValueError(f"Unknown term field: {term_field}")
+            where.append("EXISTS (SELECT 1 FROM terms t WHERE t.field = ? AND t.value = ? AND t.document_id = d.id)")
+            params += [term_field, duo_id(value) if term_field == "duo" else value]
+        if kind:
+            where.append("d.kind = ?")
+            params.append(kind)
+        if where:
+            sql.append("WHERE " + " AND ".join(where))
+        sql.append("ORDER BY documents_fts.rank, d.id" if text else "ORDER BY d.id")
+        if limit is not None:
+            sql.append("LIMIT ?")
+            params.append(limit)
+        return [SearchHit(*row) for row in self.db.execute(" ".join(sql), params)]
+
+    def counts(self) -> Tuple[int, int]:
+        """Number of indexed (files, documents)."""
+        files = self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        documents = self.db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        return files, documents
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.db.commit()
+        self.db.close()
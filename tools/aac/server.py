@@ -0,0 +1,271 @@
+"""
+Long-lived validation server that keeps the validators warm.
+
+Starting the interpreter, importing ``jsonschema`` and building the
+validators costs far more than validating one canvas, so editor integrations
+and pre-commit hooks talk to this server instead. It serves HTTP/1.1 on a
+localhost port or a Unix socket, one thread per connection:
+
+    POST /validate?name=...&max_errors=N   body: the JSON document
+    GET  /status                           schema state and latency percentiles
+    POST /reload                           rebuild the validators now
+    POST /shutdown                         stop the server
+
+The schema and profile files are checked with ``stat()`` before each request
+and the validators are rebuilt when either changes. Requests keep using the
+previous validators until the new ones are ready, and a schema that fails to
+load leaves the previous validators in place (the error shows in ``/status``).
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from . import __version__
+from .batch import BatchConfig, ValidationResult, Validators
+from .validation import Issue
+
+# Number of recent request latencies kept for the percentiles in /status
+LATENCY_WINDOW = 10000
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class ValidatorState:
+    """Current validators plus the file stats they were built from."""
+
+    def __init__(self, config: BatchConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.validators: Optional[Validators] = None
+        self.stamp: Tuple = ()
+        self.schema_hash = ""
+        self.loaded_at = 0.0
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self.reload(force=True)
+
+    def files(self) -> List[Path]:
+        return [Path(p) for p in (self.config.schema_file, self.config.profile_file) if p]
+
+    def current_stamp(self) -> Tuple:
+        stamp = []
+        for path in self.files():
+            try:
+                stat = path.stat()
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the validators if the schema files changed (or ``force``).
+
+        Returns:
+            True if new validators were installed
+        """
+        stamp = self.current_stamp()
+        if not force and stamp == self.stamp:
+            return False
+        with self.lock:
+            # Another request may have reloaded while this one waited
+            if not force and stamp == self.stamp:
+                return False
+            try:
+                validators = Validators.from_config(self.config)
+            except Exception as e:
+                if self.validators is None:
+                    raise
+                self.stamp = stamp
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            self.validators = validators
+            self.stamp = stamp
+            self.schema_hash = validators.schema_digest
+            self.loaded_at = time.time()
+            self.reloads += 1
+            self.last_error = None
+            return True
+
+    def get(self) -> Validators:
+        """Validators for the next request, reloading first if a schema file changed."""
+        self.reload()
+        return self.validators
+
+
+class ValidationHandler(BaseHTTPRequestHandler):
+    """HTTP request handler; ``self.server`` is a ValidationServer."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = f"aac-validation/{__version__}"
+
+    def setup(self) -> None:
+        # Headers and body are separate writes; with Nagle on, a kept-alive TCP
+        # connection stalls on the client's delayed ACK (~40 ms per request)
+        self.disable_nagle_algorithm = self.request.family != socket.AF_UNIX
+        super().setup()
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path == "/status":
+            self.send_json(200, self.server.status())
+        else:
+            self.send_json(404, {"error": f"unknown endpoint {self.path}"})
+
+    def do_POST(self) -> None:
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        body = self.read_body()
+        if body is None:
+            return
+
+        if url.path == "/validate":
+            query = parse_qs(url.query)
+            name = query.get("name", ["<request>"])[0]
+            try:
+                max_errors = int(query["max_errors"][0]) if "max_errors" in query else None
+            except ValueError:
+                self.send_json(400, {"error": "max_errors must be an integer"})
+                return
+            if max_errors is not None and max_errors < 1:
+                self.send_json(400, {"error": "max_errors must be at least 1"})
+                return
+            result = self.server.validate(name, body, max_errors)
+            self.send_json(200, result.to_dict())
+            self.server.record_latency(time.perf_counter() - started)
+        elif url.path == "/reload":
+            self.server.state.reload(force=True)
+            self.send_json(200, self.server.status())
+        elif url.path == "/shutdown":
+            self.send_json(200, {"stopping": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            self.send_json(404, {"error": f"unknown endpoint {self.path}"})
+
+    def read_body(self) -> Optional[bytes]:
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            self.send_json(411, {"error": "Content-Length required"})
+            return None
+        return self.rfile.read(int(length))
+
+    def send_json(self, code: int, payload: Any) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+
+class ValidationServer:
+    """Shared state for the handler threads (mixed into the socket server classes below)."""
+
+    def setup_state(self, config: BatchConfig, verbose: bool = False) -> None:
+        self.state = ValidatorState(config)
+        self.verbose = verbose
+        self.started = time.time()
+        self.requests = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.stats_lock = threading.Lock()
+
+    def validate(self, name: str, body: bytes, max_errors: Optional[int]) -> ValidationResult:
+        validators = self.state.get()
+        try:
+            data = json.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            return ValidationResult(name, "error", [Issue("", f"JSON parsing error: {e}", "parse")])
+        return validators.check(name, data, max_errors)
+
+    def record_latency(self, seconds: float) -> None:
+        with self.stats_lock:
+            self.requests += 1
+            self.latencies.append(seconds)
+
+    def status(self) -> Dict[str, Any]:
+        with self.stats_lock:
+            latencies = sorted(self.latencies)
+            requests = self.requests
+        state = self.state
+        return {
+            "version": __version__,
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started, 3),
+            "schema": state.config.schema_file,
+            "profile": state.config.profile_file,
+            "schema_hash": state.schema_hash,
+            "loaded_at": state.loaded_at,
+            "reloads": state.reloads,
+            "reload_error": state.last_error,
+            "requests": requests,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50) * 1000, 3),
+                "p90": round(percentile(latencies, 0.90) * 1000, 3),
+                "p99": round(percentile(latencies, 0.99) * 1000, 3),
+                "max": round((latencies[-1] if latencies else 0.0) * 1000, 3),
+                "window": len(latencies),
+            },
+        }
+
+
+class TCPValidationServer(ValidationServer, ThreadingHTTPServer):
+    """Validation server on a TCP port."""
+
+    daemon_threads = True
+
+
+class UnixValidationServer(ValidationServer, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Validation server on a Unix domain socket."""
+
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        # A socket file left over from a previous run would make bind() fail
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+        self.server_name = self.server_address
+        self.server_port = 0
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def make_server(
+    config: BatchConfig,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+    verbose: bool = False,
+) -> ValidationServer:
+    """Build the validators and bind the server (not yet serving)."""
+    if socket_path:
+        server = UnixValidationServer(socket_path, ValidationHandler)
+    else:
+        server = TCPValidationServer((host, port), ValidationHandler)
+    server.setup_state(config, verbose)
+    return server
@@ -0,0 +1,295 @@
+"""
+Seeded generator for synthetic canvases and RO-Crates of any size.
+
+Documents are built from the complete examples in schema/examples: every
+array the canvas schema declares (``persons``, ``userExpectations.requirements``,
+``userExpectations.requirements[].benefits``, ...) can be scaled to any length
+by cloning the example's items with fresh ``id``s and numbered titles. The
+same seed always gives the same document.
+
+Invalid documents are valid ones with a few schema-directed mutations: a
+string property set to a number, an enum property set to a value outside the
+enum, a required property removed. For RO-Crates the mutations are a
+duplicate ``@id``, a reference to a missing entity and an entity of a type
+the profile does not know.
+
+Array paths use ``.`` between properties and ``[]`` for "every item of",
+e.g. ``userExpectations.requirements[].benefits``.
+"""
+
+import copy
+import itertools
+import random
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .schemagraph import SchemaGraph
+from .validation import EXAMPLES_DIR, load_json
+
+CANVAS_TEMPLATE = EXAMPLES_DIR / "complete-canvas.json"
+CRATE_SKELETON = EXAMPLES_DIR / "minimal-example.json"
+CRATE_TEMPLATE = EXAMPLES_DIR / "complete-example.json"
+
+# Properties whose values are numbered in clones so items stay distinguishable
+LABEL_KEYS = ("title", "name")
+
+TRAILING_NUMBER = re.compile(r"-\d+$")
+
+
+def array_paths(graph: SchemaGraph) -> List[str]:
+    """Every array in the schema, as a path from the document root."""
+    paths: List[str] = []
+
+    def walk(schema: Any, path: str, visiting: Tuple[str, ...]) -> None:
+        key, schema = graph.deref(schema)
+        if key is not None:
+            if key in visiting:
+                return
+            visiting = visiting + (key,)
+        if not isinstance(schema, dict):
+            return
+        if schema.get("type") == "array":
+            paths.append(path)
+            if isinstance(schema.get("items"), dict):
+                walk(schema["items"], path + "[]", visiting)
+            return
+        for name, subschema in schema.get("properties", {}).items():
+            walk(subschema, f"{path}.{name}" if path else name, visiting)
+
+    walk(graph.root, "", ())
+    return paths
+
+
+def _split_path(path: str) -> List[str]:
+    """``a.b[].c`` -> ``["a", "b", "[]", "c"]``."""
+    parts: List[str] = []
+    for part in path.split("."):
+        if part.endswith("[]"):
+            parts.extend([part[:-2], "[]"])
+        else:
+            parts.append(part)
+    return parts
+
+
+def _containers(document: Any, parts: List[str]) -> Iterator[Tuple[dict, str]]:
+    """(parent object, property name) for every array at a split path."""
+    nodes = [document]
+    for part in parts[:-1]:
+        if part == "[]":
+            nodes = [item for node in nodes if isinstance(node, list) for item in node]
+        else:
+            nodes = [node[part] for node in nodes if isinstance(node, dict) and part in node]
+    for node in nodes:
+        if isinstance(node, dict) and isinstance(node.get(parts[-1]), list):
+            yield node, parts[-1]
+
+
+def _relabel(item: Any, numbers: Iterator[int]) -> None:
+    """Give a cloned item, and every object nested in it, a fresh id and numbered labels."""
+    if isinstance(item, list):
+        for value in item:
+            _relabel(value, numbers)
+    elif isinstance(item, dict):
+        number = next(numbers) if isinstance(item.get("id"), str) else None
+        for key, value in item.items():
+            if number is not None and key == "id":
+                item[key] = f"{TRAILING_NUMBER.sub('', value)}-{number}"
+            elif number is not None and key in LABEL_KEYS and isinstance(value, str):
+                item[key] = f"{value} {number}"
+            else:
+                _relabel(value, numbers)
+
+
+class CanvasGenerator:
+    """Builds canvases of a given size from the complete example."""
+
+    def __init__(self, schema: dict, template: Optional[dict] = None, graph: Optional[SchemaGraph] = None):
+        self.graph = graph or SchemaGraph(schema)
+        self.template = template if template is not None else load_json(CANVAS_TEMPLATE)
+        self.arrays = array_paths(self.graph)
+        # Only arrays the template has items for can be scaled by cloning
+        self.scalable = [
+            path for path in self.arrays
+            if any(parent[name] for parent, name in _containers(self.template, _split_path(path)))
+        ]
+
+    def canvas(
+        self,
+        size: int,
+        seed: int = 0,
+        scales: Optional[Dict[str, int]] = None,
+        invalid: bool = False,
+        mutations: int = 3,
+    ) -> dict:
+        """
+        Generate one canvas.
+
+        Top-level arrays (those not inside another array) get ``size`` items;
+        nested arrays keep the template's length unless ``scales`` names them.
+        """
+        rng = random.Random(seed)
+        scales = scales or {}
+        unknown = set(scales) - set(self.scalable)
+        if unknown:
+            raise ValueError(f"not a scalable array: {', '.join(sorted(unknown))} "
+                             f"(choose from: {', '.join(self.scalable)})")
+
+        document = copy.deepcopy(self.template)
+        # Numbering starts past anything the template uses, so clone ids never collide with it
+        numbers = itertools.count(1000)
+        # Outer arrays first, so nested arrays are scaled inside every clone
+        for path in self.scalable:
+            length = scales.get(path, size if "[]" not in path else None)
+            if length is None:
+                continue
+            for parent, name in _containers(document, _split_path(path)):
+                originals = parent[name]
+                clones = []
+                for index in range(length):
+                    item = copy.deepcopy(originals[index % len(originals)])
+                    if index >= len(originals):
+                        _relabel(item, numbers)
+                    clones.append(item)
+                parent[name] = clones
+        if invalid:
+            self.mutate(document, rng, mutations)
+        return document
+
+    def candidates(self, document: dict) -> Iterator[Tuple[str, Any, Any, dict]]:
+        """(kind, container, key, property schema) for every place a mutation can break."""
+
+        def walk(schema: Any, instance: Any, visiting: Tuple[str, ...]) -> Iterator:
+            key, schema = self.graph.deref(schema)
+            if key is not None:
+                if key in visiting:
+                    return
+                visiting = visiting + (key,)
+            if not isinstance(schema, dict):
+                return
+            if isinstance(instance, list) and isinstance(schema.get("items"), dict):
+                for item in instance:
+                    yield from walk(schema["items"], item, visiting)
+            if not isinstance(instance, dict):
+                return
+            for name in schema.get("required", []):
+                if name in instance:
+                    yield "remove", instance, name, schema
+            for name, subschema in schema.get("properties", {}).items():
+                if name not in instance:
+                    continue
+                _, resolved = self.graph.deref(subschema)
+                if isinstance(resolved, dict):
+                    if "enum" in resolved:
+                        yield "enum", instance, name, resolved
+                    elif resolved.get("type") == "string":
+                        yield "type", instance, name, resolved
+                yield from walk(subschema, instance[name], visiting)
+
+        return walk(self.graph.root, document, ())
+
+    def mutate(self, document: dict, rng: random.Random, count: int) -> List[str]:
+        """Apply ``count`` schema violations in place; returns their descriptions."""
+        candidates = list(self.candidates(document))
+        applied = []
+        for kind, container, key, _ in rng.sample(candidates, min(count, len(candidates))):
+            if key not in container:
+                continue
+            if kind == "remove":
+                del container[key]
+                applied.append(f"removed required {key!r}")
+            elif kind == "enum":
+                container[key] = "not-a-valid-value"
+                applied.append(f"{key!r} set outside its enum")
+            else:
+                container[key] = rng.randint(0, 1000)
+                applied.append(f"{key!r} set to a number")
+        return applied
+
+
+class CrateGenerator:
+    """
+    Builds RO-Crates with any number of entities.
+
+    Starts from the minimal example and adds clones of the entities in the
+    complete example that the profile recognizes, numbering their ``@id``s
+    per family (``#person-7``). References in clones are pointed at entities
+    of the same family, or dropped if the crate has none.
+    """
+
+    def __init__(self, profile: Any, skeleton: Optional[dict] = None, template: Optional[dict] = None):
+        self.skeleton = skeleton if skeleton is not None else load_json(CRATE_SKELETON)
+        template = template if template is not None else load_json(CRATE_TEMPLATE)
+        taken = {self.family(entity.get("@id", "")) for entity in self.skeleton["@graph"]}
+        self.templates = [
+            entity for entity in template["@graph"]
+            if isinstance(entity.get("@id"), str) and entity["@id"].startswith("#")
+            and self.family(entity["@id"]) not in taken and profile.select_branch(entity) is not None
+        ]
+
+    @staticmethod
+    def family(entity_id: str) -> str:
+        return TRAILING_NUMBER.sub("", entity_id)
+
+    def crate(self, size: int, seed: int = 0, invalid: bool = False) -> dict:
+        """
+        Generate a crate with ``size`` entities of every numbered family in the
+        template (``#person-N``, ``#role-N``, ...) and one of each other entity.
+        """
+        rng = random.Random(seed)
+        crate = copy.deepcopy(self.skeleton)
+        graph = crate["@graph"]
+        families: Dict[str, List[dict]] = {}
+        for template in self.templates:
+            families.setdefault(self.family(template["@id"]), []).append(template)
+
+        ids: Dict[str, List[str]] = {}
+        entities = []
+        for family, templates in families.items():
+            if not TRAILING_NUMBER.search(templates[0]["@id"]):
+                entities.append(copy.deepcopy(templates[0]))
+                continue
+            ids[family] = [f"{family}-{n}" for n in range(size)]
+            for n, entity_id in enumerate(ids[family]):
+                entity = copy.deepcopy(rng.choice(templates))
+                entity["@id"] = entity_id
+                if isinstance(entity.get("name"), str):
+                    entity["name"] = f"{entity['name']} {n}"
+                entities.append(entity)
+
+        existing: Set[str] = {e["@id"] for e in graph + entities if isinstance(e.get("@id"), str)}
+        for entity in entities:
+            self._retarget(entity, ids, existing, rng)
+        graph.extend(entities)
+        if invalid:
+            self.mutate(crate, rng)
+        return crate
+
+    def _retarget(self, value: Any, ids: Dict[str, List[str]], existing: Set[str], rng: random.Random) -> Any:
+        """Point local references at generated entities; returns False for ones to drop."""
+        if isinstance(value, list):
+            kept = [v for v in value if self._retarget(v, ids, existing, rng) is not False]
+            value[:] = kept
+            return value
+        if not isinstance(value, dict):
+            return value
+        target = value.get("@id")
+        if len(value) == 1 and isinstance(target, str):
+            family = ids.get(self.family(target))
+            if family:
+                value["@id"] = rng.choice(family)
+            elif target.startswith("#") and target not in existing:
+                return False
+            return value
+        for key in list(value):
+            if key != "@id" and self._retarget(value[key], ids, existing, rng) is False:
+                del value[key]
+        return value
+
+    def mutate(self, crate: dict, rng: random.Random) -> List[str]:
+        """Break a generated crate in three ways the profile checks catch."""
+        graph = crate["@graph"]
+        duplicate = copy.deepcopy(rng.choice(graph[len(self.skeleton["@graph"]):] or graph))
+        graph.append(duplicate)
+        graph.append({"@id": "#unknown-0", "@type": "Thing", "about": {"@id": "#missing-entity"}})
+        rng.shuffle(graph)
+        return [f"duplicate @id {duplicate['@id']!r}", "unknown @type 'Thing'", "dangling reference"]
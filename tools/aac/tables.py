@@ -0,0 +1,286 @@
+"""
+Flattening canvases into analytics tables.
+
+Every canvas contributes rows to four tables:
+
+- ``projects``: one row per canvas
+- ``requirements``: one row per requirement
+- ``benefits``: one row per benefit of a requirement
+- ``risks``: one row per risk of a requirement's feasibility
+
+Rows refer to their canvas by ``project_key`` (the document name: its path
+as given, or ``path:line`` for JSONL) and to their requirement by
+``requirement_id``; together with ``position`` (the index in its list) these
+keys are stable across exports of the same corpus. Columns are typed (see
+aac.columnar); benefit values are split into their numeric value, category
+and boolean columns by ``type``.
+
+``export_shard`` is the process pool task behind tools/export-tables.py: a
+shard (a contiguous run of input files) is streamed canvas by canvas into
+part files, which ``merge_parts`` concatenates in shard order, so the output
+does not depend on the number of workers.
+"""
+
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from .batch import iter_sources
+from .benefits import effort_hours, is_number
+from .columnar import ColumnWriter, iter_row_groups, read_footer
+from .validation import is_rocrate, load_json
+
+TABLES: Dict[str, List[Tuple[str, str]]] = {
+    "projects": [
+        ("project_key", "str"), ("project_id", "str"), ("title", "str"), ("project_stage", "str"),
+        ("primary_value_driver", "str"), ("start_date", "str"), ("end_date", "str"),
+        ("rough_estimate_value", "f64"), ("rough_estimate_unit", "str"), ("technical_risk", "str"),
+        ("trl_current", "i32"), ("trl_target", "i32"), ("requirement_count", "i32"),
+    ],
+    "requirements": [
+        ("project_key", "str"), ("requirement_id", "str"), ("position", "i32"), ("title", "str"),
+        ("priority", "str"), ("status", "str"), ("unit_category", "str"), ("volume_per_month", "f64"),
+        ("time_unit", "str"), ("technical_risk", "str"), ("effort_hours", "f64"), ("depends_on_count", "i32"),
+        ("benefit_count", "i32"), ("risk_count", "i32"),
+    ],
+    "benefits": [
+        ("project_key", "str"), ("requirement_id", "str"), ("position", "i32"), ("benefit_type", "str"),
+        ("metric_id", "str"), ("metric_label", "str"), ("direction", "str"), ("value_meaning", "str"),
+        ("aggregation_basis", "str"), ("benefit_unit", "str"),
+        ("baseline_type", "str"), ("baseline", "f64"), ("baseline_category", "str"), ("baseline_bool", "bool"),
+        ("expected_type", "str"), ("expected", "f64"), ("expected_category", "str"), ("expected_bool", "bool"),
+        ("target", "f64"), ("oversight_minutes_per_unit", "f64"), ("oversight_minutes_per_month", "f64"),
+        ("confidence_user", "str"), ("confidence_dev", "str"),
+    ],
+    "risks": [
+        ("project_key", "str"), ("requirement_id", "str"), ("position", "i32"), ("risk_id", "str"),
+        ("risk_category", "str"), ("title", "str"), ("likelihood", "str"), ("impact", "str"), ("status", "str"),
+    ],
+}
+
+FORMATS = ("csv", "cols")
+
+
+def _str(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+
+def _float(value: Any) -> Optional[float]:
+    return float(value) if is_number(value) else None
+
+
+def _int(value: Any) -> Optional[int]:
+    # Columns are 32-bit; larger values cannot be valid TRLs or counts
+    return value if isinstance(value, int) and not isinstance(value, bool) and abs(value) < 2 ** 31 else None
+
+
+def _list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else []
+
+
+def _dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _benefit_value(value: Any) -> Tuple[Optional[str], Optional[float], Optional[str], Optional[bool]]:
+    """A BenefitValue as (type, number, category, bool)."""
+    value = _dict(value)
+    flag = value.get("bool")
+    return _str(value.get("type")), _float(value.get("value")), _str(value.get("category")), \
+        flag if isinstance(flag, bool) else None
+
+
+def canvas_rows(key: str, canvas: Dict[str, Any]) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+    """The rows a canvas contributes, as (table, row) in table column order."""
+    project = _dict(canvas.get("project"))
+    feasibility = _dict(canvas.get("developerFeasibility"))
+    trl = _dict(feasibility.get("trlLevel"))
+    requirements = [r for r in _list(_dict(canvas.get("userExpectations")).get("requirements")) if isinstance(r, dict)]
+    yield "projects", (
+        key, _str(project.get("projectId")), _str(project.get("title")), _str(project.get("projectStage")),
+        _str(project.get("primaryValueDriver")), _str(project.get("startDate")), _str(project.get("endDate")),
+        _float(project.get("roughEstimateValue")), _str(project.get("roughEstimateUnit")),
+        _str(feasibility.get("technicalRisk")), _int(trl.get("current")), _int(trl.get("target")), len(requirements),
+    )
+    for position, requirement in enumerate(requirements):
+        requirement_id = _str(requirement.get("id"))
+        req_feasibility = _dict(requirement.get("feasibility"))
+        benefits = _list(requirement.get("benefits"))
+        risks = _list(req_feasibility.get("risks"))
+        yield "requirements", (
+            key, requirement_id, position, _str(requirement.get("title")), _str(requirement.get("priority")),
+            _str(requirement.get("status")), _str(requirement.get("unitCategory")),
+            _float(requirement.get("volumePerMonth")), _str(requirement.get("timeUnit")),
+            _str(req_feasibility.get("technicalRisk")), _float(effort_hours(requirement)),
+            len(_list(requirement.get("dependsOn"))), len(benefits), len(risks),
+        )
+        for index, benefit in enumerate(benefits):
+            if not isinstance(benefit, dict):
+                continue
+            yield "benefits", (
+                key, requirement_id, index, _str(benefit.get("benefitType")), _str(benefit.get("metricId")),
+                _str(benefit.get("metricLabel")), _str(benefit.get("direction")), _str(benefit.get("valueMeaning")),
+                _str(benefit.get("aggregationBasis")), _str(benefit.get("benefitUnit")),
+                *_benefit_value(benefit.get("baseline")), *_benefit_value(benefit.get("expected")),
+                _float(benefit.get("target")), _float(benefit.get("oversightMinutesPerUnit")),
+                _float(benefit.get("oversightMinutesPerMonth")), _str(benefit.get("confidenceUser")),
+                _str(benefit.get("confidenceDev")),
+            )
+        for index, risk in enumerate(risks):
+            if not isinstance(risk, dict):
+                continue
+            yield "risks", (
+                key, requirement_id, index, _str(risk.get("id")), _str(risk.get("riskCategory")),
+                _str(risk.get("title")), _str(risk.get("likelihood")), _str(risk.get("impact")),
+                _str(risk.get("status")),
+            )
+
+
+def csv_value(value: Any) -> Any:
+    """CSV cell for a typed value: empty for null, ``true``/``false`` for booleans, shortest float repr."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return repr(value) if isinstance(value, float) else value
+
+
+class TableWriter:
+    """Writes the rows of one table to its CSV and/or ``.cols`` file."""
+
+    def __init__(self, directory: Path, stem: str, table: str, formats: Sequence[str], row_group_size: int,
+                 header: bool = True):
+        self.files: List[Any] = []
+        self.csv: Optional[Any] = None
+        self.cols: Optional[ColumnWriter] = None
+        columns = TABLES[table]
+        if "csv" in formats:
+            f: TextIO = open(directory / f"{stem}.csv", "w", encoding="utf-8", newline="")
+            self.files.append(f)
+            self.csv = csv.writer(f)
+            if header:
+                self.csv.writerow([name for name, _ in columns])
+        if "cols" in formats:
+            f = open(directory / f"{stem}.cols", "wb")
+            self.files.append(f)
+            self.cols = ColumnWriter(f, columns, table, row_group_size)
+        self.rows = 0
+
+    def write_row(self, row: Tuple[Any, ...]) -> None:
+        if self.csv is not None:
+            self.csv.writerow([csv_value(value) for value in row])
+        if self.cols is not None:
+            self.cols.write_row(row)
+        self.rows += 1
+
+    def close(self) -> None:
+        if self.cols is not None:
+            self.cols.close()
+        for f in self.files:
+            f.close()
+
+
+@dataclass(frozen=True)
+class ExportConfig:
+    """What each worker writes (must be picklable)."""
+
+    part_dir: str
+    formats: Tuple[str, ...] = FORMATS
+    row_group_size: int = 65536
+
+
+@dataclass
+class ShardResult:
+    """Counts for one exported shard; documents that are not canvases are listed in ``skipped``."""
+
+    shard: int
+    canvases: int = 0
+    rows: Dict[str, int] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+
+def part_stem(table: str, shard: int) -> str:
+    return f"{table}.{shard:05d}"
+
+
+# Per-process state, set once by init_exporter()
+_config: Optional[ExportConfig] = None
+
+
+def init_exporter(config: ExportConfig) -> None:
+    """Process pool initializer."""
+    global _config
+    _config = config
+
+
+def export_shard(shard: int, paths: List[str]) -> ShardResult:
+    """Stream the canvases of some input files into this shard's part files."""
+    result = ShardResult(shard)
+    part_dir = Path(_config.part_dir)
+    writers = {
+        table: TableWriter(part_dir, part_stem(table, shard), table, _config.formats, _config.row_group_size,
+                           header=False)
+        for table in TABLES
+    }
+    try:
+        for source in iter_sources(paths):
+            try:
+                data = json.loads(source.text) if source.text is not None else load_json(source.path)
+            except (json.JSONDecodeError, OSError, UnicodeDecodeError) as e:
+                result.skipped.append(f"{source.name}: {e}")
+                continue
+            if not isinstance(data, dict) or is_rocrate(data):
+                result.skipped.append(f"{source.name}: not a canvas (convert RO-Crates with convert-rocrates.py)")
+                continue
+            result.canvases += 1
+            for table, row in canvas_rows(source.name, data):
+                writers[table].write_row(row)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    result.rows = {table: writer.rows for table, writer in writers.items()}
+    return result
+
+
+def export_chunk(chunk: List[Tuple[int, List[str]]]) -> List[ShardResult]:
+    """Export a chunk of shards (one pool task) in order."""
+    return [export_shard(shard, paths) for shard, paths in chunk]
+
+
+def merge_parts(output_dir: Path, part_dir: Path, shards: int, formats: Sequence[str]) -> None:
+    """Concatenate the part files of every table, in shard order, and delete them."""
+    for table, columns in TABLES.items():
+        if "csv" in formats:
+            with open(output_dir / f"{table}.csv", "w", encoding="utf-8", newline="") as out:
+                csv.writer(out).writerow([name for name, _ in columns])
+                for shard in range(shards):
+                    part = part_dir / f"{part_stem(table, shard)}.csv"
+                    with open(part, "r", encoding="utf-8", newline="") as f:
+                        for block in iter(lambda: f.read(1 << 20), ""):
+                            out.write(block)
+                    os.remove(part)
+        if "cols" in formats:
+            with open(output_dir / f"{table}.cols", "wb") as out:
+                writer = ColumnWriter(out, columns, table)
+                for shard in range(shards):
+                    part = part_dir / f"{part_stem(table, shard)}.cols"
+                    with open(part, "rb") as f:
+                        for rows, chunks in iter_row_groups(f, read_footer(f)):
+                            writer.append_row_group(rows, chunks)
+                    os.remove(part)
+                writer.close()
+
+
+def shard_paths(paths: List[str], shards: int) -> List[Tuple[int, List[str]]]:
+    """Split input files into ``shards`` contiguous runs of (nearly) equal length."""
+    shards = max(1, min(shards, len(paths)))
+    size, extra = divmod(len(paths), shards)
+    result, start = [], 0
+    for shard in range(shards):
+        end = start + size + (1 if shard < extra else 0)
+        result.append((shard, paths[start:end]))
+        start = end
+    return result
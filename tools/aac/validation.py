@@ -0,0 +1,131 @@
+"""
+Core validation helpers for canvas JSON files.
+
+Building a ``Draft7Validator`` checks the schema and compiles its keyword
+handlers, so callers should build one validator and reuse it for every
+instance instead of calling ``jsonschema.validate()`` per file.
+"""
+
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jsonschema import Draft7Validator, ValidationError
+from referencing import Registry
+from referencing.jsonschema import DRAFT7
+
+from .schemagraph import SchemaGraph, json_pointer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+SCHEMA_FILE = REPO_ROOT / "schema" / "canvas-schema.json"
+EXAMPLES_DIR = REPO_ROOT / "schema" / "examples"
+
+
+def load_json(path: Path) -> Any:
+    """Load and return a JSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def is_rocrate(data: Any) -> bool:
+    """Check if a JSON document is an RO-Crate (has @context and @graph)."""
+    return isinstance(data, dict) and "@context" in data and "@graph" in data
+
+
+def build_validator(
+    schema: dict,
+    graph: Optional[SchemaGraph] = None,
+    validator_class: type = Draft7Validator,
+) -> Draft7Validator:
+    """
+    Check the schema once and return a reusable validator for it.
+
+    If ``graph`` holds more than one document (a split schema), the other
+    documents are registered so that ``$ref``s between them resolve offline.
+    ``validator_class`` is a Draft 7 validator class, possibly extended (see
+    aac.profiling).
+    """
+    Draft7Validator.check_schema(schema)
+    if graph is None or len(graph.documents) == 1:
+        return validator_class(schema)
+
+    registry = Registry()
+    for uri, document in graph.documents.items():
+        Draft7Validator.check_schema(document)
+        registry = registry.with_resource(uri, DRAFT7.create_resource(document))
+    for alias, uri in graph.aliases.items():
+        if alias != uri:
+            registry = registry.with_resource(alias, DRAFT7.create_resource(graph.documents[uri]))
+    if "$id" not in schema:
+        # Give relative references the same base the graph resolved them against
+        schema = dict(schema, **{"$id": graph.uri})
+    return validator_class(schema, registry=registry)
+
+
+@dataclass
+class Issue:
+    """
+    One validation problem.
+
+    ``pointer`` is a JSON Pointer into the validated document, computed once
+    when the issue is created. ``keyword`` names the failing schema keyword
+    (or check, such as ``reference`` or ``parse``). ``context`` holds the
+    per-branch errors of a failed ``oneOf``/``anyOf``.
+    """
+
+    pointer: str
+    message: str
+    keyword: str = ""
+    context: List["Issue"] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return f"{self.pointer or '(root)'}: {self.message}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"pointer": self.pointer, "message": self.message, "keyword": self.keyword}
+        if self.context:
+            data["context"] = [issue.to_dict() for issue in self.context]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Issue":
+        context = [cls.from_dict(item) for item in data.get("context", [])]
+        return cls(data["pointer"], data["message"], data.get("keyword", ""), context)
+
+
+def issue_from_error(error: ValidationError) -> Issue:
+    """Convert a jsonschema error (and its branch errors) into an Issue."""
+    return Issue(
+        pointer=json_pointer(error.absolute_path),
+        message=error.message,
+        keyword=str(error.validator),
+        context=[issue_from_error(suberror) for suberror in error.context or []],
+    )
+
+
+def check_instance(
+    validator: Draft7Validator,
+    instance: Any,
+    fast: Optional[Callable[[Any], bool]] = None,
+    max_errors: Optional[int] = None,
+) -> Tuple[bool, List[Issue]]:
+    """
+    Validate an instance with a prebuilt validator and collect every error.
+
+    If a compiled fast-path check (see aac.codegen) is given, instances it
+    accepts are valid without consulting jsonschema; rejected instances are
+    re-checked with jsonschema for the error details.
+
+    Errors come from ``iter_errors()``, so all problems are reported in one
+    run; ``max_errors`` stops collecting (and validating) after that many.
+
+    Returns:
+        Tuple of (is_valid, list_of_issues)
+    """
+    if fast is not None and fast(instance):
+        return True, []
+
+    issues = [issue_from_error(error) for error in islice(validator.iter_errors(instance), max_errors)]
+    return not issues, issues
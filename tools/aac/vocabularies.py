@@ -0,0 +1,201 @@
+"""
+Lookups in the controlled vocabularies under schema/vocabularies/.
+
+Each vocabulary file is reduced to a dictionary from every value a canvas
+may use to refer to an entry (its ``id``, or ``severity``, ``value`` or
+``label`` where that is what the canvas stores) to the entry's ``id``, so a
+lookup is a single hash probe however large the vocabulary grows. DUO terms
+are matched by their ``DUO:NNNNNNN`` identifier, so CURIEs and the various
+URI forms of the same term are all recognized.
+
+Building the index means parsing every vocabulary file with its
+descriptions. The reduced index is therefore cached on disk as one compact
+JSON file named after the hash of the vocabulary files' contents (and
+INDEX_VERSION), and only rebuilt when a vocabulary changes.
+
+``VocabularyIndex.check()`` verifies every vocabulary reference in a canvas
+(REFERENCES) in a single walk, following only the paths that can contain one.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .schemagraph import json_pointer
+from .validation import REPO_ROOT, Issue
+
+# Bump when the index layout changes so stale cached indexes are not reused
+INDEX_VERSION = 1
+
+VOCABULARIES_DIR = REPO_ROOT / "schema" / "vocabularies"
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "vocabularies"
+
+DUO_ID = re.compile(r"DUO[:_](\d{7})\b")
+
+
+def duo_id(value: Any) -> Any:
+    """``DUO:0000006`` for any CURIE or URI of that term; other values unchanged."""
+    if isinstance(value, str):
+        match = DUO_ID.search(value)
+        if match:
+            return f"DUO:{match.group(1)}"
+    return value
+
+
+@dataclass(frozen=True)
+class VocabularySpec:
+    """Where a vocabulary file keeps its entries and which of their fields canvases refer to."""
+
+    name: str
+    items: str
+    keys: Tuple[str, ...]
+    normalize: Optional[Callable[[Any], Any]] = None
+
+
+VOCABULARIES = [
+    VocabularySpec("duo-terms", "terms", ("id", "uri"), duo_id),
+    VocabularySpec("function-roles", "roles", ("id",)),
+    VocabularySpec("governance-stages", "stages", ("id", "label")),
+    VocabularySpec("risk-levels", "levels", ("id", "severity")),
+    VocabularySpec("trl-levels", "levels", ("id", "value")),
+]
+
+SPECS = {spec.name: spec for spec in VOCABULARIES}
+
+# Canvas locations holding vocabulary references ("*" matches every array item).
+# project.projectStage is free text in the schema (the app only suggests the
+# governance stages), so it is not checked.
+REFERENCES = [
+    ("persons/*/functionRoles/*", "function-roles"),
+    ("developerFeasibility/trlLevel/current", "trl-levels"),
+    ("developerFeasibility/trlLevel/target", "trl-levels"),
+    ("developerFeasibility/technicalRisk", "risk-levels"),
+    ("userExpectations/requirements/*/feasibility/technicalRisk", "risk-levels"),
+    ("dataAccess/datasets/*/duoTerms/*", "duo-terms"),
+]
+
+
+def _reference_tree() -> Dict[str, Any]:
+    """REFERENCES as a tree of path segments; leaves are vocabulary names."""
+    tree: Dict[str, Any] = {}
+    for path, name in REFERENCES:
+        *parents, last = path.split("/")
+        node = tree
+        for segment in parents:
+            node = node.setdefault(segment, {})
+        node[last] = name
+    return tree
+
+
+REFERENCE_TREE = _reference_tree()
+
+
+def _key(value: Any) -> str:
+    """Dictionary key for a reference value; JSON object keys must be strings."""
+    return json.dumps(value) if not isinstance(value, str) else value
+
+
+def vocabularies_digest(directory: Path = VOCABULARIES_DIR) -> str:
+    """Hash of the vocabulary files' contents."""
+    digest = hashlib.sha256()
+    for spec in VOCABULARIES:
+        digest.update(spec.name.encode("utf-8") + b"\0")
+        digest.update((directory / f"{spec.name}.json").read_bytes())
+    return digest.hexdigest()
+
+
+def build_index(directory: Path = VOCABULARIES_DIR) -> Dict[str, Any]:
+    """Reduce the vocabulary files to their lookup tables (the cached artifact's content)."""
+    vocabularies = {}
+    for spec in VOCABULARIES:
+        with open(directory / f"{spec.name}.json", "r", encoding="utf-8") as f:
+            data = json.load(f)
+        lookup: Dict[str, str] = {}
+        for entry in data.get(spec.items) or []:
+            if not isinstance(entry, dict) or "id" not in entry:
+                continue
+            for field in spec.keys:
+                if field in entry:
+                    value = spec.normalize(entry[field]) if spec.normalize else entry[field]
+                    lookup.setdefault(_key(value), entry["id"])
+        vocabularies[spec.name] = {"title": data.get("title", spec.name), "lookup": lookup}
+    return vocabularies
+
+
+class VocabularyIndex:
+    """O(1) lookups of vocabulary references, loaded once per process."""
+
+    def __init__(self, vocabularies: Dict[str, Any], digest: str = ""):
+        self.vocabularies = vocabularies
+        self.digest = digest
+
+    @classmethod
+    def load(cls, directory: Path = VOCABULARIES_DIR, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> "VocabularyIndex":
+        """Load the cached index, building and caching it first if the vocabularies changed."""
+        digest = vocabularies_digest(directory)
+        if cache_dir is None:
+            return cls(build_index(directory), digest)
+        path = cache_dir / f"index_v{INDEX_VERSION}_{digest[:16]}.json"
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f), digest)
+        except (OSError, json.JSONDecodeError):
+            pass
+        vocabularies = build_index(directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write atomically so concurrent workers never read a partial index
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(vocabularies, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        return cls(vocabularies, digest)
+
+    def resolve(self, name: str, value: Any) -> Optional[str]:
+        """ID of the entry of vocabulary ``name`` that ``value`` refers to, or None."""
+        spec = SPECS[name]
+        if spec.normalize:
+            value = spec.normalize(value)
+        return self.vocabularies[name]["lookup"].get(_key(value))
+
+    def __contains__(self, item: Tuple[str, Any]) -> bool:
+        name, value = item
+        return self.resolve(name, value) is not None
+
+    def references(self, canvas: Any) -> Iterator[Tuple[List[Any], str, Any]]:
+        """Every vocabulary reference in a canvas as (path, vocabulary name, value)."""
+        stack: List[Tuple[Any, Any, List[Any]]] = [(canvas, REFERENCE_TREE, [])]
+        while stack:
+            value, tree, path = stack.pop()
+            if isinstance(tree, str):
+                # Unset optional fields are left empty by the app
+                if value is not None and value != "":
+                    yield path, tree, value
+            elif isinstance(value, dict):
+                for key, subtree in reversed(tree.items()):
+                    if key in value:
+                        stack.append((value[key], subtree, path + [key]))
+            elif isinstance(value, list) and "*" in tree:
+                subtree = tree["*"]
+                for position in range(len(value) - 1, -1, -1):
+                    stack.append((value[position], subtree, path + [position]))
+
+    def check(self, canvas: Any) -> List[Issue]:
+        """Issues for every vocabulary reference that names no entry of its vocabulary."""
+        issues = []
+        for path, name, value in self.references(canvas):
+            issue = self.check_reference(path, name, value)
+            if issue is not None:
+                issues.append(issue)
+        return issues
+
+    def check_reference(self, path: List[Any], name: str, value: Any) -> Optional[Issue]:
+        """An issue if ``value`` (at ``path`` in a canvas) names no entry of vocabulary ``name``."""
+        if value is None or value == "" or self.resolve(name, value) is not None:
+            return None
+        title = self.vocabularies[name]["title"]
+        return Issue(json_pointer(path), f"{value!r} is not in the {title} vocabulary", "vocabulary")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Analyze requirement dependencies in canvases.
+
+For each canvas, prints the requirements in dependency order (everything a
+requirement depends on comes before it) and the critical path: the chain of
+dependencies with the largest total effort estimate. Unknown dependency
+targets, duplicate IDs and cycles are reported like
+``validate-examples.py --semantic`` does.
+
+    python tools/analyze-dependencies.py schema/examples/complete-canvas.json
+    python tools/analyze-dependencies.py corpus/ --weight count --json
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict
+
+from aac.batch import iter_sources
+from aac.dependencies import (
+    DependencyCycleError, DependencyGraph, canvas_requirements, count_weight, dependency_issues, effort_weight,
+)
+from aac.validation import is_rocrate
+
+WEIGHTS = {"effort": effort_weight, "count": count_weight}
+
+
+def analyze(canvas: Any, weight: str) -> Dict[str, Any]:
+    """Dependency report for one canvas."""
+    graph = DependencyGraph.from_requirements(canvas_requirements(canvas), WEIGHTS[weight])
+    report: Dict[str, Any] = {
+        "requirements": len(graph),
+        "issues": [issue.to_dict() for issue in dependency_issues(canvas)],
+    }
+    try:
+        path, total = graph.critical_path()
+        report["order"] = graph.topological_order()
+        report["criticalPath"] = {"requirements": path, "weight": total, "unit": weight}
+    except DependencyCycleError:
+        report["order"] = None
+        report["criticalPath"] = None
+    return report
+
+
+def print_report(name: str, report: Dict[str, Any]) -> None:
+    """Print a report as text."""
+    print(f"Analyzing: {name} ({report['requirements']} requirement(s))")
+    for issue in report["issues"]:
+        print(f"  ✗ {issue['pointer']}: {issue['message']}")
+    if report["order"] is None:
+        print("  No dependency order (the dependencies contain a cycle)\n")
+        return
+    if report["order"]:
+        print(f"  Order: {', '.join(report['order'])}")
+        critical = report["criticalPath"]
+        unit = "person-hours" if critical["unit"] == "effort" else "requirement(s)"
+        print(f"  Critical path: {' -> '.join(critical['requirements'])} ({critical['weight']:g} {unit})")
+    if not report["issues"]:
+        print("  ✓ No dependency issues")
+    print()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Report dependency order and critical path of canvas requirements.")
+    parser.add_argument("inputs", nargs="+", help="Canvas JSON files, directories, glob patterns or JSONL files")
+    parser.add_argument(
+        "--weight", choices=sorted(WEIGHTS), default="effort",
+        help="Critical path weight: effort estimate in person-hours, or requirement count (default: effort)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print one JSON report per line")
+    args = parser.parse_args()
+
+    failed = False
+    for source in iter_sources(args.inputs):
+        try:
+            data = json.loads(source.text) if source.text is not None else json.loads(source.path.read_text("utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: {source.name}: {e}", file=sys.stderr)
+            failed = True
+            continue
+        if is_rocrate(data):
+            continue
+        report = analyze(data, args.weight)
+        failed |= bool(report["issues"])
+        if args.json:
+            print(json.dumps({"name": source.name, **report}, ensure_ascii=False))
+        else:
+            print_report(source.name, report)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
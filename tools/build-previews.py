@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Build a static preview catalogue of a canvas corpus.
+
+Renders every canvas (JSON files, JSONL lines and RO-Crates) as the same
+one-page summary the app puts in RO-Crate downloads (aac.preview), plus a
+paginated index linking to them:
+
+    python tools/build-previews.py canvases/ --output-dir site/
+    python tools/build-previews.py 'portfolio/**/*.json' corpus.jsonl -o site/ --page-size 50 -j 8
+
+Builds are incremental: the manifest of the previous build
+(site/.preview-manifest.json) records each page's input hash, so only
+canvases whose hash changed are parsed and rendered (across a process pool),
+only pages whose HTML changed are written, and pages of canvases that are
+gone are removed.
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from aac.batch import default_jobs, iter_sources, map_chunks
+from aac.output import write_if_changed
+from aac.preview import (
+    MANIFEST_FILE, MANIFEST_VERSION, PageEntry, PreviewConfig, index_file, init_renderer, render_chunk,
+    render_context, render_index,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Build a static HTML preview catalogue of canvases.")
+    parser.add_argument("inputs", nargs="+", help="Directories, glob patterns, .json or .jsonl files")
+    parser.add_argument("--output-dir", "-o", type=Path, required=True, help="Directory for the site")
+    parser.add_argument("--page-size", type=int, default=100, help="Canvases per index page (default: 100)")
+    parser.add_argument("--title", default="Agentic Automation Canvas Catalogue", help="Index page title")
+    parser.add_argument(
+        "--date",
+        help="Date shown on canvases without a version or start date (default: today, UTC)",
+    )
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    return args
+
+
+def load_manifest(manifest_file: Path) -> Dict[str, Any]:
+    """Previous build's manifest, or an empty one if missing or from another version."""
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"pages": {}, "index": []}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"pages": {}, "index": []}
+    return manifest
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    today = args.date or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    jobs = args.jobs if args.jobs is not None else default_jobs()
+    output_dir = args.output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = output_dir / MANIFEST_FILE
+    started = time.perf_counter()
+
+    previous = load_manifest(manifest_file)
+    entries = {name: PageEntry.from_dict(name, data) for name, data in previous["pages"].items()}
+    config = PreviewConfig(str(output_dir), render_context(), today)
+    tasks = ((source, entries.get(source.name)) for source in iter_sources(args.inputs))
+
+    pages: List[PageEntry] = []
+    counts = {"rendered": 0, "written": 0, "unchanged": 0, "skipped": 0}
+    try:
+        for result in map_chunks(render_chunk, tasks, jobs=jobs, initializer=init_renderer, initargs=(config,),
+                                 chunk_size=32):
+            counts[result.status] += 1
+            counts["written"] += result.written
+            if result.entry is None:
+                print(f"  ✗ Skipped {result.name}: {result.message}")
+                continue
+            pages.append(result.entry)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # Pages of canvases that are gone (or were renamed)
+    current = {entry.page for entry in pages}
+    removed = 0
+    for entry in entries.values():
+        if entry.page not in current and (output_dir / entry.page).exists():
+            (output_dir / entry.page).unlink()
+            removed += 1
+
+    index_pages = max(1, -(-len(pages) // args.page_size))
+    index_written = 0
+    for page in range(1, index_pages + 1):
+        chunk = pages[(page - 1) * args.page_size:page * args.page_size]
+        index_written += write_if_changed(
+            output_dir / index_file(page),
+            render_index(chunk, page, index_pages, len(pages), args.page_size, args.title),
+        )
+    index_files = [index_file(page) for page in range(1, index_pages + 1)]
+    for stale in sorted(set(previous["index"]) - set(index_files)):
+        if (output_dir / stale).exists():
+            (output_dir / stale).unlink()
+
+    write_if_changed(manifest_file, json.dumps({
+        "version": MANIFEST_VERSION,
+        "index": index_files,
+        "pages": {entry.name: entry.to_dict() for entry in pages},
+    }, indent=1, ensure_ascii=False) + "\n")
+
+    elapsed = time.perf_counter() - started
+    print(f"Built {len(pages)} page(s) in {elapsed:.2f}s to {output_dir}/:")
+    print(f"  ✓ {counts['rendered']} rendered ({counts['written']} written), {counts['unchanged']} unchanged, "
+          f"{removed} removed")
+    print(f"  ✓ {index_pages} index page(s) ({index_written} written)")
+    if counts["skipped"]:
+        print(f"  ✗ {counts['skipped']} skipped")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Keep the version history of canvases in a compact, content-addressed store.
+
+`record` adds canvases as new versions (aac.history): each is split into
+its top-level sections, unchanged sections are shared with earlier versions
+and changed ones are stored as JSON Patch deltas, with a full snapshot every
+--snapshot-interval versions so any version is rebuilt from at most that
+many patches.
+
+    python tools/canvas-history.py record canvases/                 # key: project.projectId or path
+    python tools/canvas-history.py record archive/v*.json --key triage-assistant
+    python tools/canvas-history.py log triage-assistant
+    python tools/canvas-history.py show triage-assistant --at 2025-06-30 -o canvas.json
+    python tools/canvas-history.py diff triage-assistant 3 7
+    python tools/canvas-history.py stats
+
+Inputs are recorded in the order given (directories in sorted order); a
+canvas equal to the latest version of its key is not recorded again.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from aac.batch import iter_sources
+from aac.history import DEFAULT_STORE_FILE, HistoryError, HistoryStore, canvas_key
+from aac.validation import is_rocrate, load_json
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Record, list, retrieve and diff canvas versions.")
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=DEFAULT_STORE_FILE,
+        help="History store file (default: canvas-history.sqlite)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record canvases as new versions")
+    record.add_argument("inputs", nargs="+", help="Directories, glob patterns, .json or .jsonl files")
+    record.add_argument(
+        "--key",
+        help="Record every input as a version of this canvas (default: project.projectId, else the file path)",
+    )
+    record.add_argument(
+        "--snapshot-interval",
+        type=int,
+        help="Versions between full snapshots, for a new store (default: 16)",
+    )
+
+    commands.add_parser("list", help="List the canvases in the store")
+
+    log = commands.add_parser("log", help="List the versions of a canvas")
+    log.add_argument("key", help="Canvas key")
+    log.add_argument("--json", action="store_true", help="Print one JSON object per version")
+
+    show = commands.add_parser("show", help="Print a version of a canvas")
+    show.add_argument("key", help="Canvas key")
+    selector = show.add_mutually_exclusive_group()
+    selector.add_argument("--seq", type=int, help="Version number (see log)")
+    selector.add_argument("--version", help="Latest version with this version label")
+    selector.add_argument("--at", metavar="DATE", help="Latest version dated on or before DATE (YYYY-MM-DD)")
+    show.add_argument("--output", "-o", type=Path, help="Write the canvas to a file instead of stdout")
+
+    diff = commands.add_parser("diff", help="Print the JSON Patch between two versions of a canvas")
+    diff.add_argument("key", help="Canvas key")
+    diff.add_argument("old", type=int, help="Old version number")
+    diff.add_argument("new", type=int, help="New version number")
+
+    commands.add_parser("stats", help="Show how much the store saves")
+    return parser.parse_args()
+
+
+def run_record(args: argparse.Namespace, store: HistoryStore) -> int:
+    """Record every input canvas."""
+    started = time.perf_counter()
+    recorded = unchanged = 0
+    errors = []
+    for source in iter_sources(args.inputs):
+        try:
+            data = json.loads(source.text) if source.text is not None else load_json(source.path)
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError) as e:
+            errors.append(f"{source.name}: {e}")
+            continue
+        if not isinstance(data, dict) or is_rocrate(data):
+            errors.append(f"{source.name}: not a canvas (convert RO-Crates with convert-rocrates.py)")
+            continue
+        # JSONL line numbers are not stable enough to identify a canvas
+        key = args.key or canvas_key(data) or (source.name if source.line is None else None)
+        if key is None:
+            errors.append(f"{source.name}: no project.projectId; record it with --key")
+            continue
+        info = store.record(key, data)
+        if info is None:
+            unchanged += 1
+            continue
+        recorded += 1
+        label = f" ({info.version})" if info.version else ""
+        print(f"  ✓ {key}: version {info.seq}{label} from {source.name}, changed: {', '.join(info.changed)}")
+    store.commit()
+
+    for error in errors:
+        print(f"  ✗ {error}")
+    elapsed = time.perf_counter() - started
+    print(f"Recorded {recorded} version(s), {unchanged} unchanged in {elapsed:.2f}s ({args.store})")
+    return 1 if errors else 0
+
+
+def run_log(args: argparse.Namespace, store: HistoryStore) -> int:
+    """Print the versions of a canvas."""
+    for info in store.versions(args.key):
+        if args.json:
+            print(json.dumps(info.to_dict(), ensure_ascii=False))
+            continue
+        snapshot = " [snapshot]" if info.snapshot else ""
+        print(f"{info.seq:>4}  {info.version or '-':<10} {info.date}  {', '.join(info.changed)}{snapshot}")
+    return 0
+
+
+def run_show(args: argparse.Namespace, store: HistoryStore) -> int:
+    """Print or write one version of a canvas."""
+    seq, canvas = store.get(args.key, seq=args.seq, at=args.at, version=args.version)
+    text = json.dumps(canvas, indent=2, ensure_ascii=False) + "\n"
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        print(f"✓ Wrote version {seq} of {args.key} to {args.output}")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    if args.command != "record" and not args.store.exists():
+        print(f"Error: no history store at {args.store}; record canvases first", file=sys.stderr)
+        sys.exit(1)
+    try:
+        store = HistoryStore(args.store, getattr(args, "snapshot_interval", None))
+    except HistoryError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        if args.command == "record":
+            status = run_record(args, store)
+        elif args.command == "list":
+            for key, versions, date in store.keys():
+                print(f"{key}  {versions} version(s), latest {date}")
+            status = 0
+        elif args.command == "log":
+            status = run_log(args, store)
+        elif args.command == "show":
+            status = run_show(args, store)
+        elif args.command == "diff":
+            print(json.dumps(store.diff(args.key, args.old, args.new), indent=2, ensure_ascii=False))
+            status = 0
+        else:
+            stats = store.stats()
+            ratio = stats["storedBytes"] / stats["logicalBytes"] if stats["logicalBytes"] else 0
+            print(f"{stats['canvases']} canvas(es), {stats['versions']} version(s)")
+            print(f"  {stats['logicalBytes']} bytes as full copies (canonical JSON)")
+            print(f"  {stats['storedBytes']} bytes stored: {stats['blobs']} section blob(s), "
+                  f"{stats['patches']} patch(es) ({ratio:.1%})")
+            status = 0
+    except HistoryError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        status = 1
+    finally:
+        store.close()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Compile JSON Schemas into fast-path Python validator modules.
+
+Generates a plain Python validator for canvas-schema.json (and any other
+schema given on the command line) in the on-disk cache used by
+validate-examples.py. Modules are keyed by the schema hash, so running this
+again is a no-op until the schema changes.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from aac.codegen import DEFAULT_CACHE_DIR, UnsupportedSchemaError, build_fast_validator, compiled_module_path
+from aac.schemagraph import SchemaGraph
+from aac.validation import SCHEMA_FILE
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Compile JSON Schemas into fast-path validator modules.")
+    parser.add_argument("schemas", nargs="*", type=Path, help="Schema files (default: schema/canvas-schema.json)")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Output directory for compiled modules")
+    args = parser.parse_args()
+
+    failed = False
+    for schema_file in args.schemas or [SCHEMA_FILE]:
+        if not schema_file.exists():
+            print(f"Error: Schema file not found: {schema_file}", file=sys.stderr)
+            failed = True
+            continue
+
+        graph = SchemaGraph.from_file(schema_file)
+        cached = compiled_module_path(graph.root, args.cache_dir, graph).exists()
+        started = time.perf_counter()
+        try:
+            module_path = build_fast_validator(graph.root, args.cache_dir, graph)
+        except UnsupportedSchemaError as e:
+            print(f"Skipped: {schema_file} ({e}); jsonschema will be used instead")
+            continue
+        if cached:
+            print(f"Up to date: {module_path}")
+        else:
+            print(f"Compiled: {schema_file} -> {module_path} ({time.perf_counter() - started:.2f}s)")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
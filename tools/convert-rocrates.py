@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Convert RO-Crates back to raw canvas JSON in bulk.
+
+Uses the Python port of the web app's RO-Crate import (aac.crateimport):
+each crate's @graph is indexed once, mapped to canvas-schema.json
+structure and normalized like an imported RO-Crate ZIP in the app
+(aac.migrate), and the result is validated with the same engine as
+validate-examples.py. Crates are converted across a process pool; a crate
+that cannot be read or converted is reported and does not stop the run.
+
+    python tools/convert-rocrates.py archive/ --output-dir canvases/
+    python tools/convert-rocrates.py 'exports/*.rocrate.zip' crates.jsonl --jsonl canvases.jsonl
+    python tools/convert-rocrates.py schema/examples/complete-example.json --jsonl -
+
+Inputs can be ro-crate-metadata.json files, RO-Crate ZIP files, JSONL files
+with one crate per line, directories or glob patterns. Without an output
+option the crates are only converted and validated.
+"""
+
+import argparse
+import contextlib
+import datetime
+import itertools
+import sys
+import time
+from pathlib import Path
+
+try:
+    import jsonschema  # noqa: F401
+except ImportError:
+    print("Error: jsonschema package not found. Install with: uv sync", file=sys.stderr)
+    sys.exit(1)
+
+from aac.batch import Source, default_jobs, iter_sources, map_chunks
+from aac.crateimport import ConversionResult, ConvertConfig, convert_chunk, init_converter
+from aac.output import OutputDirectory
+from aac.validation import SCHEMA_FILE
+
+ARCHIVE_SUFFIXES = (".rocrate", ".crate")
+
+
+def output_name(source: Source) -> str:
+    """File name for a converted crate, e.g. ``study.json`` for study/ro-crate-metadata.json."""
+    path = source.path
+    stem = path.parent.name if path.name == "ro-crate-metadata.json" and path.parent.name else path.stem
+    for suffix in ARCHIVE_SUFFIXES:
+        if stem.endswith(suffix) and stem != suffix:
+            stem = stem[: -len(suffix)]
+    if source.line is not None:
+        stem = f"{stem}-{source.line}"
+    return f"{stem}.json"
+
+
+def print_result(result: ConversionResult, verbose: bool) -> None:
+    """Print one conversion result (successes only with --verbose)."""
+    if result.status == "skipped":
+        if verbose:
+            print(f"Skipping: {result.name} (not an RO-Crate)")
+        return
+    if not result.failed:
+        if verbose:
+            print(f"Converting: {result.name}")
+            for warning in result.warnings:
+                print(f"  ! {warning}")
+            print(f"  ✓ {'Valid' if result.status == 'valid' else 'Converted'}\n")
+        return
+
+    print(f"Converting: {result.name}")
+    for warning in result.warnings:
+        print(f"  ! {warning}")
+    if result.status == "error":
+        for issue in result.errors:
+            print(f"  ✗ {issue.message}")
+    else:
+        print("  ✗ Converted canvas is invalid:")
+        for issue in result.errors:
+            print(f"    - {issue}")
+            for sub in issue.context:
+                print(f"        {sub}")
+    print()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Convert RO-Crates to raw canvas JSON in bulk.")
+    parser.add_argument(
+        "inputs", nargs="+",
+        help="RO-Crate JSON or ZIP files, directories, glob patterns or JSONL files (one crate per line)",
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--output-dir", type=Path, help="Write one canvas JSON file per crate to this directory")
+    output.add_argument("--jsonl", metavar="FILE", help="Write the canvases as JSON Lines (- for stdout)")
+    parser.add_argument("--schema", type=Path, help="Schema file (default: schema/canvas-schema.json)")
+    parser.add_argument("--no-validate", action="store_true", help="Do not validate the converted canvases")
+    parser.add_argument(
+        "--no-normalize", action="store_true",
+        help="Keep the canvases as mapped from the crate, without migrating old values to the current schema",
+    )
+    parser.add_argument(
+        "--no-fast-path", action="store_true", help="Validate with jsonschema only, without the compiled validator"
+    )
+    parser.add_argument(
+        "--version-date", metavar="YYYY-MM-DD",
+        help="versionDate written to every canvas (default: today, like an import in the app)",
+    )
+    parser.add_argument(
+        "--skip-invalid", action="store_true", help="Do not write canvases that fail validation"
+    )
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="Crates per worker task (default: 16)")
+    parser.add_argument("--prefetch", type=int, default=64, help="Worker tasks in flight (default: 64)")
+    parser.add_argument("--max-errors-per-file", type=int, help="Stop reporting errors for a canvas after N")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Report every crate, not only failures")
+    args = parser.parse_args()
+    if args.version_date is not None:
+        try:
+            datetime.date.fromisoformat(args.version_date)
+        except ValueError:
+            parser.error("--version-date must be a date in YYYY-MM-DD format")
+    return args
+
+
+def run(args: argparse.Namespace) -> None:
+    """Convert the requested crates and exit with the result."""
+    schema_file = args.schema or SCHEMA_FILE
+    if not args.no_validate and not schema_file.exists():
+        print(f"Error: Schema file not found: {schema_file}", file=sys.stderr)
+        sys.exit(1)
+
+    config = ConvertConfig(
+        today=args.version_date or datetime.datetime.now(datetime.timezone.utc).date().isoformat(),
+        schema_file=None if args.no_validate else str(schema_file),
+        fast_path=not args.no_fast_path,
+        max_errors=args.max_errors_per_file,
+        indent=None if args.jsonl else 2,
+        normalize=not args.no_normalize,
+    )
+    jobs = args.jobs if args.jobs is not None else default_jobs()
+    directory = OutputDirectory(args.output_dir) if args.output_dir else None
+    stream = None
+    if args.jsonl:
+        stream = sys.__stdout__ if args.jsonl == "-" else open(args.jsonl, "w", encoding="utf-8")
+
+    counts = {"valid": 0, "invalid": 0, "converted": 0, "skipped": 0, "error": 0}
+    started = time.perf_counter()
+    # The tee only buffers the sources whose results are still in flight
+    sources, submitted = itertools.tee(iter_sources(args.inputs))
+    try:
+        results = map_chunks(
+            convert_chunk, submitted, jobs=jobs, initializer=init_converter, initargs=(config,),
+            prefetch=args.prefetch, chunk_size=args.chunk_size,
+        )
+        for source, result in zip(sources, results):
+            counts[result.status] += 1
+            print_result(result, args.verbose)
+            if result.text is None or (args.skip_invalid and result.status == "invalid"):
+                continue
+            if directory is not None:
+                directory.write(output_name(source), result.text)
+            elif stream is not None:
+                stream.write(result.text + "\n")
+    finally:
+        if stream is not None and stream is not sys.__stdout__:
+            stream.close()
+        elif stream is not None:
+            stream.flush()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(f"Converted {total - counts['skipped'] - counts['error']} of {total} document(s): "
+          f"{counts['valid']} valid, {counts['invalid']} invalid, {counts['converted']} not validated, "
+          f"{counts['error']} error(s), {counts['skipped']} skipped (not RO-Crates)")
+    rate = total / elapsed if elapsed > 0 else float("inf")
+    print(f"Processed {total} document(s) in {elapsed:.2f}s ({rate:.1f} files/s, {jobs} worker(s))")
+    if directory is not None:
+        print(f"Wrote {directory.written} file(s) to {directory.path} "
+              f"({sum(directory.used.values()) - directory.written} unchanged)")
+
+    if counts["invalid"] or counts["error"]:
+        print("Some crates could not be converted to valid canvases. See errors above.", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(0)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    if args.jsonl == "-":
+        # Keep stdout clean for the JSON Lines stream
+        with contextlib.redirect_stdout(sys.stderr):
+            run(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
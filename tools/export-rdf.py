@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Export canvases and RO-Crates as RDF for bulk loading into a triple store.
+
+Every canvas is written as triples whose predicates come from the ontology
+mappings of the reference documentation (aac.ontology, aac.rdf), as
+N-Triples or Turtle, optionally gzip-compressed:
+
+    python tools/export-rdf.py canvases/ --output canvases.nt
+    python tools/export-rdf.py 'portfolio/**/*.json' crates/ corpus.jsonl -o corpus.ttl.gz -j 8
+
+The format and compression follow the output suffix (.nt, .ttl, .gz) unless
+--format is given. Input files are split into contiguous shards that are
+exported in parallel, each streaming its canvases straight into a part file,
+so memory stays flat; the parts are then concatenated in input order, so the
+output is the same for any -j.
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from aac.batch import default_jobs, expand_inputs, map_chunks
+from aac.rdf import DEFAULT_BASE_IRI, FORMATS, ExportConfig, export_chunk, init_exporter, is_iri, merge_parts
+from aac.tables import shard_paths
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Export canvases and RO-Crates as N-Triples or Turtle.")
+    parser.add_argument("inputs", nargs="+", help="Directories, glob patterns, .json, .jsonl or .zip files")
+    parser.add_argument("--output", "-o", type=Path, required=True, help="Output file (.nt, .ttl, optionally .gz)")
+    parser.add_argument("--format", choices=FORMATS, help="nt (N-Triples) or ttl (Turtle) (default: from --output)")
+    parser.add_argument(
+        "--base",
+        default=DEFAULT_BASE_IRI,
+        help=f"IRI prefix for canvases whose projectId is not an IRI (default: {DEFAULT_BASE_IRI})",
+    )
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    suffixes = args.output.suffixes
+    args.compress = bool(suffixes) and suffixes[-1] == ".gz"
+    if args.format is None:
+        suffix = suffixes[-2 if args.compress else -1] if len(suffixes) > args.compress else ""
+        if suffix[1:] not in FORMATS:
+            parser.error("cannot tell the format from --output; use --format")
+        args.format = suffix[1:]
+    if not is_iri(args.base):
+        parser.error(f"--base must be an absolute IRI: {args.base}")
+    return args
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    paths = [str(path) for path in expand_inputs(args.inputs)]
+    if not paths:
+        print("Error: no input files found", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    jobs = min(args.jobs if args.jobs is not None else default_jobs(), len(paths))
+    # More shards than workers, so a slow shard does not hold up the others
+    shards = shard_paths(paths, jobs * 4 if jobs > 1 else 1)
+    output_dir = args.output.parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    part_dir = Path(tempfile.mkdtemp(prefix=".parts-", dir=output_dir))
+    config = ExportConfig(str(part_dir), args.format, args.compress, args.base)
+
+    canvases = triples = 0
+    skipped = []
+    try:
+        for result in map_chunks(export_chunk, shards, jobs=jobs, initializer=init_exporter, initargs=(config,),
+                                 chunk_size=1):
+            canvases += result.canvases
+            triples += result.triples
+            skipped.extend(result.skipped)
+        merge_parts(args.output, part_dir, len(shards), args.format, args.compress)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+    for message in skipped:
+        print(f"  ✗ Skipped {message}")
+    elapsed = time.perf_counter() - started
+    print(f"Exported {canvases} canvas(es) from {len(paths)} file(s) in {elapsed:.2f}s "
+          f"({len(shards)} shard(s), {jobs} worker(s)):")
+    print(f"  ✓ {triples} triple(s) to {args.output}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Export canvases as typed tables for analytics.
+
+Flattens every canvas into projects, requirements, benefits and risks
+tables (aac.tables) with stable keys (project_key, requirement_id,
+position), written as CSV and as compact binary columnar files (.cols,
+aac.columnar):
+
+    python tools/export-tables.py canvases/ --output-dir tables/
+    python tools/export-tables.py 'portfolio/**/*.json' corpus.jsonl -o tables/ --format cols -j 8
+
+Input files are split into contiguous shards that are exported in parallel,
+each streaming its canvases into column buffers that are flushed every
+--row-group-size rows, so memory stays flat; the shards' part files are then
+concatenated in input order, so the output is the same for any -j.
+
+Read a .cols table with aac.columnar.read_table(), e.g.
+
+    from aac.columnar import read_table
+    benefits = read_table("tables/benefits.cols", ["project_key", "baseline", "expected"])
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+from aac.batch import default_jobs, expand_inputs, map_chunks
+from aac.tables import FORMATS, TABLES, ExportConfig, export_chunk, init_exporter, merge_parts, shard_paths
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Export canvases as typed tables (CSV and binary columnar).")
+    parser.add_argument("inputs", nargs="+", help="Directories, glob patterns, .json or .jsonl files")
+    parser.add_argument("--output-dir", "-o", type=Path, required=True, help="Directory for the table files")
+    parser.add_argument(
+        "--format",
+        choices=FORMATS + ("all",),
+        default="all",
+        help="csv, cols (binary columnar) or all (default: all)",
+    )
+    parser.add_argument("--row-group-size", type=int, default=65536, help="Rows per flushed chunk (default: 65536)")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    if args.row_group_size < 1:
+        parser.error("--row-group-size must be at least 1")
+    return args
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    formats = FORMATS if args.format == "all" else (args.format,)
+    paths = [str(path) for path in expand_inputs(args.inputs)]
+    if not paths:
+        print("Error: no input files found", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    jobs = min(args.jobs if args.jobs is not None else default_jobs(), len(paths))
+    # More shards than workers, so a slow shard does not hold up the others
+    shards = shard_paths(paths, jobs * 4 if jobs > 1 else 1)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    part_dir = Path(tempfile.mkdtemp(prefix=".parts-", dir=args.output_dir))
+    config = ExportConfig(str(part_dir), formats, args.row_group_size)
+
+    canvases = 0
+    rows: Dict[str, int] = {table: 0 for table in TABLES}
+    skipped = []
+    try:
+        for result in map_chunks(export_chunk, shards, jobs=jobs, initializer=init_exporter, initargs=(config,),
+                                 chunk_size=1):
+            canvases += result.canvases
+            skipped.extend(result.skipped)
+            for table, count in result.rows.items():
+                rows[table] += count
+        merge_parts(args.output_dir, part_dir, len(shards), formats)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+    for message in skipped:
+        print(f"  ✗ Skipped {message}")
+    elapsed = time.perf_counter() - started
+    print(f"Exported {canvases} canvas(es) from {len(paths)} file(s) in {elapsed:.2f}s "
+          f"({len(shards)} shard(s), {jobs} worker(s)) to {args.output_dir}/ ({', '.join(formats)}):")
+    for table, count in rows.items():
+        print(f"  ✓ {table}: {count} row(s)")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,20 @@
 Generate reference documentation from JSON Schema.
 
 This script parses the AAC JSON Schema and generates Markdown reference
-documentation for each main type/object in the schema.
+documentation for each main type/object in the schema: an index page with
+the main schema properties and one page per top-level type. Unchanged pages
+are not rewritten.
 """
 
+import hashlib
 import json
-import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set
+
+from aac.ontology import ONTOLOGY_MAPPINGS
+from aac.output import ChangedFileWriter, write_if_changed
+from aac.schemagraph import RefCycleError, RefResolutionError, SchemaGraph
 
 
 def escape_markdown(text: str) -> str:
@@ -49,23 +55,34 @@ def format_type_name(type_name: str) -> str:
     return " ".join(formatted_parts)
 
 
-def format_type(schema: Dict[str, Any], defs: Dict[str, Any] = None) -> str:
-    """Format the type information from a schema."""
+def format_type(schema: Dict[str, Any], graph: SchemaGraph = None, links: Dict[str, str] = None) -> str:
+    """
+    Format the type information from a schema.
+
+    ``links`` maps type names to the page (and anchor) documenting them; without
+    it, references link to an anchor on the same page.
+    """
     if "$ref" in schema:
         # Resolve reference
         ref_path = schema["$ref"]
-        if ref_path.startswith("#/$defs/"):
-            ref_name = ref_path.replace("#/$defs/", "")
-            if defs and ref_name in defs:
-                # Check if it's a oneOf type (like BenefitValue) - don't link
-                ref_schema = defs[ref_name]
-                if "oneOf" in ref_schema:
-                    return ref_name
-                # Use anchor link within the same page instead of separate .md file
-                anchor = ref_name.lower().replace("_", "-")
-                return f"[{ref_name}](#{anchor})"
+        if graph is None:
+            return ref_path
+        try:
+            key = graph.resolve(ref_path, graph.base_of(schema))
+            ref_schema = resolve_ref(graph.get(key), graph)
+        except RefResolutionError:
+            return ref_path
+        ref_name = graph.definition_name(key)
+        if ref_name is None:
+            return ref_path
+        # Check if it's a oneOf type (like BenefitValue) - don't link
+        if "oneOf" in ref_schema:
             return ref_name
-        return ref_path
+        if links is not None and ref_name in links:
+            return f"[{ref_name}]({links[ref_name]})"
+        # Use anchor link within the same page instead of separate .md file
+        anchor = ref_name.lower().replace("_", "-")
+        return f"[{ref_name}](#{anchor})"
     
     if "type" in schema:
         if isinstance(schema["type"], list):
@@ -74,7 +91,7 @@ def format_type(schema: Dict[str, Any], defs: Dict[str, Any] = None) -> str:
         
         # Handle array types
         if schema_type == "array" and "items" in schema:
-            items_type = format_type(schema["items"], defs)
+            items_type = format_type(schema["items"], graph, links)
             return f"array of {items_type}"
         
         return schema_type
@@ -120,87 +137,6 @@ def format_constraints(schema: Dict[str, Any]) -> str:
     return "<br>".join(constraints) if constraints else ""
 
 
-# Mapping of generic fields to their underlying ontologies
-ONTOLOGY_MAPPINGS = {
-    # Schema.org mappings
-    "title": "schema:name",
-    "name": "schema:name",
-    "description": "schema:description",
-    "objective": "schema:abstract",
-    "startDate": "schema:startDate",
-    "endDate": "schema:endDate",
-    "keywords": "schema:keywords",
-    "projectId": "schema:identifier",
-    "identifier": "schema:identifier",
-    "pid": "schema:identifier",
-    "doi": "schema:identifier",
-    "license": "schema:license",
-    "publisher": "schema:publisher",
-    "author": "schema:author",
-    "authors": "schema:author",
-    "date": "schema:datePublished",
-    "datePublished": "schema:datePublished",
-    "format": "schema:encodingFormat",
-    "affiliation": "schema:affiliation",
-    "orcid": "schema:identifier",
-    
-    # DCAT mappings
-    "accessRights": "dct:accessRights",
-    "duoTerms": "dct:conformsTo",
-    
-    # PROV-O mappings
-    "startedAtTime": "prov:startedAtTime",
-    "endedAtTime": "prov:endedAtTime",
-    "wasAssociatedWith": "prov:wasAssociatedWith",
-    "wasGeneratedBy": "prov:wasGeneratedBy",
-    "wasInformedBy": "prov:wasInformedBy",
-    "hadPlan": "prov:hadPlan",
-    
-    # P-Plan mappings
-    "requirements": "p-plan:hasStep",
-    "milestones": "p-plan:hasMilestone",
-    "userStory": "p-plan:Step",
-    
-    # FRAPO mappings
-    "fundingGrant": "frapo:fundingGrant",
-    "leadOrganization": "frapo:leadOrganization",
-    "projectStage": "frapo:hasStatus",
-    "deliverables": "frapo:deliverable",
-    
-    # Custom AAC fields (no ontology mapping)
-    "headlineValue": None,
-    "aggregateBenefitValue": None,
-    "aggregateBenefitUnit": None,
-    "primaryValueDriver": None,
-    "aggregateBenefits": None,
-    "version": None,
-    "versionDate": None,
-    "isImported": None,
-    "benefitType": None,
-    "metricId": None,
-    "metricLabel": None,
-    "direction": None,
-    "valueMeaning": None,
-    "benefitUnit": None,
-    "baseline": None,
-    "expected": None,
-    "confidenceUser": None,
-    "confidenceDev": None,
-    "assumptions": None,
-    "aggregationBasis": None,
-    "unitOfWork": None,
-    "unitCategory": None,
-    "volumePerMonth": None,
-    "humanOversightMinutesPerUnit": None,
-    "roleContext": None,
-    "containsPersonalData": None,
-    "sensitivityLevel": None,
-    "evaluationType": None,
-    "metrics": None,
-    "complianceStandard": None,
-}
-
-
 def get_ontology_note(prop_name: str, prop_type: str = None) -> str:
     """Get ontology mapping note for a property."""
     # Check if property has an explicit ontology mapping first
@@ -230,7 +166,12 @@ def get_ontology_note(prop_name: str, prop_type: str = None) -> str:
     return "AAC"
 
 
-def generate_property_table(properties: Dict[str, Any], required: List[str], defs: Dict[str, Any] = None) -> str:
+def generate_property_table(
+    properties: Dict[str, Any],
+    required: List[str],
+    graph: SchemaGraph = None,
+    links: Dict[str, str] = None,
+) -> str:
     """Generate a Markdown table for object properties."""
     lines = [
         "| Property | Type | Required | Description | Constraints | Ontology |",
@@ -238,7 +179,7 @@ def generate_property_table(properties: Dict[str, Any], required: List[str], def
     ]
     
     for prop_name, prop_schema in sorted(properties.items()):
-        prop_type = format_type(prop_schema, defs)
+        prop_type = format_type(prop_schema, graph, links)
         is_required = "Yes" if prop_name in required else "No"
         description = prop_schema.get("description", "").replace("\n", " ")
         constraints = format_constraints(prop_schema)
@@ -252,23 +193,33 @@ def generate_property_table(properties: Dict[str, Any], required: List[str], def
     return "\n".join(lines)
 
 
-def resolve_ref(schema: Dict[str, Any], defs: Dict[str, Any]) -> Dict[str, Any]:
-    """Resolve a $ref reference to the actual schema."""
-    if "$ref" in schema:
-        ref_path = schema["$ref"]
-        if ref_path.startswith("#/$defs/"):
-            ref_name = ref_path.replace("#/$defs/", "")
-            if ref_name in defs:
-                return defs[ref_name]
-    return schema
-
-
-def extract_nested_types(properties: Dict[str, Any], defs: Dict[str, Any], type_name: str, seen: Set[str]) -> Dict[str, Dict[str, Any]]:
-    """Extract nested object types from properties."""
+def resolve_ref(schema: Dict[str, Any], graph: SchemaGraph) -> Dict[str, Any]:
+    """Resolve a $ref reference (following chains of them) to the actual schema."""
+    try:
+        return graph.deref(schema)[1]
+    except RefCycleError:
+        raise
+    except RefResolutionError:
+        return schema
+
+
+def extract_nested_types(
+    properties: Dict[str, Any],
+    graph: SchemaGraph,
+    type_name: str,
+    seen: Set[str],
+    visiting: FrozenSet[int] = frozenset(),
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract nested object types from properties.
+
+    ``visiting`` holds the object schemas on the current path, so recursive
+    schemas (a type containing itself through a $ref) stop instead of looping.
+    """
     nested_types = {}
     
     for prop_name, prop_schema in properties.items():
-        prop_schema = resolve_ref(prop_schema, defs)
+        prop_schema = resolve_ref(prop_schema, graph)
         
         # Skip if this is just a reference to a $def (we'll document $defs separately)
         if "$ref" in prop_schema:
@@ -279,34 +230,38 @@ def extract_nested_types(properties: Dict[str, Any], defs: Dict[str, Any], type_
             # Skip if items is just a reference to a $def
             if "$ref" in prop_schema.get("items", {}):
                 continue
-            items_schema = resolve_ref(prop_schema["items"], defs)
+            items_schema = resolve_ref(prop_schema["items"], graph)
             if items_schema.get("type") == "object" and "properties" in items_schema:
                 nested_name = f"{type_name}_{prop_name.rstrip('s')}"  # Remove plural
                 # Skip if this would duplicate a $def
-                if nested_name.lower() in [d.lower() for d in defs.keys()]:
+                if graph.find(nested_name, case_insensitive=True) or id(items_schema) in visiting:
                     continue
                 if nested_name not in seen and nested_name not in nested_types:
                     nested_types[nested_name] = items_schema
                     seen.add(nested_name)
                     # Recursively extract nested types
-                    nested_types.update(extract_nested_types(items_schema["properties"], defs, nested_name, seen))
+                    nested_types.update(extract_nested_types(
+                        items_schema["properties"], graph, nested_name, seen, visiting | {id(items_schema)}
+                    ))
         
         # Handle direct objects
         elif prop_schema.get("type") == "object" and "properties" in prop_schema:
             nested_name = f"{type_name}_{prop_name}"
             # Skip if this would duplicate a $def
-            if nested_name.lower() in [d.lower() for d in defs.keys()]:
+            if graph.find(nested_name, case_insensitive=True) or id(prop_schema) in visiting:
                 continue
             if nested_name not in seen and nested_name not in nested_types:
                 nested_types[nested_name] = prop_schema
                 seen.add(nested_name)
                 # Recursively extract nested types
-                nested_types.update(extract_nested_types(prop_schema["properties"], defs, nested_name, seen))
+                nested_types.update(extract_nested_types(
+                    prop_schema["properties"], graph, nested_name, seen, visiting | {id(prop_schema)}
+                ))
     
     return nested_types
 
 
-def generate_type_doc(type_name: str, type_schema: Dict[str, Any], defs: Dict[str, Any], output_dir: Path) -> None:
+def generate_type_doc(type_name: str, type_schema: Dict[str, Any], graph: SchemaGraph, output_dir: Path) -> None:
     """Generate documentation for a type."""
     title = format_type_name(type_name)
     description = type_schema.get("description", "")
@@ -320,7 +275,7 @@ def generate_type_doc(type_name: str, type_schema: Dict[str, Any], defs: Dict[st
     
     if properties:
         content += "## Properties\n\n"
-        content += generate_property_table(properties, required, defs)
+        content += generate_property_table(properties, required, graph)
         content += "\n"
     
     output_file = output_dir / f"{type_name.lower()}.md"
@@ -328,9 +283,9 @@ def generate_type_doc(type_name: str, type_schema: Dict[str, Any], defs: Dict[st
     print(f"Generated: {output_file}")
 
 
-def generate_defs_docs(defs: Dict[str, Any], output_dir: Path) -> None:
+def generate_defs_docs(graph: SchemaGraph, output_dir: Path) -> None:
     """Generate documentation for schema definitions."""
-    for def_name, def_schema in sorted(defs.items()):
+    for def_name, def_schema in sorted(graph.definitions().items()):
         # Skip oneOf types (like BenefitValue) - they don't have properties
         if "oneOf" in def_schema:
             continue
@@ -338,106 +293,270 @@ def generate_defs_docs(defs: Dict[str, Any], output_dir: Path) -> None:
         if def_schema.get("type") != "object":
             continue
         
-        generate_type_doc(def_name, def_schema, defs, output_dir)
-
-
-def generate_type_section(type_name: str, type_schema: Dict[str, Any], defs: Dict[str, Any]) -> str:
-    """Generate a section for a type (for inclusion in main reference page)."""
+        generate_type_doc(def_name, def_schema, graph, output_dir)
+
+
+def generate_type_section(
+    type_name: str,
+    type_schema: Dict[str, Any],
+    graph: SchemaGraph,
+    links: Dict[str, str] = None,
+    heading: bool = True,
+) -> str:
+    """
+    Generate a section for a type.
+
+    With ``heading=False`` the section has no title of its own, for the type a
+    page is named after (the page title already names it).
+    """
     title = format_type_name(type_name)
     description = type_schema.get("description", "")
     properties = type_schema.get("properties", {})
     required = type_schema.get("required", [])
-    
-    content = f"\n## {title}\n\n"
-    
+
+    parts = [f"\n## {title}\n\n"] if heading else []
     if description:
-        content += f"{description}\n\n"
-    
+        parts.append(f"{description}\n\n")
     if properties:
-        content += generate_property_table(properties, required, defs)
-        content += "\n"
-    
-    return content
+        parts.append(generate_property_table(properties, required, graph, links))
+        parts.append("\n")
+    return "".join(parts)
+
+
+# Main object types to document
+MAIN_TYPES = {
+    "project": "Project",
+    "userExpectations": "User Expectations",
+    "developerFeasibility": "Developer Feasibility",
+    "governance": "Governance",
+    "dataAccess": "Data Access",
+    "outcomes": "Outcomes",
+    "persons": "Person"
+}
 
+INDEX_INTRO = (
+    "# Schema Reference\n\n"
+    "This section provides detailed reference documentation for all types and properties in the AAC schema.\n\n"
+    "!!! info \"Ontology Alignment\"\n"
+    "    The reference tables include an **Ontology** column indicating which standard vocabulary each generic "
+    "field maps to. Fields marked with an ontology (e.g., \"Schema.org\", \"DCAT/Dublin Core\") align with "
+    "established standards. Complex object types show \"—\" (not applicable). Custom AAC-specific fields are "
+    "marked with \"AAC\". See the [schema ontology alignment](../schema/index.md#ontology-alignment) section for "
+    "more details.\n\n"
+)
+
+# Rendered sections from the previous run, keyed by a hash of their inputs
+MANIFEST_FILE = Path(__file__).resolve().parent.parent / ".cache" / "reference-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def collect_types(graph: SchemaGraph) -> Dict[str, Dict[str, Any]]:
+    """All documented object types (main properties, their nested objects and $defs) by type name."""
+    properties = graph.root.get("properties", {})
+    defs = graph.definitions()
 
-def generate_main_types_docs(schema: Dict[str, Any], output_dir: Path) -> None:
-    """Generate documentation for main schema types."""
-    properties = schema.get("properties", {})
-    required = schema.get("required", [])
-    defs = schema.get("$defs", {})
-    
     # Extract nested types from main properties
     seen = set()
     nested_types = {}
-    
-    # Main object types to document
-    main_types = {
-        "project": "Project",
-        "userExpectations": "User Expectations",
-        "developerFeasibility": "Developer Feasibility",
-        "governance": "Governance",
-        "dataAccess": "Data Access",
-        "outcomes": "Outcomes",
-        "persons": "Person"
-    }
-    
+
     for prop_name, prop_schema in properties.items():
-        prop_schema = resolve_ref(prop_schema, defs)
+        prop_schema = resolve_ref(prop_schema, graph)
         
         # Handle arrays (like persons)
         if prop_schema.get("type") == "array" and "items" in prop_schema:
-            items_schema = resolve_ref(prop_schema["items"], defs)
+            items_schema = resolve_ref(prop_schema["items"], graph)
             if items_schema.get("type") == "object":
                 type_name = prop_name.rstrip("s")  # Remove plural
                 nested_types[type_name] = items_schema
                 seen.add(type_name)
                 # Extract nested types
                 if "properties" in items_schema:
-                    nested_types.update(extract_nested_types(items_schema["properties"], defs, type_name, seen))
+                    nested_types.update(extract_nested_types(items_schema["properties"], graph, type_name, seen))
         
         # Handle direct objects
-        elif prop_schema.get("type") == "object" and prop_name in main_types:
+        elif prop_schema.get("type") == "object" and prop_name in MAIN_TYPES:
             nested_types[prop_name] = prop_schema
             seen.add(prop_name)
             # Extract nested types
             if "properties" in prop_schema:
-                nested_types.update(extract_nested_types(prop_schema["properties"], defs, prop_name, seen))
-    
-    # Generate main schema overview with all types as sections
-    content = "# Schema Reference\n\n"
-    content += "This section provides detailed reference documentation for all types and properties in the AAC schema.\n\n"
-    
-    content += "!!! info \"Ontology Alignment\"\n"
-    content += "    The reference tables include an **Ontology** column indicating which standard vocabulary each generic field maps to. Fields marked with an ontology (e.g., \"Schema.org\", \"DCAT/Dublin Core\") align with established standards. Complex object types show \"—\" (not applicable). Custom AAC-specific fields are marked with \"AAC\". See the [schema ontology alignment](../schema/index.md#ontology-alignment) section for more details.\n\n"
-    
-    content += "## Main Schema Properties\n\n"
-    content += generate_property_table(properties, required, defs)
-    content += "\n"
+                nested_types.update(extract_nested_types(prop_schema["properties"], graph, prop_name, seen))
     
-    # Collect all types (nested + defs) for sorting
-    all_types = {}
-    
-    # Add nested types
-    for type_name, type_schema in nested_types.items():
-        all_types[type_name] = type_schema
-    
-    # Add $defs types
+    # Collect all types (nested + defs)
+    all_types = dict(nested_types)
     for def_name, def_schema in defs.items():
         if def_name not in ["BenefitValue"]:  # Skip oneOf types
             if def_schema.get("type") == "object":
                 all_types[def_name] = def_schema
-    
-    # Generate sections for all types, sorted alphabetically
-    for type_name in sorted(all_types.keys()):
-        type_schema = all_types[type_name]
-        content += generate_type_section(type_name, type_schema, defs)
-    
-    # Ensure file ends with newline
-    content = content.rstrip() + "\n"
-    
-    output_file = output_dir / "index.md"
-    output_file.write_text(content, encoding="utf-8")
-    print(f"Generated: {output_file}")
+    return all_types
+
+
+def group_pages(all_types: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Group types into pages: one page per top-level type, holding its nested types.
+
+    Nested type names extend their parent's with ``_`` (``governance_stage``),
+    so the page is named after the first component. Types are sorted within
+    and across pages.
+    """
+    pages: Dict[str, List[str]] = {}
+    for type_name in sorted(all_types):
+        pages.setdefault(type_name.split("_")[0], []).append(type_name)
+    return pages
+
+
+def section_anchor(type_name: str) -> str:
+    """Anchor mkdocs generates for a type's section heading."""
+    return format_type_name(type_name).lower().replace(" ", "-")
+
+
+def content_hash(*parts: Any) -> str:
+    """Hash of JSON-serializable inputs, used to detect changed sections."""
+    data = json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(manifest_file: Path) -> Dict[str, Any]:
+    """Previous run's manifest, or an empty one if missing or from another version."""
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"sections": {}, "pages": []}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"sections": {}, "pages": []}
+    return manifest
+
+
+class SectionRenderer:
+    """Renders sections, reusing the previous run's text for sections whose inputs are unchanged."""
+
+    def __init__(self, previous: Dict[str, Any], context: str):
+        self.previous = previous.get("sections", {})
+        self.context = context
+        self.sections: Dict[str, Dict[str, str]] = {}
+        self.rendered = 0
+        self.reused = 0
+
+    def render(self, key: str, fragment: Any, render: Callable[[], str]) -> str:
+        digest = content_hash(self.context, fragment)
+        cached = self.previous.get(key)
+        if cached and cached.get("hash") == digest:
+            text = cached["text"]
+            self.reused += 1
+        else:
+            text = render()
+            self.rendered += 1
+        self.sections[key] = {"hash": digest, "text": text}
+        return text
+
+
+def generate_main_types_docs(
+    schema: Dict[str, Any],
+    output_dir: Path,
+    manifest_file: Path = MANIFEST_FILE,
+    graph: Optional[SchemaGraph] = None,
+) -> None:
+    """
+    Generate the reference pages for the main schema types.
+
+    ``index.md`` holds the main schema properties and links to one page per
+    top-level type. Each section's text is reused from the manifest when its
+    schema fragment is unchanged, and pages whose content is identical to the
+    file on disk are not written at all, so unchanged pages keep their
+    modification time and incremental doc builds skip them.
+    """
+    properties = schema.get("properties", {})
+    required = schema.get("required", [])
+    graph = graph or SchemaGraph(schema)
+    defs = graph.definitions()
+
+    all_types = collect_types(graph)
+    pages = group_pages(all_types)
+
+    # Where each type is documented, for links between pages
+    links = {}
+    for page_name, type_names in pages.items():
+        for position, type_name in enumerate(type_names):
+            page_file = f"{page_name.lower()}.md"
+            links[type_name] = page_file if position == 0 else f"{page_file}#{section_anchor(type_name)}"
+
+    # Everything a section's text depends on besides its own schema fragment;
+    # the generator's own source is included so template changes re-render
+    context = content_hash(
+        Path(__file__).read_text(encoding="utf-8"),
+        links,
+        sorted(name for name, d in defs.items() if "oneOf" in d),
+    )
+    previous = load_manifest(manifest_file)
+    renderer = SectionRenderer(previous, context)
+    written: List[Path] = []
+    unchanged = 0
+
+    def finish(writer: ChangedFileWriter) -> None:
+        nonlocal unchanged
+        if writer.changed:
+            written.append(writer.path)
+        else:
+            unchanged += 1
+
+    with ChangedFileWriter(output_dir / "index.md") as writer:
+        writer.write(INDEX_INTRO)
+        writer.write(renderer.render(
+            "index:properties",
+            [properties, required],
+            lambda: "## Main Schema Properties\n\n" + generate_property_table(properties, required, graph, links) + "\n",
+        ))
+        writer.write("\n## Types\n\n")
+        for page_name, type_names in pages.items():
+            writer.write(f"- [{format_type_name(page_name)}]({page_name.lower()}.md)")
+            nested = [format_type_name(t)[len(format_type_name(page_name)) + 1:] for t in type_names[1:]]
+            writer.write(f": {', '.join(nested)}\n" if nested else "\n")
+    finish(writer)
+
+    for page_name, type_names in pages.items():
+        with ChangedFileWriter(output_dir / f"{page_name.lower()}.md") as writer:
+            writer.write(f"# {format_type_name(page_name)}\n\n")
+            for position, type_name in enumerate(type_names):
+                type_schema = all_types[type_name]
+                writer.write(renderer.render(
+                    f"type:{type_name}",
+                    [type_schema, position == 0],
+                    lambda: generate_type_section(type_name, type_schema, graph, links, heading=position != 0),
+                ))
+        finish(writer)
+
+    # Remove pages generated last time for types that no longer exist
+    page_files = ["index.md"] + [f"{page_name.lower()}.md" for page_name in pages]
+    for stale in sorted(set(previous.get("pages", [])) - set(page_files)):
+        stale_file = output_dir / stale
+        if stale_file.exists():
+            stale_file.unlink()
+            print(f"Removed: {stale_file}")
+
+    for path in written:
+        print(f"Generated: {path}")
+    print(f"Unchanged: {unchanged} page(s); sections rendered: {renderer.rendered}, reused: {renderer.reused}")
+
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(manifest_file, json.dumps({
+        "version": MANIFEST_VERSION,
+        "pages": page_files,
+        "sections": renderer.sections,
+    }, indent=1, ensure_ascii=False) + "\n")
+
+    check_nav(page_files, output_dir)
+
+
+def check_nav(page_files: List[str], output_dir: Path) -> None:
+    """Warn about generated pages missing from the mkdocs.yml nav."""
+    mkdocs_file = output_dir.parent.parent / "mkdocs.yml"
+    if not mkdocs_file.exists():
+        return
+    nav = mkdocs_file.read_text(encoding="utf-8")
+    missing = [name for name in page_files if f"reference/{name}" not in nav]
+    if missing:
+        print(f"Warning: add to the Reference nav in {mkdocs_file.name}: "
+              f"{', '.join('reference/' + name for name in missing)}", file=sys.stderr)
 
 
 def main():
@@ -455,11 +574,15 @@ def main():
         print(f"Error: Schema file not found: {schema_file}", file=sys.stderr)
         sys.exit(1)
     
-    with open(schema_file, "r", encoding="utf-8") as f:
-        schema = json.load(f)
+    # Index the schema (and any documents it references) once
+    graph = SchemaGraph.from_file(schema_file)
     
-    # Generate main types documentation (includes nested types as sections in single page)
-    generate_main_types_docs(schema, output_dir)
+    # Generate the reference pages (one per main type, nested types as sections)
+    try:
+        generate_main_types_docs(graph.root, output_dir, graph=graph)
+    except RefCycleError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
     
     print(f"\nReference documentation generated in: {output_dir}")
 
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Generate RO-Crates from canvas JSON in bulk, without the web app.
+
+Uses the Python port of the app's RO-Crate export (aac.crateexport): every
+canvas is checked like an export in the app, turned into the same
+ro-crate-metadata.json the app downloads and validated against
+schema/rocrate-profile.json. Canvases are converted across a process pool;
+a canvas that cannot be read, exported or converted is reported and does not
+stop the run.
+
+    python tools/generate-rocrates.py canvases/ --output-dir crates/
+    python tools/generate-rocrates.py 'portfolio/**/*.json' records.jsonl --jsonl crates.jsonl -j 8
+    python tools/generate-rocrates.py schema/examples/complete-example.json --jsonl -
+    python tools/generate-rocrates.py --check-spec
+
+Inputs can be canvas JSON files, JSONL files with one canvas per line,
+directories or glob patterns. Without an output option the crates are only
+generated and validated. Throughput and peak memory (of this process and of
+the busiest worker) are reported for every --batch-size canvases.
+"""
+
+import argparse
+import contextlib
+import datetime
+import itertools
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import jsonschema  # noqa: F401
+except ImportError:
+    print("Error: jsonschema package not found. Install with: uv sync", file=sys.stderr)
+    sys.exit(1)
+
+from aac import __version__
+from aac.batch import Source, default_jobs, iter_sources, map_chunks, peak_rss_mb
+from aac.crateexport import (
+    RO_CRATE_SPEC,
+    GenerateConfig,
+    GenerationResult,
+    canvas_to_crate,
+    generate_chunk,
+    init_generator,
+)
+from aac.output import OutputDirectory
+
+CRATE_SUFFIX = ".rocrate.json"
+MODEL_CARD = "https://example.com/model-card/gpt-4o"
+LICENSE = "https://creativecommons.org/licenses/by/4.0/"
+
+
+def output_name(source: Source) -> str:
+    """File name for a generated crate, e.g. ``study.rocrate.json`` for study.json."""
+    stem = source.path.stem
+    if source.line is not None:
+        stem = f"{stem}-{source.line}"
+    return f"{stem}{CRATE_SUFFIX}"
+
+
+def _entity(crate: Dict[str, Any], entity_id: str) -> Dict[str, Any]:
+    return next((entity for entity in crate["@graph"] if entity.get("@id") == entity_id), {})
+
+
+def _canvas(title: str, **sections: Any) -> Dict[str, Any]:
+    return {"project": {"title": title, "description": ""}, **sections}
+
+
+def _requirements(*feasibilities: Dict[str, Any]) -> Dict[str, Any]:
+    return {"requirements": [{"id": f"req-{index + 1}", "title": f"Task {index + 1}", "benefits": [],
+                              "feasibility": feasibility} for index, feasibility in enumerate(feasibilities)]}
+
+
+def _is_model(entity: Dict[str, Any]) -> bool:
+    return (entity.get("@type") == "schema:SoftwareApplication"
+            and entity.get("schema:applicationCategory") == "Machine Learning Model")
+
+
+def _is_iso_date(value: Any) -> bool:
+    try:
+        return isinstance(value, str) and len(value) == 10 and datetime.date.fromisoformat(value) is not None
+    except ValueError:
+        return False
+
+
+MINIMAL = _canvas("Minimal Project")
+MODEL_CANVAS = _canvas("Model Card Test", userExpectations=_requirements(
+    {"modelSelection": "frontier-model", "modelName": "gpt-4o", "modelCardUri": MODEL_CARD}))
+SHEET_URI = "https://example.com/sheets/ds-1"
+SHEET_CANVAS = _canvas("Dataset Sheet Test", dataAccess={"datasets": [
+    {"id": "ds-1", "title": "Test Dataset", "accessRights": "open", "datasetSheetUri": SHEET_URI}]})
+
+# The cases of src/utils/rocrate.spec.ts: (description, canvas, schema version, check of the crate)
+SPEC_CASES: List[Tuple[str, Dict[str, Any], Optional[str], Callable[[Dict[str, Any]], bool]]] = [
+    ("returns @graph that exists and is an array", MINIMAL, None,
+     lambda crate: isinstance(crate.get("@graph"), list)),
+    ('contains root entity with @id "./"', MINIMAL, None,
+     lambda crate: bool(_entity(crate, "./"))),
+    ("root has aac:version", MINIMAL, None,
+     lambda crate: isinstance(_entity(crate, "./").get("aac:version"), str)),
+    ("with schemaVersion option, root has aac:schemaVersion", MINIMAL, "0.10.0",
+     lambda crate: _entity(crate, "./").get("aac:schemaVersion") == "0.10.0"),
+    ("metadata descriptor conformsTo references RO-Crate 1.2", MINIMAL, None,
+     lambda crate: _entity(crate, "ro-crate-metadata.json").get("conformsTo") == {"@id": RO_CRATE_SPEC}),
+    ("root has datePublished in ISO date format", MINIMAL, None,
+     lambda crate: _is_iso_date(_entity(crate, "./").get("datePublished"))),
+    ("includes license contextual entity when project has license",
+     {"project": {"title": "Licensed Project", "description": "", "license": LICENSE}}, None,
+     lambda crate: _entity(crate, "./").get("license") == {"@id": LICENSE} and bool(_entity(crate, LICENSE))),
+    ("does not include license when project has no license", MINIMAL, None,
+     lambda crate: "license" not in _entity(crate, "./")),
+    ("emits SoftwareApplication entity for model card URI", MODEL_CANVAS, None,
+     lambda crate: _is_model(_entity(crate, MODEL_CARD))
+     and _entity(crate, MODEL_CARD).get("schema:url") == MODEL_CARD
+     and _entity(crate, MODEL_CARD).get("name") == "gpt-4o"),
+    ("step entity has aac:model and prov:used reference to model", MODEL_CANVAS, None,
+     lambda crate: _entity(crate, "#req-1").get("aac:model") == {"@id": MODEL_CARD}
+     and _entity(crate, "#req-1").get("prov:used") == {"@id": MODEL_CARD}),
+    ("no model entity emitted when modelCardUri is absent",
+     _canvas("No Model Card",
+             userExpectations=_requirements({"modelSelection": "frontier-model", "modelName": "gpt-4o"})),
+     None, lambda crate: not any(_is_model(entity) for entity in crate["@graph"])),
+    ("deduplicates when multiple tasks share the same model URI",
+     _canvas("Shared Model", userExpectations=_requirements({"modelName": "gpt-4o", "modelCardUri": MODEL_CARD},
+                                                            {"modelName": "gpt-4o", "modelCardUri": MODEL_CARD})),
+     None, lambda crate: sum(entity.get("@id") == MODEL_CARD for entity in crate["@graph"]) == 1),
+    ("sets dcat:landingPage when datasetSheetUri is present", SHEET_CANVAS, None,
+     lambda crate: _entity(crate, "#dataset-0").get("dcat:landingPage") == {"@id": SHEET_URI}),
+    ("no dcat:landingPage when datasetSheetUri is absent",
+     _canvas("No Sheet Test",
+             dataAccess={"datasets": [{"id": "ds-1", "title": "Test Dataset", "accessRights": "open"}]}),
+     None, lambda crate: "dcat:landingPage" not in _entity(crate, "#dataset-0")),
+]
+
+
+def check_spec() -> int:
+    """Run the generator against the cases of the app's rocrate.spec.ts."""
+    failed = 0
+    for description, canvas, schema_version, check in SPEC_CASES:
+        crate, _ = canvas_to_crate(canvas, schema_version=schema_version)
+        if check(crate):
+            print(f"  ✓ {description}")
+        else:
+            failed += 1
+            print(f"  ✗ {description}")
+    print(f"{len(SPEC_CASES) - failed} of {len(SPEC_CASES)} rocrate.spec.ts case(s) passed")
+    return 1 if failed else 0
+
+
+def print_result(result: GenerationResult, verbose: bool) -> None:
+    """Print one generation result (successes only with --verbose)."""
+    if result.status == "skipped":
+        if verbose:
+            print(f"Skipping: {result.name} (already an RO-Crate)")
+        return
+    if not result.failed:
+        if verbose:
+            print(f"Generating: {result.name}")
+            for warning in result.warnings:
+                print(f"  ! {warning}")
+            print(f"  ✓ {'Valid' if result.status == 'valid' else 'Generated'}\n")
+        return
+
+    print(f"Generating: {result.name}")
+    for warning in result.warnings:
+        print(f"  ! {warning}")
+    if result.status == "error":
+        for issue in result.errors:
+            print(f"  ✗ {issue.message}")
+    elif result.status == "blocked":
+        print("  ✗ Canvas cannot be exported:")
+        for issue in result.errors:
+            print(f"    - {issue}")
+    else:
+        print("  ✗ Generated crate does not conform to the RO-Crate profile:")
+        for issue in result.errors:
+            print(f"    - {issue}")
+            for sub in issue.context:
+                print(f"        {sub}")
+    print()
+
+
+class BatchMeter:
+    """Reports throughput and peak memory for every ``size`` results."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.batches = 0
+        self.count = 0
+        self.worker_peak: Optional[float] = None
+        self.started = time.perf_counter()
+
+    def add(self, result: GenerationResult) -> None:
+        self.count += 1
+        if result.peak_rss_mb is not None:
+            self.worker_peak = max(self.worker_peak or 0.0, result.peak_rss_mb)
+        if self.count == self.size:
+            self.report()
+
+    def report(self) -> None:
+        if not self.count:
+            return
+        elapsed = time.perf_counter() - self.started
+        rate = self.count / elapsed if elapsed > 0 else float("inf")
+        self.batches += 1
+        print(f"Batch {self.batches}: {self.count} canvas(es) in {elapsed:.2f}s ({rate:.1f} canvases/s), "
+              f"peak RSS {_mib(peak_rss_mb())} (main), {_mib(self.worker_peak)} (workers)")
+        self.count = 0
+        self.worker_peak = None
+        self.started = time.perf_counter()
+
+
+def _mib(value: Optional[float]) -> str:
+    return f"{value:.1f} MiB" if value is not None else "n/a"
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Generate RO-Crates from canvas JSON in bulk.")
+    parser.add_argument(
+        "inputs", nargs="*",
+        help="Canvas JSON files, directories, glob patterns or JSONL files (one canvas per line)",
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "--output-dir", type=Path, help=f"Write one crate per canvas to this directory (<name>{CRATE_SUFFIX})"
+    )
+    output.add_argument("--jsonl", metavar="FILE", help="Write the crates as JSON Lines (- for stdout)")
+    parser.add_argument(
+        "--date", metavar="YYYY-MM-DD",
+        help="datePublished of every crate and versionDate of canvases without one (default: today)",
+    )
+    parser.add_argument(
+        "--schema-version", default=__version__,
+        help=f"aac:schemaVersion recorded in every crate (default: {__version__})",
+    )
+    parser.add_argument(
+        "--no-validate", action="store_true", help="Do not validate the crates against the RO-Crate profile"
+    )
+    parser.add_argument(
+        "--no-fast-path", action="store_true", help="Validate with jsonschema only, without the compiled validator"
+    )
+    parser.add_argument("--skip-invalid", action="store_true", help="Do not write crates that fail validation")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="Canvases per worker task (default: 16)")
+    parser.add_argument("--prefetch", type=int, default=64, help="Worker tasks in flight (default: 64)")
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Canvases per throughput and memory report (default: 1000)"
+    )
+    parser.add_argument("--max-errors-per-file", type=int, help="Stop reporting errors for a crate after N")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Report every canvas, not only failures")
+    parser.add_argument(
+        "--check-spec", action="store_true", help="Check the generator against the app's rocrate.spec.ts cases"
+    )
+    args = parser.parse_args()
+    if not args.inputs and not args.check_spec:
+        parser.error("no inputs given")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.date is not None:
+        try:
+            datetime.date.fromisoformat(args.date)
+        except ValueError:
+            parser.error("--date must be a date in YYYY-MM-DD format")
+    return args
+
+
+def run(args: argparse.Namespace) -> None:
+    """Generate the requested crates and exit with the result."""
+    config = GenerateConfig(
+        today=args.date or datetime.datetime.now(datetime.timezone.utc).date().isoformat(),
+        schema_version=args.schema_version or None,
+        validate=not args.no_validate,
+        fast_path=not args.no_fast_path,
+        max_errors=args.max_errors_per_file,
+        indent=None if args.jsonl else 2,
+    )
+    jobs = args.jobs if args.jobs is not None else default_jobs()
+    directory = OutputDirectory(args.output_dir, CRATE_SUFFIX) if args.output_dir else None
+    stream = None
+    if args.jsonl:
+        stream = sys.__stdout__ if args.jsonl == "-" else open(args.jsonl, "w", encoding="utf-8")
+
+    counts = {"valid": 0, "invalid": 0, "generated": 0, "blocked": 0, "skipped": 0, "error": 0}
+    meter = BatchMeter(args.batch_size)
+    started = time.perf_counter()
+    # The tee only buffers the sources whose results are still in flight
+    sources, submitted = itertools.tee(iter_sources(args.inputs))
+    try:
+        results = map_chunks(
+            generate_chunk, submitted, jobs=jobs, initializer=init_generator, initargs=(config,),
+            prefetch=args.prefetch, chunk_size=args.chunk_size,
+        )
+        for source, result in zip(sources, results):
+            counts[result.status] += 1
+            print_result(result, args.verbose)
+            if result.text is not None and not (args.skip_invalid and result.status == "invalid"):
+                if directory is not None:
+                    directory.write(output_name(source), result.text)
+                elif stream is not None:
+                    stream.write(result.text + "\n")
+            meter.add(result)
+        meter.report()
+    finally:
+        if stream is not None and stream is not sys.__stdout__:
+            stream.close()
+        elif stream is not None:
+            stream.flush()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    generated = counts["valid"] + counts["invalid"] + counts["generated"]
+    print(f"Generated {generated} of {total} document(s): {counts['valid']} valid, {counts['invalid']} invalid, "
+          f"{counts['generated']} not validated, {counts['blocked']} blocked, {counts['error']} error(s), "
+          f"{counts['skipped']} skipped (already RO-Crates)")
+    rate = total / elapsed if elapsed > 0 else float("inf")
+    print(f"Processed {total} document(s) in {elapsed:.2f}s ({rate:.1f} files/s, {jobs} worker(s))")
+    if directory is not None:
+        print(f"Wrote {directory.written} file(s) to {directory.path} "
+              f"({sum(directory.used.values()) - directory.written} unchanged)")
+
+    if counts["invalid"] or counts["blocked"] or counts["error"]:
+        print("Some canvases could not be exported as valid RO-Crates. See errors above.", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(0)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    if args.check_spec:
+        status = check_spec()
+        if status or not args.inputs:
+            sys.exit(status)
+    if args.jsonl == "-":
+        # Keep stdout clean for the JSON Lines stream
+        with contextlib.redirect_stdout(sys.stderr):
+            run(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Migrate stored canvases to the current schema version.
+
+Each canvas gets only the migration steps it needs (aac.migrate): the
+schema version it was written against is inferred from the oldest legacy
+shape it contains, or given with --from. Canvases are read lazily and
+migrated across a process pool, so memory stays flat for any corpus size.
+Migrated files are replaced atomically, and files that need no migration
+are not touched.
+
+    python tools/migrate-canvases.py corpus/ --dry-run
+    python tools/migrate-canvases.py corpus/ --diff | less
+    python tools/migrate-canvases.py corpus/ 'archive/**/*.jsonl'
+    python tools/migrate-canvases.py old.jsonl --jsonl migrated.jsonl
+    python tools/migrate-canvases.py --list
+
+JSONL files are rewritten line by line (through a temporary file) when
+any of their canvases changes. RO-Crates are skipped; convert them with
+convert-rocrates.py first.
+"""
+
+import argparse
+import contextlib
+import itertools
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from aac.batch import default_jobs, iter_sources, map_chunks
+from aac.migrate import (
+    CURRENT_VERSION, MIGRATIONS, MigrateConfig, MigrationResult, init_migrator, migrate_chunk, parse_version,
+)
+from aac.output import ChangedFileWriter, write_if_changed
+
+
+class JsonlRewriter:
+    """Rewrites JSONL files in place as their lines' results arrive, one file at a time."""
+
+    def __init__(self):
+        self.path: Optional[Path] = None
+        self.writer: Optional[ChangedFileWriter] = None
+        self.changed = False
+        self.rewritten = 0
+
+    def write(self, path: Path, line: str, changed: bool) -> None:
+        if path != self.path:
+            self.close()
+            self.path = path
+            self.writer = ChangedFileWriter(path)
+            self.changed = False
+        self.changed |= changed
+        self.writer.write(line if line.endswith("\n") else line + "\n")
+
+    def close(self) -> None:
+        if self.writer is None:
+            return
+        if self.changed:
+            if self.writer.close():
+                self.rewritten += 1
+        else:
+            self.writer.discard()
+        self.writer = None
+        self.path = None
+
+    def discard(self) -> None:
+        if self.writer is not None:
+            self.writer.discard()
+            self.writer = None
+
+
+def print_result(result: MigrationResult, verbose: bool) -> None:
+    """Print one result (unchanged canvases only with --verbose)."""
+    if result.status == "skipped":
+        if verbose:
+            print(f"Skipping: {result.name} (RO-Crate format, not raw canvas JSON)")
+        return
+    if result.status == "current":
+        if verbose:
+            print(f"Current: {result.name}")
+        return
+    if result.status == "error":
+        print(f"Migrating: {result.name}")
+        print(f"  ✗ {result.error}\n")
+        return
+    print(f"Migrating: {result.name} (schema < {result.from_version})")
+    for note in result.notes:
+        print(f"  - {note}")
+    print()
+
+
+def print_migrations() -> None:
+    """List the registered migration steps."""
+    print(f"Current schema version: {CURRENT_VERSION}\n")
+    for step in MIGRATIONS:
+        print(f"  {step.version:<8} {step.name:<24} {step.description}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Migrate stored canvases to the current schema version.")
+    parser.add_argument("inputs", nargs="*", help="Canvas JSON files, directories, glob patterns or JSONL files")
+    parser.add_argument("--list", action="store_true", help="List the migration steps and exit")
+    parser.add_argument(
+        "--from", dest="from_version", metavar="VERSION",
+        help="Schema version all inputs were written against (default: inferred per canvas)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--dry-run", "-n", action="store_true", help="Report what would change without writing")
+    mode.add_argument("--diff", action="store_true", help="Print a unified diff of every change without writing")
+    mode.add_argument(
+        "--check", action="store_true", help="Like --dry-run, but exit with code 1 if any canvas needs migrating"
+    )
+    mode.add_argument(
+        "--jsonl", metavar="FILE",
+        help="Write every canvas (migrated or not) as JSON Lines to FILE instead of in place (- for stdout)",
+    )
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Canvases per worker task (default: 32)")
+    parser.add_argument("--prefetch", type=int, default=64, help="Worker tasks in flight (default: 64)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Also list canvases that are already current")
+    args = parser.parse_args()
+    if not args.inputs and not args.list:
+        parser.error("no inputs given")
+    if args.from_version is not None:
+        try:
+            parse_version(args.from_version)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+def run(args: argparse.Namespace) -> None:
+    """Migrate the requested canvases and exit with the result."""
+    write = not (args.dry_run or args.diff or args.check)
+    config = MigrateConfig(
+        from_version=args.from_version, diff=args.diff, serialize_all=bool(args.jsonl), compact=bool(args.jsonl)
+    )
+    jobs = args.jobs if args.jobs is not None else default_jobs()
+    stream = None
+    if args.jsonl:
+        stream = sys.__stdout__ if args.jsonl == "-" else open(args.jsonl, "w", encoding="utf-8")
+    rewriter = JsonlRewriter()
+
+    counts: Dict[str, int] = {"migrated": 0, "current": 0, "skipped": 0, "error": 0}
+    steps: Dict[str, int] = {}
+    written = 0
+    started = time.perf_counter()
+    # The tee only buffers the sources whose results are still in flight
+    sources, submitted = itertools.tee(iter_sources(args.inputs))
+    try:
+        results = map_chunks(
+            migrate_chunk, submitted, jobs=jobs, initializer=init_migrator, initargs=(config,),
+            prefetch=args.prefetch, chunk_size=args.chunk_size,
+        )
+        for source, result in zip(sources, results):
+            counts[result.status] += 1
+            for step in result.steps:
+                steps[step] = steps.get(step, 0) + 1
+            print_result(result, args.verbose)
+            if result.diff:
+                sys.__stdout__.write(result.diff)
+            if stream is not None:
+                if result.text is not None:
+                    stream.write(result.text + "\n")
+            elif write and source.line is not None:
+                migrated = result.status == "migrated"
+                rewriter.write(source.path, result.text if migrated else source.text, migrated)
+            elif write and result.status == "migrated":
+                written += write_if_changed(source.path, result.text + "\n")
+        rewriter.close()
+    except BaseException:
+        rewriter.discard()
+        raise
+    finally:
+        if stream is not None and stream is not sys.__stdout__:
+            stream.close()
+        elif stream is not None:
+            stream.flush()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(f"{counts['migrated']} of {total} document(s) {'migrated' if write else 'need migrating'}, "
+          f"{counts['current']} already current, {counts['skipped']} skipped (RO-Crates), {counts['error']} error(s)")
+    for step in MIGRATIONS:
+        if step.name in steps:
+            print(f"  {step.version:<8} {step.name:<24} {steps[step.name]} canvas(es)")
+    rate = total / elapsed if elapsed > 0 else float("inf")
+    print(f"Processed {total} document(s) in {elapsed:.2f}s ({rate:.1f} files/s, {jobs} worker(s))")
+    if write and stream is None:
+        print(f"Wrote {written} JSON file(s) and {rewriter.rewritten} JSONL file(s)")
+
+    if counts["error"] or (args.check and counts["migrated"]):
+        sys.exit(1)
+    sys.exit(0)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    if args.list:
+        print_migrations()
+        sys.exit(0)
+    if args.jsonl == "-" or args.diff:
+        # Keep stdout clean for the JSON Lines stream or the diff
+        with contextlib.redirect_stdout(sys.stderr):
+            run(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Aggregate benefits across a portfolio of canvases.
+
+Loads every canvas into columnar NumPy arrays (aac.portfolio) and computes,
+in batch, the figures the web app's canvas summary shows for each canvas
+(time saved net of oversight, benefit type counts, amortization) plus
+portfolio totals and volumePerMonth-weighted rollups per benefit metric.
+
+    python tools/portfolio-benefits.py canvases/ --per-canvas results.csv
+    python tools/portfolio-benefits.py 'portfolio/**/*.json' --group-by project.projectStage --json -
+    python tools/portfolio-benefits.py canvases/ --verify --cross-check
+
+--verify compares every per-canvas result with the line-by-line Python port
+of the TypeScript helpers (aac.benefits); --cross-check runs the TypeScript
+itself (scripts/benefit-rollups.ts, needs npm install) on the same canvases.
+"""
+
+import argparse
+import csv
+import json
+import math
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    print("Error: numpy package not found. Install with: uv sync --group portfolio", file=sys.stderr)
+    sys.exit(1)
+
+from aac.batch import iter_sources
+from aac.benefits import canvas_benefit_summary
+from aac.portfolio import Portfolio, PortfolioBuilder
+from aac.validation import REPO_ROOT, is_rocrate, load_json
+
+TS_ROLLUP_SCRIPT = REPO_ROOT / "scripts" / "benefit-rollups.ts"
+
+CSV_COLUMNS = [
+    "name", "group", "taskCount", "totalMinutesSavedPerMonth", "totalTimeSavedHoursPerMonth",
+    "grossMinutesPerMonth", "oversightMinutesPerMonth", "amortizationMonths", "benefitTypeCounts",
+]
+
+
+def group_key(canvas: dict, path: Optional[str]) -> Optional[str]:
+    """Value at a dotted path, as a group name ("(none)" if missing)."""
+    if not path:
+        return None
+    value: Any = canvas
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    if value is None or value == "":
+        return "(none)"
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def iter_canvases(inputs: List[str], skipped: List[str]) -> Iterator[Tuple[str, dict]]:
+    """Parsed canvases from files, directories, globs and JSONL; others are noted in ``skipped``."""
+    for source in iter_sources(inputs):
+        try:
+            data = json.loads(source.text) if source.text is not None else load_json(source.path)
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError) as e:
+            skipped.append(f"{source.name}: {e}")
+            continue
+        if not isinstance(data, dict) or is_rocrate(data):
+            skipped.append(f"{source.name}: not a canvas (RO-Crates are not supported)")
+            continue
+        yield source.name, data
+
+
+def close(expected: Any, actual: Any, tolerance: float) -> bool:
+    if expected is None or actual is None:
+        return expected is None and actual is None
+    return math.isclose(expected, actual, rel_tol=tolerance, abs_tol=tolerance)
+
+
+def compare(reference: Dict[str, Any], record: Dict[str, Any], tolerance: float) -> List[str]:
+    """Differences between a reference result and the engine's record for one canvas."""
+    differences = []
+    if reference.get("error"):
+        return [f"reference failed: {reference['error']}"]
+    if reference["taskCount"] != record["taskCount"]:
+        differences.append(f"taskCount {reference['taskCount']} != {record['taskCount']}")
+    for key in ("totalMinutesSavedPerMonth", "totalTimeSavedHoursPerMonth", "amortizationMonths"):
+        if not close(reference[key], record[key], tolerance):
+            differences.append(f"{key} {reference[key]!r} != {record[key]!r}")
+    if reference["benefitTypeCounts"] != record["benefitTypeCounts"]:
+        differences.append(f"benefitTypeCounts {reference['benefitTypeCounts']} != {record['benefitTypeCounts']}")
+    return differences
+
+
+def run_typescript(jsonl_path: Path) -> List[Dict[str, Any]]:
+    """Run scripts/benefit-rollups.ts over a JSONL file of canvases."""
+    with open(jsonl_path, "rb") as stdin:
+        completed = subprocess.run(
+            ["npx", "--no-install", "tsx", str(TS_ROLLUP_SCRIPT)],
+            cwd=REPO_ROOT,
+            stdin=stdin,
+            capture_output=True,
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.decode("utf-8", "replace").strip() or "tsx failed (run npm install)")
+    return [json.loads(line) for line in completed.stdout.decode("utf-8").splitlines() if line.strip()]
+
+
+def report_mismatches(label: str, references: List[Dict[str, Any]], records: List[Dict[str, Any]],
+                      tolerance: float) -> bool:
+    """Print per-canvas differences; returns True if everything matched."""
+    if len(references) != len(records):
+        print(f"✗ {label}: {len(references)} result(s) for {len(records)} canvas(es)", file=sys.stderr)
+        return False
+    mismatched = 0
+    for reference, record in zip(references, records):
+        differences = compare(reference, record, tolerance)
+        if differences:
+            mismatched += 1
+            if mismatched <= 20:
+                print(f"✗ {label}: {record['name']}: {'; '.join(differences)}", file=sys.stderr)
+    if mismatched:
+        print(f"✗ {label}: {mismatched} of {len(records)} canvas(es) differ", file=sys.stderr)
+        return False
+    print(f"✓ {label}: all {len(records)} canvas(es) match")
+    return True
+
+
+def write_per_canvas(records: List[Dict[str, Any]], target: str) -> None:
+    """Write per-canvas results as CSV (by extension) or JSON Lines ("-" for stdout)."""
+    if target != "-" and Path(target).suffix == ".csv":
+        with open(target, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            for record in records:
+                row = dict(record, benefitTypeCounts=json.dumps(record["benefitTypeCounts"], sort_keys=True))
+                writer.writerow(row)
+        return
+    out = sys.stdout if target == "-" else open(target, "w", encoding="utf-8")
+    try:
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def print_group(rollup: Dict[str, Any], top_metrics: int) -> None:
+    """Human-readable totals for one group (or the whole portfolio)."""
+    title = f"Group: {rollup['group']}" if rollup["group"] else "Portfolio"
+    print(f"{title}: {rollup['canvases']} canvas(es), {rollup['tasks']} task(s) "
+          f"({rollup['tasks_with_time_benefit']} with a time benefit)")
+    print(f"  Time saved: {rollup['hours_saved_per_month']:.1f} h/month net "
+          f"({rollup['gross_hours_per_month']:.1f} gross, {rollup['oversight_hours_per_month']:.1f} oversight)")
+    print(f"  Per canvas: p50 {rollup['hours_saved_p50']:.1f} h/month, p90 {rollup['hours_saved_p90']:.1f} h/month")
+    if rollup["amortization_months"] is not None:
+        print(f"  Effort: {rollup['effort_hours']:.1f} h, amortized in {rollup['amortization_months']:.1f} month(s)")
+    if rollup["benefit_types"]:
+        counts = ", ".join(f"{t} {n}" for t, n in sorted(rollup["benefit_types"].items(), key=lambda i: -i[1]))
+        print(f"  Benefits: {counts}")
+    metrics = sorted(rollup["metrics"], key=lambda m: -m["benefits"])[:top_metrics]
+    if metrics:
+        print("  Metrics (weighted by monthly volume):")
+        for m in metrics:
+            label = f"    {m['benefitType']}/{m['metricId']}"
+            if m["aggregate"] == "mean":
+                if m["mean_baseline"] is None:
+                    values = "no monthly volume"
+                else:
+                    values = f"mean baseline {m['mean_baseline']:.6g} -> expected {m['mean_expected']:.6g}"
+                # The mean is in the metric's own unit
+                print(f"{label} [{m['unit']}]: {m['benefits']} benefit(s), {values}")
+            else:
+                # A sum of values times volumes, which is not in the metric's unit
+                print(f"{label}: {m['benefits']} benefit(s), weighted sum "
+                      f"baseline {m['monthly_baseline']:.6g} -> expected {m['monthly_expected']:.6g}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Aggregate benefits across a portfolio of canvases.")
+    parser.add_argument("inputs", nargs="+", help="Canvas JSON files, directories, glob patterns or JSONL files")
+    parser.add_argument("--group-by", metavar="PATH", help="Roll up per value of a field, e.g. project.projectStage")
+    parser.add_argument("--per-canvas", metavar="FILE", help="Write per-canvas results (.csv, else JSON Lines; - for stdout)")
+    parser.add_argument("--json", metavar="FILE", help="Write the portfolio rollups as JSON (- for stdout)")
+    parser.add_argument("--top-metrics", type=int, default=10, help="Metrics listed per group (default: 10)")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check every canvas against the scalar port of the TypeScript helpers")
+    parser.add_argument("--cross-check", action="store_true",
+                        help="Check every canvas against the TypeScript itself (npx tsx; needs npm install)")
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="Relative tolerance for checks (default: 1e-9)")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    quiet = "-" in (args.json, args.per_canvas)
+    log = sys.stderr if quiet else sys.stdout
+
+    skipped: List[str] = []
+    builder = PortfolioBuilder()
+    references: List[Dict[str, Any]] = []
+    spool = tempfile.NamedTemporaryFile("w", suffix=".jsonl", encoding="utf-8", delete=False) if args.cross_check else None
+    started = time.perf_counter()
+    try:
+        for name, canvas in iter_canvases(args.inputs, skipped):
+            builder.add(name, canvas, group_key(canvas, args.group_by))
+            if args.verify:
+                references.append(canvas_benefit_summary(canvas))
+            if spool is not None:
+                spool.write(json.dumps(canvas) + "\n")
+        if spool is not None:
+            spool.close()
+        portfolio: Portfolio = builder.build()
+        loaded = time.perf_counter()
+
+        for message in skipped:
+            print(f"Skipped: {message}", file=sys.stderr)
+        if not portfolio.canvas_count:
+            print("Error: no canvases found", file=sys.stderr)
+            sys.exit(1)
+
+        records = portfolio.canvas_records()
+        groups = portfolio.group_rollups()
+        computed = time.perf_counter()
+        print(f"Loaded {portfolio.canvas_count} canvas(es) in {loaded - started:.2f}s; "
+              f"rollups computed in {(computed - loaded) * 1000:.1f} ms", file=log)
+
+        ok = True
+        if args.verify:
+            ok &= report_mismatches("Python reference", references, records, args.tolerance)
+        if spool is not None:
+            try:
+                typescript = run_typescript(Path(spool.name))
+            except (OSError, RuntimeError) as e:
+                print(f"Error: TypeScript cross-check failed: {e}", file=sys.stderr)
+                sys.exit(1)
+            ok &= report_mismatches("TypeScript", typescript, records, args.tolerance)
+    finally:
+        if spool is not None:
+            Path(spool.name).unlink(missing_ok=True)
+
+    if args.per_canvas:
+        write_per_canvas(records, args.per_canvas)
+    if args.json:
+        payload = json.dumps({"canvases": portfolio.canvas_count, "groups": groups}, indent=2)
+        if args.json == "-":
+            print(payload)
+        else:
+            Path(args.json).write_text(payload + "\n", encoding="utf-8")
+    if not quiet:
+        print()
+        for rollup in groups:
+            print_group(rollup, args.top_metrics)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Publish the schema artifacts served from w3id.org.
+
+Builds the site's schema/ and examples/ files from canvas-schema.json,
+rocrate-profile.json, the vocabularies and the examples (aac.publish):
+pretty and minified JSON, YAML for the canvas schema, content-addressed
+copies, precompressed .gz/.br variants, and schema/manifest.json with the
+SHA-256 of every file.
+
+    python tools/publish-schema.py                  # into site/
+    python tools/publish-schema.py --output-dir dist/docs
+    python tools/publish-schema.py --check          # exit 1 if the site is out of date
+
+Sources whose inputs are unchanged since the last build (per the manifest)
+are skipped, the rest are built in parallel, and files are only replaced
+when their content changes. Files listed in the previous manifest that are
+no longer generated (e.g. an example that was removed, or a content-addressed
+copy of an old version) are deleted.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from aac.batch import default_jobs, map_chunks
+from aac.output import write_if_changed
+from aac.publish import (
+    DEFAULT_OUTPUT_DIR, MANIFEST_FILE, Publication, PublishConfig, brotli, build_chunk, init_publisher, input_hash,
+    is_current, load_manifest, manifest_text, publications,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Publish the schema artifacts (JSON, YAML, precompressed variants).")
+    parser.add_argument(
+        "--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR, help="Site directory to publish into (default: site/)"
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild every source, even if its inputs are unchanged")
+    parser.add_argument("--check", action="store_true", help="Only report what is out of date; exit 1 if anything is")
+    parser.add_argument(
+        "--no-content-addressed", action="store_true", help="Do not write content-addressed copies of the files"
+    )
+    parser.add_argument("--gzip-level", type=int, default=9, help="gzip compression level (default: 9)")
+    parser.add_argument("--brotli-quality", type=int, default=11, help="Brotli quality (default: 11)")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="List unchanged sources too")
+    args = parser.parse_args()
+    if not 0 <= args.gzip_level <= 9:
+        parser.error("--gzip-level must be between 0 and 9")
+    if not 0 <= args.brotli_quality <= 11:
+        parser.error("--brotli-quality must be between 0 and 11")
+    return args
+
+
+def remove_stale(output_dir: Path, previous: Dict[str, Any], files: Dict[str, Any]) -> int:
+    """Delete files of the previous build that this build no longer generates."""
+    removed = 0
+    for path in previous["files"]:
+        if path not in files:
+            target = output_dir / path
+            if target.is_file():
+                target.unlink()
+                removed += 1
+    return removed
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    config = PublishConfig(
+        output_dir=str(args.output_dir),
+        content_addressed=not args.no_content_addressed,
+        gzip_level=args.gzip_level,
+        brotli_quality=args.brotli_quality,
+    )
+    output_dir = args.output_dir
+    previous = load_manifest(output_dir)
+    if brotli is None:
+        print("Note: brotli package not found, skipping .br files. Install with: uv sync --group publish")
+
+    started = time.perf_counter()
+    sources: Dict[str, Dict[str, Any]] = {}
+    files: Dict[str, Dict[str, Any]] = {}
+    stale: List[Publication] = []
+    try:
+        items = publications()
+        for publication in items:
+            digest = input_hash(publication, config)
+            if not args.force and is_current(previous, publication, digest, output_dir):
+                entry = previous["sources"][publication.source]
+                sources[publication.source] = entry
+                files.update((path, previous["files"][path]) for path in entry["files"] if path in previous["files"])
+                if args.verbose:
+                    print(f"Unchanged: {publication.source}")
+            else:
+                stale.append(publication)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.check:
+        for publication in stale:
+            print(f"Out of date: {publication.source}")
+        print(f"{len(stale)} of {len(items)} source(s) out of date")
+        sys.exit(1 if stale else 0)
+
+    jobs = min(args.jobs if args.jobs is not None else default_jobs(), max(len(stale), 1))
+    written = 0
+    failed = False
+    results = map_chunks(build_chunk, stale, jobs=jobs, initializer=init_publisher, initargs=(config,), chunk_size=1)
+    for publication, result in zip(stale, results):
+        if result.error:
+            print(f"Publishing: {publication.source}")
+            print(f"  ✗ {result.error}\n")
+            failed = True
+            # Keep the previous build's files for this source
+            entry = previous["sources"].get(publication.source)
+            if entry:
+                sources[publication.source] = entry
+                files.update((path, previous["files"][path]) for path in entry["files"] if path in previous["files"])
+            continue
+        sources[publication.source] = {"input": result.input, "files": sorted(result.files)}
+        files.update(result.files)
+        written += result.written
+        print(f"Publishing: {publication.source} -> {publication.target}")
+        print(f"  ✓ {len(result.files)} file(s), {result.written} written\n")
+
+    removed = remove_stale(output_dir, previous, files)
+    manifest_written = write_if_changed(output_dir / MANIFEST_FILE, manifest_text(sources, files))
+
+    elapsed = time.perf_counter() - started
+    print(f"Built {len(stale)} of {len(items)} source(s) in {elapsed:.2f}s ({jobs} worker(s)): "
+          f"{written} file(s) written, {removed} stale file(s) removed, "
+          f"manifest {'updated' if manifest_written else 'unchanged'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
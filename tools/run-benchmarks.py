@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Benchmark the schema tools on synthetic canvases and RO-Crates.
+
+Documents come from the seeded generator in aac.synthetic, scaled along the
+arrays of canvas-schema.json. Each benchmark case runs in a fresh process so
+its peak RSS is its own, is timed over enough repetitions to be stable, and
+is compared with a saved JSON baseline: the run fails if any case got slower
+(or larger) than the baseline by more than the threshold.
+
+    python tools/run-benchmarks.py run --save              # record a baseline
+    python tools/run-benchmarks.py run                     # compare with it
+    python tools/run-benchmarks.py run --sizes 10,100 --cases 'canvas-*'
+    python tools/run-benchmarks.py generate /tmp/corpus --count 500 --invalid-ratio 0.1
+    python tools/run-benchmarks.py arrays                  # scalable array paths
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aac import __version__
+from aac.batch import peak_rss_mb
+from aac.validation import REPO_ROOT
+
+TOOLS_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = REPO_ROOT / ".cache" / "benchmark-baseline.json"
+BASELINE_VERSION = 1
+
+# Each timed batch repeats the operation until it takes at least this long
+MIN_BATCH_SECONDS = 0.2
+
+
+def load_tool(name: str) -> Any:
+    """Import one of the hyphenated scripts in tools/ as a module."""
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), TOOLS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Case setup functions run untimed in the benchmark process and return
+# (operation, work units per operation, bytes per operation); resources they
+# create are entered into _case_resources, which run_case() closes afterwards
+_case_resources = contextlib.ExitStack()
+
+
+def setup_canvas(size: int, seed: int, scales: Dict[str, int], invalid: bool) -> Tuple[Callable, int, int]:
+    from aac.synthetic import CanvasGenerator
+    from aac.validation import SCHEMA_FILE, load_json
+
+    validate_example = load_tool("validate-examples").validate_example
+    schema = load_json(SCHEMA_FILE)
+    document = CanvasGenerator(schema).canvas(size, seed, scales, invalid=invalid)
+    path = Path(f"synthetic-{size}.json")
+
+    def operation() -> None:
+        is_valid, errors = validate_example(schema, document, path)
+        if is_valid == invalid:
+            raise AssertionError(f"generated canvas expected {'invalid' if invalid else 'valid'}: {errors[:3]}")
+
+    return operation, 1, len(json.dumps(document))
+
+
+def setup_rocrate(size: int, seed: int, scales: Dict[str, int], invalid: bool, stream: bool) -> Tuple[Callable, int, int]:
+    from aac.rocrate import ProfileValidator
+    from aac.synthetic import CrateGenerator
+
+    profile = ProfileValidator.from_file()
+    crate = CrateGenerator(profile).crate(size, seed, invalid=invalid)
+    text = json.dumps(crate)
+
+    def operation() -> None:
+        if stream:
+            is_valid, issues = profile.validate_stream(io.StringIO(text))
+        else:
+            is_valid, issues = profile.validate(crate)
+        if is_valid == invalid:
+            raise AssertionError(f"generated crate expected {'invalid' if invalid else 'valid'}: {issues[:3]}")
+
+    return operation, len(crate["@graph"]), len(text)
+
+
+def setup_reference(size: int, seed: int, scales: Dict[str, int], warm: bool) -> Tuple[Callable, int, int]:
+    from aac.schemagraph import SchemaGraph
+    from aac.validation import SCHEMA_FILE
+
+    generate_main_types_docs = load_tool("generate-reference").generate_main_types_docs
+    graph = SchemaGraph.from_file(SCHEMA_FILE)
+    work_dir = Path(_case_resources.enter_context(tempfile.TemporaryDirectory(prefix="aac-bench-")))
+
+    def generate() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_main_types_docs(graph.root, work_dir / "reference", work_dir / "manifest.json", graph)
+
+    def operation() -> None:
+        if not warm:
+            shutil.rmtree(work_dir / "reference", ignore_errors=True)
+            (work_dir / "manifest.json").unlink(missing_ok=True)
+        generate()
+
+    if warm:
+        generate()
+    return operation, 1, SCHEMA_FILE.stat().st_size
+
+
+# name -> (setup, keyword arguments, whether the case is run once per size)
+CASES: Dict[str, Tuple[Callable, Dict[str, Any], bool]] = {
+    "canvas-valid": (setup_canvas, {"invalid": False}, True),
+    "canvas-invalid": (setup_canvas, {"invalid": True}, True),
+    "rocrate": (setup_rocrate, {"invalid": False, "stream": False}, True),
+    "rocrate-invalid": (setup_rocrate, {"invalid": True, "stream": False}, True),
+    "rocrate-stream": (setup_rocrate, {"invalid": False, "stream": True}, True),
+    "reference-cold": (setup_reference, {"warm": False}, False),
+    "reference-warm": (setup_reference, {"warm": True}, False),
+}
+
+
+def run_case(case: str, size: int, seed: int, scales: Dict[str, int], repeat: int) -> Dict[str, Any]:
+    """Set up and time one case (in a fresh process)."""
+    setup, kwargs, _ = CASES[case]
+    with _case_resources:
+        return time_case(setup(size, seed, scales, **kwargs), repeat)
+
+
+def time_case(case: Tuple[Callable, int, int], repeat: int) -> Dict[str, Any]:
+    """Time a set-up case: loops are doubled until a batch takes MIN_BATCH_SECONDS."""
+    operation, units, size_bytes = case
+
+    # Warm-up: builds and caches validators, so only steady-state work is timed
+    operation()
+
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_BATCH_SECONDS or number >= 1 << 16:
+            break
+        number *= 2
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            operation()
+        timings.append((time.perf_counter() - started) / number)
+
+    seconds = statistics.median(timings)
+    return {
+        "seconds": seconds,
+        "min_seconds": min(timings),
+        "stdev_seconds": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "loops": number,
+        "repeat": repeat,
+        "units": units,
+        "bytes": size_bytes,
+        "units_per_second": units / seconds,
+        "mb_per_second": size_bytes / seconds / (1 << 20),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(case: str, size: int, seed: int, scales: Dict[str, int], repeat: int) -> Dict[str, Any]:
+    """Run a case in a new interpreter so peak RSS and caches are not shared."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_case, case, size, seed, scales, repeat).result()
+
+
+def selected_cases(patterns: List[str], sizes: List[int]) -> List[Tuple[str, str, int]]:
+    """(result name, case, size) for the cases matching any pattern."""
+    selected = []
+    for case, (_, _, sized) in CASES.items():
+        for size in sizes if sized else [0]:
+            name = f"{case}/{size}" if sized else case
+            if any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(case, p) for p in patterns):
+                selected.append((name, case, size))
+    return selected
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": str(os.cpu_count()),
+    }
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    """The saved baseline, or None if there is none (or it is unreadable)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: ignoring unreadable baseline {path}: {e}", file=sys.stderr)
+        return None
+    if baseline.get("version") != BASELINE_VERSION:
+        print(f"Warning: ignoring baseline {path} from an incompatible version", file=sys.stderr)
+        return None
+    return baseline
+
+
+def compare(
+    name: str,
+    result: Dict[str, Any],
+    baseline: Optional[Dict[str, Any]],
+    threshold: float,
+    memory_threshold: float,
+) -> Tuple[str, List[str]]:
+    """
+    Compare a result with its baseline entry.
+
+    Returns:
+        Tuple of (change column text, list of regression messages)
+    """
+    previous = (baseline or {}).get("results", {}).get(name)
+    if previous is None:
+        return "new", []
+    regressions = []
+    change = result["seconds"] / previous["seconds"] - 1
+    if change > threshold:
+        regressions.append(f"{name}: {change:+.0%} time ({previous['seconds'] * 1000:.3f} ms -> "
+                           f"{result['seconds'] * 1000:.3f} ms, threshold {threshold:.0%})")
+    if result["peak_rss_mb"] and previous.get("peak_rss_mb"):
+        memory_change = result["peak_rss_mb"] / previous["peak_rss_mb"] - 1
+        if memory_change > memory_threshold:
+            regressions.append(f"{name}: {memory_change:+.0%} peak RSS ({previous['peak_rss_mb']:.1f} MiB -> "
+                               f"{result['peak_rss_mb']:.1f} MiB, threshold {memory_threshold:.0%})")
+    return f"{change:+.1%}", regressions
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the selected cases, compare with the baseline and optionally save."""
+    cases = selected_cases(args.cases, args.sizes)
+    if not cases:
+        print(f"Error: no benchmark case matches {', '.join(args.cases)}", file=sys.stderr)
+        return 1
+    baseline = None if args.save else load_baseline(args.baseline)
+    if baseline and baseline.get("environment") != environment():
+        print("Warning: baseline was recorded on a different machine or Python; comparisons may mislead",
+              file=sys.stderr)
+    if baseline and baseline.get("seed") != args.seed:
+        print(f"Warning: baseline used seed {baseline.get('seed')}, this run uses {args.seed}", file=sys.stderr)
+
+    print(f"Running {len(cases)} benchmark case(s), seed {args.seed}, {args.repeat} repeat(s)")
+    print(f"{'case':<24} {'median':>11} {'min':>11} {'units/s':>11} {'MiB/s':>8} {'peak RSS':>10} {'vs base':>8}")
+    results: Dict[str, Dict[str, Any]] = {}
+    regressions: List[str] = []
+    started = time.perf_counter()
+    for name, case, size in cases:
+        try:
+            result = run_isolated(case, size, args.seed, args.scales, args.repeat)
+        except Exception as e:
+            print(f"{name:<24} failed: {e}", file=sys.stderr)
+            regressions.append(f"{name}: failed ({e})")
+            continue
+        result["case"] = case
+        result["size"] = size
+        results[name] = result
+        change, case_regressions = compare(name, result, baseline, args.threshold, args.memory_threshold)
+        regressions.extend(case_regressions)
+        rss = f"{result['peak_rss_mb']:.1f} MiB" if result["peak_rss_mb"] else "n/a"
+        print(f"{name:<24} {result['seconds'] * 1000:>8.3f} ms {result['min_seconds'] * 1000:>8.3f} ms "
+              f"{result['units_per_second']:>11.1f} {result['mb_per_second']:>8.2f} {rss:>10} {change:>8}",
+              flush=True)
+    print(f"\nCompleted in {time.perf_counter() - started:.1f}s")
+
+    record = {
+        "version": BASELINE_VERSION,
+        "tool_version": __version__,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seed": args.seed,
+        "scales": args.scales,
+        "environment": environment(),
+        "results": results,
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to: {args.output}")
+    if args.save:
+        if len(results) != len(cases):
+            print("Error: not saving a baseline from a run with failed cases", file=sys.stderr)
+            return 1
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved to: {args.baseline}")
+    elif baseline is None:
+        print(f"No baseline at {args.baseline}; record one with --save")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):", file=sys.stderr)
+        for regression in regressions:
+            print(f"  - {regression}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def generate(args: argparse.Namespace) -> int:
+    """Write a corpus of synthetic documents to a directory."""
+    from aac.rocrate import ProfileValidator
+    from aac.synthetic import CanvasGenerator, CrateGenerator
+    from aac.validation import SCHEMA_FILE, load_json
+
+    rng = random.Random(args.seed)
+    if args.rocrate:
+        generator = CrateGenerator(ProfileValidator.from_file())
+    else:
+        generator = CanvasGenerator(load_json(SCHEMA_FILE))
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    invalid_count = 0
+    for index in range(args.count):
+        seed = rng.randrange(1 << 32)
+        invalid = rng.random() < args.invalid_ratio
+        invalid_count += invalid
+        if args.rocrate:
+            document = generator.crate(args.size, seed, invalid=invalid)
+        else:
+            document = generator.canvas(args.size, seed, args.scales, invalid=invalid)
+        kind = "invalid" if invalid else "valid"
+        with open(args.output_dir / f"{kind}-{index:06d}.json", "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    print(f"Generated {args.count} {'RO-Crate' if args.rocrate else 'canvas'} document(s) "
+          f"({invalid_count} invalid) in {args.output_dir}")
+    return 0
+
+
+def arrays(args: argparse.Namespace) -> int:
+    """List the canvas arrays the generator can scale."""
+    from aac.synthetic import CanvasGenerator
+    from aac.validation import SCHEMA_FILE, load_json
+
+    generator = CanvasGenerator(load_json(SCHEMA_FILE))
+    for path in generator.arrays:
+        note = "" if path in generator.scalable else "  (no example items; not scalable)"
+        print(f"{path}{note}")
+    return 0
+
+
+def parse_scale(value: str) -> Tuple[str, int]:
+    path, sep, count = value.partition("=")
+    if not sep or not count.isdigit():
+        raise argparse.ArgumentTypeError(f"expected ARRAY=N, got {value!r}")
+    return path, int(count)
+
+
+def parse_sizes(value: str) -> List[int]:
+    try:
+        sizes = [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got {value!r}") from None
+    if not sizes or min(sizes) < 0:
+        raise argparse.ArgumentTypeError("sizes must be non-negative")
+    return sizes
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the schema tools on synthetic canvases and RO-Crates.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generator_options = argparse.ArgumentParser(add_help=False)
+    generator_options.add_argument("--seed", type=int, default=0, help="Generator seed (default: 0)")
+    generator_options.add_argument(
+        "--scale",
+        dest="scale_list",
+        type=parse_scale,
+        action="append",
+        default=[],
+        metavar="ARRAY=N",
+        help="Items in one canvas array, e.g. userExpectations.requirements[].benefits=20 (repeatable)",
+    )
+
+    run_parser = commands.add_parser("run", parents=[generator_options], help="Run benchmarks")
+    run_parser.add_argument("--sizes", type=parse_sizes, default=[10, 100, 1000],
+                            help="Items per top-level array (default: 10,100,1000)")
+    run_parser.add_argument("--cases", action="append", metavar="PATTERN",
+                            help=f"Only cases matching this glob (repeatable; cases: {', '.join(CASES)})")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case (default: 5)")
+    run_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                            help="Baseline file (default: .cache/benchmark-baseline.json)")
+    run_parser.add_argument("--save", action="store_true", help="Save this run as the new baseline")
+    run_parser.add_argument("--threshold", type=float, default=0.25,
+                            help="Fail if a case is this much slower than the baseline (default: 0.25 = 25%%)")
+    run_parser.add_argument("--memory-threshold", type=float, default=0.25,
+                            help="Fail if a case's peak RSS grew this much (default: 0.25)")
+    run_parser.add_argument("--output", type=Path, help="Also write this run's results as JSON")
+    run_parser.set_defaults(func=run)
+
+    generate_parser = commands.add_parser("generate", parents=[generator_options], help="Write synthetic documents")
+    generate_parser.add_argument("output_dir", type=Path, help="Directory to write documents to")
+    generate_parser.add_argument("--count", type=int, default=100, help="Number of documents (default: 100)")
+    generate_parser.add_argument("--size", type=int, default=10, help="Items per top-level array (default: 10)")
+    generate_parser.add_argument("--invalid-ratio", type=float, default=0.0,
+                                 help="Fraction of deliberately invalid documents (default: 0)")
+    generate_parser.add_argument("--rocrate", action="store_true", help="Generate RO-Crates instead of canvases")
+    generate_parser.set_defaults(func=generate)
+
+    arrays_parser = commands.add_parser("arrays", help="List the canvas arrays --scale accepts")
+    arrays_parser.set_defaults(func=arrays)
+
+    args = parser.parse_args()
+    args.scales = dict(getattr(args, "scale_list", []))
+    if args.command == "run":
+        args.cases = args.cases or ["*"]
+        if args.repeat < 1:
+            parser.error("--repeat must be at least 1")
+    return args
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    if args.scales:
+        from aac.synthetic import CanvasGenerator
+        from aac.validation import SCHEMA_FILE, load_json
+
+        scalable = CanvasGenerator(load_json(SCHEMA_FILE)).scalable
+        unknown = sorted(set(args.scales) - set(scalable))
+        if unknown:
+            print(f"Error: not a scalable array: {', '.join(unknown)} (see: run-benchmarks.py arrays)",
+                  file=sys.stderr)
+            sys.exit(1)
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Check a schema change against a corpus, revalidating only affected canvases.
+
+Diffs the schema against a previous version subschema by subschema and
+classifies every change as breaking, non-breaking or annotation-only
+(aac.impact). The corpus is indexed by the instance paths each canvas
+populates (.cache/impact.sqlite, updated incrementally), so only canvases
+that contain a location validated by a breaking change are revalidated,
+against both versions: a canvas breaks if the old schema accepted it and
+the new one does not.
+
+    python tools/schema-impact.py corpus/                    # working tree vs HEAD
+    python tools/schema-impact.py corpus/ --base v0.14.0
+    python tools/schema-impact.py corpus/ --old old-schema.json --new schema/canvas-schema.json --json
+
+Exits with code 1 if any canvas breaks.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+try:
+    import jsonschema  # noqa: F401
+except ImportError:
+    print("Error: jsonschema package not found. Install with: uv sync", file=sys.stderr)
+    sys.exit(1)
+
+from aac.batch import BatchConfig, Source, default_jobs, expand_inputs, map_chunks, run_batch
+from aac.impact import (
+    DEFAULT_INDEX_FILE, IndexedCanvas, PathIndex, SchemaChange, affected_patterns, diff_schemas, instance_patterns,
+    read_chunk,
+)
+from aac.schemagraph import SchemaGraph
+from aac.validation import REPO_ROOT, SCHEMA_FILE
+
+SYMBOLS = {"breaking": "✗", "non-breaking": "✓", "annotation": "·"}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Revalidate only the canvases a schema change can affect.")
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="Directories, glob patterns, .json or .jsonl files (default: schema/examples/)",
+    )
+    old = parser.add_mutually_exclusive_group()
+    old.add_argument("--base", default="HEAD", help="Git revision holding the old schema (default: HEAD)")
+    old.add_argument("--old", type=Path, help="Old schema file (instead of --base)")
+    parser.add_argument(
+        "--new",
+        type=Path,
+        default=SCHEMA_FILE,
+        help="New schema file (default: schema/canvas-schema.json)",
+    )
+    parser.add_argument(
+        "--all-changes",
+        action="store_true",
+        help="Also revalidate canvases affected by non-breaking changes",
+    )
+    parser.add_argument("--changes-only", action="store_true", help="Only list the schema changes")
+    parser.add_argument(
+        "--index-file",
+        type=Path,
+        default=DEFAULT_INDEX_FILE,
+        help="Path index location (default: .cache/impact.sqlite)",
+    )
+    parser.add_argument("-j", "--jobs", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--max-errors-per-file",
+        type=int,
+        default=5,
+        metavar="N",
+        help="Errors shown per canvas (default: 5)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Also list annotation-only changes")
+    return parser.parse_args()
+
+
+def display_name(name: str) -> str:
+    """Indexed paths are absolute; show them relative to the working directory where possible."""
+    relative = os.path.relpath(name)
+    return name if relative.startswith("..") else relative
+
+
+def load_old_schema(args: argparse.Namespace, directory: Path) -> Path:
+    """The old schema as a file (from --old, or written to ``directory`` from git)."""
+    if args.old:
+        return args.old
+    relative = args.new.resolve().relative_to(REPO_ROOT).as_posix()
+    try:
+        text = subprocess.run(
+            ["git", "show", f"{args.base}:{relative}"], cwd=REPO_ROOT, check=True, capture_output=True, text=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        detail = e.stderr.strip() if isinstance(e, subprocess.CalledProcessError) else str(e)
+        print(f"Error: cannot read {relative} at {args.base}: {detail}", file=sys.stderr)
+        sys.exit(1)
+    path = directory / f"old-{Path(relative).name}"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def update_index(index: PathIndex, inputs: List[str], jobs: int) -> Set[str]:
+    """Bring the index up to date with the inputs; returns the input files (resolved)."""
+    paths = list(expand_inputs(inputs))
+    files = {str(path.resolve()) for path in paths}
+    updated = 0
+    for update in map_chunks(read_chunk, index.stale(paths), jobs=jobs, chunk_size=64):
+        for error in update.errors:
+            print(f"  ✗ {display_name(error)}")
+        updated += index.apply(update)
+    index.db.commit()
+    print(f"Path index: {len(files)} file(s), {updated} canvas(es) reindexed, {index.unchanged} file(s) unchanged")
+    return files
+
+
+def sources_for(canvases: List[IndexedCanvas]) -> List[Source]:
+    """Sources to validate; JSONL files are read once for all their affected lines."""
+    lines: Dict[str, Dict[int, str]] = {}
+    for canvas in canvases:
+        if canvas.line is not None and canvas.path not in lines:
+            with open(canvas.path, "r", encoding="utf-8", errors="replace") as f:
+                wanted = {c.line for c in canvases if c.path == canvas.path}
+                lines[canvas.path] = {n: line for n, line in enumerate(f, 1) if n in wanted}
+    return [
+        Source(display_name(c.name), Path(c.path), c.line, lines[c.path].get(c.line) if c.line is not None else None)
+        for c in canvases
+    ]
+
+
+def print_change(change: SchemaChange, count: Optional[int]) -> None:
+    affected = f" ({count} canvas(es))" if count is not None and change.impact != "annotation" else ""
+    print(f"  {SYMBOLS[change.impact]} {change.impact:<12} {change.location}: {change.message}{affected}")
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    inputs = args.inputs or [str(REPO_ROOT / "schema" / "examples")]
+    jobs = args.jobs if args.jobs is not None else default_jobs()
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_file = load_old_schema(args, Path(tmp))
+        try:
+            old_graph, new_graph = SchemaGraph.from_file(old_file), SchemaGraph.from_file(args.new)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        changes = diff_schemas(old_graph, new_graph)
+        old_patterns, new_patterns = instance_patterns(old_graph), instance_patterns(new_graph)
+        patterns = [affected_patterns(change, old_patterns, new_patterns) for change in changes]
+
+        report = {"old": str(args.old or args.base), "new": str(args.new), "changes": [], "canvases": []}
+        if not args.json:
+            print(f"Schema changes from {report['old']} to {args.new}: {len(changes)}")
+        if args.changes_only:
+            counts = [None] * len(changes)
+            affected: List[IndexedCanvas] = []
+        else:
+            index = PathIndex(args.index_file)
+            try:
+                files = _quiet(update_index, index, inputs, jobs) if args.json else update_index(index, inputs, jobs)
+                counts = [len(index.canvases(p, files)) for p in patterns]
+                relevant = ("breaking", "non-breaking") if args.all_changes else ("breaking",)
+                wanted = set().union(*(p for c, p in zip(changes, patterns) if c.impact in relevant))
+                affected = index.canvases(wanted, files)
+                total = index.counts()[0]
+            finally:
+                index.close()
+
+        for change, change_patterns, count in zip(changes, patterns, counts):
+            entry = dict(change.to_dict(), instancePaths=sorted(change_patterns))
+            if count is not None:
+                entry["canvases"] = count
+            report["changes"].append(entry)
+            if not args.json and (args.verbose or change.impact != "annotation"):
+                print_change(change, count)
+        if args.changes_only:
+            if args.json:
+                print(json.dumps(report, indent=2, ensure_ascii=False))
+            sys.exit(0)
+
+        sources = sources_for(affected)
+        broken = 0
+        if sources:
+            max_errors = args.max_errors_per_file
+            new_results = run_batch(sources, BatchConfig(str(args.new), max_errors=max_errors), jobs=jobs)
+            old_results = list(run_batch(sources, BatchConfig(str(old_file), max_errors=1), jobs=jobs))
+            for old_result, new_result in zip(old_results, new_results):
+                if new_result.status == "valid":
+                    status = "fixed" if old_result.status != "valid" else "valid"
+                else:
+                    status = "breaks" if old_result.status == "valid" else "still invalid"
+                broken += status == "breaks"
+                report["canvases"].append({
+                    "name": new_result.name,
+                    "status": status,
+                    "errors": [issue.to_dict() for issue in new_result.errors],
+                })
+                if not args.json and status in ("breaks", "fixed"):
+                    print(f"\n{new_result.name}")
+                    print("  ✗ Breaks:" if status == "breaks" else "  ✓ Now valid")
+                    for issue in new_result.errors if status == "breaks" else []:
+                        print(f"    - {issue}")
+
+    elapsed = time.perf_counter() - started
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        statuses = [c["status"] for c in report["canvases"]]
+        print(f"\nRevalidated {len(sources)} of {total} indexed canvas(es) in {elapsed:.2f}s: "
+              f"{broken} break, {statuses.count('still invalid')} already invalid, {statuses.count('fixed')} now valid")
+    sys.exit(1 if broken else 0)
+
+
+def _quiet(func, *args):
+    """Call ``func`` with its progress output sent to stderr (keeps --json output clean)."""
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    try:
+        return func(*args)
+    finally:
+        sys.stdout = stdout
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Search canvas and RO-Crate corpora through a SQLite full-text index.
+
+`index` extracts the searchable fields of every document (project title,
+description and keywords, primary value driver, project stage, technical
+risk levels, DUO terms) into .cache/search.sqlite (aac.search). Only files
+that changed since the last run are read, so re-indexing a large corpus
+takes about as long as listing it. `query` then answers from the index
+without touching the corpus.
+
+    python tools/search-canvases.py index corpus/ archive/*.jsonl
+    python tools/search-canvases.py query "radiology AND triage"
+    python tools/search-canvases.py query --keyword biomedical --risk high --duo DUO:0000006
+    python tools/search-canvases.py query --value-driver time --json
+
+The text query uses the SQLite FTS5 syntax: words, "phrases", prefix*,
+AND/OR/NOT and column filters such as title:triage.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from aac.batch import default_jobs, expand_inputs, map_chunks
+from aac.search import DEFAULT_INDEX_FILE, SearchIndex, read_chunk
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Search canvas and RO-Crate corpora through a SQLite index.")
+    parser.add_argument(
+        "--index-file",
+        type=Path,
+        default=DEFAULT_INDEX_FILE,
+        help="Index location (default: .cache/search.sqlite)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index = commands.add_parser("index", help="Add new and changed files to the index")
+    index.add_argument("inputs", nargs="+", help="Directories, glob patterns, .json or .jsonl files")
+    index.add_argument("--prune", action="store_true", help="Drop indexed files that no longer exist")
+    index.add_argument("-j", "--jobs", type=int, help="Worker processes (default: CPU count)")
+    index.add_argument("--chunk-size", type=int, default=64, help="Files per worker task (default: 64)")
+
+    query = commands.add_parser("query", help="Search the index")
+    query.add_argument("text", nargs="?", help="Full-text query (FTS5 syntax) over titles, descriptions and keywords")
+    query.add_argument("--keyword", action="append", default=[], help="Project keyword or domain (repeatable)")
+    query.add_argument("--value-driver", help="project.primaryValueDriver, e.g. time")
+    query.add_argument("--stage", help="project.projectStage")
+    query.add_argument(
+        "--risk",
+        action="append",
+        default=[],
+        help="Technical risk level of the project or of any requirement (repeatable)",
+    )
+    query.add_argument("--overall-risk", help="developerFeasibility.technicalRisk only")
+    query.add_argument("--duo", action="append", default=[], help="DUO term of any dataset, as CURIE or URI (repeatable)")
+    query.add_argument("--kind", choices=["canvas", "rocrate"], help="Only canvases or only RO-Crates")
+    query.add_argument("--limit", type=int, default=20, help="Maximum number of results, 0 for all (default: 20)")
+    query.add_argument("--json", action="store_true", help="Print one JSON object per result")
+    return parser.parse_args()
+
+
+def display_name(name: str) -> str:
+    """Indexed paths are absolute; show them relative to the working directory where possible."""
+    relative = os.path.relpath(name)
+    return name if relative.startswith("..") else relative
+
+
+def run_index(args: argparse.Namespace, index: SearchIndex) -> int:
+    """Bring the index up to date with the inputs."""
+    started = time.perf_counter()
+    jobs = args.jobs if args.jobs is not None else default_jobs()
+    files = documents = 0
+    errors = []
+    tasks = index.stale(expand_inputs(args.inputs))
+    for update in map_chunks(read_chunk, tasks, jobs=jobs, chunk_size=args.chunk_size):
+        errors.extend(update.errors)
+        if update.documents is not None or not update.content_hash:
+            files += 1
+        documents += index.apply(update)
+    pruned = index.prune() if args.prune else 0
+    index.db.commit()
+
+    for error in errors:
+        print(f"  ✗ {display_name(error)}")
+    total_files, total_documents = index.counts()
+    elapsed = time.perf_counter() - started
+    print(f"Indexed {documents} document(s) from {files} changed file(s), {index.unchanged} unchanged, "
+          f"{pruned} pruned in {elapsed:.2f}s")
+    print(f"Index: {total_documents} document(s) in {total_files} file(s) ({args.index_file})")
+    return 1 if errors else 0
+
+
+def run_query(args: argparse.Namespace, index: SearchIndex) -> int:
+    """Print the documents matching the query."""
+    filters = {}
+    if args.value_driver:
+        filters["value_driver"] = args.value_driver
+    if args.stage:
+        filters["stage"] = args.stage
+    if args.overall_risk:
+        filters["technical_risk"] = args.overall_risk
+    terms = [("keyword", value) for value in args.keyword]
+    terms += [("risk", value) for value in args.risk] + [("duo", value) for value in args.duo]
+
+    started = time.perf_counter()
+    try:
+        hits = index.search(args.text, filters, terms, args.kind, args.limit or None)
+    except sqlite3.OperationalError as e:
+        print(f"Error: invalid query {args.text!r}: {e}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - started
+
+    for hit in hits:
+        if args.json:
+            print(json.dumps(dict(hit.to_dict(), name=display_name(hit.name)), ensure_ascii=False))
+            continue
+        details = ", ".join(
+            f"{label}: {value}"
+            for label, value in (("driver", hit.value_driver), ("risk", hit.technical_risk), ("stage", hit.stage))
+            if value
+        )
+        kind = " (RO-Crate)" if hit.kind == "rocrate" else ""
+        print(f"{display_name(hit.name)}{kind}")
+        print(f"  {hit.title or '(untitled)'}" + (f"  [{details}]" if details else ""))
+    if not args.json:
+        print(f"\n{len(hits)} result(s) in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    if args.command == "query" and not args.index_file.exists():
+        print(f"Error: no index at {args.index_file}; run the index command first", file=sys.stderr)
+        sys.exit(1)
+    index = SearchIndex(args.index_file)
+    try:
+        status = run_index(args, index) if args.command == "index" else run_query(args, index)
+    finally:
+        index.close()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
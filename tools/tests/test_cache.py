@@ -0,0 +1,203 @@
+"""
+Tests for the persistent result cache (aac.cache) and its config key.
+
+Results must be found again only for the same content under the same
+configuration, and stat data may stand in for hashing only once a file is
+old enough not to change within its mtime tick:
+
+    python -m unittest discover tools/tests
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.batch import BatchConfig, Source, ValidationResult, iter_sources, run_batch  # noqa: E402
+from aac.cache import RACY_WINDOW_NS, ResultCache, hash_bytes, hash_file  # noqa: E402
+from aac.rocrate import PROFILE_FILE  # noqa: E402
+from aac.validation import EXAMPLES_DIR, SCHEMA_FILE, Issue, load_json  # noqa: E402
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="aac-cache-test-"))
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def write(self, name, data, age=None):
+        """Write a JSON file, backdated by ``age`` seconds if given."""
+        path = self.tmp / name
+        path.write_text(json.dumps(data), encoding="utf-8")
+        if age is not None:
+            stamp = time.time() - age
+            os.utime(path, (stamp, stamp))
+        return path
+
+    def open_cache(self, config_key="key"):
+        cache = ResultCache(self.tmp / "cache" / "results.sqlite", config_key)
+        self.addCleanup(lambda: cache.db.close())
+        return cache
+
+
+class ConfigKeyTests(CacheTestCase):
+    def config(self, **kwargs):
+        kwargs.setdefault("schema_file", str(SCHEMA_FILE))
+        kwargs.setdefault("profile_file", str(PROFILE_FILE))
+        return BatchConfig(**kwargs)
+
+    def test_options_that_change_results(self):
+        base = self.config().cache_key()
+        self.assertEqual(self.config().cache_key(), base)
+        changed = {
+            "max_errors": self.config(max_errors=5),
+            "no profile": self.config(profile_file=None),
+            "rules": self.config(rules=("dependencies",)),
+        }
+        for name, config in changed.items():
+            with self.subTest(option=name):
+                self.assertNotEqual(config.cache_key(), base)
+
+    def test_options_that_do_not(self):
+        base = self.config(rules=("dependencies", "vocabularies")).cache_key()
+        for config in (self.config(rules=("vocabularies", "dependencies")),
+                       self.config(rules=("dependencies", "vocabularies"), fast_path=False, stream=True)):
+            with self.subTest(config=config):
+                self.assertEqual(config.cache_key(), base)
+
+    def test_keyed_by_content_not_path(self):
+        base = self.config().cache_key()
+        schema = Path(shutil.copy(SCHEMA_FILE, self.tmp))
+        profile = Path(shutil.copy(PROFILE_FILE, self.tmp))
+        self.assertEqual(self.config(schema_file=str(schema), profile_file=str(profile)).cache_key(), base)
+
+        edited = load_json(PROFILE_FILE)
+        edited["description"] = "edited"
+        profile = self.write("rocrate-profile.json", edited)
+        self.assertNotEqual(self.config(profile_file=str(profile)).cache_key(), base)
+
+        edited = load_json(SCHEMA_FILE)
+        edited["required"] = edited.get("required", []) + ["extra"]
+        schema = self.write("canvas-schema.json", edited)
+        self.assertNotEqual(self.config(schema_file=str(schema)).cache_key(), base)
+
+
+class ResultCacheTests(CacheTestCase):
+    def result(self, source):
+        return ValidationResult(source.name, "invalid", [Issue("/a", "'a' is a required property", "required")])
+
+    def test_store_and_lookup(self):
+        path = self.write("doc.json", {"a": 1}, age=60)
+        cache = self.open_cache()
+        source = Source(name="doc.json", path=path)
+        self.assertIsNone(cache.lookup(source))
+        self.assertEqual(source.digest, hash_file(path))
+        cache.store(source, self.result(source))
+
+        hit = cache.lookup(Source(name="doc.json", path=path))
+        self.assertEqual(hit.to_dict(), self.result(source).to_dict())
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Another configuration does not see the result
+        cache.db.commit()
+        other = ResultCache(cache.path, "other")
+        self.addCleanup(lambda: other.db.close())
+        self.assertIsNone(other.lookup(Source(name="doc.json", path=path)))
+
+    def test_same_content_under_another_name(self):
+        cache = self.open_cache()
+        first = Source(name="a.json", path=self.write("a.json", {"a": 1}))
+        cache.lookup(first)
+        cache.store(first, self.result(first))
+        copy = Source(name="b.json", path=self.write("b.json", {"a": 1}))
+        self.assertEqual(cache.lookup(copy).name, "b.json")
+
+        line = Source(name="c.jsonl:1", path=self.tmp / "c.jsonl", line=1, text=json.dumps({"a": 1}))
+        self.assertEqual(cache.lookup(line).name, "c.jsonl:1")
+        self.assertEqual(line.digest, hash_bytes(line.text.encode("utf-8")))
+
+    def test_changed_content_misses(self):
+        path = self.write("doc.json", {"a": 1}, age=60)
+        cache = self.open_cache()
+        source = Source(name="doc.json", path=path)
+        cache.lookup(source)
+        cache.store(source, self.result(source))
+        self.write("doc.json", {"a": 2}, age=30)
+        self.assertIsNone(cache.lookup(Source(name="doc.json", path=path)))
+
+    def test_stat_data_replaces_hashing_for_old_files(self):
+        old = self.write("old.json", {"a": 1}, age=60)
+        new = self.write("new.json", {"a": 2})
+        cache = self.open_cache()
+        for path in (old, new):
+            cache.lookup(Source(name=path.name, path=path))
+        rows = dict(cache.db.execute("SELECT path, mtime_ns FROM files"))
+        self.assertEqual(rows[str(old.resolve())], old.stat().st_mtime_ns)
+        # Modified within the racy window: hashed again next time
+        self.assertLess(time.time_ns() - new.stat().st_mtime_ns, RACY_WINDOW_NS)
+        self.assertEqual(rows[str(new.resolve())], -1)
+
+        # A stored hash is trusted while size and mtime match
+        cache.db.execute("UPDATE files SET content_hash = 'stale' WHERE path = ?", (str(old.resolve()),))
+        source = Source(name="old.json", path=old)
+        cache.lookup(source)
+        self.assertEqual(source.digest, "stale")
+
+    def test_unreadable_file_is_a_miss(self):
+        cache = self.open_cache()
+        source = Source(name="gone.json", path=self.tmp / "gone.json")
+        self.assertIsNone(cache.lookup(source))
+        self.assertIsNone(source.digest)
+        cache.store(source, self.result(source))
+        self.assertEqual(cache.db.execute("SELECT COUNT(*) FROM results").fetchone()[0], 0)
+
+    def test_prune(self):
+        kept = self.write("kept.json", {"a": 1}, age=60)
+        removed = self.write("removed.json", {"a": 2}, age=60)
+        line = Source(name="lines.jsonl:1", path=self.tmp / "lines.jsonl", line=1, text=json.dumps({"a": 3}))
+        cache = self.open_cache()
+        for source in (Source(name="kept.json", path=kept), Source(name="removed.json", path=removed), line):
+            cache.lookup(source)
+            cache.store(source, self.result(source))
+        cache.close()
+
+        removed.unlink()
+        cache = self.open_cache()
+        cache.lookup(Source(name="kept.json", path=kept))
+        cache.lookup(Source(name=line.name, path=line.path, line=1, text=line.text))
+        # The missing file and its result go; the JSONL line was seen in this run
+        self.assertEqual(cache.prune(), 2)
+        self.assertEqual(cache.db.execute("SELECT COUNT(*) FROM results").fetchone()[0], 2)
+        # In a later run that does not see it, the line's result goes too
+        cache.started += 1
+        self.assertEqual(cache.prune(), 1)
+        self.assertIsNotNone(cache.lookup(Source(name="kept.json", path=kept)))
+
+
+class RunBatchTests(CacheTestCase):
+    def test_second_run_is_served_from_the_cache(self):
+        for name in ("complete-canvas.json", "minimal-canvas.json", "complete-example.json"):
+            shutil.copy(EXAMPLES_DIR / name, self.tmp / name)
+        self.write("broken.json", {"canvasVersion": 1})
+        config = BatchConfig(schema_file=str(SCHEMA_FILE), profile_file=str(PROFILE_FILE))
+
+        runs = []
+        for _ in range(2):
+            cache = self.open_cache(config.cache_key())
+            results = list(run_batch(iter_sources([str(self.tmp / "*.json")]), config, cache=cache))
+            runs.append(([result.to_dict() for result in results], cache.hits, cache.misses))
+            cache.close()
+        (first, hits, misses), (second, *counts) = runs
+        self.assertEqual(second, first)
+        self.assertEqual((hits, misses), (0, 4))
+        self.assertEqual(counts, [4, 0])
+        self.assertEqual([result["status"] for result in first], ["invalid", "valid", "valid", "valid"])
+
+
+if __name__ == "__main__":
+    unittest.main()
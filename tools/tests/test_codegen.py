@@ -0,0 +1,165 @@
+"""
+Tests for the compiled fast-path validator (aac.codegen).
+
+Every compiled check must accept exactly the instances jsonschema accepts,
+so each case compares the two on the same instances. Compiled modules are
+written to a temporary cache directory:
+
+    python -m unittest discover tools/tests
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from jsonschema import Draft7Validator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.codegen import (  # noqa: E402
+    UnsupportedSchemaError,
+    build_fast_validator,
+    compile_schema,
+    compiled_module_path,
+    load_fast_validator,
+)
+from aac.schemagraph import SchemaGraph  # noqa: E402
+from aac.synthetic import CanvasGenerator  # noqa: E402
+from aac.validation import EXAMPLES_DIR, SCHEMA_FILE, load_json  # noqa: E402
+
+# (schema, instances): the instances mix values each schema accepts and rejects
+CASES = {
+    "types": (
+        {"type": ["integer", "null"]},
+        [1, 1.0, 1.5, True, None, "1", [], {}],
+    ),
+    "numbers": (
+        {"type": "number", "minimum": 0, "exclusiveMaximum": 10, "multipleOf": 0.5},
+        [0, 0.5, 9.5, 10, -0.5, 0.25, False, "5"],
+    ),
+    "strings": (
+        {"type": "string", "minLength": 2, "maxLength": 4, "pattern": "^[a-z]+$"},
+        ["ab", "abcd", "a", "abcde", "aB", "", 12],
+    ),
+    "enum and const": (
+        {"anyOf": [{"enum": [1, "a", [1, 2], {"k": None}]}, {"const": False}]},
+        [1, 1.0, True, "a", [1, 2], [2, 1], {"k": None}, {"k": 0}, False, 0, None],
+    ),
+    "objects": (
+        {
+            "type": "object",
+            "properties": {"id": {"type": "string"}, "n": {"type": "integer"}},
+            "required": ["id"],
+            "additionalProperties": {"type": "boolean"},
+            "minProperties": 1,
+            "maxProperties": 3,
+        },
+        [{"id": "x"}, {"id": "x", "n": 2, "flag": True}, {"id": "x", "flag": 1}, {"n": 1},
+         {"id": 1}, {"id": "x", "a": True, "b": False}, [], "x"],
+    ),
+    "closed objects": (
+        {"properties": {"a": {}}, "additionalProperties": False},
+        [{}, {"a": 1}, {"b": 1}, [1], 3],
+    ),
+    "arrays": (
+        {"type": "array", "items": {"type": "integer"}, "contains": {"minimum": 5}, "minItems": 1, "maxItems": 3},
+        [[5], [1, 6], [1, 2], [], [1, 2, 3, 9], [5, "x"], {"0": 5}],
+    ),
+    "combinators": (
+        {"oneOf": [{"type": "integer"}, {"minimum": 2}], "not": {"const": 7}},
+        [1, 2, 2.5, 7, 8.5, "x", None],
+    ),
+    "conditionals": (
+        {
+            "if": {"properties": {"kind": {"const": "a"}}},
+            "then": {"required": ["a"]},
+            "else": {"required": ["b"]},
+        },
+        [{"kind": "a", "a": 1}, {"kind": "a", "b": 1}, {"kind": "b", "b": 1}, {"b": 1}, {}, 5],
+    ),
+    "recursive refs": (
+        {
+            "$ref": "#/definitions/node",
+            "definitions": {
+                "node": {
+                    "type": "object",
+                    "properties": {"children": {"type": "array", "items": {"$ref": "#/definitions/node"}}},
+                    "required": ["children"],
+                },
+            },
+        },
+        [{"children": []}, {"children": [{"children": [{"children": []}]}]}, {"children": [{}]}, {}],
+    ),
+}
+
+
+class CodegenTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="aac-codegen-test-"))
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+
+    def fast(self, schema, graph=None):
+        fast = load_fast_validator(schema, self.cache_dir, graph)
+        self.assertIsNotNone(fast)
+        return fast
+
+
+class KeywordTests(CodegenTestCase):
+    def test_compiled_checks_agree_with_jsonschema(self):
+        for name, (schema, instances) in CASES.items():
+            fast = self.fast(schema)
+            validator = Draft7Validator(schema)
+            for instance in instances:
+                with self.subTest(case=name, instance=instance):
+                    self.assertEqual(fast(instance), validator.is_valid(instance))
+
+    def test_unsupported_keywords(self):
+        for schema in ({"type": "object", "dependencies": {"a": ["b"]}},
+                       {"items": [{"type": "string"}, {"type": "number"}]}):
+            with self.subTest(schema=schema):
+                with self.assertRaises(UnsupportedSchemaError):
+                    compile_schema(schema)
+                self.assertIsNone(load_fast_validator(schema, self.cache_dir))
+
+
+class CacheTests(CodegenTestCase):
+    def test_module_is_reused_until_the_schema_changes(self):
+        schema = {"type": "object", "required": ["a"]}
+        path = build_fast_validator(schema, self.cache_dir)
+        self.assertEqual(path, compiled_module_path(schema, self.cache_dir))
+        path.write_text(path.read_text(encoding="utf-8") + "\n# kept\n", encoding="utf-8")
+        self.assertEqual(build_fast_validator(schema, self.cache_dir), path)
+        self.assertTrue(path.read_text(encoding="utf-8").endswith("# kept\n"))
+
+        changed = dict(schema, required=["b"])
+        self.assertNotEqual(build_fast_validator(changed, self.cache_dir), path)
+        self.assertTrue(self.fast(changed)({"b": 1}))
+        self.assertFalse(self.fast(changed)({"a": 1}))
+
+
+class CanvasSchemaTests(CodegenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.schema = load_json(SCHEMA_FILE)
+        self.graph = SchemaGraph.from_file(SCHEMA_FILE)
+        self.validator = Draft7Validator(self.schema)
+
+    def test_examples(self):
+        fast = self.fast(self.graph.root, self.graph)
+        for name in ("complete-canvas.json", "minimal-canvas.json"):
+            with self.subTest(example=name):
+                self.assertTrue(fast(load_json(EXAMPLES_DIR / name)))
+
+    def test_synthetic_canvases_agree_with_jsonschema(self):
+        fast = self.fast(self.graph.root, self.graph)
+        generator = CanvasGenerator(self.schema, graph=self.graph)
+        for seed in range(40):
+            canvas = generator.canvas(size=2, seed=seed, invalid=seed % 4 != 0, mutations=1)
+            with self.subTest(seed=seed):
+                self.assertEqual(fast(canvas), self.validator.is_valid(canvas))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for the binary columnar table format (aac.columnar).
+
+Every column type, with nulls, must read back as written, across row group
+boundaries and when row groups are copied into another file:
+
+    python -m unittest discover tools/tests
+"""
+
+import io
+import math
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.columnar import ColumnWriter, decode_chunk, iter_row_groups, read_footer, read_table  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:  # optional, only for the zero-copy check
+    np = None
+
+COLUMNS = [("key", "str"), ("value", "f64"), ("count", "i32"), ("flag", "bool"), ("unit", "str")]
+ROWS = [
+    ("a", 1.5, 3, True, "hours"),
+    ("b", None, None, None, None),
+    ("ä€", -0.0, -(2 ** 31) + 1, False, "hours"),
+    ("", 1e300, 2 ** 31 - 1, True, "%"),
+    ("a", math.inf, 0, False, "hours"),
+]
+
+
+class ColumnarTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="aac-columnar-test-"))
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def write(self, name, rows, row_group_size=65536):
+        path = self.tmp / name
+        with open(path, "wb") as f:
+            writer = ColumnWriter(f, COLUMNS, "example", row_group_size)
+            for row in rows:
+                writer.write_row(row)
+            writer.close()
+        return path
+
+    def assert_rows(self, path, rows):
+        table = read_table(str(path))
+        self.assertEqual(list(table), [name for name, _ in COLUMNS])
+        self.assertEqual(list(zip(*table.values())), rows)
+
+
+class RoundTripTests(ColumnarTestCase):
+    def test_values_and_nulls(self):
+        for row_group_size in (1, 2, 5, 100):
+            with self.subTest(row_group_size=row_group_size):
+                path = self.write(f"table-{row_group_size}.cols", ROWS, row_group_size)
+                self.assert_rows(path, ROWS)
+                with open(path, "rb") as f:
+                    footer = read_footer(f)
+                self.assertEqual(footer["table"], "example")
+                self.assertEqual([group["rows"] for group in footer["rowGroups"]],
+                                 [min(row_group_size, len(ROWS) - start)
+                                  for start in range(0, len(ROWS), row_group_size)])
+
+    def test_empty_table(self):
+        self.assert_rows(self.write("empty.cols", []), [])
+
+    def test_selected_columns(self):
+        path = self.write("table.cols", ROWS, row_group_size=2)
+        self.assertEqual(read_table(str(path), ["unit", "count"]),
+                         {"count": [3, None, -(2 ** 31) + 1, 2 ** 31 - 1, 0],
+                          "unit": ["hours", None, "hours", "%", "hours"]})
+
+    def test_strings_are_stored_once_per_row_group(self):
+        f = io.BytesIO()
+        writer = ColumnWriter(f, [("unit", "str")])
+        for _ in range(1000):
+            writer.write_row(("person-hours",))
+        writer.close()
+        (rows, (chunk,)), = iter_row_groups(f, read_footer(f))
+        self.assertEqual(rows, 1000)
+        self.assertEqual(len(chunk), 4 * 1000 + 4 + 4 * 2 + len("person-hours"))
+        self.assertEqual(decode_chunk("str", rows, chunk), ["person-hours"] * 1000)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numeric_chunks_map_with_numpy(self):
+        f = io.BytesIO()
+        writer = ColumnWriter(f, COLUMNS)
+        for row in ROWS:
+            writer.write_row(row)
+        writer.close()
+        (rows, chunks), = iter_row_groups(f, read_footer(f))
+        values = np.frombuffer(chunks[1], "<f8")
+        self.assertEqual(values.shape, (rows,))
+        self.assertTrue(np.isnan(values[1]))
+        self.assertEqual(np.frombuffer(chunks[2], "<i4")[0], 3)
+
+    def test_copied_row_groups(self):
+        parts = [self.write("part-0.cols", ROWS[:2], 1), self.write("part-1.cols", ROWS[2:], 2)]
+        merged = self.tmp / "merged.cols"
+        with open(merged, "wb") as out:
+            writer = ColumnWriter(out, COLUMNS, "example")
+            for part in parts:
+                with open(part, "rb") as f:
+                    for rows, chunks in iter_row_groups(f, read_footer(f)):
+                        writer.append_row_group(rows, chunks)
+            writer.close()
+        self.assert_rows(merged, ROWS)
+
+
+class ErrorTests(ColumnarTestCase):
+    def test_unknown_type(self):
+        with self.assertRaises(ValueError):
+            ColumnWriter(io.BytesIO(), [("x", "f32")])
+
+    def test_not_a_table(self):
+        path = self.write("table.cols", ROWS)
+        data = path.read_bytes()
+        cases = {"bad magic": b"NOTCOLS1" + data[8:], "truncated": data[:-4]}
+        for name, content in cases.items():
+            with self.subTest(case=name):
+                with self.assertRaises(ValueError):
+                    read_footer(io.BytesIO(content))
+
+
+if __name__ == "__main__":
+    unittest.main()
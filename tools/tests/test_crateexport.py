@@ -0,0 +1,177 @@
+"""
+Tests for canvas to RO-Crate generation (aac.crateexport).
+
+The bundled complete canvas is exported, checked against the RO-Crate
+profile and converted back with aac.crateimport; apart from positional
+``@id``s and the export date the canvas must come back unchanged:
+
+    python -m unittest discover tools/tests
+"""
+
+import copy
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.batch import Source  # noqa: E402
+from aac.crateexport import (  # noqa: E402
+    AGENTS_FILE,
+    BENEFIT_DISPLAY_FILE,
+    CONTEXT,
+    METADATA_DESCRIPTOR,
+    GenerateConfig,
+    canvas_to_crate,
+    generate_source,
+    init_generator,
+    is_valid_date,
+    validate_for_export,
+)
+from aac.crateimport import crate_to_canvas  # noqa: E402
+from aac.jsonpatch import make_patch  # noqa: E402
+from aac.rocrate import ProfileValidator  # noqa: E402
+from aac.validation import EXAMPLES_DIR, load_json  # noqa: E402
+
+TODAY = "2026-01-15"
+COMPLETE = load_json(EXAMPLES_DIR / "complete-canvas.json")
+
+
+def entities(crate):
+    return {e["@id"]: e for e in crate["@graph"]}
+
+
+class ValidateForExportTests(unittest.TestCase):
+    def test_complete_canvas_can_be_exported(self):
+        self.assertEqual(validate_for_export(COMPLETE), [])
+        self.assertEqual(validate_for_export({}), [])
+        self.assertEqual(validate_for_export({"userExpectations": {"requirements": [{"benefits": []}, 1]}}), [])
+
+    def test_incomplete_benefits_are_blocking(self):
+        canvas = copy.deepcopy(COMPLETE)
+        benefits = canvas["userExpectations"]["requirements"][0]["benefits"]
+        del benefits[0]["direction"]
+        benefits[0]["valueMeaning"] = ""
+        benefits[1]["direction"] = "targetIsBetter"
+        issues = validate_for_export(canvas)
+        base = "/userExpectations/requirements/0/benefits"
+        self.assertEqual([issue.pointer for issue in issues],
+                         [f"{base}/0/direction", f"{base}/0/valueMeaning", f"{base}/1/target"])
+        self.assertEqual({issue.keyword for issue in issues}, {"export"})
+        benefits[1]["target"] = None
+        self.assertEqual(len(validate_for_export(canvas)), 2)
+
+    def test_valid_dates(self):
+        for value, expected in (("2025-01-30", True), ("1000", True), (" 3000-12", True), ("999-01-01", False),
+                                ("3001-01-01", False), ("", False), ("x-2025", False), (2025, False), (None, False)):
+            with self.subTest(value=value):
+                self.assertIs(is_valid_date(value), expected)
+
+
+class CanvasToCrateTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.profile = ProfileValidator.from_file()
+
+    def test_complete_canvas(self):
+        crate, warnings = canvas_to_crate(COMPLETE, TODAY, "1.0.0")
+        self.assertEqual(warnings, [])
+        self.assertEqual(self.profile.validate(crate), (True, []))
+        self.assertIs(crate["@context"], CONTEXT)
+        self.assertIs(crate["@graph"][0], METADATA_DESCRIPTOR)
+        by_id = entities(crate)
+        root = by_id["./"]
+        self.assertEqual((root["datePublished"], root["aac:schemaVersion"]), (TODAY, "1.0.0"))
+        self.assertEqual((root["aac:version"], root["aac:versionDate"]), ("0.1.0", "2025-01-30"))
+        self.assertIn({"@id": AGENTS_FILE["@id"]}, root["hasPart"])
+        self.assertNotIn(BENEFIT_DISPLAY_FILE["@id"], by_id)
+        self.assertEqual(by_id["#project"]["hasPlan"], {"@id": "#user-plan"})
+        self.assertEqual(by_id["#user-plan"]["p-plan:hasStep"], [{"@id": "#requirement-0"}])
+        self.assertEqual(by_id["#stage-0"]["startedAtTime"], "2025-02-01T00:00:00Z")
+
+    def test_same_canvas_same_crate(self):
+        crate, _ = canvas_to_crate(COMPLETE, TODAY)
+        before = copy.deepcopy(COMPLETE)
+        for _ in range(2):
+            self.assertEqual(json.dumps(canvas_to_crate(copy.deepcopy(COMPLETE), TODAY)[0]), json.dumps(crate))
+        self.assertEqual(COMPLETE, before)
+        self.assertRegex(canvas_to_crate(COMPLETE)[0]["@graph"][1]["datePublished"], r"^\d{4}-\d{2}-\d{2}$")
+
+    def test_fields_the_app_leaves_out(self):
+        canvas = copy.deepcopy(COMPLETE)
+        canvas["dataAccess"]["datasets"][0].update(publisher="Institute", sensitivityLevel="restricted")
+        by_id = entities(canvas_to_crate(canvas, TODAY)[0])
+        self.assertEqual(by_id["#requirement-0"]["aac:timeUnit"], "minutes")
+        self.assertEqual((by_id["#dataset-0"]["schema:publisher"], by_id["#dataset-0"]["aac:sensitivityLevel"]),
+                         ("Institute", "restricted"))
+        self.assertEqual(by_id["#evaluation-0"]["aac:metrics"], COMPLETE["outcomes"]["evaluations"][0]["metrics"])
+
+    def test_unknown_persons_are_left_out(self):
+        canvas = copy.deepcopy(COMPLETE)
+        canvas["userExpectations"]["requirements"][0]["stakeholders"] = ["person-0", "nobody"]
+        canvas["governance"]["stages"][0]["agents"] += [{"type": "person", "personId": "ghost"},
+                                                        {"type": "software", "role": "Helper"}]
+        crate, warnings = canvas_to_crate(canvas, TODAY)
+        self.assertEqual(warnings, ["Stakeholder references unknown person: nobody",
+                                    "Agent references unknown person: ghost", "Non-person agent missing name"])
+        self.assertEqual(entities(crate)["#project"]["contributor"], {"@id": "#person-0"})
+        self.assertEqual(self.profile.validate(crate), (True, []))
+
+    def test_benefit_display_file(self):
+        for display, added in (({"displayGroupCount": 5}, False), ({"displayGroupCount": 3}, True),
+                               ({"displayGroups": [["time"]]}, True), (None, False)):
+            with self.subTest(display=display):
+                crate, _ = canvas_to_crate(COMPLETE, TODAY, benefit_display=display)
+                self.assertEqual(BENEFIT_DISPLAY_FILE["@id"] in entities(crate), added)
+
+
+class RoundTripTests(unittest.TestCase):
+    def test_complete_canvas_comes_back(self):
+        crate, _ = canvas_to_crate(COMPLETE, TODAY)
+        canvas = crate_to_canvas(json.loads(json.dumps(crate)), TODAY)
+        changed = {op["path"] for op in make_patch(COMPLETE, canvas)}
+        # Only the ids allocated from positions, the version date and the pid the app does not export differ
+        self.assertEqual(changed, {"/project/versionDate", "/versionDate", "/outcomes/publications/0/id",
+                                   "/outcomes/publications/0/pid", "/outcomes/evaluations/0/id"})
+        requirement = canvas["userExpectations"]["requirements"][0]
+        self.assertEqual(requirement["timeUnit"], "minutes")
+        self.assertEqual(canvas["outcomes"]["evaluations"][0]["metrics"],
+                         COMPLETE["outcomes"]["evaluations"][0]["metrics"])
+        self.assertEqual(canvas["governance"], COMPLETE["governance"])
+
+    def test_dataset_fields_come_back(self):
+        canvas = copy.deepcopy(COMPLETE)
+        canvas["dataAccess"]["datasets"][0].update(publisher="Institute", sensitivityLevel="restricted")
+        back = crate_to_canvas(canvas_to_crate(canvas, TODAY)[0], TODAY)
+        self.assertEqual(back["dataAccess"], canvas["dataAccess"])
+
+
+class GenerateSourceTests(unittest.TestCase):
+    def setUp(self):
+        init_generator(GenerateConfig(today=TODAY, indent=None))
+
+    def generate(self, data):
+        text = data if isinstance(data, str) else json.dumps(data)
+        return generate_source(Source(name="canvas.json", path=Path("canvas.json"), text=text))
+
+    def test_statuses(self):
+        blocked = copy.deepcopy(COMPLETE)
+        del blocked["userExpectations"]["requirements"][0]["benefits"][0]["direction"]
+        cases = {
+            "valid": COMPLETE,
+            "blocked": blocked,
+            "skipped": load_json(EXAMPLES_DIR / "complete-example.json"),
+            "error": "{broken",
+        }
+        for status, data in cases.items():
+            with self.subTest(status=status):
+                result = self.generate(data)
+                self.assertEqual(result.status, status)
+                self.assertEqual(result.failed, status in ("blocked", "error"))
+        self.assertEqual(json.loads(self.generate(COMPLETE).text), canvas_to_crate(COMPLETE, TODAY)[0])
+        self.assertEqual(self.generate([1]).errors[0].keyword, "type")
+
+
+if __name__ == "__main__":
+    unittest.main()
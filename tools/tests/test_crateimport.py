@@ -0,0 +1,194 @@
+"""
+Tests for RO-Crate to canvas conversion (aac.crateimport).
+
+Crates are built entity by entity so each test shows the RO-Crate terms it
+maps; the bundled complete example must convert to a valid canvas:
+
+    python -m unittest discover tools/tests
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from jsonschema import Draft7Validator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.batch import Source  # noqa: E402
+from aac.crateimport import (  # noqa: E402
+    ConvertConfig,
+    CrateImportError,
+    CrateIndex,
+    convert_source,
+    crate_to_canvas,
+    init_converter,
+)
+from aac.migrate import normalize_canvas  # noqa: E402
+from aac.validation import EXAMPLES_DIR, SCHEMA_FILE, load_json  # noqa: E402
+
+TODAY = "2026-01-15"
+
+
+def crate(*entities):
+    """An RO-Crate around the given entities, with a descriptor and root."""
+    return {
+        "@context": "https://w3id.org/ro/crate/1.2/context",
+        "@graph": [
+            {"@id": "ro-crate-metadata.json", "@type": "CreativeWork", "about": {"@id": "./"}},
+            {"@id": "./", "@type": "Dataset", "name": "Crate"},
+            {"@id": "#project", "@type": "schema:Project", "name": "Project", "description": "About"},
+            *entities,
+        ],
+    }
+
+
+class CrateIndexTests(unittest.TestCase):
+    def test_lookups(self):
+        graph = [
+            {"@id": "#a", "@type": ["Person", "schema:Person"]},
+            {"@id": "#b", "@type": "Organization"},
+            {"@id": "#a", "@type": "Thing"},
+            {"@id": "#c", "@type": ["Person", "Person"]},
+            {"@type": "Person"},
+        ]
+        index = CrateIndex(graph)
+        self.assertIs(index.get("#a"), graph[0])
+        self.assertIs(index.resolve({"@id": "#b"}), graph[1])
+        self.assertIsNone(index.resolve({"@id": "#missing"}))
+        self.assertIsNone(index.get(["#a"]))
+        self.assertEqual(index.of_type("Person", "schema:Person", "Organization"),
+                         [graph[0], graph[1], graph[3], graph[4]])
+        self.assertEqual(index.of_type("Thing"), [graph[2]])
+
+
+class CrateToCanvasTests(unittest.TestCase):
+    def test_not_a_crate(self):
+        for document in ({"@graph": []}, {"@context": "x"}, {"@context": "x", "@graph": {"@id": "./"}}, []):
+            with self.subTest(document=document):
+                with self.assertRaises(CrateImportError):
+                    crate_to_canvas(document, TODAY)
+
+    def test_complete_example_is_valid(self):
+        canvas, _ = normalize_canvas(crate_to_canvas(load_json(EXAMPLES_DIR / "complete-example.json"), TODAY))
+        errors = [error.message for error in Draft7Validator(load_json(SCHEMA_FILE)).iter_errors(canvas)]
+        self.assertEqual(errors, [])
+        self.assertEqual(canvas["versionDate"], TODAY)
+        self.assertEqual(canvas["project"]["versionDate"], TODAY)
+
+    def test_stage_agents(self):
+        canvas = crate_to_canvas(crate(
+            {"@id": "#stage-0", "@type": "prov:Activity", "name": "Build",
+             "wasAssociatedWith": [{"@id": "#person-0"}, {"@id": "#org-0"}, {"@id": "#tool-0"}]},
+            {"@id": "#stage-1", "@type": "prov:Activity", "name": "Run",
+             "wasAssociatedWith": [{"@id": "#person-0"}]},
+            {"@id": "#person-0", "@type": "Person", "name": "Ada"},
+            {"@id": "#org-0", "@type": "Organization", "name": "Lab"},
+            {"@id": "#tool-0", "@type": "SoftwareApplication", "name": "Runner", "role": "executor"},
+            {"@id": "#role-0", "@type": "Role", "schema:roleName": "Lead", "schema:member": {"@id": "#person-0"},
+             "aac:roleContext": "stakeholder"},
+            {"@id": "#role-1", "@type": "Role", "schema:roleName": "Developer", "schema:member": {"@id": "#person-0"},
+             "aac:roleContext": "stage-agent", "aac:stageId": "#stage-0"},
+            {"@id": "#role-2", "@type": "Role", "schema:roleName": "Partner", "schema:member": {"@id": "#org-0"},
+             "aac:roleContext": "stage-agent", "aac:stageId": "#stage-0"},
+        ), TODAY)
+        build, run = canvas["governance"]["stages"]
+        self.assertEqual(build["agents"], [
+            {"personId": "person-0", "role": "Developer", "type": "person"},
+            {"name": "Lab", "role": "Partner", "type": "organization"},
+            {"name": "Runner", "role": "executor", "type": "software"},
+        ])
+        # No role for this stage: any stage-agent role of the person
+        self.assertEqual(run["agents"], [{"personId": "person-0", "role": "Developer", "type": "person"}])
+        self.assertEqual([person["id"] for person in canvas["persons"]], ["person-0"])
+
+    def test_milestones_are_names(self):
+        canvas = crate_to_canvas(crate(
+            {"@id": "#stage-0", "@type": "prov:Activity", "name": "Build",
+             "hasMilestone": [{"@id": "#milestone-0"}, {"@id": "#milestone-1"}, {"@id": "#missing"}]},
+            {"@id": "#milestone-0", "@type": "CreativeWork", "name": "Alpha", "description": "First cut"},
+            {"@id": "#milestone-1", "@type": "CreativeWork", "description": "Unnamed"},
+        ), TODAY)
+        self.assertEqual(canvas["governance"]["stages"][0]["milestones"], ["Alpha", ""])
+        # Milestone entities are not deliverables
+        self.assertNotIn("outcomes", canvas)
+
+    def test_fields_the_app_drops(self):
+        metrics = {"accuracy": 0.9, "recall": {"value": 0.8}}
+        canvas = crate_to_canvas(crate(
+            {"@id": "#plan", "@type": "p-plan:Plan", "p-plan:hasStep": [{"@id": "#requirement-0"}]},
+            {"@id": "#requirement-0", "@type": "p-plan:Step", "name": "Triage", "aac:timeUnit": "hours"},
+            {"@id": "#dataset-0", "@type": "dcat:Dataset", "name": "Records", "dct:accessRights": "restricted",
+             "schema:publisher": {"@id": "https://example.org/registry"}, "aac:sensitivityLevel": "high"},
+            {"@id": "#dataset-1", "@type": "Dataset", "name": "Open", "schema:publisher": "Registry"},
+            {"@id": "#evaluation-0", "@type": "CreativeWork", "name": "Pilot", "aac:evaluationType": "pilot",
+             "aac:metrics": metrics},
+            {"@id": "#evaluation-1", "@type": "CreativeWork", "name": "Audit", "aac:evaluationType": "audit",
+             "aac:metrics": "n/a"},
+        ), TODAY)
+        self.assertEqual(canvas["userExpectations"]["requirements"][0]["timeUnit"], "hours")
+        records, open_ = canvas["dataAccess"]["datasets"]
+        self.assertEqual((records["publisher"], records["sensitivityLevel"]), ("https://example.org/registry", "high"))
+        self.assertEqual(open_["publisher"], "Registry")
+        self.assertNotIn("sensitivityLevel", open_)
+        pilot, audit = canvas["outcomes"]["evaluations"]
+        self.assertEqual(pilot["metrics"], metrics)
+        self.assertIsNot(pilot["metrics"], metrics)
+        self.assertNotIn("metrics", audit)
+
+
+class ConvertSourceTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="aac-crateimport-test-"))
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        init_converter(ConvertConfig(today=TODAY, schema_file=str(SCHEMA_FILE)))
+
+    def convert(self, name, data):
+        path = self.tmp / name
+        if isinstance(data, bytes):
+            path.write_bytes(data)
+        else:
+            path.write_text(json.dumps(data), encoding="utf-8")
+        return convert_source(Source(name=name, path=path))
+
+    def test_statuses(self):
+        archive = self.tmp / "crate.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.write(EXAMPLES_DIR / "complete-example.json", "ro-crate-metadata.json")
+        result = convert_source(Source(name="crate.zip", path=archive))
+        self.assertEqual((result.status, result.errors), ("valid", []))
+        self.assertEqual(json.loads(result.text)["versionDate"], TODAY)
+
+        self.assertEqual(self.convert("canvas.json", load_json(EXAMPLES_DIR / "complete-canvas.json")).status,
+                         "skipped")
+        self.assertEqual(self.convert("empty.json", crate()).status, "invalid")
+
+    def test_errors(self):
+        empty_zip = self.tmp / "empty.zip"
+        with zipfile.ZipFile(empty_zip, "w") as zf:
+            zf.writestr("README.md", "no metadata")
+        cases = {
+            "broken.json": (self.convert("broken.json", b'{"@graph": ['), "parse"),
+            "latin1.json": (self.convert("latin1.json", '{"name": "caf\xe9"}'.encode("latin-1")), "parse"),
+            "not-a.zip": (self.convert("not-a.zip", b"plain text"), "io"),
+            "empty.zip": (convert_source(Source(name="empty.zip", path=empty_zip)), "io"),
+            # An activity without @id breaks the mapping of that crate only
+            "no-id.json": (self.convert("no-id.json", crate({"@type": "prov:Activity", "name": "Stage"})), "convert"),
+        }
+        for name, (result, keyword) in cases.items():
+            with self.subTest(source=name):
+                self.assertEqual(result.status, "error")
+                self.assertEqual([issue.keyword for issue in result.errors], [keyword])
+
+    def test_jsonl_line(self):
+        line = Source(name="crates.jsonl:1", path=self.tmp / "crates.jsonl", line=1,
+                      text=json.dumps(load_json(EXAMPLES_DIR / "complete-example.json")))
+        self.assertEqual(convert_source(line).status, "valid")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Tests for requirement dependency analysis (aac.dependencies).
+
+A graph edited one requirement at a time must answer every query the way
+a graph rebuilt from the resulting requirements does:
+
+    python -m unittest discover tools/tests
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.dependencies import DependencyCycleError, DependencyGraph, dependency_issues  # noqa: E402
+
+
+def weight(requirement):
+    return requirement.get("weight", 1)
+
+
+def graph_of(*requirements):
+    return DependencyGraph.from_requirements(requirements, weight)
+
+
+class QueryTests(unittest.TestCase):
+    def test_topological_order_and_critical_path(self):
+        graph = graph_of(
+            {"id": "deploy", "dependsOn": ["test", "docs"], "weight": 1},
+            {"id": "test", "dependsOn": ["build"], "weight": 3},
+            {"id": "build", "weight": 5},
+            {"id": "docs", "weight": 2},
+        )
+        order = graph.topological_order()
+        self.assertEqual(sorted(order), ["build", "deploy", "docs", "test"])
+        self.assertLess(order.index("build"), order.index("test"))
+        self.assertLess(order.index("test"), order.index("deploy"))
+        self.assertLess(order.index("docs"), order.index("deploy"))
+        self.assertEqual(graph.critical_path(), (["build", "test", "deploy"], 9))
+        self.assertEqual(graph_of().critical_path(), ([], 0))
+
+    def test_cycles(self):
+        graph = graph_of(
+            {"id": "a", "dependsOn": ["c"]},
+            {"id": "b", "dependsOn": ["a"]},
+            {"id": "c", "dependsOn": ["b"]},
+            {"id": "d", "dependsOn": ["d"]},
+            {"id": "e", "dependsOn": ["a"]},
+        )
+        self.assertEqual(sorted(graph.cycles()), [["a", "b", "c"], ["d"]])
+        for query in (graph.topological_order, graph.critical_path):
+            with self.subTest(query=query.__name__):
+                with self.assertRaises(DependencyCycleError) as raised:
+                    query()
+                self.assertIn("a -> b -> c -> a", str(raised.exception))
+
+    def test_cycle_does_not_depend_on_edge_order(self):
+        # r1 depends on itself and is in a cycle with r3; the reported cycle
+        # must not change with the order the edges were declared or added in
+        orders = (["r1", "r3"], ["r3", "r1"])
+        found = []
+        for deps in orders:
+            requirements = [{"id": "r1", "dependsOn": deps}, {"id": "r2"}, {"id": "r3", "dependsOn": ["r1"]}]
+            found.append(DependencyGraph.from_requirements(requirements).cycles())
+            incremental = DependencyGraph()
+            for requirement in reversed(requirements):
+                incremental.set_requirement(requirement)
+            found.append(incremental.cycles())
+        self.assertEqual(found, [[["r1", "r3"]]] * 4)
+
+    def test_missing_references_connect_later(self):
+        graph = graph_of({"id": "b", "dependsOn": ["a"]})
+        self.assertEqual(graph.missing, {"a": {0: None}})
+        graph.set_requirement({"id": "a", "weight": 4})
+        self.assertEqual(graph.missing, {})
+        self.assertEqual(graph.critical_path(), (["a", "b"], 5))
+        graph.remove_requirement("a")
+        self.assertEqual(list(graph.missing), ["a"])
+        self.assertEqual(graph.topological_order(), ["b"])
+
+
+class IncrementalTests(unittest.TestCase):
+    """Random edit sequences, checked against a rebuild as they go."""
+
+    IDS = [f"r{n}" for n in range(12)]
+
+    def random_requirement(self, rng, req_id, acyclic):
+        # In acyclic runs requirements only depend on lower-numbered IDs
+        candidates = self.IDS[:self.IDS.index(req_id)] if acyclic else self.IDS
+        deps = rng.sample(candidates, min(len(candidates), rng.randint(0, 3)))
+        return {"id": req_id, "dependsOn": deps, "weight": rng.randint(1, 10_000)}
+
+    def assert_same_answers(self, graph, requirements):
+        rebuilt = DependencyGraph.from_requirements(requirements.values(), weight)
+        self.assertEqual(len(graph), len(rebuilt))
+        self.assertEqual(sorted(graph.cycles()), sorted(rebuilt.cycles()))
+        if rebuilt.cycles():
+            with self.assertRaises(DependencyCycleError):
+                graph.topological_order()
+            return
+
+        order = graph.topological_order()
+        self.assertEqual(sorted(order), sorted(requirements))
+        position = {req_id: n for n, req_id in enumerate(order)}
+        for req_id, requirement in requirements.items():
+            for dep_id in requirement["dependsOn"]:
+                if dep_id in requirements:
+                    self.assertLess(position[dep_id], position[req_id])
+
+        path, total = graph.critical_path()
+        self.assertEqual(total, rebuilt.critical_path()[1])
+        self.assertEqual(sum(requirements[req_id]["weight"] for req_id in path), total)
+        for dep_id, req_id in zip(path, path[1:]):
+            self.assertIn(dep_id, requirements[req_id]["dependsOn"])
+
+    def run_edits(self, seed, acyclic):
+        rng = random.Random(seed)
+        graph = DependencyGraph(weight)
+        requirements = {}
+        for _ in range(60):
+            req_id = rng.choice(self.IDS)
+            if req_id in requirements and rng.random() < 0.3:
+                graph.remove_requirement(req_id)
+                del requirements[req_id]
+            else:
+                requirements[req_id] = self.random_requirement(rng, req_id, acyclic)
+                graph.set_requirement(requirements[req_id])
+            # Query between edits too, so the maintained order and path are reused
+            if rng.random() < 0.5:
+                self.assert_same_answers(graph, requirements)
+        self.assert_same_answers(graph, requirements)
+
+    def test_acyclic_edits(self):
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                self.run_edits(seed, acyclic=True)
+
+    def test_edits_with_cycles(self):
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                self.run_edits(seed, acyclic=False)
+
+
+class IssueTests(unittest.TestCase):
+    def test_dependency_issues(self):
+        canvas = {"userExpectations": {"requirements": [
+            {"id": "a", "dependsOn": ["b", "zz"]},
+            {"id": "b", "dependsOn": ["a"]},
+            {"id": "a"},
+            {"id": "c", "dependsOn": ["c"]},
+        ]}}
+        issues = [(issue.pointer, issue.keyword) for issue in dependency_issues(canvas)]
+        self.assertEqual(issues, [
+            ("/userExpectations/requirements/2/id", "duplicate-id"),
+            ("/userExpectations/requirements/0/dependsOn/1", "dependency"),
+            ("/userExpectations/requirements/0/dependsOn", "dependency-cycle"),
+            ("/userExpectations/requirements/3/dependsOn", "dependency-cycle"),
+        ])
+        self.assertEqual(dependency_issues({"userExpectations": {}}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
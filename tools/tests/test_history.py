@@ -0,0 +1,179 @@
+"""
+Tests for the canvas version history store (aac.history).
+
+A series of edited canvases is recorded with a short snapshot interval, so
+versions are rebuilt from blobs and from chains of patches; every version
+must come back as recorded:
+
+    python -m unittest discover tools/tests
+"""
+
+import copy
+import json
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.history import META_SECTION, HistoryError, HistoryStore, canvas_key, split_sections  # noqa: E402
+from aac.jsonpatch import apply_patch  # noqa: E402
+from aac.validation import EXAMPLES_DIR, load_json  # noqa: E402
+
+COMPLETE = load_json(EXAMPLES_DIR / "complete-canvas.json")
+
+
+def edits(count):
+    """``count`` successive versions of the complete example, each changing one or two sections."""
+    canvas = copy.deepcopy(COMPLETE)
+    versions = []
+    for n in range(count):
+        canvas = copy.deepcopy(canvas)
+        requirement = canvas["userExpectations"]["requirements"][0]
+        requirement["title"] = f"Automated data processing, revision {n}"
+        if n % 3 == 1:
+            canvas["project"]["description"] += f" Revised in step {n}."
+        if n % 4 == 2:
+            canvas["versionDate"] = f"2026-0{1 + n // 4}-15"
+            canvas["version"] = f"1.{n}.0"
+        if n == 5:
+            canvas.pop("outcomes", None)
+        versions.append(canvas)
+    return versions
+
+
+class HistoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="aac-history-test-"))
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.path = self.tmp / "history.sqlite"
+
+    def open_store(self, **kwargs):
+        store = HistoryStore(self.path, **kwargs)
+        self.addCleanup(lambda: store.db.close())
+        return store
+
+    def record_all(self, store, key, canvases):
+        infos = [store.record(key, canvas, recorded_at=f"2026-01-{n + 1:02d}T12:00:00Z")
+                 for n, canvas in enumerate(canvases)]
+        store.commit()
+        return infos
+
+
+class RecordTests(HistoryTestCase):
+    def test_every_version_comes_back(self):
+        canvases = edits(10)
+        store = self.open_store(snapshot_interval=4)
+        infos = self.record_all(store, "p1", canvases)
+        self.assertEqual([info.seq for info in infos], list(range(1, 11)))
+        self.assertEqual([info.snapshot for info in infos], [n % 4 == 0 for n in range(10)])
+        self.assertGreater(store.stats()["patches"], 0)
+
+        store.close()
+        store = self.open_store()
+        self.assertEqual(store.snapshot_interval, 4)
+        for seq, canvas in enumerate(canvases, 1):
+            with self.subTest(seq=seq):
+                self.assertEqual(store.get("p1", seq=seq), (seq, canvas))
+                self.assertEqual(list(store.get("p1", seq=seq)[1]), list(canvas))
+        self.assertEqual(store.get("p1"), (10, canvases[-1]))
+
+    def test_unchanged_canvas_is_not_recorded(self):
+        store = self.open_store()
+        self.assertIsNotNone(store.record("p1", COMPLETE))
+        self.assertIsNone(store.record("p1", copy.deepcopy(COMPLETE)))
+        reordered = dict(reversed(list(COMPLETE.items())))
+        self.assertIsNone(store.record("p1", reordered))
+        self.assertEqual(len(store.versions("p1")), 1)
+
+    def test_changed_sections(self):
+        store = self.open_store(snapshot_interval=4)
+        infos = self.record_all(store, "p1", edits(6))
+        listed = store.versions("p1")
+        self.assertEqual([info.changed for info in listed], [info.changed for info in infos])
+        self.assertEqual(listed[0].changed, [name for name in
+                                             ["project", "userExpectations", "developerFeasibility", "governance",
+                                              "dataAccess", "outcomes", "persons", META_SECTION]
+                                             if name in split_sections(COMPLETE)])
+        self.assertEqual(listed[1].changed, ["project", "userExpectations"])
+        self.assertEqual(listed[2].changed, ["userExpectations", META_SECTION])
+        self.assertEqual(listed[5].changed, ["userExpectations", "outcomes"])
+
+    def test_identical_sections_are_stored_once(self):
+        store = self.open_store()
+        store.record("a", COMPLETE)
+        blobs = store.stats()["blobs"]
+        other = copy.deepcopy(COMPLETE)
+        other["project"]["title"] = "Another project"
+        store.record("b", other)
+        self.assertEqual(store.stats()["blobs"], blobs + 1)
+        self.assertEqual(store.get("b")[1], other)
+
+
+class ReadTests(HistoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.canvases = edits(10)
+        self.store = self.open_store(snapshot_interval=3)
+        self.record_all(self.store, "p1", self.canvases)
+
+    def test_lookups(self):
+        # Later versions keep the version and date set at seq 3 (1.2.0, 2026-01-15) and 7 (1.6.0, 2026-02-15)
+        self.assertEqual(self.store.get("p1", version="1.2.0")[0], 6)
+        self.assertEqual(self.store.get("p1", version="0.1.0")[0], 2)
+        self.assertEqual(self.store.get("p1", at="2026-02-01")[0], 6)
+        self.assertEqual(self.store.get("p1", at="2026-02-15")[0], 10)
+        self.assertEqual(self.store.get("p1", at="2025-12-31")[0], 2)
+        for kwargs in ({"seq": 11}, {"version": "9.9.9"}, {"at": "2025-01-29"}):
+            with self.subTest(**kwargs):
+                with self.assertRaises(HistoryError):
+                    self.store.get("p1", **kwargs)
+        with self.assertRaises(HistoryError):
+            self.store.get("nobody")
+        self.assertEqual(list(self.store.keys()), [("p1", 10, "2026-02-15")])
+
+    def test_diff(self):
+        for old, new in ((1, 2), (2, 1), (1, 10), (3, 7), (5, 6), (4, 4)):
+            with self.subTest(old=old, new=new):
+                patch = self.store.diff("p1", old, new)
+                self.assertEqual(apply_patch(self.canvases[old - 1], patch), self.canvases[new - 1])
+        self.assertEqual(self.store.diff("p1", 4, 4), [])
+
+    def test_corrupted_blob(self):
+        digest, = self.store.db.execute(
+            "SELECT s.digest FROM sections s JOIN versions v ON v.id = s.version_id "
+            "WHERE v.seq = 1 AND s.section = 'userExpectations'"
+        ).fetchone()
+        self.store.db.execute("UPDATE blobs SET data = ? WHERE digest = ?",
+                              (zlib.compress(json.dumps({"requirements": []}).encode("utf-8")), digest))
+        with self.assertRaises(HistoryError):
+            self.store.get("p1", seq=2)
+
+
+class StoreTests(HistoryTestCase):
+    def test_other_format_is_refused(self):
+        db = sqlite3.connect(str(self.path))
+        db.execute("PRAGMA user_version = 99")
+        db.close()
+        with self.assertRaises(HistoryError):
+            HistoryStore(self.path)
+
+    def test_snapshot_interval(self):
+        with self.assertRaises(HistoryError):
+            HistoryStore(self.tmp / "zero.sqlite", snapshot_interval=0)
+        self.assertEqual(self.open_store(snapshot_interval=5).snapshot_interval, 5)
+        self.assertEqual(self.open_store(snapshot_interval=2).snapshot_interval, 5)
+
+    def test_canvas_key(self):
+        self.assertEqual(canvas_key({"project": {"projectId": "p-1"}}), "p-1")
+        for canvas in ({}, {"project": {"projectId": ""}}, {"project": []}):
+            with self.subTest(canvas=canvas):
+                self.assertIsNone(canvas_key(canvas))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Tests for JSON Patch generation and application (aac.jsonpatch).
+
+Applying the patch between two documents to the first must give the second,
+equal as JSON (so ``1``, ``1.0`` and ``true`` stay apart):
+
+    python -m unittest discover tools/tests
+"""
+
+import copy
+import json
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.jsonpatch import JsonPatchError, apply_patch, make_patch  # noqa: E402
+from aac.validation import EXAMPLES_DIR, load_json  # noqa: E402
+
+PAIRS = {
+    "equal": ({"a": [1, {"b": None}]}, {"a": [1, {"b": None}]}),
+    "scalars": ({"a": 1, "b": "x"}, {"a": 2, "b": "x"}),
+    "add and remove keys": ({"a": 1, "b": 2}, {"b": 2, "c": {"d": []}}),
+    "numbers that compare equal": ({"a": 1, "b": 1, "c": [0]}, {"a": 1.0, "b": True, "c": [False]}),
+    "type change": ({"a": {"b": 1}}, {"a": [{"b": 1}]}),
+    "list insert": ([1, 2, 3, 4], [1, 2, 9, 3, 4]),
+    "list delete": ([1, 2, 3, 4], [1, 4]),
+    "list edit": ([{"id": 1, "v": "a"}, {"id": 2, "v": "b"}], [{"id": 1, "v": "a"}, {"id": 2, "v": "c"}]),
+    "list replaced": ([1, 2], ["x", "y", "z"]),
+    "escaped keys": ({"a/b": 1, "c~d": {"~1": 2}}, {"a/b": 2, "c~d": {"~1": 3}, "/": 0}),
+    "root": ({"a": 1}, [1]),
+}
+
+
+def mutate(rng, value):
+    """A random edit somewhere inside ``value`` (returns the edited copy)."""
+    if isinstance(value, dict) and value and rng.random() < 0.8:
+        key = rng.choice(sorted(value))
+        choice = rng.random()
+        result = dict(value)
+        if choice < 0.15:
+            del result[key]
+        elif choice < 0.3:
+            result[f"new-{rng.randint(0, 99)}"] = rng.choice([None, 1, "x", [1], {"k": 1.5}])
+        else:
+            result[key] = mutate(rng, value[key])
+        return result
+    if isinstance(value, list) and value and rng.random() < 0.8:
+        result = list(value)
+        position = rng.randrange(len(value))
+        choice = rng.random()
+        if choice < 0.2:
+            del result[position]
+        elif choice < 0.4:
+            result.insert(position, copy.deepcopy(rng.choice(value)))
+        else:
+            result[position] = mutate(rng, value[position])
+        return result
+    return rng.choice([None, True, 0, 1.0, "changed", [], {}])
+
+
+class RoundTripTests(unittest.TestCase):
+    def assert_round_trip(self, old, new):
+        before = copy.deepcopy(old)
+        patch = make_patch(old, new)
+        result = apply_patch(old, patch)
+        self.assertEqual(json.dumps(result, sort_keys=True), json.dumps(new, sort_keys=True))
+        self.assertEqual(old, before)
+        # The patch is plain JSON
+        self.assertEqual(json.loads(json.dumps(patch)), patch)
+        return patch
+
+    def test_pairs(self):
+        for name, (old, new) in PAIRS.items():
+            with self.subTest(case=name):
+                patch = self.assert_round_trip(old, new)
+                self.assertEqual(patch == [], name == "equal")
+
+    def test_random_edits_of_a_canvas(self):
+        canvas = load_json(EXAMPLES_DIR / "complete-canvas.json")
+        rng = random.Random(0)
+        for n in range(200):
+            edited = canvas
+            for _ in range(rng.randint(1, 4)):
+                edited = mutate(rng, edited)
+            with self.subTest(n=n):
+                self.assert_round_trip(canvas, edited)
+
+    def test_patches_stay_local(self):
+        old = {"items": [{"id": n, "name": f"item {n}"} for n in range(100)]}
+        new = copy.deepcopy(old)
+        new["items"][50]["name"] = "renamed"
+        self.assertEqual(make_patch(old, new), [{"op": "replace", "path": "/items/50/name", "value": "renamed"}])
+        shorter = copy.deepcopy(old)
+        del shorter["items"][10]
+        self.assertEqual(make_patch(old, shorter), [{"op": "remove", "path": "/items/10"}])
+        self.assertEqual(make_patch(old["items"], old["items"][:98]),
+                         [{"op": "remove", "path": "/99"}, {"op": "remove", "path": "/98"}])
+
+
+class ApplyTests(unittest.TestCase):
+    def test_in_place(self):
+        document = {"a": [1]}
+        value = {"b": 2}
+        result = apply_patch(document, [{"op": "add", "path": "/a/-", "value": value}], in_place=True)
+        self.assertIs(result, document)
+        self.assertIs(document["a"][1], value)
+        copied = apply_patch(document, [{"op": "add", "path": "/c", "value": value}])
+        self.assertNotIn("c", document)
+        self.assertIsNot(copied["c"], value)
+
+    def test_errors(self):
+        document = {"a": [1, 2], "b": {"c": 1}, "s": "text"}
+        patches = {
+            "missing key": {"op": "remove", "path": "/x"},
+            "missing parent": {"op": "add", "path": "/x/y", "value": 1},
+            "index out of range": {"op": "replace", "path": "/a/2", "value": 1},
+            "leading zero": {"op": "remove", "path": "/a/01"},
+            "not an index": {"op": "remove", "path": "/a/-"},
+            "scalar parent": {"op": "add", "path": "/s/0", "value": 1},
+            "remove root": {"op": "remove", "path": ""},
+            "bad pointer": {"op": "add", "path": "a", "value": 1},
+            "unsupported": {"op": "move", "from": "/a", "path": "/d"},
+        }
+        for name, op in patches.items():
+            with self.subTest(case=name):
+                with self.assertRaises(JsonPatchError):
+                    apply_patch(document, [op])
+        self.assertEqual(apply_patch(document, [{"op": "add", "path": "/a/2", "value": 3}])["a"], [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+"""
+Tests for canvas migrations (aac.migrate).
+
+Each registered step is applied to the legacy shape it detects; ``plan``
+and ``migrate`` must pick the steps from the canvas's inferred version on,
+and normalization (the app's import path) must agree with the steps:
+
+    python -m unittest discover tools/tests
+"""
+
+import copy
+import json
+import sys
+import unittest
+from pathlib import Path
+
+from jsonschema import Draft7Validator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.batch import Source  # noqa: E402
+from aac.migrate import (  # noqa: E402
+    MIGRATIONS,
+    MigrateConfig,
+    init_migrator,
+    migrate,
+    migrate_source,
+    normalize_canvas,
+    parse_effort_estimate,
+    parse_version,
+    plan,
+)
+from aac.validation import EXAMPLES_DIR, SCHEMA_FILE, load_json  # noqa: E402
+
+STEPS = {step.name: step for step in MIGRATIONS}
+
+
+def requirement(**fields):
+    return dict({"id": "r1", "title": "Task", "unitCategory": "item", "benefits": []}, **fields)
+
+
+def canvas_with(*requirements, **fields):
+    return dict({"project": {"title": "P", "description": "D"},
+                 "userExpectations": {"requirements": list(requirements)}}, **fields)
+
+
+class ParseTests(unittest.TestCase):
+    def test_parse_version(self):
+        self.assertEqual(parse_version("0.13.1"), (0, 13, 1))
+        self.assertEqual(parse_version(" 1.2.3-rc.1+build "), (1, 2, 3))
+        with self.assertRaises(ValueError):
+            parse_version("v1")
+
+    def test_parse_effort_estimate(self):
+        cases = {
+            "3 weeks": {"value": 3, "unit": "weeks"},
+            "2.5 wk": {"value": 2.5, "unit": "weeks"},
+            "20 PH": {"value": 20, "unit": "person-hours"},
+            "about 40 person-hours": {"value": 40, "unit": "person-hours"},
+            "5": {"value": 5, "unit": "weeks"},
+            "unknown": None,
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_effort_estimate(text), expected)
+
+
+class StepTests(unittest.TestCase):
+    def apply(self, name, canvas):
+        step = STEPS[name]
+        self.assertTrue(step.detect(canvas))
+        notes = step.apply(canvas)
+        self.assertTrue(notes)
+        self.assertFalse(step.detect(canvas))
+        return canvas
+
+    def test_steps_are_ordered_by_version(self):
+        self.assertEqual([step.key for step in MIGRATIONS], sorted(step.key for step in MIGRATIONS))
+        for step in MIGRATIONS:
+            with self.subTest(step=step.name):
+                self.assertTrue(step.description)
+
+    def test_drop_aggregate_benefits(self):
+        canvas = canvas_with(
+            requirement(aggregateBenefitValue=3, benefits=[{"benefitType": "time", "isImported": True}]),
+            aggregateBenefits=[],
+        )
+        canvas = self.apply("drop_aggregate_benefits", canvas)
+        self.assertNotIn("aggregateBenefits", canvas)
+        self.assertEqual(canvas["userExpectations"]["requirements"][0]["benefits"], [{"benefitType": "time"}])
+
+    def test_requirement_titles(self):
+        canvas = canvas_with({"id": "r1", "description": " Sort mail ", "priority": "high"})
+        canvas = self.apply("requirement_titles", canvas)
+        self.assertEqual(canvas["userExpectations"]["requirements"][0],
+                         {"id": "r1", "title": "Sort mail", "priority": "high"})
+
+    def test_unit_categories(self):
+        canvas = canvas_with(requirement(unitCategory="case"), requirement(unitCategory="meeting"),
+                             requirement(unitCategory="widget"), requirement(unitCategory="item"))
+        canvas = self.apply("unit_categories", canvas)
+        self.assertEqual([r["unitCategory"] for r in canvas["userExpectations"]["requirements"]],
+                         ["item", "interaction", "other", "item"])
+
+    def test_oversight_to_benefits(self):
+        canvas = canvas_with(
+            requirement(humanOversightMinutesPerUnit=5,
+                        benefits=[{"benefitType": "quality"}, {"benefitType": "time"}]),
+            requirement(humanOversightMinutesPerUnit=5,
+                        benefits=[{"benefitType": "time", "oversightMinutesPerUnit": 2}]),
+            requirement(humanOversightMinutesPerUnit=5, benefits=[{"benefitType": "quality"}]),
+        )
+        moved, kept, dropped = self.apply("oversight_to_benefits", canvas)["userExpectations"]["requirements"]
+        self.assertEqual(moved["benefits"][1]["oversightMinutesPerUnit"], 5)
+        self.assertEqual(kept["benefits"][0]["oversightMinutesPerUnit"], 2)
+        self.assertEqual(dropped["benefits"], [{"benefitType": "quality"}])
+
+    def test_effort_estimates(self):
+        canvas = canvas_with(requirement(feasibility={"effortEstimate": "3 weeks"}),
+                             developerFeasibility={"effortEstimate": "soon"})
+        canvas = self.apply("effort_estimates", canvas)
+        self.assertEqual(canvas["userExpectations"]["requirements"][0]["feasibility"],
+                         {"effortEstimate": {"value": 3, "unit": "weeks"}})
+        self.assertEqual(canvas["developerFeasibility"], {})
+
+    def test_value_driver(self):
+        canvas = self.apply("value_driver", canvas_with(project={"title": "P", "primaryValueDriver": "speed"}))
+        self.assertEqual(canvas["project"], {"title": "P"})
+        self.assertFalse(STEPS["value_driver"].detect(canvas_with(project={"primaryValueDriver": "cost"})))
+
+    def test_legacy_stakeholders(self):
+        canvas = canvas_with(requirement(stakeholder=" ada lovelace"), requirement(stakeholder="Nobody"),
+                             persons=[{"id": "p1", "name": "Ada Lovelace"}])
+        canvas["userExpectations"]["stakeholders"] = ["Ada"]
+        canvas = self.apply("legacy_stakeholders", canvas)
+        linked, dropped = canvas["userExpectations"]["requirements"]
+        self.assertEqual(linked["stakeholders"], ["p1"])
+        self.assertNotIn("stakeholders", dropped)
+        self.assertNotIn("stakeholders", canvas["userExpectations"])
+
+    def test_person_local_titles(self):
+        canvas = canvas_with(persons=[{"id": "p1", "localTitles": ["Dr", "Prof"]},
+                                      {"id": "p2", "localTitles": ["Dr"], "localTitle": "MD"}])
+        canvas = self.apply("person_local_titles", canvas)
+        self.assertEqual(canvas["persons"], [{"id": "p1", "localTitle": "Dr, Prof"}, {"id": "p2", "localTitle": "MD"}])
+
+    def test_structured_authors(self):
+        authors = ["ada", "Lab", {"type": "organization", "name": "X"}]
+        canvas = canvas_with(persons=[{"id": "p1", "name": "Ada"}],
+                             outcomes={"publications": [{"title": "T", "authors": authors}]})
+        canvas = self.apply("structured_authors", canvas)
+        self.assertEqual(canvas["outcomes"]["publications"][0]["authors"], [
+            {"type": "person", "personId": "p1"},
+            {"type": "organization", "name": "Lab"},
+            {"type": "organization", "name": "X"},
+        ])
+
+
+class PlanTests(unittest.TestCase):
+    def test_current_canvases_need_nothing(self):
+        for name in ("complete-canvas.json", "minimal-canvas.json"):
+            canvas = load_json(EXAMPLES_DIR / name)
+            with self.subTest(example=name):
+                self.assertEqual(plan(canvas), [])
+                outcome = migrate(canvas)
+                self.assertFalse(outcome.changed)
+                self.assertIsNone(outcome.from_version)
+
+    def test_plan_starts_at_the_oldest_legacy_shape(self):
+        canvas = canvas_with(persons=[{"id": "p1", "localTitles": ["Dr"]}])
+        self.assertEqual(plan(canvas)[0].name, "person_local_titles")
+        canvas["userExpectations"]["requirements"].append({"id": "r1", "description": "Untitled"})
+        self.assertEqual(plan(canvas)[0].version, "0.11.0")
+        self.assertEqual([step.name for step in plan(canvas, from_version="0.12.0")],
+                         ["person_local_titles", "structured_authors"])
+
+    def test_migrate_leaves_the_input_alone(self):
+        canvas = load_json(EXAMPLES_DIR / "complete-canvas.json")
+        legacy = copy.deepcopy(canvas)
+        legacy["aggregateBenefits"] = []
+        legacy["persons"][0]["localTitles"] = ["Dr"]
+        legacy["persons"][0].pop("localTitle", None)
+        before = copy.deepcopy(legacy)
+        outcome = migrate(legacy)
+        self.assertEqual(legacy, before)
+        self.assertEqual(outcome.from_version, "0.10.0")
+        self.assertEqual([step.name for step, _ in outcome.applied], ["drop_aggregate_benefits", "person_local_titles"])
+        self.assertEqual(list(Draft7Validator(load_json(SCHEMA_FILE)).iter_errors(outcome.canvas)), [])
+
+
+class NormalizeTests(unittest.TestCase):
+    def test_oversight_matches_the_migration_step(self):
+        cases = {
+            "first time benefit": [{"benefitType": "quality"}, {"benefitType": "time"}],
+            "value on the benefit wins": [{"benefitType": "time", "oversightMinutesPerUnit": 2}],
+            "no time benefit": [{"benefitType": "quality"}],
+        }
+        for name, benefits in cases.items():
+            for oversight in (5, None):
+                canvas = canvas_with(requirement(humanOversightMinutesPerUnit=oversight, benefits=benefits))
+                with self.subTest(case=name, oversight=oversight):
+                    normalized, _ = normalize_canvas(canvas)
+                    migrated = migrate(canvas).canvas
+                    self.assertEqual(normalized["userExpectations"]["requirements"][0]["benefits"],
+                                     migrated["userExpectations"]["requirements"][0]["benefits"])
+                    self.assertEqual(canvas["userExpectations"]["requirements"][0]["benefits"], benefits)
+
+    def test_warnings(self):
+        canvas = canvas_with({"id": "r1", "description": "Sort", "unitCategory": "case"},
+                             requirement(unitCategory="widget"), project={"title": "P", "primaryValueDriver": "speed"})
+        normalized, warnings = normalize_canvas(canvas)
+        self.assertEqual(len(warnings), 4)
+        self.assertEqual([r["unitCategory"] for r in normalized["userExpectations"]["requirements"]], ["item", "other"])
+        self.assertNotIn("primaryValueDriver", normalized["project"])
+
+
+class MigrateSourceTests(unittest.TestCase):
+    def setUp(self):
+        init_migrator(MigrateConfig(diff=True))
+
+    def source(self, document):
+        return Source(name="canvases.jsonl:1", path=Path("canvases.jsonl"), line=1, text=json.dumps(document))
+
+    def test_results(self):
+        result = migrate_source(self.source(canvas_with(persons=[{"id": "p1", "localTitles": ["Dr"]}])))
+        self.assertEqual((result.status, result.from_version, result.steps),
+                         ("migrated", "0.13.1", ["person_local_titles"]))
+        self.assertEqual(json.loads(result.text)["persons"], [{"id": "p1", "localTitle": "Dr"}])
+        self.assertNotIn("\n", result.text)
+        self.assertIn('+      "localTitle": "Dr"', result.diff)
+
+        self.assertEqual(migrate_source(self.source(canvas_with())).status, "current")
+        self.assertEqual(migrate_source(self.source({"@context": {}, "@graph": []})).status, "skipped")
+        self.assertEqual(migrate_source(self.source([1])).status, "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Tests for RO-Crate profile validation (aac.rocrate).
+
+Crates are checked entity by entity against the profile branch each entity
+selects, with and without the compiled fast path, loaded or streamed:
+
+    python -m unittest discover tools/tests
+"""
+
+import copy
+import io
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.rocrate import ProfileValidator  # noqa: E402
+from aac.synthetic import CrateGenerator  # noqa: E402
+from aac.validation import EXAMPLES_DIR, load_json  # noqa: E402
+
+COMPLETE = load_json(EXAMPLES_DIR / "complete-example.json")
+
+
+def entity(crate, entity_id):
+    return next(e for e in crate["@graph"] if e.get("@id") == entity_id)
+
+
+class ProfileTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.profile = ProfileValidator.from_file()
+        cls.slow = ProfileValidator.from_file(fast_path=False)
+
+    def issues(self, crate, **kwargs):
+        """Issues of a crate; the fast path and jsonschema alone must agree on them."""
+        is_valid, issues = self.profile.validate(crate, **kwargs)
+        self.assertEqual(self.slow.validate(crate, **kwargs), (is_valid, issues))
+        self.assertEqual(is_valid, not issues)
+        return issues
+
+    def keywords(self, crate):
+        return [issue.keyword for issue in self.issues(crate)]
+
+
+class ValidateTests(ProfileTestCase):
+    def test_examples_are_valid(self):
+        for name in ("complete-example.json", "minimal-example.json"):
+            with self.subTest(example=name):
+                self.assertEqual(self.issues(load_json(EXAMPLES_DIR / name)), [])
+
+    def test_type_forms_select_the_same_branch(self):
+        person = entity(COMPLETE, "#person-0")
+        branch = self.profile.select_branch(person)
+        self.assertIsNotNone(branch)
+        for types in ("Person", ["schema:Person"], ["Person"]):
+            with self.subTest(types=types):
+                self.assertEqual(self.profile.select_branch(dict(person, **{"@type": types})), branch)
+                crate = copy.deepcopy(COMPLETE)
+                entity(crate, "#person-0")["@type"] = types
+                self.assertEqual(self.issues(crate), [])
+
+    def test_unknown_type(self):
+        crate = copy.deepcopy(COMPLETE)
+        crate["@graph"].append({"@id": "#thing", "@type": "Thing"})
+        issues = self.issues(crate)
+        self.assertEqual([issue.keyword for issue in issues], ["oneOf"])
+        self.assertEqual(issues[0].pointer, f"/@graph/{len(crate['@graph']) - 1}")
+
+    def test_entity_errors_point_into_the_graph(self):
+        crate = copy.deepcopy(COMPLETE)
+        del entity(crate, "ro-crate-metadata.json")["conformsTo"]
+        entity(crate, "./")["@type"] = "Collection"
+        issues = self.issues(crate)
+        positions = {e["@id"]: i for i, e in enumerate(crate["@graph"])}
+        self.assertEqual([issue.pointer for issue in issues],
+                         [f"/@graph/{positions['ro-crate-metadata.json']}", f"/@graph/{positions['./']}/@type"])
+        self.assertIn("(ro-crate-metadata.json) [RO-Crate Metadata File Descriptor]", issues[0].message)
+        self.assertIn("(./) [Root Dataset]", issues[1].message)
+
+    def test_duplicate_id(self):
+        crate = copy.deepcopy(COMPLETE)
+        crate["@graph"].append(copy.deepcopy(entity(crate, "#person-1")))
+        self.assertEqual(self.keywords(crate), ["uniqueId"])
+
+    def test_references(self):
+        crate = copy.deepcopy(COMPLETE)
+        project = entity(crate, "#project")
+        # Forward references and absolute IRIs are fine; unknown local ones are not
+        crate["@graph"].remove(project)
+        crate["@graph"].append(project)
+        project["sameAs"] = {"@id": "https://example.org/project"}
+        self.assertEqual(self.issues(crate), [])
+        project["isPartOf"] = {"@id": "#programme"}
+        issues = self.issues(crate)
+        self.assertEqual([issue.keyword for issue in issues], ["reference"])
+        self.assertTrue(issues[0].pointer.endswith("/isPartOf"))
+
+    def test_missing_descriptor(self):
+        crate = copy.deepcopy(COMPLETE)
+        crate["@graph"] = [e for e in crate["@graph"] if e["@id"] != "ro-crate-metadata.json"]
+        self.assertIn("required", self.keywords(crate))
+
+    def test_max_errors(self):
+        crate = copy.deepcopy(COMPLETE)
+        crate["@graph"].extend({"@id": f"#thing-{n}", "@type": "Thing"} for n in range(5))
+        self.assertEqual(len(self.issues(crate)), 5)
+        self.assertEqual(len(self.issues(crate, max_errors=2)), 2)
+
+
+class StreamTests(ProfileTestCase):
+    def test_stream_matches_loaded(self):
+        generator = CrateGenerator(self.profile)
+        for seed, invalid in ((0, False), (1, True), (2, True)):
+            crate = generator.crate(size=20, seed=seed, invalid=invalid)
+            with self.subTest(seed=seed, invalid=invalid):
+                expected = self.issues(crate)
+                self.assertEqual(bool(expected), invalid)
+                # A small chunk size splits entities across reads
+                stream = io.StringIO(json.dumps(crate))
+                self.assertEqual(self.profile.validate_stream(stream, chunk_size=64), (not expected, expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Tests for the corpus search index (aac.search).
+
+Files are indexed the way tools/search-canvases.py does it (``stale``,
+``read_chunk``, ``apply``), then changed, touched and deleted; the index
+must answer queries as if it had been rebuilt from scratch:
+
+    python -m unittest discover tools/tests
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.search import SEARCH_INDEX_VERSION, SearchIndex, extract, read_chunk  # noqa: E402
+from aac.validation import EXAMPLES_DIR, load_json  # noqa: E402
+
+
+def canvas(title, driver=None, keywords=(), risk=None, duo=(), requirement=None):
+    data = {"project": {"title": title, "description": f"{title} project", "keywords": list(keywords)}}
+    if driver:
+        data["project"]["primaryValueDriver"] = driver
+    if risk:
+        data["developerFeasibility"] = {"technicalRisk": risk, "trlLevel": {"current": 3, "target": 6}}
+    if duo:
+        data["dataAccess"] = {"datasets": [{"title": "Records", "duoTerms": list(duo)}]}
+    if requirement:
+        data["userExpectations"] = {"requirements": [{"id": "r1", "title": requirement}]}
+    return data
+
+
+class ExtractTests(unittest.TestCase):
+    def test_canvas_fields(self):
+        doc = extract("a.json", canvas("Triage", "time", ["Radiology", "AI"], "High",
+                                       ["http://purl.obolibrary.org/obo/DUO_0000042"], "Sort referrals"))
+        self.assertEqual((doc.kind, doc.title, doc.value_driver, doc.technical_risk),
+                         ("canvas", "Triage", "time", "High"))
+        self.assertEqual((doc.trl_current, doc.trl_target), (3, 6))
+        self.assertEqual(doc.terms, [("duo", "DUO:0000042"), ("keyword", "ai"), ("keyword", "radiology"),
+                                     ("risk", "high")])
+        self.assertEqual(doc.text, "Sort referrals\nRecords")
+
+    def test_rocrates_are_mapped_to_canvas_fields(self):
+        crate = extract("crate.json", load_json(EXAMPLES_DIR / "complete-example.json"))
+        same = extract("canvas.json", load_json(EXAMPLES_DIR / "complete-canvas.json"))
+        self.assertEqual(crate.kind, "rocrate")
+        self.assertEqual((crate.title, crate.value_driver, crate.stage), (same.title, same.value_driver, same.stage))
+
+    def test_not_indexable(self):
+        for data in ([], "x", {"@context": {}, "@graph": [{"@id": "#a"}]}):
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    extract("bad.json", data)
+
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="aac-search-test-"))
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.corpus = self.tmp / "corpus"
+        self.corpus.mkdir()
+        self.index = self.open_index()
+        self.write("triage.json", canvas("Triage", "time", ["radiology"], "high", ["DUO:0000042"], "Sort referrals"))
+        self.write("billing.json", canvas("Billing", "cost", ["finance"], "low"))
+        self.write("more.jsonl", "\n".join([
+            json.dumps(canvas("Radiology reports", "quality", ["Radiology"], "medium")),
+            "",
+            "{broken",
+            json.dumps(canvas("Scheduling", "time")),
+        ]))
+        self.errors = self.update()
+
+    def open_index(self):
+        index = SearchIndex(self.tmp / "index" / "search.sqlite")
+        self.addCleanup(lambda: index.db.close())
+        return index
+
+    def write(self, name, data, age=60):
+        """Write a corpus file, backdated so its stat data is trusted."""
+        path = self.corpus / name
+        path.write_text(data if isinstance(data, str) else json.dumps(data), encoding="utf-8")
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+        return path
+
+    def update(self):
+        """One indexing run over the corpus; returns the parse errors."""
+        paths = sorted(self.corpus.iterdir())
+        updates = read_chunk(list(self.index.stale(paths)))
+        self.reindexed = sum(self.index.apply(update) for update in updates)
+        return [error for update in updates for error in update.errors]
+
+    def titles(self, **kwargs):
+        return [hit.title for hit in self.index.search(**kwargs)]
+
+    def test_queries(self):
+        self.assertEqual(self.index.counts(), (3, 4))
+        self.assertEqual(len(self.errors), 1)
+        self.assertIn("more.jsonl:3", self.errors[0])
+
+        self.assertEqual(self.titles(text="radiology"), ["Radiology reports", "Triage"])
+        self.assertEqual(self.titles(text="referrals"), ["Triage"])
+        self.assertEqual(self.titles(filters={"value_driver": "TIME"}), ["Scheduling", "Triage"])
+        self.assertEqual(self.titles(terms=[("risk", "High")]), ["Triage"])
+        self.assertEqual(self.titles(terms=[("duo", "http://purl.obolibrary.org/obo/DUO_0000042")]), ["Triage"])
+        self.assertEqual(self.titles(text="radiology", filters={"technical_risk": "medium"}), ["Radiology reports"])
+        self.assertEqual(len(self.titles(limit=2)), 2)
+        self.assertEqual(self.titles(kind="rocrate"), [])
+        hit = self.index.search(text="scheduling")[0]
+        self.assertEqual(hit.name, f"{(self.corpus / 'more.jsonl').resolve()}:4")
+        for kwargs in ({"filters": {"title": "x"}}, {"terms": [("title", "x")]}):
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(ValueError):
+                    self.index.search(**kwargs)
+
+    def test_unchanged_and_touched_files_are_not_reindexed(self):
+        self.assertEqual(list(self.index.stale(sorted(self.corpus.iterdir()))), [])
+        self.assertEqual(self.index.unchanged, 3)
+
+        path = self.corpus / "billing.json"
+        stamp = time.time() - 30
+        os.utime(path, (stamp, stamp))
+        (task,) = self.index.stale(sorted(self.corpus.iterdir()))
+        self.assertEqual(task[0], str(path.resolve()))
+        self.update()
+        self.assertEqual(self.reindexed, 0)
+        self.assertEqual(self.titles(text="billing"), ["Billing"])
+        self.assertEqual(list(self.index.stale(sorted(self.corpus.iterdir()))), [])
+
+    def test_changed_files_replace_their_documents(self):
+        self.write("triage.json", canvas("Intake", "risk", ["oncology"]), age=30)
+        self.write("more.jsonl", json.dumps(canvas("Scheduling", "time")), age=30)
+        self.assertEqual(self.update(), [])
+        self.assertEqual(self.reindexed, 2)
+        self.assertEqual(self.index.counts(), (3, 3))
+        self.assertEqual(self.titles(text="radiology OR triage"), [])
+        self.assertEqual(self.titles(terms=[("risk", "high")]), [])
+        self.assertEqual(self.titles(terms=[("keyword", "oncology")]), ["Intake"])
+        self.assertEqual(sorted(self.titles()), ["Billing", "Intake", "Scheduling"])
+
+    def test_prune(self):
+        (self.corpus / "billing.json").unlink()
+        self.assertEqual(self.index.prune(), 1)
+        self.assertEqual(self.index.counts(), (2, 3))
+        self.assertEqual(self.titles(text="billing"), [])
+        self.assertEqual(self.titles(terms=[("keyword", "finance")]), [])
+
+    def test_other_versions_are_rebuilt(self):
+        self.index.close()
+        index = self.open_index()
+        self.assertEqual(index.counts(), (3, 4))
+        index.db.execute(f"PRAGMA user_version = {SEARCH_INDEX_VERSION + 1}")
+        index.close()
+        self.assertEqual(self.open_index().counts(), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Tests for the analytics table export (aac.tables).
+
+A corpus is exported the way tools/export-tables.py does it, with different
+numbers of shards; the CSV and ``.cols`` outputs must agree with each other,
+with the canvases they were flattened from and across shard counts:
+
+    python -m unittest discover tools/tests
+"""
+
+import copy
+import csv
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.columnar import read_table  # noqa: E402
+from aac.synthetic import CanvasGenerator  # noqa: E402
+from aac.tables import (  # noqa: E402
+    FORMATS,
+    TABLES,
+    ExportConfig,
+    canvas_rows,
+    csv_value,
+    export_chunk,
+    init_exporter,
+    merge_parts,
+    shard_paths,
+)
+from aac.validation import EXAMPLES_DIR, SCHEMA_FILE, load_json  # noqa: E402
+
+COMPLETE = load_json(EXAMPLES_DIR / "complete-canvas.json")
+
+
+class CanvasRowsTests(unittest.TestCase):
+    def test_rows_follow_the_table_columns(self):
+        rows = list(canvas_rows("complete-canvas.json", COMPLETE))
+        requirements = COMPLETE["userExpectations"]["requirements"]
+        counts = Counter(table for table, _ in rows)
+        self.assertEqual(counts["projects"], 1)
+        self.assertEqual(counts["requirements"], len(requirements))
+        self.assertEqual(counts["benefits"], sum(len(r.get("benefits", [])) for r in requirements))
+        for table, row in rows:
+            with self.subTest(table=table):
+                self.assertEqual(len(row), len(TABLES[table]))
+                self.assertEqual(row[0], "complete-canvas.json")
+
+    def test_benefit_values_are_split_by_type(self):
+        canvas = copy.deepcopy(COMPLETE)
+        benefits = canvas["userExpectations"]["requirements"][0]["benefits"]
+        benefits[:] = [
+            {"benefitType": "quality", "baseline": {"type": "categorical", "category": "low"},
+             "expected": {"type": "boolean", "bool": False}},
+            {"benefitType": "time", "baseline": {"type": "numeric", "value": 30}, "expected": "not a value"},
+        ]
+        columns = [name for name, _ in TABLES["benefits"]]
+        rows = [dict(zip(columns, row)) for table, row in canvas_rows("k", canvas) if table == "benefits"]
+        self.assertEqual([(r["baseline_type"], r["baseline"], r["baseline_category"], r["baseline_bool"])
+                          for r in rows[:2]], [("categorical", None, "low", None), ("numeric", 30.0, None, None)])
+        self.assertEqual((rows[0]["expected_type"], rows[0]["expected_bool"]), ("boolean", False))
+        self.assertEqual(rows[1]["expected_type"], None)
+
+    def test_out_of_range_and_mistyped_values_are_null(self):
+        canvas = copy.deepcopy(COMPLETE)
+        canvas["developerFeasibility"]["trlLevel"] = {"current": 2 ** 40, "target": True}
+        canvas["project"]["title"] = 5
+        _, project = next(canvas_rows("k", canvas))
+        row = dict(zip([name for name, _ in TABLES["projects"]], project))
+        self.assertEqual((row["trl_current"], row["trl_target"], row["title"]), (None, None, None))
+
+    def test_csv_values(self):
+        self.assertEqual([csv_value(v) for v in (None, True, False, 0.1, 3, "x")], ["", "true", "false", "0.1", 3, "x"])
+
+
+class ExportTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        generator = CanvasGenerator(load_json(SCHEMA_FILE))
+        cls.canvases = [generator.canvas(size=1 + seed % 3, seed=seed) for seed in range(12)]
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="aac-tables-test-"))
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        corpus = self.tmp / "corpus"
+        corpus.mkdir()
+        for n, canvas in enumerate(self.canvases[:8]):
+            (corpus / f"canvas-{n:02d}.json").write_text(json.dumps(canvas), encoding="utf-8")
+        lines = [json.dumps(canvas) for canvas in self.canvases[8:]]
+        (corpus / "more.jsonl").write_text("\n".join(lines[:2] + ["[1, 2]"] + lines[2:]), encoding="utf-8")
+        self.paths = [str(path) for path in sorted(corpus.iterdir())]
+
+    def export(self, shards, row_group_size=7):
+        output = self.tmp / f"out-{shards}"
+        parts = output / "parts"
+        parts.mkdir(parents=True)
+        init_exporter(ExportConfig(str(parts), FORMATS, row_group_size))
+        results = export_chunk(shard_paths(self.paths, shards))
+        merge_parts(output, parts, len(results), FORMATS)
+        self.assertEqual(list(parts.iterdir()), [])
+        return output, results
+
+    def test_output_does_not_depend_on_shards(self):
+        single, results = self.export(1)
+        self.assertEqual(sum(result.canvases for result in results), len(self.canvases))
+        self.assertEqual([message.split(":")[-2] for result in results for message in result.skipped], ["3"])
+        for shards in (3, 9):
+            output, _ = self.export(shards)
+            for table in TABLES:
+                with self.subTest(shards=shards, table=table):
+                    self.assertEqual((output / f"{table}.csv").read_text(encoding="utf-8"),
+                                     (single / f"{table}.csv").read_text(encoding="utf-8"))
+                    self.assertEqual(read_table(str(output / f"{table}.cols")),
+                                     read_table(str(single / f"{table}.cols")))
+
+    def test_csv_and_columnar_agree(self):
+        output, results = self.export(4)
+        for table, columns in TABLES.items():
+            with self.subTest(table=table):
+                with open(output / f"{table}.csv", encoding="utf-8", newline="") as f:
+                    reader = csv.reader(f)
+                    self.assertEqual(next(reader), [name for name, _ in columns])
+                    csv_rows = list(reader)
+                cols = read_table(str(output / f"{table}.cols"))
+                self.assertEqual(csv_rows, [[str(csv_value(value)) for value in row] for row in zip(*cols.values())])
+                self.assertEqual(len(csv_rows), sum(result.rows[table] for result in results))
+
+    def test_rollups_match_the_canvases(self):
+        output, _ = self.export(4)
+        requirements = read_table(str(output / "requirements.cols"), ["project_key", "benefit_count"])
+        benefits = read_table(str(output / "benefits.cols"), ["project_key"])
+        projects = read_table(str(output / "projects.cols"), ["project_key", "requirement_count"])
+
+        # Counts stored on parent rows equal the child rows per project
+        per_project = Counter(requirements["project_key"])
+        self.assertEqual(dict(zip(projects["project_key"], projects["requirement_count"])),
+                         {key: per_project[key] for key in projects["project_key"]})
+        benefit_counts = Counter()
+        for key, count in zip(requirements["project_key"], requirements["benefit_count"]):
+            benefit_counts[key] += count
+        self.assertEqual(benefit_counts, Counter(benefits["project_key"]))
+
+        expected = sum(len(r.get("benefits", [])) for canvas in self.canvases
+                       for r in canvas["userExpectations"]["requirements"])
+        self.assertEqual(len(benefits["project_key"]), expected)
+
+    def test_shard_paths(self):
+        paths = [str(n) for n in range(7)]
+        for shards in (1, 3, 7, 20):
+            with self.subTest(shards=shards):
+                split = shard_paths(paths, shards)
+                self.assertEqual([shard for shard, _ in split], list(range(min(shards, 7))))
+                self.assertEqual([path for _, part in split for path in part], paths)
+                sizes = [len(part) for _, part in split]
+                self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
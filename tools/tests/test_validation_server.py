@@ -0,0 +1,145 @@
+"""
+Offline tests for the validation server (aac.server) and its client.
+
+The server is started in a background thread on 127.0.0.1:0 and on a Unix
+socket in a temporary directory, with its own copies of the schema files so
+that the reload test can change them:
+
+    python -m unittest discover tools/tests
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aac.batch import BatchConfig  # noqa: E402
+from aac.client import ValidationClient  # noqa: E402
+from aac.rocrate import PROFILE_FILE  # noqa: E402
+from aac.server import make_server  # noqa: E402
+from aac.validation import REPO_ROOT, SCHEMA_FILE  # noqa: E402
+
+EXAMPLES = REPO_ROOT / "schema" / "examples"
+VALID_CANVAS = (EXAMPLES / "complete-canvas.json").read_bytes()
+VALID_CRATE = (EXAMPLES / "complete-example.json").read_bytes()
+# project misses its required fields and persons is not an array: several errors
+INVALID_CANVAS = json.dumps({"project": {}, "persons": "nobody"}).encode("utf-8")
+
+
+class ServerTestCase(unittest.TestCase):
+    """Starts a server on fresh copies of the schema files for each test."""
+
+    unix = False
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="aac-server-test-"))
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.schema_file = self.tmp / SCHEMA_FILE.name
+        profile_file = self.tmp / PROFILE_FILE.name
+        shutil.copyfile(SCHEMA_FILE, self.schema_file)
+        shutil.copyfile(PROFILE_FILE, profile_file)
+
+        config = BatchConfig(schema_file=str(self.schema_file), profile_file=str(profile_file))
+        socket_path = str(self.tmp / "server.sock") if self.unix else None
+        self.server = make_server(config, "127.0.0.1", 0, socket_path)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        address = f"unix:{socket_path}" if self.unix else f"127.0.0.1:{self.server.server_address[1]}"
+        self.client = ValidationClient(address, timeout=30)
+        self.addCleanup(self.client.close)
+
+
+class ValidateTests(ServerTestCase):
+    def test_valid_canvas(self):
+        result = self.client.validate(VALID_CANVAS, "complete-canvas.json")
+        self.assertEqual(result["status"], "valid")
+        self.assertEqual(result["name"], "complete-canvas.json")
+        self.assertEqual(result["errors"], [])
+
+    def test_valid_rocrate(self):
+        result = self.client.validate(VALID_CRATE, "complete-example.json")
+        self.assertEqual(result["kind"], "rocrate")
+        self.assertEqual(result["status"], "valid", result["errors"])
+
+    def test_invalid_canvas_reports_every_error(self):
+        result = self.client.validate(INVALID_CANVAS)
+        self.assertEqual(result["status"], "invalid")
+        self.assertGreater(len(result["errors"]), 1)
+        self.assertIn("/persons", [error["pointer"] for error in result["errors"]])
+
+    def test_max_errors_caps_the_report(self):
+        result = self.client.validate(INVALID_CANVAS, max_errors=1)
+        self.assertEqual(result["status"], "invalid")
+        self.assertEqual(len(result["errors"]), 1)
+
+    def test_max_errors_below_one_is_rejected(self):
+        for value in (0, -1):
+            with self.subTest(max_errors=value), self.assertRaisesRegex(RuntimeError, "at least 1"):
+                self.client.validate(INVALID_CANVAS, max_errors=value)
+        # The server keeps serving after a rejected request
+        self.assertEqual(self.client.validate(VALID_CANVAS)["status"], "valid")
+
+    def test_max_errors_must_be_an_integer(self):
+        with self.assertRaisesRegex(RuntimeError, "must be an integer"):
+            self.client.request("POST", "/validate?max_errors=many", INVALID_CANVAS)
+
+    def test_malformed_json(self):
+        result = self.client.validate(b'{"project": ', "broken.json")
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["errors"][0]["keyword"], "parse")
+
+    def test_status_counts_requests(self):
+        self.client.validate(VALID_CANVAS)
+        self.client.validate(INVALID_CANVAS)
+        status = self.client.status()
+        self.assertEqual(status["requests"], 2)
+        self.assertEqual(status["reloads"], 1)
+
+
+class UnixSocketValidateTests(ValidateTests):
+    unix = True
+
+
+class ReloadTests(ServerTestCase):
+    def change_schema(self, **changes):
+        schema = json.loads(self.schema_file.read_text(encoding="utf-8"))
+        schema.update(changes)
+        stat = self.schema_file.stat()
+        self.schema_file.write_text(json.dumps(schema), encoding="utf-8")
+        # Make the change visible even on file systems with coarse timestamps
+        os.utime(self.schema_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_reloads_when_the_schema_changes(self):
+        self.assertEqual(self.client.validate(VALID_CANVAS)["status"], "valid")
+        schema_hash = self.client.status()["schema_hash"]
+
+        self.change_schema(required=["project", "addedByTest"])
+        result = self.client.validate(VALID_CANVAS)
+        self.assertEqual(result["status"], "invalid")
+        self.assertTrue(any("addedByTest" in error["message"] for error in result["errors"]))
+        status = self.client.status()
+        self.assertEqual(status["reloads"], 2)
+        self.assertNotEqual(status["schema_hash"], schema_hash)
+
+    def test_broken_schema_keeps_the_last_validators(self):
+        self.schema_file.write_text("{not json", encoding="utf-8")
+        os.utime(self.schema_file, ns=(0, self.schema_file.stat().st_mtime_ns + 1_000_000_000))
+        self.assertEqual(self.client.validate(VALID_CANVAS)["status"], "valid")
+        self.assertIsNotNone(self.client.status()["reload_error"])
+
+    def test_forced_reload(self):
+        self.assertEqual(self.client.reload()["reloads"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,21 +3,40 @@
 Validate example files against the AAC JSON Schema.
 
 This script validates all example files in schema/examples/ against
-the canvas-schema.json and reports any validation errors.
+the canvas-schema.json and reports any validation errors. With --rocrate,
+RO-Crate files are validated against rocrate-profile.json instead of
+being skipped. With --semantic, canvases are also checked against the
+cross-field rules in aac.rules (dates, ID references, dependencies,
+vocabularies), evaluated together in one pass over each canvas.
+With --profile-schema, every schema keyword is timed and the run ends with
+the schema locations that take the most time (see aac.profiling).
+
+Pass directories, glob patterns, JSON or JSONL files to validate an
+arbitrary corpus instead (batch mode). Files are then spread across a
+process pool, each worker building the validator once.
 """
 
+import argparse
+import contextlib
 import json
 import sys
+import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 try:
     import jsonschema
-    from jsonschema import validate, ValidationError
 except ImportError:
     print("Error: jsonschema package not found. Install with: uv sync", file=sys.stderr)
     sys.exit(1)
 
+from aac.batch import BatchConfig, Source, default_jobs, iter_sources, run_batch, worker_validators
+from aac.cache import DEFAULT_CACHE_FILE, ResultCache
+from aac.codegen import load_fast_validator
+from aac.reports import open_reports
+from aac.rules import RULES, rule_names
+from aac.validation import build_validator, check_instance
+
 
 def load_schema(schema_path: Path) -> dict:
     """Load and return the JSON Schema."""
@@ -36,117 +55,375 @@ def is_rocrate_file(data: dict) -> bool:
     return "@context" in data and "@graph" in data
 
 
+# Validators for the most recently used schema, so repeated calls don't rebuild them
+_cached_validator = (None, None, None)
+
+
 def validate_example(schema: dict, example_data: dict, example_path: Path) -> Tuple[bool, List[str]]:
     """
-    Validate an example against the schema.
+    Validate an example against the schema, collecting every error.
     
     Returns:
         Tuple of (is_valid, list_of_errors)
     """
-    errors = []
-    
+    global _cached_validator
     try:
-        # Validate against the schema
-        validate(instance=example_data, schema=schema)
-        return True, []
-    except ValidationError as e:
-        # Extract validation error message
-        error_path = " -> ".join(str(p) for p in e.absolute_path) if e.absolute_path else "root"
-        error_msg = f"{error_path}: {e.message}"
-        errors.append(error_msg)
-        
-        # If there are more errors in the context, include them
-        if e.context:
-            for suberror in e.context:
-                suberror_path = " -> ".join(str(p) for p in suberror.absolute_path) if suberror.absolute_path else "root"
-                errors.append(f"  {suberror_path}: {suberror.message}")
-        
-        return False, errors
+        cached_schema, validator, fast = _cached_validator
+        if cached_schema is not schema:
+            validator = build_validator(schema)
+            fast = load_fast_validator(schema)
+            _cached_validator = (schema, validator, fast)
+        is_valid, issues = check_instance(validator, example_data, fast)
+        return is_valid, [str(issue) for issue in issues]
     except Exception as e:
-        errors.append(f"Unexpected error: {str(e)}")
-        return False, errors
+        return False, [f"Unexpected error: {str(e)}"]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Validate canvas JSON files against the AAC JSON Schema.")
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="Directories, glob patterns, .json or .jsonl files to validate (default: schema/examples/*.json)",
+    )
+    parser.add_argument("--schema", type=Path, help="Schema file (default: schema/canvas-schema.json)")
+    parser.add_argument(
+        "--rocrate",
+        action="store_true",
+        help="Validate RO-Crate files against the RO-Crate profile instead of skipping them",
+    )
+    parser.add_argument("--profile", type=Path, help="RO-Crate profile (default: schema/rocrate-profile.json)")
+    parser.add_argument(
+        "--semantic",
+        action="store_true",
+        help="Also check canvases against the semantic rules (see --list-rules)",
+    )
+    parser.add_argument(
+        "--rule",
+        action="append",
+        metavar="NAME",
+        help="Only evaluate this semantic rule (repeatable; implies --semantic)",
+    )
+    parser.add_argument(
+        "--skip-rule",
+        action="append",
+        metavar="NAME",
+        help="Do not evaluate this semantic rule (repeatable)",
+    )
+    parser.add_argument("--list-rules", action="store_true", help="List the semantic rules and exit")
+    parser.add_argument(
+        "--rule-timing",
+        action="store_true",
+        help="Report the time spent in each semantic rule",
+    )
+    parser.add_argument(
+        "--profile-schema",
+        action="store_true",
+        help="Time every schema keyword and report the hot spots (runs in one process, without the cache)",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Rows per table of the schema profile (default: 20)",
+    )
+    parser.add_argument(
+        "--collapsed",
+        metavar="PATH",
+        help="With --profile-schema, write collapsed stacks for flamegraph.pl or speedscope to PATH",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse RO-Crate @graph entities incrementally so memory is bounded by the largest entity",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        help="Worker processes (default: 1 for the bundled examples, CPU count in batch mode)",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=64,
+        help="Maximum number of chunks read ahead and in flight (default: 64)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=16, help="Documents per worker task (default: 16)")
+    parser.add_argument(
+        "--no-fast-path",
+        action="store_true",
+        help="Validate with jsonschema only instead of the compiled validator",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse results for unchanged files from a SQLite result cache",
+    )
+    parser.add_argument(
+        "--cache-file",
+        type=Path,
+        default=DEFAULT_CACHE_FILE,
+        help="Result cache location (default: .cache/validation.sqlite)",
+    )
+    parser.add_argument(
+        "--prune-cache",
+        action="store_true",
+        help="With --cache, drop entries for files that no longer exist",
+    )
+    parser.add_argument(
+        "--max-errors-per-file",
+        type=int,
+        metavar="N",
+        help="Stop validating a document after N errors (default: report all)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop the whole run at the first invalid or unreadable document",
+    )
+    parser.add_argument(
+        "--jsonl",
+        metavar="PATH",
+        help="Stream results as JSON Lines to PATH ('-' for stdout; other output then goes to stderr)",
+    )
+    parser.add_argument("--junit", metavar="PATH", help="Write a JUnit XML report to PATH")
+    parser.add_argument(
+        "--output",
+        choices=["per-file", "summary"],
+        help="Print every file (per-file) or only failures and totals (summary). "
+             "Default: per-file for the bundled examples, summary in batch mode",
+    )
+    args = parser.parse_args()
+    if args.max_errors_per_file is not None and args.max_errors_per_file < 1:
+        parser.error("--max-errors-per-file must be at least 1")
+    if args.collapsed and not args.profile_schema:
+        parser.error("--collapsed requires --profile-schema")
+    args.rules = None
+    if args.semantic or args.rule or args.skip_rule or args.rule_timing:
+        names = rule_names()
+        unknown = [name for name in (args.rule or []) + (args.skip_rule or []) if name not in names]
+        if unknown:
+            parser.error(f"unknown rule(s): {', '.join(unknown)} (available: {', '.join(names)})")
+        args.rules = tuple(
+            name for name in names if (not args.rule or name in args.rule) and name not in (args.skip_rule or [])
+        )
+    return args
+
+
+def print_rules() -> None:
+    """List the semantic rules."""
+    for r in RULES:
+        print(f"  {r.name:<20} {r.description}")
+
+
+def print_rule_timings(timings: Dict[str, float], documents: int) -> None:
+    """Print the time spent per semantic rule, slowest first."""
+    total = sum(timings.values())
+    print(f"Semantic rule timing ({documents} canvas(es) checked):")
+    for name, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+        share = seconds / total * 100 if total else 0
+        print(f"  {name:<20} {seconds * 1000:10.1f} ms  {share:5.1f}%")
+
+
+def write_schema_profile(top: int, collapsed: Optional[str]) -> None:
+    """Print the schema profile of this run and write its collapsed stacks."""
+    profiler = worker_validators().profiler
+    profiler.print_report(top)
+    if collapsed:
+        try:
+            with open(collapsed, "w", encoding="utf-8") as f:
+                for line in profiler.collapsed_lines():
+                    f.write(line + "\n")
+        except OSError as e:
+            print(f"Error: cannot write {collapsed}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\nCollapsed stacks written to {collapsed}")
+
+
+def print_result(result, per_file: bool) -> None:
+    """Print one validation result in the per-file or summary format."""
+    if result.status == "skipped":
+        if per_file:
+            print(f"Skipping: {result.name} (RO-Crate format, not raw canvas JSON)")
+        return
+    label = f"{result.name} (RO-Crate)" if result.kind == "rocrate" else result.name
+    if result.status == "valid":
+        if per_file:
+            print(f"Validating: {label}")
+            print("  ✓ Valid\n")
+        return
+
+    print(f"Validating: {label}")
+    if result.status == "error":
+        for issue in result.errors:
+            print(f"  ✗ {issue.message}")
+    else:
+        print("  ✗ Invalid:")
+        for issue in result.errors:
+            print(f"    - {issue}")
+            for sub in issue.context:
+                print(f"        {sub}")
+    print()
 
 
 def main():
     """Main entry point."""
+    args = parse_args()
+    if args.list_rules:
+        print_rules()
+        sys.exit(0)
+    if args.jsonl == "-":
+        # Keep stdout clean for the JSON Lines stream
+        with contextlib.redirect_stdout(sys.stderr):
+            run(args)
+    else:
+        run(args)
+
+
+def run(args: argparse.Namespace) -> None:
+    """Validate the requested files and exit with the result."""
+
     # Get paths
     repo_root = Path(__file__).parent.parent
-    schema_file = repo_root / "schema" / "canvas-schema.json"
+    schema_file = args.schema or repo_root / "schema" / "canvas-schema.json"
+    profile_file = args.profile or repo_root / "schema" / "rocrate-profile.json"
     examples_dir = repo_root / "schema" / "examples"
+    batch_mode = bool(args.inputs)
     
     # Check schema file exists
     if not schema_file.exists():
         print(f"Error: Schema file not found: {schema_file}", file=sys.stderr)
         sys.exit(1)
-    
-    # Check examples directory exists
-    if not examples_dir.exists():
-        print(f"Error: Examples directory not found: {examples_dir}", file=sys.stderr)
+    if args.rocrate and not profile_file.exists():
+        print(f"Error: RO-Crate profile not found: {profile_file}", file=sys.stderr)
         sys.exit(1)
     
-    # Load schema
     print(f"Loading schema from: {schema_file}")
-    schema = load_schema(schema_file)
-    
-    # Find all JSON example files
-    example_files = sorted(examples_dir.glob("*.json"))
-    
-    if not example_files:
-        print(f"Warning: No example files found in {examples_dir}", file=sys.stderr)
-        sys.exit(0)
-    
-    print(f"Found {len(example_files)} example file(s)\n")
+    if args.rocrate:
+        print(f"Loading RO-Crate profile from: {profile_file}")
+
+    if batch_mode:
+        sources = iter_sources(args.inputs)
+        print(f"Inputs: {', '.join(args.inputs)}\n")
+    else:
+        # Check examples directory exists
+        if not examples_dir.exists():
+            print(f"Error: Examples directory not found: {examples_dir}", file=sys.stderr)
+            sys.exit(1)
+
+        # Find all JSON example files
+        example_files = sorted(examples_dir.glob("*.json"))
+
+        if not example_files:
+            print(f"Warning: No example files found in {examples_dir}", file=sys.stderr)
+            sys.exit(0)
+
+        print(f"Found {len(example_files)} example file(s)\n")
+        sources = [Source(name=f.name, path=f) for f in example_files]
+
+    jobs = args.jobs if args.jobs is not None else (default_jobs() if batch_mode else 1)
+    if args.profile_schema:
+        # The profile is collected in-process, and cached results would not be timed
+        jobs = 1
+        args.cache = False
+    per_file = (args.output or ("summary" if batch_mode else "per-file")) == "per-file"
     
+    config = BatchConfig(
+        schema_file=str(schema_file),
+        fast_path=not args.no_fast_path,
+        profile_file=str(profile_file) if args.rocrate else None,
+        stream=args.stream,
+        max_errors=args.max_errors_per_file,
+        rules=args.rules,
+        profile_schema=args.profile_schema,
+    )
+
     # Validate each example
     all_valid = True
     rocrate_files = []
+    validated_rocrates = []
     canvas_files = []
-    
-    for example_file in example_files:
-        try:
-            example_data = load_example(example_file)
-            
-            # Check if this is an RO-Crate file
-            if is_rocrate_file(example_data):
-                rocrate_files.append(example_file.name)
-                print(f"Skipping: {example_file.name} (RO-Crate format, not raw canvas JSON)")
-                continue
-            
-            # Validate raw canvas JSON files
-            canvas_files.append(example_file.name)
-            print(f"Validating: {example_file.name}")
-            
-            is_valid, errors = validate_example(schema, example_data, example_file)
-            
-            if is_valid:
-                print(f"  ✓ Valid\n")
-            else:
-                all_valid = False
-                print(f"  ✗ Invalid:")
-                for error in errors:
-                    print(f"    - {error}")
-                print()
-        except json.JSONDecodeError as e:
-            all_valid = False
-            print(f"  ✗ JSON parsing error: {e}\n")
-        except Exception as e:
+    started = time.perf_counter()
+
+    cache = ResultCache(args.cache_file, config.cache_key()) if args.cache else None
+    reports = open_reports(args.jsonl, args.junit)
+    stopped_early = False
+    rule_timings: Dict[str, float] = {}
+    timed = 0
+
+    results = run_batch(sources, config, jobs=jobs, prefetch=args.prefetch, chunk_size=args.chunk_size, cache=cache)
+    for result in results:
+        print_result(result, per_file)
+        if result.timings:
+            timed += 1
+            for name, seconds in result.timings.items():
+                rule_timings[name] = rule_timings.get(name, 0.0) + seconds
+        for report in reports:
+            report.write(result)
+        if result.status == "skipped":
+            rocrate_files.append(result.name)
+            continue
+        if result.kind == "rocrate":
+            validated_rocrates.append(result.name)
+        else:
+            canvas_files.append(result.name)
+        if result.status != "valid":
             all_valid = False
-            print(f"  ✗ Error: {e}\n")
+        if args.fail_fast and result.failed:
+            stopped_early = True
+            results.close()
+            break
+
+    for report in reports:
+        report.close(stopped_early)
+    elapsed = time.perf_counter() - started
+    total = len(canvas_files) + len(rocrate_files) + len(validated_rocrates)
+
+    pruned = 0
+    if cache is not None:
+        pruned = cache.prune() if args.prune_cache else 0
+        cache.close()
     
     # Summary
     print()
     if rocrate_files:
-        print(f"Note: Skipped {len(rocrate_files)} RO-Crate file(s): {', '.join(rocrate_files)}")
-        print("      RO-Crate files are validated separately against the RO-Crate profile.")
+        if batch_mode:
+            print(f"Note: Skipped {len(rocrate_files)} RO-Crate file(s)")
+        else:
+            print(f"Note: Skipped {len(rocrate_files)} RO-Crate file(s): {', '.join(rocrate_files)}")
+        print("      Use --rocrate to validate them against the RO-Crate profile.")
         print()
     
-    if not canvas_files:
+    if validated_rocrates:
+        if batch_mode:
+            print(f"Validated {len(validated_rocrates)} RO-Crate file(s) against the RO-Crate profile")
+        else:
+            print(f"Validated {len(validated_rocrates)} RO-Crate file(s): {', '.join(validated_rocrates)}")
+
+    if not canvas_files and not validated_rocrates:
         print("No raw canvas JSON files found to validate.")
         print("Note: The examples directory contains RO-Crate files (output format), not raw canvas JSON (input format).")
         print("      To validate canvas data, add raw canvas JSON files to the examples directory.")
         sys.exit(0)
     
-    print(f"Validated {len(canvas_files)} raw canvas JSON file(s): {', '.join(canvas_files)}")
+    if batch_mode:
+        print(f"Validated {len(canvas_files)} raw canvas JSON document(s)")
+    elif canvas_files:
+        print(f"Validated {len(canvas_files)} raw canvas JSON file(s): {', '.join(canvas_files)}")
+    rate = total / elapsed if elapsed > 0 else float("inf")
+    print(f"Processed {total} document(s) in {elapsed:.2f}s ({rate:.1f} files/s, {jobs} worker(s))")
+    if cache is not None:
+        print(f"Cache: {cache.hits} hit(s), {cache.misses} miss(es), {pruned} stale entries pruned")
+    if stopped_early:
+        print("Stopped at the first failure (--fail-fast); remaining documents were not validated.")
+    if args.rule_timing:
+        print()
+        print_rule_timings(rule_timings, timed)
+    if args.profile_schema:
+        print()
+        write_schema_profile(args.profile_top, args.collapsed)
     print()
     
     # Exit with appropriate code
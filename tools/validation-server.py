@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Run or query the long-lived AAC validation server.
+
+The server loads canvas-schema.json and rocrate-profile.json once, keeps the
+compiled validators warm and rebuilds them when either file changes. Editor
+integrations and pre-commit hooks then validate through the thin client,
+which starts without importing jsonschema.
+
+    python tools/validation-server.py serve &
+    python tools/validation-server.py check canvas.json
+    python tools/validation-server.py bench schema/examples/complete-canvas.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from aac.client import DEFAULT_ADDRESS, ServerUnavailable, ValidationClient
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Start the server and block until it is stopped."""
+    try:
+        import jsonschema  # noqa: F401
+    except ImportError:
+        print("Error: jsonschema package not found. Install with: uv sync", file=sys.stderr)
+        return 1
+
+    from aac.batch import BatchConfig
+    from aac.rocrate import PROFILE_FILE
+    from aac.server import make_server
+    from aac.validation import SCHEMA_FILE
+
+    schema_file = args.schema or SCHEMA_FILE
+    profile_file = args.profile or PROFILE_FILE
+    for path in (schema_file, profile_file):
+        if not path.exists():
+            print(f"Error: Schema file not found: {path}", file=sys.stderr)
+            return 1
+
+    config = BatchConfig(
+        schema_file=str(schema_file),
+        fast_path=not args.no_fast_path,
+        profile_file=str(profile_file),
+    )
+    server = make_server(config, args.host, args.port, args.socket, args.verbose)
+    where = f"unix:{args.socket}" if args.socket else f"{args.host}:{server.server_address[1]}"
+    print(f"Loaded schema from: {schema_file}")
+    print(f"Loaded RO-Crate profile from: {profile_file}")
+    print(f"Validation server listening on {where} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print("Validation server stopped")
+    return 0
+
+
+def check(args: argparse.Namespace) -> int:
+    """Validate files through the server; exit 1 if any is invalid."""
+    client = ValidationClient(args.server)
+    all_valid = True
+    for name in args.files:
+        try:
+            data = Path(name).read_bytes()
+        except OSError as e:
+            print(f"{name}: Error: {e}", file=sys.stderr)
+            all_valid = False
+            continue
+        result = client.validate(data, name, args.max_errors_per_file)
+        if args.json:
+            print(json.dumps(result))
+        elif result["status"] == "valid":
+            print(f"{name}: ✓ Valid")
+        elif result["status"] == "skipped":
+            print(f"{name}: skipped")
+        else:
+            print(f"{name}: ✗ {'Invalid' if result['status'] == 'invalid' else 'Error'}")
+            for issue in result["errors"]:
+                print(f"    - {issue['pointer'] or '(root)'}: {issue['message']}")
+        if result["status"] in ("invalid", "error"):
+            all_valid = False
+    return 0 if all_valid else 1
+
+
+def bench(args: argparse.Namespace) -> int:
+    """Measure request latency with several concurrent clients."""
+    data = Path(args.file).read_bytes()
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        client = ValidationClient(args.server)
+        local = []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            client.validate(data, args.file)
+            local.append(time.perf_counter() - started)
+        client.close()
+        with lock:
+            latencies.extend(local)
+
+    # Fail early with a clear message if the server is down
+    ValidationClient(args.server).status()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, max(0, round(fraction * len(latencies)) - 1))] * 1000
+
+    print(f"{len(latencies)} request(s) from {args.clients} client(s) in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.1f} req/s)")
+    print(f"Latency: p50 {pct(0.50):.2f} ms, p90 {pct(0.90):.2f} ms, p99 {pct(0.99):.2f} ms, "
+          f"max {latencies[-1] * 1000:.2f} ms")
+    return 0
+
+
+def control(args: argparse.Namespace) -> int:
+    """status / reload / stop."""
+    client = ValidationClient(args.server)
+    if args.command == "status":
+        print(json.dumps(client.status(), indent=2))
+    elif args.command == "reload":
+        status = client.reload()
+        if status["reload_error"]:
+            print(f"Reload failed, still serving the previous schema: {status['reload_error']}", file=sys.stderr)
+            return 1
+        print(f"Reloaded schema {status['schema_hash'][:16]}")
+    else:
+        client.shutdown()
+        print("Validation server stopping")
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Run or query the long-lived AAC validation server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    server_option = argparse.ArgumentParser(add_help=False)
+    server_option.add_argument(
+        "--server",
+        default=os.environ.get("AAC_VALIDATION_SERVER", DEFAULT_ADDRESS),
+        help=f"Server address: HOST:PORT or unix:PATH (default: $AAC_VALIDATION_SERVER or {DEFAULT_ADDRESS})",
+    )
+
+    serve_parser = commands.add_parser("serve", help="Start the server")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765, 0 picks a free port)")
+    serve_parser.add_argument("--socket", help="Listen on this Unix socket instead of a TCP port")
+    serve_parser.add_argument("--schema", type=Path, help="Schema file (default: schema/canvas-schema.json)")
+    serve_parser.add_argument("--profile", type=Path, help="RO-Crate profile (default: schema/rocrate-profile.json)")
+    serve_parser.add_argument("--no-fast-path", action="store_true", help="Validate with jsonschema only")
+    serve_parser.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    serve_parser.set_defaults(func=serve)
+
+    check_parser = commands.add_parser("check", parents=[server_option], help="Validate files through the server")
+    check_parser.add_argument("files", nargs="+", help="Canvas or RO-Crate JSON files")
+    check_parser.add_argument("--max-errors-per-file", type=int, metavar="N", help="Stop after N errors per file")
+    check_parser.add_argument("--json", action="store_true", help="Print one JSON result per line")
+    check_parser.set_defaults(func=check)
+
+    bench_parser = commands.add_parser("bench", parents=[server_option], help="Measure latency under concurrent clients")
+    bench_parser.add_argument("file", help="Document to validate repeatedly")
+    bench_parser.add_argument("--clients", type=int, default=8, help="Concurrent clients (default: 8)")
+    bench_parser.add_argument("--requests", type=int, default=200, help="Requests per client (default: 200)")
+    bench_parser.set_defaults(func=bench)
+
+    for name, help_text in (("status", "Show server state and latency percentiles"),
+                            ("reload", "Rebuild the validators from the schema files"),
+                            ("stop", "Stop the server")):
+        commands.add_parser(name, parents=[server_option], help=help_text).set_defaults(func=control)
+
+    args = parser.parse_args()
+    if args.func is check and args.max_errors_per_file is not None and args.max_errors_per_file < 1:
+        check_parser.error("--max-errors-per-file must be at least 1")
+    return args
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    try:
+        sys.exit(args.func(args))
+    except ServerUnavailable as e:
+        print(f"Error: {e}", file=sys.stderr)
+        print("Start it with: python tools/validation-server.py serve", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()